@@ -12,20 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
 import os.path
 import sqlite3
 import sys
 import time
 import traceback
+from urllib.request import pathname2url
 
 
-def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
+def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0,
+                        read_only=False):
     """
     :param db_path: str, the path to the database, relative to the
         current working directory, defaults to "../db/io.db"
     :param timeout: int, number of seconds the connection should wait for the
         database lock to go away before raising an exception, defaults to 5
     :param detect_types: int, type detection parameter, defaults to 0
+    :param read_only: boolean, whether to open the database in read-only
+        mode (writes through the connection will raise an exception),
+        defaults to False
     :return: the sqlite3 database connection object
 
     Connect to a database and return the connection object.
@@ -39,7 +45,15 @@ def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
             )
         )
 
-    conn = sqlite3.connect(db_path, timeout=timeout, detect_types=detect_types)
+    if read_only:
+        conn = sqlite3.connect(
+            "file:{}?mode=ro".format(pathname2url(os.path.abspath(db_path))),
+            uri=True, timeout=timeout, detect_types=detect_types
+        )
+    else:
+        conn = sqlite3.connect(
+            db_path, timeout=timeout, detect_types=detect_types
+        )
 
     # Enforce foreign keys (default = not enforced)
     conn.execute("PRAGMA foreign_keys=ON;")
@@ -106,3 +120,80 @@ def spin_on_database_lock(conn, cursor, sql, data, many=True,
         else:
             # print("...done.")
             break
+
+
+class DeferredCommitConnection(object):
+    """
+    Wrap a database connection so that calls to its *commit* method (e.g.
+    by *spin_on_database_lock* after each statement) are ignored; all other
+    attributes are those of the wrapped connection. This lets us run many
+    statements (e.g. all results imports for a subproblem) as one
+    transaction that is committed once at the end (see *single_transaction*).
+    """
+    def __init__(self, conn):
+        """
+        :param conn: the connection object to wrap
+        """
+        self._conn = conn
+
+    def commit(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@contextmanager
+def single_transaction(conn):
+    """
+    :param conn: the connection object
+
+    Context manager that yields a connection whose commits are deferred
+    until the end of the block, so that all statements run in the block
+    are committed in a single transaction. If the block fails, the
+    transaction is rolled back.
+
+    Usage:
+        with single_transaction(conn) as transaction_conn:
+            spin_on_database_lock(conn=transaction_conn, ...)
+    """
+    try:
+        yield DeferredCommitConnection(conn)
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+@contextmanager
+def bulk_load_pragmas(conn):
+    """
+    :param conn: the connection object
+
+    Context manager that tunes the SQLite settings of the connection for
+    bulk loading data: the database file is not synced to disk after each
+    transaction and the rollback journal and temporary tables are kept in
+    memory. This is much faster but the database may be corrupted if the
+    machine crashes during the load. The previous settings are restored at
+    the end of the block.
+    """
+    c = conn.cursor()
+    bulk_load_settings = {
+        "synchronous": "OFF",
+        "journal_mode": "MEMORY",
+        "temp_store": "MEMORY",
+        "cache_size": -262144  # in KiB, i.e. 256 MiB
+    }
+    previous_settings = {
+        pragma: c.execute("PRAGMA {};".format(pragma)).fetchone()[0]
+        for pragma in bulk_load_settings.keys()
+    }
+
+    for pragma, setting in bulk_load_settings.items():
+        c.execute("PRAGMA {} = {};".format(pragma, setting))
+    try:
+        yield
+    finally:
+        for pragma, setting in previous_settings.items():
+            c.execute("PRAGMA {} = {};".format(pragma, setting))
@@ -187,6 +187,47 @@ PRIMARY KEY (scenario_id, subproblem_id, stage_id),
 FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
 );
 
+-- Scenario results version: a token that changes whenever the scenario's
+-- results are imported or processed, so that caches of data derived from
+-- the results (e.g. the UI's plot cache) can be invalidated
+DROP TABLE IF EXISTS results_scenario_version;
+CREATE TABLE results_scenario_version (
+scenario_id INTEGER PRIMARY KEY,
+results_version VARCHAR(32)
+);
+
+-- Scenario results processed: the subproblems and stages whose results
+-- have been processed by each module (see process_results.py), so that
+-- only the results of newly imported subproblems and stages are processed
+-- when process_results is run again; the rows are deleted along with the
+-- results they refer to
+DROP TABLE IF EXISTS results_scenario_processed;
+CREATE TABLE results_scenario_processed (
+scenario_id INTEGER,
+subproblem_id INTEGER,
+stage_id INTEGER,
+gridpath_module VARCHAR(128),
+PRIMARY KEY (scenario_id, subproblem_id, stage_id, gridpath_module),
+FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+);
+
+-- Scenario profile: wall time and peak memory of each step of the run (if
+-- the scenario was run with the --profile option)
+DROP TABLE IF EXISTS results_scenario_profile;
+CREATE TABLE results_scenario_profile (
+scenario_id INTEGER,
+subproblem_id INTEGER,
+stage_id INTEGER,
+step_id INTEGER,
+phase VARCHAR(64),
+module VARCHAR(128),
+component VARCHAR(128),
+seconds FLOAT,
+peak_memory_mb FLOAT,
+PRIMARY KEY (scenario_id, subproblem_id, stage_id, step_id),
+FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+);
+
 
 -------------------------------------------------------------------------------
 ---- SUBSCENARIOS AND INPUTS -----
@@ -2425,6 +2466,19 @@ FOREIGN KEY (solver_options_id)
     REFERENCES subscenarios_options_solver (solver_options_id)
 );
 
+-- Run queue workers: the scenario processes launched by the run queue
+-- manager and their resource reservations, so that a restarted queue
+-- manager can account for the runs still in progress
+DROP TABLE IF EXISTS run_queue_workers;
+CREATE TABLE run_queue_workers (
+scenario_id INTEGER PRIMARY KEY,
+process_id INTEGER,
+cpu_reservation INTEGER,
+memory_reservation_gb FLOAT,
+launch_time TEXT,  -- ISO8601 String
+FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+);
+
 --------------------------
 -- -- DATA INTEGRITY -- --
 --------------------------
@@ -2564,6 +2618,12 @@ scheduled_curtailment_mw FLOAT,
 PRIMARY KEY (scenario_id, subproblem_id, stage_id, timepoint, load_zone)
 );
 
+-- Curtailment by load zone and timepoints (see viz.dispatch_plot and the
+-- curtailment heatmap plots)
+DROP INDEX IF EXISTS results_project_curtailment_variable_zone_timepoint_idx;
+CREATE INDEX results_project_curtailment_variable_zone_timepoint_idx
+ON results_project_curtailment_variable (scenario_id, load_zone, timepoint);
+
 DROP TABLE IF EXISTS results_project_curtailment_hydro;
 CREATE TABLE results_project_curtailment_hydro (
 scenario_id INTEGER,
@@ -2581,6 +2641,12 @@ scheduled_curtailment_mw FLOAT,
 PRIMARY KEY (scenario_id, subproblem_id, stage_id, timepoint, load_zone)
 );
 
+-- Curtailment by load zone and timepoints (see viz.dispatch_plot and the
+-- curtailment heatmap plots)
+DROP INDEX IF EXISTS results_project_curtailment_hydro_zone_timepoint_idx;
+CREATE INDEX results_project_curtailment_hydro_zone_timepoint_idx
+ON results_project_curtailment_hydro (scenario_id, load_zone, timepoint);
+
 DROP TABLE IF EXISTS results_project_dispatch_by_technology;
 CREATE TABLE results_project_dispatch_by_technology (
 scenario_id INTEGER,
@@ -2598,6 +2664,11 @@ PRIMARY KEY (scenario_id, subproblem_id, stage_id, timepoint, load_zone,
 technology)
 );
 
+-- Dispatch by load zone and timepoints (see viz.dispatch_plot)
+DROP INDEX IF EXISTS results_project_dispatch_by_technology_zone_timepoint_idx;
+CREATE INDEX results_project_dispatch_by_technology_zone_timepoint_idx
+ON results_project_dispatch_by_technology (scenario_id, load_zone, timepoint);
+
 DROP TABLE IF EXISTS results_project_dispatch_by_technology_period;
 CREATE TABLE results_project_dispatch_by_technology_period (
 scenario_id INTEGER,
@@ -2612,6 +2683,27 @@ PRIMARY KEY (scenario_id, subproblem_id, stage_id, period, load_zone,
 technology, spinup_or_lookahead)
 );
 
+-- Energy by load zone and stage (see viz.energy_plot)
+DROP INDEX IF EXISTS results_project_dispatch_by_technology_period_zone_stage_idx;
+CREATE INDEX results_project_dispatch_by_technology_period_zone_stage_idx
+ON results_project_dispatch_by_technology_period (scenario_id, load_zone, stage_id);
+
+-- Energy and weighted hours by project, period, subproblem, and stage,
+-- excluding spinup/lookahead timepoints (e.g. for capacity factors)
+DROP TABLE IF EXISTS results_project_dispatch_by_period;
+CREATE TABLE results_project_dispatch_by_period (
+scenario_id INTEGER,
+project VARCHAR(64),
+period INTEGER,
+subproblem_id INTEGER,
+stage_id INTEGER,
+load_zone VARCHAR(32),
+technology VARCHAR(32),
+energy_mwh FLOAT,
+weighted_hours FLOAT,
+PRIMARY KEY (scenario_id, project, period, subproblem_id, stage_id)
+);
+
 DROP TABLE IF EXISTS results_project_lf_reserves_up;
 CREATE TABLE results_project_lf_reserves_up (
 scenario_id INTEGER,
@@ -2634,6 +2726,12 @@ reserve_provision_mw FLOAT,
 PRIMARY KEY (scenario_id, project, subproblem_id, stage_id, timepoint)
 );
 
+-- Reserve provision by project and timepoint (see
+-- viz.project_operations_plot)
+DROP INDEX IF EXISTS results_project_lf_reserves_up_project_timepoint_idx;
+CREATE INDEX results_project_lf_reserves_up_project_timepoint_idx
+ON results_project_lf_reserves_up (scenario_id, project, stage_id, timepoint);
+
 DROP TABLE IF EXISTS results_project_lf_reserves_down;
 CREATE TABLE results_project_lf_reserves_down (
 scenario_id INTEGER,
@@ -2656,6 +2754,12 @@ reserve_provision_mw FLOAT,
 PRIMARY KEY (scenario_id, project, subproblem_id, stage_id, timepoint)
 );
 
+-- Reserve provision by project and timepoint (see
+-- viz.project_operations_plot)
+DROP INDEX IF EXISTS results_project_lf_reserves_down_project_timepoint_idx;
+CREATE INDEX results_project_lf_reserves_down_project_timepoint_idx
+ON results_project_lf_reserves_down (scenario_id, project, stage_id, timepoint);
+
 DROP TABLE IF EXISTS results_project_regulation_up;
 CREATE TABLE results_project_regulation_up (
 scenario_id INTEGER,
@@ -2678,6 +2782,12 @@ reserve_provision_mw FLOAT,
 PRIMARY KEY (scenario_id, project, subproblem_id, stage_id, timepoint)
 );
 
+-- Reserve provision by project and timepoint (see
+-- viz.project_operations_plot)
+DROP INDEX IF EXISTS results_project_regulation_up_project_timepoint_idx;
+CREATE INDEX results_project_regulation_up_project_timepoint_idx
+ON results_project_regulation_up (scenario_id, project, stage_id, timepoint);
+
 DROP TABLE IF EXISTS results_project_regulation_down;
 CREATE TABLE results_project_regulation_down (
 scenario_id INTEGER,
@@ -2700,6 +2810,12 @@ reserve_provision_mw FLOAT,
 PRIMARY KEY (scenario_id, project, subproblem_id, stage_id, timepoint)
 );
 
+-- Reserve provision by project and timepoint (see
+-- viz.project_operations_plot)
+DROP INDEX IF EXISTS results_project_regulation_down_project_timepoint_idx;
+CREATE INDEX results_project_regulation_down_project_timepoint_idx
+ON results_project_regulation_down (scenario_id, project, stage_id, timepoint);
+
 DROP TABLE IF EXISTS results_project_frequency_response;
 CREATE TABLE results_project_frequency_response (
 scenario_id INTEGER,
@@ -2723,6 +2839,12 @@ partial INTEGER,
 PRIMARY KEY (scenario_id, project, subproblem_id, stage_id, timepoint)
 );
 
+-- Reserve provision by project and timepoint (see
+-- viz.project_operations_plot)
+DROP INDEX IF EXISTS results_project_frequency_response_project_timepoint_idx;
+CREATE INDEX results_project_frequency_response_project_timepoint_idx
+ON results_project_frequency_response (scenario_id, project, stage_id, timepoint);
+
 DROP TABLE IF EXISTS results_project_spinning_reserves;
 CREATE TABLE results_project_spinning_reserves (
 scenario_id INTEGER,
@@ -2745,6 +2867,12 @@ reserve_provision_mw FLOAT,
 PRIMARY KEY (scenario_id, project, subproblem_id, stage_id, timepoint)
 );
 
+-- Reserve provision by project and timepoint (see
+-- viz.project_operations_plot)
+DROP INDEX IF EXISTS results_project_spinning_reserves_project_timepoint_idx;
+CREATE INDEX results_project_spinning_reserves_project_timepoint_idx
+ON results_project_spinning_reserves (scenario_id, project, stage_id, timepoint);
+
 DROP TABLE IF EXISTS results_project_prm_deliverability;
 CREATE TABLE results_project_prm_deliverability (
 scenario_id INTEGER,
@@ -3094,6 +3222,11 @@ net_imports_mw FLOAT,
 PRIMARY KEY (scenario_id, load_zone, subproblem_id, stage_id, timepoint)
 );
 
+-- Imports and exports by load zone and timepoints (see viz.dispatch_plot)
+DROP INDEX IF EXISTS results_transmission_imports_exports_zone_timepoint_idx;
+CREATE INDEX results_transmission_imports_exports_zone_timepoint_idx
+ON results_transmission_imports_exports (scenario_id, load_zone, timepoint);
+
 DROP TABLE IF EXISTS results_transmission_operations;
 CREATE TABLE results_transmission_operations (
 scenario_id INTEGER,
@@ -3196,6 +3329,11 @@ marginal_price_per_mw FLOAT,
 PRIMARY KEY (scenario_id, load_zone, subproblem_id, stage_id, timepoint)
 );
 
+-- Load by load zone and timepoints (see viz.dispatch_plot)
+DROP INDEX IF EXISTS results_system_load_balance_zone_timepoint_idx;
+CREATE INDEX results_system_load_balance_zone_timepoint_idx
+ON results_system_load_balance (scenario_id, load_zone, timepoint);
+
 DROP TABLE IF EXISTS results_system_market_participation;
 CREATE TABLE results_system_market_participation (
 scenario_id INTEGER,
@@ -3842,6 +3980,202 @@ USING (temporal_scenario_id, project, period)
 ;
 
 
+-- Materialized version of the project_operational_timepoints view for the
+-- subscenario combinations (portfolio, opchars, specified capacity, new cost,
+-- and temporal subscenarios) of the scenarios we have written inputs for.
+-- Querying the view requires cross-joining all projects with all timepoints
+-- for each subproblem, stage, and operational type, which is slow for large
+-- temporal subscenarios, so we materialize the project-timepoints once for
+-- each subscenario combination (see
+-- gridpath.auxiliary.db_interface.update_project_operational_timepoints).
+DROP TABLE IF EXISTS project_operational_timepoints_materialized;
+CREATE TABLE project_operational_timepoints_materialized (
+project_portfolio_scenario_id INTEGER,
+project_operational_chars_scenario_id INTEGER,
+project_specified_capacity_scenario_id INTEGER,
+project_new_cost_scenario_id INTEGER,
+temporal_scenario_id INTEGER,
+subproblem_id INTEGER,
+stage_id INTEGER,
+operational_type VARCHAR(32),
+variable_generator_profile_scenario_id INTEGER,
+project VARCHAR(64),
+timepoint INTEGER
+);
+
+DROP INDEX IF EXISTS project_operational_timepoints_materialized_idx;
+CREATE INDEX project_operational_timepoints_materialized_idx
+ON project_operational_timepoints_materialized (
+project_portfolio_scenario_id, project_operational_chars_scenario_id,
+project_specified_capacity_scenario_id, project_new_cost_scenario_id,
+temporal_scenario_id, subproblem_id, stage_id, operational_type
+);
+
+-- The subscenario combinations that are currently materialized in the
+-- project_operational_timepoints_materialized table
+DROP TABLE IF EXISTS project_operational_timepoints_subscenarios;
+CREATE TABLE project_operational_timepoints_subscenarios (
+project_portfolio_scenario_id INTEGER,
+project_operational_chars_scenario_id INTEGER,
+project_specified_capacity_scenario_id INTEGER,
+project_new_cost_scenario_id INTEGER,
+temporal_scenario_id INTEGER,
+PRIMARY KEY (project_portfolio_scenario_id,
+project_operational_chars_scenario_id,
+project_specified_capacity_scenario_id, project_new_cost_scenario_id,
+temporal_scenario_id)
+);
+
+-- When the inputs of a portfolio, opchar, specified capacity, new cost, or
+-- temporal subscenario change, the materialized subscenario combinations
+-- that include it are out of date, so we remove them from the
+-- project_operational_timepoints_subscenarios table; their project-timepoints
+-- are then materialized again the next time they are needed
+DROP TRIGGER IF EXISTS inputs_project_portfolios_insert_project_operational_timepoints;
+CREATE TRIGGER inputs_project_portfolios_insert_project_operational_timepoints
+AFTER INSERT ON inputs_project_portfolios
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_portfolio_scenario_id = NEW.project_portfolio_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_portfolios_update_project_operational_timepoints;
+CREATE TRIGGER inputs_project_portfolios_update_project_operational_timepoints
+AFTER UPDATE ON inputs_project_portfolios
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_portfolio_scenario_id = OLD.project_portfolio_scenario_id OR project_portfolio_scenario_id = NEW.project_portfolio_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_portfolios_delete_project_operational_timepoints;
+CREATE TRIGGER inputs_project_portfolios_delete_project_operational_timepoints
+AFTER DELETE ON inputs_project_portfolios
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_portfolio_scenario_id = OLD.project_portfolio_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_operational_chars_insert_project_operational_timepoints;
+CREATE TRIGGER inputs_project_operational_chars_insert_project_operational_timepoints
+AFTER INSERT ON inputs_project_operational_chars
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_operational_chars_scenario_id = NEW.project_operational_chars_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_operational_chars_update_project_operational_timepoints;
+CREATE TRIGGER inputs_project_operational_chars_update_project_operational_timepoints
+AFTER UPDATE ON inputs_project_operational_chars
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_operational_chars_scenario_id = OLD.project_operational_chars_scenario_id OR project_operational_chars_scenario_id = NEW.project_operational_chars_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_operational_chars_delete_project_operational_timepoints;
+CREATE TRIGGER inputs_project_operational_chars_delete_project_operational_timepoints
+AFTER DELETE ON inputs_project_operational_chars
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_operational_chars_scenario_id = OLD.project_operational_chars_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_specified_capacity_insert_project_operational_timepoints;
+CREATE TRIGGER inputs_project_specified_capacity_insert_project_operational_timepoints
+AFTER INSERT ON inputs_project_specified_capacity
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_specified_capacity_scenario_id = NEW.project_specified_capacity_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_specified_capacity_update_project_operational_timepoints;
+CREATE TRIGGER inputs_project_specified_capacity_update_project_operational_timepoints
+AFTER UPDATE ON inputs_project_specified_capacity
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_specified_capacity_scenario_id = OLD.project_specified_capacity_scenario_id OR project_specified_capacity_scenario_id = NEW.project_specified_capacity_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_specified_capacity_delete_project_operational_timepoints;
+CREATE TRIGGER inputs_project_specified_capacity_delete_project_operational_timepoints
+AFTER DELETE ON inputs_project_specified_capacity
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_specified_capacity_scenario_id = OLD.project_specified_capacity_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_new_cost_insert_project_operational_timepoints;
+CREATE TRIGGER inputs_project_new_cost_insert_project_operational_timepoints
+AFTER INSERT ON inputs_project_new_cost
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_new_cost_scenario_id = NEW.project_new_cost_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_new_cost_update_project_operational_timepoints;
+CREATE TRIGGER inputs_project_new_cost_update_project_operational_timepoints
+AFTER UPDATE ON inputs_project_new_cost
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_new_cost_scenario_id = OLD.project_new_cost_scenario_id OR project_new_cost_scenario_id = NEW.project_new_cost_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_project_new_cost_delete_project_operational_timepoints;
+CREATE TRIGGER inputs_project_new_cost_delete_project_operational_timepoints
+AFTER DELETE ON inputs_project_new_cost
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE project_new_cost_scenario_id = OLD.project_new_cost_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_temporal_periods_insert_project_operational_timepoints;
+CREATE TRIGGER inputs_temporal_periods_insert_project_operational_timepoints
+AFTER INSERT ON inputs_temporal_periods
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE temporal_scenario_id = NEW.temporal_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_temporal_periods_update_project_operational_timepoints;
+CREATE TRIGGER inputs_temporal_periods_update_project_operational_timepoints
+AFTER UPDATE ON inputs_temporal_periods
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE temporal_scenario_id = OLD.temporal_scenario_id OR temporal_scenario_id = NEW.temporal_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_temporal_periods_delete_project_operational_timepoints;
+CREATE TRIGGER inputs_temporal_periods_delete_project_operational_timepoints
+AFTER DELETE ON inputs_temporal_periods
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE temporal_scenario_id = OLD.temporal_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_temporal_insert_project_operational_timepoints;
+CREATE TRIGGER inputs_temporal_insert_project_operational_timepoints
+AFTER INSERT ON inputs_temporal
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE temporal_scenario_id = NEW.temporal_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_temporal_update_project_operational_timepoints;
+CREATE TRIGGER inputs_temporal_update_project_operational_timepoints
+AFTER UPDATE ON inputs_temporal
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE temporal_scenario_id = OLD.temporal_scenario_id OR temporal_scenario_id = NEW.temporal_scenario_id;
+END;
+
+DROP TRIGGER IF EXISTS inputs_temporal_delete_project_operational_timepoints;
+CREATE TRIGGER inputs_temporal_delete_project_operational_timepoints
+AFTER DELETE ON inputs_temporal
+BEGIN
+DELETE FROM project_operational_timepoints_subscenarios
+WHERE temporal_scenario_id = OLD.temporal_scenario_id;
+END;
+
+
 -- ratio of hrs that are (not) spinup/lookahead in each period-subproblem-stage
 DROP VIEW IF EXISTS spinup_or_lookahead_ratios;
 CREATE VIEW spinup_or_lookahead_ratios AS
@@ -126,17 +126,10 @@ def get_subscenario_data(csv_file, cols_to_exclude_str, **kwargs):
 
     # Read the CSV
     df = pd.read_csv(csv_file, delimiter=",")
-    csv_columns = df.columns.tolist()
-
-    # Exclude some columns if directed to do so
-    if cols_to_exclude_str == "nan":
-        pass
-    else:
-        cols_to_exclude = [
-            i for i in csv_columns if i.startswith(cols_to_exclude_str)
-        ]
-        for c in cols_to_exclude:
-            csv_columns.remove(c)
+    csv_columns = get_csv_columns_to_import(
+        csv_columns=df.columns.tolist(),
+        cols_to_exclude_str=cols_to_exclude_str
+    )
 
     # Make the dataframe with the correct columns
     df = df[csv_columns]
@@ -150,6 +143,59 @@ def get_subscenario_data(csv_file, cols_to_exclude_str, **kwargs):
     return csv_columns, tuples_for_import
 
 
+def get_subscenario_data_chunks(
+    csv_file, cols_to_exclude_str, chunk_size, **kwargs
+):
+    """
+    :param csv_file: str, path to CSV file
+    :param cols_to_exclude_str:
+    :param chunk_size: int, the number of CSV rows to read at a time
+    :return: list of header strings, generator of lists of tuples
+
+    Like *get_subscenario_data*, but rather than reading the whole CSV at
+    once, stream it in chunks of *chunk_size* rows and yield the list of
+    tuples for each chunk (with Python rather than numpy values, so that the
+    chunks can be passed between processes cheaply).
+    """
+    kwd_tuple = tuple()
+    for kwd in kwargs.keys():
+        kwd_tuple += (kwargs[kwd], )
+
+    # Read the header only
+    csv_columns = get_csv_columns_to_import(
+        csv_columns=pd.read_csv(csv_file, delimiter=",", nrows=0)
+        .columns.tolist(),
+        cols_to_exclude_str=cols_to_exclude_str
+    )
+
+    def chunks():
+        for df in pd.read_csv(csv_file, delimiter=",", usecols=csv_columns,
+                              chunksize=chunk_size):
+            yield [
+                kwd_tuple + x
+                for x in df[csv_columns].to_records(index=False).tolist()
+            ]
+
+    return csv_columns, chunks()
+
+
+def get_csv_columns_to_import(csv_columns, cols_to_exclude_str):
+    """
+    :param csv_columns: list of the CSV header strings
+    :param cols_to_exclude_str:
+    :return: list of the header strings of the columns to import
+
+    Exclude the columns starting with *cols_to_exclude_str* if directed to
+    do so.
+    """
+    if cols_to_exclude_str == "nan":
+        return csv_columns
+    else:
+        return [
+            i for i in csv_columns if not i.startswith(cols_to_exclude_str)
+        ]
+
+
 def csv_to_subscenario_for_insertion(
     dir_subsc, inputs_dir, csv_file, project_flag, cols_to_exclude_str
 ):
@@ -880,13 +926,10 @@ def generic_insert_subscenario_data(
     c = conn.cursor()
     # Insert the subscenario data
     # Get column names for this table
-    table_data_query = c.execute(
-      """SELECT * FROM inputs_{};""".format(table)
-    )
+    column_names = get_table_column_names(c=c, table="inputs_{}".format(table))
 
     # If we have passed headers, check that they are as expected (i.e.
     # the same as in the table we're inserting into)
-    column_names = [s[0] for s in table_data_query.description]
 
     if csv_headers is not None:
         if project_flag:
@@ -920,6 +963,21 @@ def generic_insert_subscenario_data(
     c.close()
 
 
+def get_table_column_names(c, table):
+    """
+    :param c: the database cursor object
+    :param table: str
+    :return: list of the column names of the table
+
+    Get the column names from the table schema, so that we don't need to
+    query the table itself.
+    """
+    return [
+        column[1] for column in
+        c.execute("PRAGMA table_info({});".format(table)).fetchall()
+    ]
+
+
 def load_all_subscenario_ids_from_dir_to_subscenario_table(
     conn, subscenario, table, subscenario_type, project_flag,
     cols_to_exclude_str, custom_method, inputs_dir, filename, quiet
@@ -1157,3 +1215,151 @@ def verify_project_flag_project_alignment(
             "Please specify which project you'd like to import data for "
             "in addition to the {}.".format(subscenario)
         )
+
+
+# ### Functions for bulk loading ### #
+
+def get_subscenario_csvs_to_load(
+    subscenario_type, project_flag, inputs_dir, filename, quiet
+):
+    """
+    :param subscenario_type: str; determines which CSV-to-DB functions to use
+    :param project_flag: boolean
+    :param inputs_dir: str
+    :param filename: str
+    :param quiet: boolean
+    :return: list of dictionaries with the arguments of
+        *parse_subscenario_csv* (except the cols_to_exclude_str and
+        chunk_size) for each CSV to load
+
+    Determine all CSVs to load for a subscenario the same way as
+    *load_all_subscenario_ids_from_dir_to_subscenario_table*, so that the
+    CSVs can be parsed ahead of (and in parallel to) inserting the data
+    into the database.
+    """
+    if subscenario_type == "simple":
+        csv_files = [f for f in os.listdir(inputs_dir) if f.endswith(".csv")]
+        check_ids_are_unique(inputs_dir=inputs_dir, csv_files=csv_files,
+                             use_project_method=project_flag)
+        return [
+            dict(dir_subsc=False, inputs_dir=inputs_dir, csv_file=csv_file,
+                 use_project_method=project_flag,
+                 skip_subscenario_info=False, skip_subscenario_data=False)
+            for csv_file in csv_files
+        ]
+    elif subscenario_type in [
+        "dir_subsc_only", "dir_main", "dir_aux"
+    ]:
+        skip_subscenario_info, skip_subscenario_data = \
+            determine_whether_to_skip_subscenario_info_and_or_data(
+                subscenario_type=subscenario_type
+            )
+        return [
+            dict(dir_subsc=True, inputs_dir=subscenario_directory,
+                 csv_file=filename, use_project_method=False,
+                 skip_subscenario_info=skip_subscenario_info,
+                 skip_subscenario_data=skip_subscenario_data)
+            for subscenario_directory in get_directory_subscenarios(
+                main_directory=inputs_dir, quiet=quiet
+            )
+        ]
+    else:
+        return []
+
+
+def parse_subscenario_csv(
+    dir_subsc, inputs_dir, csv_file, use_project_method,
+    skip_subscenario_info, skip_subscenario_data, cols_to_exclude_str,
+    chunk_size
+):
+    """
+    :param dir_subsc: boolean
+    :param inputs_dir: string; the directory where the CSV is located
+    :param csv_file: string; the name of the CSV file
+    :param use_project_method: boolean
+    :param skip_subscenario_info: boolean (not used here; included so that
+        the output of *get_subscenario_csvs_to_load* can be passed directly)
+    :param skip_subscenario_data: boolean
+    :param cols_to_exclude_str: string
+    :param chunk_size: int, the number of CSV rows to read at a time
+    :return: list of tuples (the subscenario info), list of strings (the CSV
+        headers), and generator of lists of tuples (the subscenario data)
+
+    Like *csv_to_subscenario_for_insertion*, but stream the subscenario data
+    in chunks. The data are not read if they won't be inserted.
+    """
+    subsc_tuples = get_subscenario_info(
+        dir_subsc, inputs_dir, csv_file, use_project_method
+    )
+
+    if skip_subscenario_data \
+            or (not isinstance(csv_file, str) and math.isnan(csv_file)):
+        return subsc_tuples, None, iter([])
+
+    csv_file_path = os.path.join(inputs_dir, csv_file)
+    if not use_project_method:
+        csv_headers, data_chunks = get_subscenario_data_chunks(
+            csv_file=csv_file_path, cols_to_exclude_str=cols_to_exclude_str,
+            chunk_size=chunk_size, subscenario_id=subsc_tuples[0][0]
+        )
+    else:
+        csv_headers, data_chunks = get_subscenario_data_chunks(
+            csv_file=csv_file_path, cols_to_exclude_str=cols_to_exclude_str,
+            chunk_size=chunk_size, project=subsc_tuples[0][0],
+            subscenario_id=subsc_tuples[0][1]
+        )
+
+    return subsc_tuples, csv_headers, data_chunks
+
+
+def parse_subscenario_csv_in_worker(kwargs):
+    """
+    :param kwargs: dictionary with the arguments of *parse_subscenario_csv*
+    :return: the output of *parse_subscenario_csv* with the data chunks as a
+        list, so that they can be sent back to the main process
+    """
+    subsc_tuples, csv_headers, data_chunks = parse_subscenario_csv(**kwargs)
+    return subsc_tuples, csv_headers, list(data_chunks)
+
+
+def bulk_insert_subscenario(
+    conn, subscenario, table, subscenario_tuples, csv_headers, data_chunks,
+    project_flag, skip_subscenario_info, skip_subscenario_data, custom_method
+):
+    """
+    :param conn: database connection object
+    :param subscenario: string
+    :param table: string
+    :param subscenario_tuples: list of tuples
+    :param csv_headers: list of strings
+    :param data_chunks: iterable of lists of tuples
+    :param project_flag: boolean
+    :param skip_subscenario_info: boolean
+    :param skip_subscenario_data: boolean
+    :param custom_method: string
+    :return: int, the number of rows of data inserted
+
+    Insert the subscenario info and the chunks of data for a subscenario
+    parsed with *parse_subscenario_csv*, then run the custom method if
+    requested (see *get_subscenario_data_and_insert_into_db*).
+    """
+    if not skip_subscenario_info:
+        generic_insert_subscenario_info(
+            conn, subscenario, table, subscenario_tuples, project_flag
+        )
+
+    n_rows = 0
+    if not skip_subscenario_data:
+        for chunk in data_chunks:
+            generic_insert_subscenario_data(
+                conn, subscenario, table, chunk, project_flag, csv_headers
+            )
+            n_rows += len(chunk)
+
+    if custom_method != "nan":
+        getattr(custom, custom_method)(
+            conn=conn,
+            subscenario_id=subscenario_tuples[0][0]
+        )
+
+    return n_rows
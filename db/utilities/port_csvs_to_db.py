@@ -64,23 +64,35 @@ The *scenarios.csv* under the scenario folder contains the subscenario ID
 specifications for each scenario to be loaded. The user-defined name of the
 scenario should be entered as the name of the scenario column.
 
+When loading all data, large datasets (e.g. hourly profiles) can be loaded
+much faster with the *--bulk_load* option: the CSVs are then parsed in
+chunks (in parallel if *--n_parallel_parsers* is greater than 1), each
+table is loaded in a single transaction with SQLite settings tuned for bulk
+loading, and the throughput is reported.
+
 """
 
 from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import os
 import pandas as pd
 import sqlite3
 import sys
+import time
 
 # Data-import modules
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, bulk_load_pragmas, \
+    single_transaction
 from db.utilities.common_functions import \
     load_all_subscenario_ids_from_dir_to_subscenario_table, \
     load_single_subscenario_id_from_dir_to_subscenario_table, \
     generic_delete_subscenario, determine_tables_to_delete_from, \
     confirm_and_temp_update_affected_tables, repopulate_tables, \
-    verify_project_flag_project_alignment
+    verify_project_flag_project_alignment, get_subscenario_csvs_to_load, \
+    parse_subscenario_csv, parse_subscenario_csv_in_worker, \
+    bulk_insert_subscenario
 
 
 def parse_arguments(args):
@@ -127,6 +139,21 @@ def parse_arguments(args):
                         help="Delete prior data. Defaults to False.")
     parser.add_argument("--quiet", default=False, action="store_true",
                         help="Don't print output. Defaults to False.")
+    # Bulk loading options
+    parser.add_argument("--bulk_load", default=False, action="store_true",
+                        help="Use the high-throughput mode when loading all "
+                             "data: parse the CSVs in parallel and in "
+                             "chunks, load each table in a single "
+                             "transaction, and turn off syncing to disk "
+                             "during the load (the database may be "
+                             "corrupted if the machine crashes during the "
+                             "load). Defaults to False.")
+    parser.add_argument("--n_parallel_parsers", default=1, type=int,
+                        help="The number of processes to parse CSVs with "
+                             "in bulk-load mode. Defaults to 1.")
+    parser.add_argument("--chunk_size", default=100000, type=int,
+                        help="The number of CSV rows to read and insert at "
+                             "a time in bulk-load mode. Defaults to 100000.")
 
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
@@ -162,6 +189,151 @@ def load_all_from_master_csv(conn, csv_path, csv_data_master, quiet):
             pass
 
 
+def bulk_load_all_from_master_csv(
+    conn, csv_path, csv_data_master, n_parallel_parsers, chunk_size, quiet
+):
+    """
+    :param conn: the database connection
+    :param csv_path: str, the directory where the CSV files are located
+    :param csv_data_master: Pandas dataframe of the CSV master file
+    :param n_parallel_parsers: int, the number of processes to parse CSVs
+        with
+    :param chunk_size: int, the number of CSV rows to read and insert at a
+        time
+    :param quiet: boolean for whether to print output
+    :return:
+
+    Read and load all data specified in the CSV master file like
+    *load_all_from_master_csv*, but in high-throughput mode. The CSVs are
+    parsed in chunks, in *n_parallel_parsers* worker processes if more
+    than one (the database writes stay in this process, as SQLite only
+    allows one writer). The data for each table are inserted in a single
+    transaction with SQLite settings tuned for bulk loading. We report the
+    throughput for each table and overall.
+    """
+    # Determine all the CSVs to load, table by table
+    tables_to_load = list()
+    csvs_to_load = list()
+    for index, row in csv_data_master.iterrows():
+        # Load data if a directory is specified for this table
+        if isinstance(row["path"], str):
+            table, inputs_dir, project_flag, cols_to_exclude_str, \
+                custom_method, subscenario_type, filename = \
+                parse_row(row=row, csv_path=csv_path)
+            tables_to_load.append(
+                (row["subscenario"], table, inputs_dir, project_flag,
+                 custom_method)
+            )
+            csvs_to_load.append([
+                dict(csv_kwargs, cols_to_exclude_str=cols_to_exclude_str,
+                     chunk_size=chunk_size)
+                for csv_kwargs in get_subscenario_csvs_to_load(
+                    subscenario_type=subscenario_type,
+                    project_flag=project_flag, inputs_dir=inputs_dir,
+                    filename=filename, quiet=quiet
+                )
+            ])
+
+    if n_parallel_parsers > 1:
+        executor = ProcessPoolExecutor(max_workers=n_parallel_parsers)
+    else:
+        executor = None
+
+    total_rows = 0
+    start_time = time.time()
+    try:
+        parsed_csvs = parse_csvs(
+            executor=executor,
+            csvs_to_load=[kwargs for table_csvs in csvs_to_load
+                          for kwargs in table_csvs],
+            max_pending=2 * n_parallel_parsers
+        )
+        with bulk_load_pragmas(conn):
+            for (subscenario, table, inputs_dir, project_flag,
+                 custom_method), table_csvs in zip(tables_to_load,
+                                                   csvs_to_load):
+                if not quiet:
+                    print("Importing data for subscenario {}, table {} from "
+                          "{}...".format(subscenario, table, inputs_dir))
+                table_rows = 0
+                table_start_time = time.time()
+                with single_transaction(conn) as transaction_conn:
+                    for csv_kwargs in table_csvs:
+                        subscenario_tuples, csv_headers, data_chunks = \
+                            next(parsed_csvs)
+                        if not quiet:
+                            print("...importing data from {}".format(
+                                os.path.join(csv_kwargs["inputs_dir"],
+                                             str(csv_kwargs["csv_file"]))
+                            ))
+                        table_rows += bulk_insert_subscenario(
+                            conn=transaction_conn,
+                            subscenario=subscenario,
+                            table=table,
+                            subscenario_tuples=subscenario_tuples,
+                            csv_headers=csv_headers,
+                            data_chunks=data_chunks,
+                            project_flag=csv_kwargs["use_project_method"],
+                            skip_subscenario_info=csv_kwargs[
+                                "skip_subscenario_info"],
+                            skip_subscenario_data=csv_kwargs[
+                                "skip_subscenario_data"],
+                            custom_method=custom_method
+                        )
+                total_rows += table_rows
+                if not quiet:
+                    print_throughput(
+                        "...loaded", table_rows, time.time() - table_start_time
+                    )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if not quiet:
+        print_throughput("Loaded", total_rows, time.time() - start_time)
+
+
+def parse_csvs(executor, csvs_to_load, max_pending):
+    """
+    :param executor: the ProcessPoolExecutor to parse the CSVs with; if
+        None, the CSVs are parsed in this process as they are needed
+    :param csvs_to_load: list of dictionaries with the arguments of
+        *parse_subscenario_csv* for each CSV
+    :param max_pending: int, the maximum number of CSVs to parse ahead
+    :return: generator of the output of *parse_subscenario_csv* for each CSV,
+        in the order of *csvs_to_load*
+
+    Parse the CSVs, in parallel if an executor is given. We limit the number
+    of CSVs parsed ahead of the ones being inserted into the database so
+    that we don't hold all the data in memory at once.
+    """
+    if executor is None:
+        for kwargs in csvs_to_load:
+            yield parse_subscenario_csv(**kwargs)
+    else:
+        pending = deque()
+        for kwargs in csvs_to_load:
+            pending.append(
+                executor.submit(parse_subscenario_csv_in_worker, kwargs)
+            )
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def print_throughput(prefix, n_rows, seconds):
+    """
+    :param prefix: str, the start of the message
+    :param n_rows: int, the number of rows loaded
+    :param seconds: float, the time taken to load them
+    :return:
+    """
+    print("{} {:,} rows in {:.2f} seconds ({:,.0f} rows per second)".format(
+        prefix, n_rows, seconds, n_rows / seconds if seconds > 0 else 0
+    ))
+
+
 def load_all_subscenario_ids_from_directory(
     conn, csv_path, csv_data_master, subscenario, quiet
 ):
@@ -346,10 +518,17 @@ def main(args=None):
     # Load all data in directory
     if parsed_args.subscenario is None and parsed_args.subscenario_id is \
             None and parsed_args.project is None:
-        load_all_from_master_csv(
-            conn=conn, csv_path=csv_path, csv_data_master=csv_data_master,
-            quiet=parsed_args.quiet
-        )
+        if parsed_args.bulk_load:
+            bulk_load_all_from_master_csv(
+                conn=conn, csv_path=csv_path, csv_data_master=csv_data_master,
+                n_parallel_parsers=parsed_args.n_parallel_parsers,
+                chunk_size=parsed_args.chunk_size, quiet=parsed_args.quiet
+            )
+        else:
+            load_all_from_master_csv(
+                conn=conn, csv_path=csv_path,
+                csv_data_master=csv_data_master, quiet=parsed_args.quiet
+            )
     elif parsed_args.subscenario is not None and parsed_args.subscenario_id \
             is None:
         # Load all IDs for a subscenario-table
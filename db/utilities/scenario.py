@@ -220,13 +220,20 @@ def delete_scenario_results_and_status(conn, scenario_id):
                           data=(scenario_id,), many=False)
 
 
-def delete_scenario_results(conn, scenario_id):
+def delete_scenario_results(conn, scenario_id, subproblem=None, stage=None):
     """
     :param conn:
     :param scenario_id:
+    :param subproblem: only delete the results of this subproblem_id if
+        specified
+    :param stage: only delete the results of this stage_id if specified
     :return:
 
-    Delete scenario from all results tables.
+    Delete scenario from all results tables. If a subproblem and/or stage is
+    specified, only the results of that subproblem and/or stage are deleted
+    (from the results tables indexed by subproblem and stage), so that the
+    results of a subproblem/stage can be re-imported without re-importing
+    the other results of the scenario.
     """
     c = conn.cursor()
     all_tables = c.execute(
@@ -237,13 +244,29 @@ def delete_scenario_results(conn, scenario_id):
         tbl[0] for tbl in all_tables if tbl[0].startswith("results")
     ]
 
+    where = "scenario_id = ?"
+    data = (scenario_id,)
+    if subproblem is not None:
+        where += " AND subproblem_id = ?"
+        data += (subproblem,)
+    if stage is not None:
+        where += " AND stage_id = ?"
+        data += (stage,)
+
     # Delete from all results tables
     for tbl in results_tables:
+        if subproblem is not None or stage is not None:
+            columns = [
+                col[1] for col in
+                c.execute("PRAGMA table_info({});".format(tbl)).fetchall()
+            ]
+            if "subproblem_id" not in columns or "stage_id" not in columns:
+                continue
         sql = """
-            DELETE FROM {} WHERE scenario_id = ?;
-            """.format(tbl)
+            DELETE FROM {} WHERE {};
+            """.format(tbl, where)
         spin_on_database_lock(conn=conn, cursor=c, sql=sql,
-                              data=(scenario_id,), many=False)
+                              data=data, many=False)
 
 
 def check_if_scenario_name_exists(conn, scenario_name):
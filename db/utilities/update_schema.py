@@ -0,0 +1,338 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC. All rights reserved.
+
+"""
+Migrate an existing database to the tables, views, triggers, and indexes in
+db_schema.sql.
+
+New databases get all schema objects when the schema is created. Databases
+created before a table (e.g. project_operational_timepoints_materialized),
+trigger, or index was added to the schema can be updated with this script
+without recreating them:
+
+    python update_schema.py --database ../io.db
+
+GridPath doesn't change the schema of the databases it reads from and
+writes to: getting the inputs and importing or processing the results of a
+scenario fail with a request to run this script if the database is missing
+schema objects (see *check_database_schema*), and the UI server only warns
+about them.
+
+Only the objects that are missing from the database are created; existing
+objects and their data are left as they are. The object definitions are
+read from the schema file, so the schema remains the only place where they
+are specified. Tables that are created are empty: the tables GridPath
+fills on demand (e.g. the materialized project operational timepoints) are
+filled the next time they are needed, while the results versions and the
+dispatch aggregated by period of the scenarios with results are filled
+here.
+
+The exception are the tables of results aggregated from other results
+whose columns or primary key have changed in the schema (e.g.
+results_project_dispatch_by_period, which is now aggregated by subproblem):
+SQLite can't change the primary key of an existing table, so these tables
+are recreated and their results are aggregated again here.
+"""
+
+from argparse import ArgumentParser
+import os.path
+import re
+import sqlite3
+import sys
+
+from db.common_functions import connect_to_database
+from gridpath.auxiliary.db_interface import add_missing_results_versions
+from gridpath.project.operations.power import backfill_dispatch_by_period
+
+DB_SCHEMA = os.path.join(os.path.dirname(__file__), "..", "db_schema.sql")
+# The tables of aggregated results that can be recreated if their
+# definition has changed, and the modules that aggregate them
+AGGREGATED_RESULTS_TABLES = {
+    "results_project_dispatch_by_period": "gridpath.project.operations.power"
+}
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+
+    Parse the known arguments.
+    """
+    parser = ArgumentParser(add_help=True)
+
+    # Database name and location options
+    parser.add_argument("--database", default="../io.db",
+                        help="The database file path relative to the current "
+                             "working directory. Defaults to ../io.db ")
+    parser.add_argument("--db_schema", default=DB_SCHEMA,
+                        help="The SQL file containing the database schema. "
+                             "Defaults to the GridPath db_schema.sql.")
+    parser.add_argument("--quiet", default=False, action="store_true",
+                        help="Don't print output.")
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def get_schema_objects(db_schema=DB_SCHEMA):
+    """
+    :param db_schema: the SQL file containing the database schema
+    :return: list of (object type, name, SQL statement) tuples for the
+        tables, views, triggers, and indexes created in the schema, in the
+        order in which they are created
+
+    Get the CREATE statements of the schema. Trigger bodies contain
+    semicolons, so we use *sqlite3.complete_statement* rather than splitting
+    the schema on semicolons.
+    """
+    schema_objects = list()
+    statement = ""
+    with open(db_schema, "r") as f:
+        for line in f:
+            # Skip comments between statements
+            if not statement and line.strip().startswith("--"):
+                continue
+            statement += line
+            if not sqlite3.complete_statement(statement):
+                continue
+            match = re.match(
+                r"\s*CREATE\s+(?:UNIQUE\s+)?(TABLE|VIEW|TRIGGER|INDEX)\s+"
+                r"(\w+)", statement, re.IGNORECASE
+            )
+            if match is not None:
+                schema_objects.append(
+                    (match.group(1).lower(), match.group(2),
+                     statement.strip())
+                )
+            statement = ""
+
+    return schema_objects
+
+
+def create_missing_schema_objects(
+    conn, tables=None, db_schema=DB_SCHEMA, quiet=False
+):
+    """
+    :param conn: database connection
+    :param tables: list of table names; if specified, only these tables
+        and the triggers and indexes that refer to them are created;
+        otherwise, all schema objects are created
+    :param db_schema: the SQL file containing the database schema
+    :param quiet: boolean; don't print output if True
+    :return: list of the names of the objects created
+
+    Create the schema's tables, views, triggers, and indexes that are
+    missing from the database.
+    """
+    c = conn.cursor()
+    existing_objects = [r[0] for r in c.execute(
+        "SELECT name FROM sqlite_master;"
+    ).fetchall()]
+
+    created_objects = list()
+    for object_type, name, sql in get_schema_objects(db_schema=db_schema):
+        if name in existing_objects:
+            continue
+        if tables is not None:
+            if object_type in ["table", "view"] and name not in tables:
+                continue
+            if object_type in ["trigger", "index"] and not any(
+                re.search(r"\b{}\b".format(table), sql) for table in tables
+            ):
+                continue
+        if not quiet:
+            print("... creating {} {}".format(object_type, name))
+        c.execute(sql)
+        created_objects.append(name)
+    conn.commit()
+    c.close()
+
+    return created_objects
+
+
+def get_missing_schema_objects(conn, db_schema=DB_SCHEMA):
+    """
+    :param conn: database connection
+    :param db_schema: the SQL file containing the database schema
+    :return: list of the names of the schema's tables, views, and triggers
+        that are missing from the database
+
+    Indexes are not included, as queries work without them (only slower).
+    """
+    existing_objects = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master;"
+    ).fetchall()]
+
+    return [
+        name for object_type, name, sql
+        in get_schema_objects(db_schema=db_schema)
+        if object_type != "index" and name not in existing_objects
+    ]
+
+
+def check_database_schema(conn, db_schema=DB_SCHEMA):
+    """
+    :param conn: database connection
+    :param db_schema: the SQL file containing the database schema
+
+    Raise an error if the database was created before tables, views, or
+    triggers that GridPath relies on were added to the schema, or before
+    the definition of its aggregated results tables changed. The database
+    is only read: it must be migrated with this script.
+    """
+    missing_objects = get_missing_schema_objects(
+        conn=conn, db_schema=db_schema
+    )
+    outdated_tables = get_outdated_tables(conn=conn, db_schema=db_schema)
+    if missing_objects or outdated_tables:
+        raise ValueError(
+            "The database schema is out of date (missing objects: {}; "
+            "outdated tables: {}). Migrate it with "
+            "db/utilities/update_schema.py.".format(
+                ", ".join(missing_objects) or "none",
+                ", ".join(outdated_tables) or "none"
+            )
+        )
+
+
+def get_table_columns(conn, table):
+    """
+    :param conn: database connection
+    :param table: the table name
+    :return: list of (column, primary key position) tuples for the columns
+        of the table
+    """
+    return [
+        (name, pk) for (cid, name, column_type, notnull, default, pk)
+        in conn.execute("PRAGMA table_info({});".format(table)).fetchall()
+    ]
+
+
+def get_outdated_tables(
+    conn, tables=AGGREGATED_RESULTS_TABLES, db_schema=DB_SCHEMA
+):
+    """
+    :param conn: database connection
+    :param tables: the names of the tables to compare
+    :param db_schema: the SQL file containing the database schema
+    :return: list of the tables whose columns or primary key differ from
+        their definition in the schema
+
+    Tables that don't exist in the database are not included.
+    """
+    schema_tables = dict(
+        (name, sql) for object_type, name, sql
+        in get_schema_objects(db_schema=db_schema) if object_type == "table"
+    )
+    existing_tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table';"
+    ).fetchall()]
+
+    # Create the schema's tables in an empty database to compare them
+    schema_conn = sqlite3.connect(":memory:")
+    outdated_tables = list()
+    for table in tables:
+        if table not in existing_tables:
+            continue
+        schema_conn.execute(schema_tables[table])
+        if get_table_columns(schema_conn, table) \
+                != get_table_columns(conn, table):
+            outdated_tables.append(table)
+    schema_conn.close()
+
+    return outdated_tables
+
+
+def rebuild_outdated_tables(
+    conn, tables=AGGREGATED_RESULTS_TABLES, db_schema=DB_SCHEMA, quiet=False
+):
+    """
+    :param conn: database connection
+    :param tables: dictionary with the module aggregating each table's
+        results by table name
+    :param db_schema: the SQL file containing the database schema
+    :param quiet: boolean; don't print output if True
+    :return: list of the tables recreated
+
+    Recreate the tables whose columns or primary key differ from their
+    definition in the schema, along with their indexes. The tables'
+    results are deleted, so we also remove the subproblems and stages the
+    aggregating modules have processed from the results_scenario_processed
+    table, so that the results are aggregated again the next time they are
+    processed.
+    """
+    schema_tables = dict(
+        (name, sql) for object_type, name, sql
+        in get_schema_objects(db_schema=db_schema) if object_type == "table"
+    )
+    c = conn.cursor()
+    existing_tables = [r[0] for r in c.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table';"
+    ).fetchall()]
+
+    rebuilt_tables = get_outdated_tables(
+        conn=conn, tables=tables, db_schema=db_schema
+    )
+    for table in rebuilt_tables:
+        if not quiet:
+            print("... recreating table {}".format(table))
+        c.execute("DROP TABLE {};".format(table))
+        c.execute(schema_tables[table])
+        if "results_scenario_processed" in existing_tables:
+            c.execute(
+                """DELETE FROM results_scenario_processed
+                WHERE gridpath_module = ?;""",
+                (tables[table],)
+            )
+    conn.commit()
+    c.close()
+
+    if rebuilt_tables:
+        create_missing_schema_objects(
+            conn=conn, tables=rebuilt_tables, db_schema=db_schema,
+            quiet=quiet
+        )
+
+    return rebuilt_tables
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = parse_arguments(args=args)
+
+    # Check if database exists
+    if not os.path.isfile(parsed_args.database):
+        raise OSError(
+            "The database file {} was not found. Did you mean to "
+            "specify a different database?".format(
+                os.path.abspath(parsed_args.database)
+            )
+        )
+
+    conn = connect_to_database(db_path=parsed_args.database)
+    rebuilt_tables = rebuild_outdated_tables(
+        conn=conn, db_schema=parsed_args.db_schema, quiet=parsed_args.quiet
+    )
+    created_objects = create_missing_schema_objects(
+        conn=conn, db_schema=parsed_args.db_schema, quiet=parsed_args.quiet
+    )
+
+    # Fill the tables derived from the results for the scenarios whose
+    # results were imported or processed before the tables were added to
+    # the schema or recreated above
+    add_missing_results_versions(conn=conn)
+    backfill_dispatch_by_period(db=conn, quiet=parsed_args.quiet)
+    conn.close()
+
+    if not parsed_args.quiet:
+        print("Recreated {} tables and created {} schema objects.".format(
+            len(rebuilt_tables), len(created_objects)
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,8 @@ import os.path
 import pandas as pd
 import traceback
 
+from gridpath.auxiliary.input_file_cache import read_input_file
+
 
 def get_required_subtype_modules_from_projects_file(
     scenario_directory, subproblem, stage, which_type
@@ -28,7 +30,7 @@ def get_required_subtype_modules_from_projects_file(
     """
     Get a list of unique types from projects.tab.
     """
-    project_df = pd.read_csv(
+    project_df = read_input_file(
         os.path.join(
             scenario_directory, str(subproblem), str(stage), "inputs",
             "projects.tab"
@@ -117,6 +119,122 @@ def subset_init_by_param_value(mod, set_name, param_name, param_value):
     ]
 
 
+def _get_set_index_cache(mod):
+    """
+    Get the dictionary in which the set indexes of a model instance are
+    stored, creating it if it doesn't exist yet.
+    """
+    try:
+        return mod._set_index_cache
+    except AttributeError:
+        mod._set_index_cache = dict()
+        return mod._set_index_cache
+
+
+def get_set_index_by_position(mod, set_name, key_position, value_position):
+    """
+    Get a reverse index of a multi-dimensional set, i.e. a dictionary with
+    the elements in position *key_position* as keys and the ordered list
+    of unique elements in position *value_position* as values. For
+    example, indexing PRJ_OPR_TMPS by its second position gives the
+    projects that are operational in each timepoint.
+
+    The index is built in a single pass over the set the first time it is
+    requested and then cached on the model instance, so indexed-set
+    initializers that call it once per index don't have to scan the full
+    set for each index (which scales quadratically with the number of
+    timepoints). The index is rebuilt if the size of the set has changed.
+
+    :param mod: the model instance
+    :param set_name: str, name of the multi-dimensional set to index
+    :param key_position: int, position of the element to index by
+    :param value_position: int, position of the element to collect
+    :return: dictionary {key: [values]}; keys without values are absent
+    """
+    cache = _get_set_index_cache(mod)
+    cache_key = ("position", set_name, key_position, value_position)
+    the_set = getattr(mod, set_name)
+    if cache_key not in cache or cache[cache_key][0] != len(the_set):
+        index = dict()
+        for element in the_set:
+            values = index.setdefault(element[key_position], dict())
+            values[element[value_position]] = None
+        cache[cache_key] = (
+            len(the_set), {k: list(v) for k, v in index.items()}
+        )
+
+    return cache[cache_key][1]
+
+
+def get_set_index_by_param(mod, set_name, param_name):
+    """
+    Get a reverse index of a set by the value of a param indexed by that
+    set, i.e. a dictionary with the param values as keys and the ordered
+    list of set elements with that param value as values. For example,
+    indexing TMPS by the *period* param gives the timepoints in each
+    period.
+
+    Like :func:`get_set_index_by_position`, the index is built in a single
+    pass and cached on the model instance.
+
+    :param mod: the model instance
+    :param set_name: str, name of the set to index
+    :param param_name: str, name of the param (indexed by *set_name*) whose
+        value to index by
+    :return: dictionary {param value: [set elements]}
+    """
+    cache = _get_set_index_cache(mod)
+    cache_key = ("param", set_name, param_name)
+    the_set = getattr(mod, set_name)
+    if cache_key not in cache or cache[cache_key][0] != len(the_set):
+        param = getattr(mod, param_name)
+        index = dict()
+        for element in the_set:
+            index.setdefault(param[element], []).append(element)
+        cache[cache_key] = (len(the_set), index)
+
+    return cache[cache_key][1]
+
+
+def get_zone_tmp_index(mod, set_name, zone_param_name):
+    """
+    Get an index of a two-dimensional (component, timepoint) set, e.g.
+    PRJ_OPR_TMPS or TX_OPR_TMPS, by zone and timepoint, i.e. a dictionary
+    with (zone, timepoint) as keys and the ordered list of components in
+    that zone that are operational in that timepoint as values. The zone of
+    each component is the value of the *zone_param_name* param, e.g.
+    *load_zone* for projects or *load_zone_to* for transmission lines.
+    Components that the zone param is not defined for (e.g. projects that
+    don't provide a reserve) are skipped.
+
+    Aggregation expressions can then be built by looking up the components
+    of each (zone, timepoint) rather than by filtering all components in
+    each timepoint by zone.
+
+    Like :func:`get_set_index_by_position`, the index is built in a single
+    pass and cached on the model instance.
+
+    :param mod: the model instance
+    :param set_name: str, name of the (component, timepoint) set to index
+    :param zone_param_name: str, name of the param giving the zone of each
+        component
+    :return: dictionary {(zone, timepoint): [components]}; (zone,
+        timepoint) combinations without components are absent
+    """
+    cache = _get_set_index_cache(mod)
+    cache_key = ("zone_tmp", set_name, zone_param_name)
+    the_set = getattr(mod, set_name)
+    if cache_key not in cache or cache[cache_key][0] != len(the_set):
+        zone_param = getattr(mod, zone_param_name)
+        index = dict()
+        for (c, tmp) in the_set:
+            if c in zone_param:
+                index.setdefault((zone_param[c], tmp), []).append(c)
+        cache[cache_key] = (len(the_set), index)
+
+    return cache[cache_key][1]
+
+
 def check_list_has_single_item(l, error_msg):
     if len(l) > 1:
         raise ValueError(error_msg)
@@ -1,4 +1,7 @@
-from db.common_functions import spin_on_database_lock
+import sqlite3
+import uuid
+
+from db.common_functions import spin_on_database_lock, single_transaction
 
 
 def get_required_capacity_types_from_database(conn, scenario_id):
@@ -150,3 +153,432 @@ def setup_results_import(conn, cursor, table, scenario_id, subproblem, stage):
 
     spin_on_database_lock(conn=conn, cursor=cursor, sql=temp_tbl_sql,
                           data=(), many=False)
+
+
+def update_results_from_staging_table(
+    conn, cursor, table, key_columns, update_columns, rows
+):
+    """
+    :param conn: the connection object
+    :param cursor: the cursor object
+    :param table: the results table to update
+    :param key_columns: list of the columns identifying the rows to update
+    :param update_columns: list of the columns to update
+    :param rows: list of tuples with the values of the key columns followed
+        by the values of the update columns
+
+    Update the results table in bulk: insert the new values into a
+    temporary staging table (with the same column types as the results
+    table) with a single executemany, then update the matching rows of the
+    results table with one set-based UPDATE rather than one UPDATE
+    statement per row.
+    """
+    staging_table = "temp_{}_staging".format(table)
+
+    # Get the column types from the results table
+    column_types = {
+        column[1]: column[2] for column in cursor.execute(
+            "PRAGMA table_info({});".format(table)
+        ).fetchall()
+    }
+
+    spin_on_database_lock(
+        conn=conn, cursor=cursor,
+        sql="DROP TABLE IF EXISTS {};".format(staging_table),
+        data=(), many=False
+    )
+    create_sql = """
+        CREATE TEMPORARY TABLE {} (
+        {},
+        PRIMARY KEY ({})
+        );
+        """.format(
+            staging_table,
+            ",\n".join("{} {}".format(col, column_types[col])
+                       for col in key_columns + update_columns),
+            ", ".join(key_columns)
+        )
+    spin_on_database_lock(conn=conn, cursor=cursor, sql=create_sql,
+                          data=(), many=False)
+
+    insert_sql = """
+        INSERT INTO {} ({}) VALUES ({});
+        """.format(
+            staging_table, ", ".join(key_columns + update_columns),
+            ", ".join(["?"] * len(key_columns + update_columns))
+        )
+    spin_on_database_lock(conn=conn, cursor=cursor, sql=insert_sql,
+                          data=rows)
+
+    # UPDATE ... FROM requires SQLite 3.33.0; use a correlated subquery
+    # with a row value (SQLite 3.15.0) on older versions
+    join_condition = " AND ".join(
+        "{}.{} = {}.{}".format(table, col, staging_table, col)
+        for col in key_columns
+    )
+    if sqlite3.sqlite_version_info >= (3, 33, 0):
+        update_sql = """
+            UPDATE {}
+            SET {}
+            FROM {}
+            WHERE {};
+            """.format(
+                table,
+                ",\n".join("{} = {}.{}".format(col, staging_table, col)
+                           for col in update_columns),
+                staging_table, join_condition
+            )
+    else:
+        update_sql = """
+            UPDATE {}
+            SET ({}) = (SELECT {} FROM {} WHERE {})
+            WHERE EXISTS (SELECT 1 FROM {} WHERE {});
+            """.format(
+                table, ", ".join(update_columns),
+                ", ".join(update_columns), staging_table, join_condition,
+                staging_table, join_condition
+            )
+    spin_on_database_lock(conn=conn, cursor=cursor, sql=update_sql,
+                          data=(), many=False)
+
+    spin_on_database_lock(
+        conn=conn, cursor=cursor,
+        sql="DROP TABLE {};".format(staging_table),
+        data=(), many=False
+    )
+
+
+def update_project_operational_timepoints(conn, subscenarios):
+    """
+    :param conn: the connection object
+    :param subscenarios: SubScenarios object with all subscenario info
+
+    Make sure the project_operational_timepoints_materialized table is up to
+    date for the scenario's portfolio, opchar, specified capacity, new cost,
+    and temporal subscenarios. If this subscenario combination is not in the
+    project_operational_timepoints_subscenarios table (i.e. it has not been
+    materialized yet or its inputs have changed since), we (re)materialize
+    its project-timepoints from the project_operational_timepoints view for
+    all subproblems, stages, and operational types at once; otherwise, we
+    don't do anything. When materializing, we also purge the combinations
+    that no scenario uses anymore and the project-timepoints of the
+    combinations that are not materialized (i.e. out of date), so that
+    the materialized table doesn't keep growing. Databases created before
+    the materialized tables were added to the schema must be migrated with
+    db.utilities.update_schema.
+    """
+    # Unspecified subscenario IDs are "NULL" in the SubScenarios object
+    subscenario_ids = tuple(
+        None if subscenario_id == "NULL" else subscenario_id
+        for subscenario_id in (
+            subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
+            subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
+            subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
+            subscenarios.PROJECT_NEW_COST_SCENARIO_ID,
+            subscenarios.TEMPORAL_SCENARIO_ID
+        )
+    )
+
+    c = conn.cursor()
+    materialized = c.execute(
+        """SELECT COUNT(*)
+        FROM project_operational_timepoints_subscenarios
+        WHERE project_portfolio_scenario_id IS ?
+        AND project_operational_chars_scenario_id IS ?
+        AND project_specified_capacity_scenario_id IS ?
+        AND project_new_cost_scenario_id IS ?
+        AND temporal_scenario_id IS ?;""",
+        subscenario_ids
+    ).fetchone()[0]
+
+    if materialized:
+        return
+
+    # Materialize in a single transaction, so that the project-timepoints
+    # and the subscenario combination are committed together
+    with single_transaction(conn) as transaction_conn:
+        # Forget the combinations that no scenario uses anymore (other than
+        # this one, in case its scenario is not in the scenarios table)
+        purge_sql = """
+            DELETE FROM project_operational_timepoints_subscenarios
+            WHERE NOT EXISTS (
+                SELECT 1 FROM scenarios
+                WHERE scenarios.project_portfolio_scenario_id
+                IS project_operational_timepoints_subscenarios
+                .project_portfolio_scenario_id
+                AND scenarios.project_operational_chars_scenario_id
+                IS project_operational_timepoints_subscenarios
+                .project_operational_chars_scenario_id
+                AND scenarios.project_specified_capacity_scenario_id
+                IS project_operational_timepoints_subscenarios
+                .project_specified_capacity_scenario_id
+                AND scenarios.project_new_cost_scenario_id
+                IS project_operational_timepoints_subscenarios
+                .project_new_cost_scenario_id
+                AND scenarios.temporal_scenario_id
+                IS project_operational_timepoints_subscenarios
+                .temporal_scenario_id
+            )
+            AND NOT (project_portfolio_scenario_id IS ?
+                AND project_operational_chars_scenario_id IS ?
+                AND project_specified_capacity_scenario_id IS ?
+                AND project_new_cost_scenario_id IS ?
+                AND temporal_scenario_id IS ?);
+            """
+        spin_on_database_lock(
+            conn=transaction_conn, cursor=c, sql=purge_sql,
+            data=subscenario_ids, many=False
+        )
+
+        # Remove the project-timepoints of the combinations that are not
+        # materialized anymore, including any out-of-date project-timepoints
+        # for these subscenarios
+        delete_sql = """
+            DELETE FROM project_operational_timepoints_materialized
+            WHERE NOT EXISTS (
+                SELECT 1 FROM project_operational_timepoints_subscenarios
+                WHERE project_operational_timepoints_subscenarios
+                .project_portfolio_scenario_id
+                IS project_operational_timepoints_materialized
+                .project_portfolio_scenario_id
+                AND project_operational_timepoints_subscenarios
+                .project_operational_chars_scenario_id
+                IS project_operational_timepoints_materialized
+                .project_operational_chars_scenario_id
+                AND project_operational_timepoints_subscenarios
+                .project_specified_capacity_scenario_id
+                IS project_operational_timepoints_materialized
+                .project_specified_capacity_scenario_id
+                AND project_operational_timepoints_subscenarios
+                .project_new_cost_scenario_id
+                IS project_operational_timepoints_materialized
+                .project_new_cost_scenario_id
+                AND project_operational_timepoints_subscenarios
+                .temporal_scenario_id
+                IS project_operational_timepoints_materialized
+                .temporal_scenario_id
+            );
+            """
+        spin_on_database_lock(
+            conn=transaction_conn, cursor=c, sql=delete_sql,
+            data=(), many=False
+        )
+
+        # NOTE: There can be cases where a resource is both in specified
+        # capacity table and in new build table, but depending on capacity
+        # type you'd only use one of them, so filtering with OR is not 100%
+        # correct.
+        insert_sql = """
+            INSERT INTO project_operational_timepoints_materialized
+            (project_portfolio_scenario_id,
+            project_operational_chars_scenario_id,
+            project_specified_capacity_scenario_id,
+            project_new_cost_scenario_id,
+            temporal_scenario_id, subproblem_id, stage_id, operational_type,
+            variable_generator_profile_scenario_id, project, timepoint)
+            SELECT ?, ?, ?, ?, ?, subproblem_id, stage_id, operational_type,
+            variable_generator_profile_scenario_id, project, timepoint
+            FROM project_operational_timepoints
+            WHERE project_portfolio_scenario_id = ?
+            AND project_operational_chars_scenario_id = ?
+            AND temporal_scenario_id = ?
+            AND (project_specified_capacity_scenario_id = ?
+                 OR project_new_cost_scenario_id = ?);
+            """
+        spin_on_database_lock(
+            conn=transaction_conn, cursor=c, sql=insert_sql,
+            data=subscenario_ids + (
+                subscenario_ids[0], subscenario_ids[1], subscenario_ids[4],
+                subscenario_ids[2], subscenario_ids[3]
+            ),
+            many=False
+        )
+
+        subscenarios_sql = """
+            INSERT OR REPLACE INTO project_operational_timepoints_subscenarios
+            (project_portfolio_scenario_id,
+            project_operational_chars_scenario_id,
+            project_specified_capacity_scenario_id,
+            project_new_cost_scenario_id,
+            temporal_scenario_id)
+            VALUES (?, ?, ?, ?, ?);
+            """
+        spin_on_database_lock(
+            conn=transaction_conn, cursor=c, sql=subscenarios_sql,
+            data=subscenario_ids, many=False
+        )
+
+
+def update_results_version(conn, scenario_id):
+    """
+    :param conn: the connection object
+    :param scenario_id: the scenario_id
+
+    Give the scenario's results a new version token. This should be called
+    whenever the scenario's results change (i.e. when they are imported or
+    processed), so that caches of data derived from the results (e.g. the
+    UI's plot cache) can tell that they are out of date. The token is
+    random rather than a counter, since the version is deleted along with
+    the scenario's other results.
+    """
+    c = conn.cursor()
+    sql = """
+        INSERT OR REPLACE INTO results_scenario_version
+        (scenario_id, results_version)
+        VALUES (?, ?);
+        """
+    spin_on_database_lock(
+        conn=conn, cursor=c, sql=sql,
+        data=(scenario_id, uuid.uuid4().hex), many=False
+    )
+
+
+def get_results_version(conn, scenario_id):
+    """
+    :param conn: the connection object
+    :param scenario_id: the scenario_id
+    :return: the version token of the scenario's results (None if the
+        scenario has no results or if the database was created before the
+        results_scenario_version table was added to the schema)
+    """
+    c = conn.cursor()
+    if c.execute(
+        """SELECT COUNT(*) FROM sqlite_master
+        WHERE type = 'table'
+        AND name = 'results_scenario_version';"""
+    ).fetchone()[0] == 0:
+        return None
+
+    version = c.execute(
+        """SELECT results_version
+        FROM results_scenario_version
+        WHERE scenario_id = ?;""",
+        (scenario_id, )
+    ).fetchone()
+
+    return None if version is None else version[0]
+
+
+def add_missing_results_versions(conn):
+    """
+    :param conn: the connection object
+    :return: list of the scenario_ids given a results version
+
+    Give a results version to the scenarios with results but no version,
+    e.g. the scenarios whose results were imported before the
+    results_scenario_version table was added to the schema.
+    """
+    c = conn.cursor()
+    scenario_ids = [r[0] for r in c.execute(
+        """SELECT DISTINCT scenario_id
+        FROM results_scenario
+        WHERE scenario_id NOT IN (
+            SELECT scenario_id FROM results_scenario_version
+        )
+        ORDER BY scenario_id;"""
+    ).fetchall()]
+    for scenario_id in scenario_ids:
+        update_results_version(conn=conn, scenario_id=scenario_id)
+
+    return scenario_ids
+
+
+def get_subproblem_stages_to_process(conn, scenario_id, gridpath_module):
+    """
+    :param conn: the connection object
+    :param scenario_id: the scenario_id
+    :param gridpath_module: the name of the module processing the results
+    :return: list of the (subproblem_id, stage_id) tuples whose results
+        have been imported but not yet processed by the module
+
+    The subproblems and stages processed by each module are recorded in the
+    results_scenario_processed table (see
+    record_processed_subproblem_stages). Since the table's rows are deleted
+    along with the results they refer to, re-imported subproblems and stages
+    are processed again.
+    """
+    return conn.cursor().execute(
+        """SELECT subproblem_id, stage_id
+        FROM results_scenario
+        WHERE scenario_id = ?
+        AND (subproblem_id, stage_id) NOT IN (
+            SELECT subproblem_id, stage_id
+            FROM results_scenario_processed
+            WHERE scenario_id = ?
+            AND gridpath_module = ?
+        )
+        ORDER BY subproblem_id, stage_id;""",
+        (scenario_id, scenario_id, gridpath_module)
+    ).fetchall()
+
+
+def record_processed_subproblem_stages(
+        conn, scenario_id, gridpath_module, subproblem_stages
+):
+    """
+    :param conn: the connection object
+    :param scenario_id: the scenario_id
+    :param gridpath_module: the name of the module that processed the
+        results
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        processed
+
+    Record the subproblems and stages whose results the module has
+    processed.
+    """
+    c = conn.cursor()
+    sql = """
+        INSERT OR REPLACE INTO results_scenario_processed
+        (scenario_id, subproblem_id, stage_id, gridpath_module)
+        VALUES (?, ?, ?, ?);
+        """
+    spin_on_database_lock(
+        conn=conn, cursor=c, sql=sql,
+        data=[(scenario_id, subproblem, stage, gridpath_module)
+              for (subproblem, stage) in subproblem_stages]
+    )
+
+
+def get_subproblem_stage_filter(subproblem_stages):
+    """
+    :param subproblem_stages: list of (subproblem_id, stage_id) tuples
+    :return: SQL condition selecting the rows of the subproblems and stages
+
+    The condition is meant to be added to the WHERE clause of the queries
+    processing results, so that they can be limited to the subproblems and
+    stages that need to be processed. The IDs are integers, so they are
+    written into the condition rather than passed as parameters.
+    """
+    return "(subproblem_id, stage_id) IN (VALUES {})".format(
+        ", ".join("({}, {})".format(int(subproblem), int(stage))
+                  for (subproblem, stage) in subproblem_stages)
+    )
+
+
+def insert_aggregated_results(conn, cursor, table, columns, sql, data):
+    """
+    :param conn: the connection object
+    :param cursor: the cursor object
+    :param table: the results table to insert into
+    :param columns: string, the comma-separated columns to insert, in the
+        order of the columns selected by the query
+    :param sql: the query selecting the (aggregated) results
+    :param data: the query parameters
+
+    Insert the rows selected by the query into the results table. The query
+    is run into a temporary table first, and the rows are then copied into
+    the results table, so the database is only locked for writing while the
+    rows are copied. This allows modules processing results in parallel on
+    separate connections to run their queries concurrently.
+    """
+    cursor.execute("DROP TABLE IF EXISTS temp.aggregated_results;")
+    cursor.execute(
+        "CREATE TEMP TABLE aggregated_results AS {}".format(sql), data
+    )
+    spin_on_database_lock(
+        conn=conn, cursor=cursor,
+        sql="""INSERT INTO {} ({})
+        SELECT * FROM temp.aggregated_results;""".format(table, columns),
+        data=(), many=False
+    )
+    cursor.execute("DROP TABLE temp.aggregated_results;")
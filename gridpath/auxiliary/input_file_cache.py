@@ -0,0 +1,151 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Many modules read the same input files when building the model, loading
+data, and exporting results (e.g. projects.tab is read by the project,
+capacity, operations, and reserves modules to determine their subtypes and
+optional columns). The input file cache reads each file from disk once and
+keeps its contents, as well as the DataFrames parsed from it, in memory,
+so that all modules in a run can share them.
+
+Files are identified by their path, so each scenario, subproblem, and stage
+has its own entries. Before each read, we check the file's modification
+time and size; if the file has changed since it was cached, we read it
+again. The least recently used files are dropped if the cached contents
+exceed the size limit.
+"""
+
+from collections import OrderedDict
+import io
+import os.path
+
+import pandas as pd
+
+
+class InputFileCache(object):
+    """
+    Keep the contents of input files in memory along with the DataFrames
+    parsed from them (one for each set of read_csv arguments), and count
+    the disk reads and parses avoided.
+    """
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """
+        :param max_bytes: the maximum total size of the cached file contents
+        """
+        self.max_bytes = max_bytes
+        # {file path: (modification time, size, contents, {read_csv
+        # arguments: DataFrame})}
+        self.files = OrderedDict()
+        self.cached_bytes = 0
+
+        self.n_disk_reads = 0
+        self.bytes_read = 0
+        self.n_disk_reads_avoided = 0
+        self.bytes_avoided = 0
+        self.n_parses_avoided = 0
+
+    def read_csv(self, file_path, **kwargs):
+        """
+        :param file_path: the path to the file
+        :param kwargs: keyword arguments for pandas' read_csv
+        :return: the DataFrame pandas' read_csv returns for the file and
+            arguments
+
+        The DataFrame is a copy, so callers can modify it without affecting
+        the cache.
+        """
+        file_path = os.path.abspath(file_path)
+        # Raises FileNotFoundError like read_csv if the file doesn't exist
+        stat = os.stat(file_path)
+
+        entry = self.files.get(file_path)
+        if entry is not None \
+                and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            self.files.move_to_end(file_path)
+            self.n_disk_reads_avoided += 1
+            self.bytes_avoided += stat.st_size
+        else:
+            if entry is not None:
+                self._drop(file_path)
+            with open(file_path, "rb") as f:
+                contents = f.read()
+            self.n_disk_reads += 1
+            self.bytes_read += len(contents)
+            entry = (stat.st_mtime_ns, stat.st_size, contents, dict())
+            self.files[file_path] = entry
+            self.cached_bytes += len(contents)
+            self._evict()
+
+        dataframes = entry[3]
+        arguments_key = repr(sorted(kwargs.items()))
+        if arguments_key in dataframes:
+            self.n_parses_avoided += 1
+        else:
+            dataframes[arguments_key] = pd.read_csv(
+                io.BytesIO(entry[2]), **kwargs
+            )
+
+        return dataframes[arguments_key].copy()
+
+    def _drop(self, file_path):
+        """
+        :param file_path: the path to the cached file
+
+        Remove a file from the cache.
+        """
+        self.cached_bytes -= len(self.files.pop(file_path)[2])
+
+    def _evict(self):
+        """
+        Remove the least recently used files until the cached contents
+        don't exceed the size limit (the most recent file is always kept).
+        """
+        while self.cached_bytes > self.max_bytes and len(self.files) > 1:
+            self._drop(next(iter(self.files)))
+
+    def clear(self):
+        """
+        Remove all files from the cache (the counts are kept).
+        """
+        self.files.clear()
+        self.cached_bytes = 0
+
+    def summary(self):
+        """
+        :return: str, a summary of the file reads and parses avoided
+        """
+        return "Input file cache: {} file(s) read from disk ({:,} bytes); " \
+               "{} disk read(s) avoided ({:,} bytes); {} parse(s) " \
+               "avoided.".format(
+                   self.n_disk_reads, self.bytes_read,
+                   self.n_disk_reads_avoided, self.bytes_avoided,
+                   self.n_parses_avoided
+               )
+
+
+# The cache shared by all modules in a (process of a) run
+INPUT_FILE_CACHE = InputFileCache()
+
+
+def read_input_file(file_path, **kwargs):
+    """
+    :param file_path: the path to the input file
+    :param kwargs: keyword arguments for pandas' read_csv
+    :return: DataFrame with the file data
+
+    Read an input file with pandas' read_csv through the shared input file
+    cache.
+    """
+    return INPUT_FILE_CACHE.read_csv(file_path, **kwargs)
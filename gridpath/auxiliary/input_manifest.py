@@ -0,0 +1,335 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The input manifest records, for each inputs directory of a scenario (one per
+subproblem and stage) and each module that writes inputs, which subscenario
+IDs the module used, a fingerprint of everything its inputs depend on (the
+module code, the scenario ID, the subproblem and stage, and the values of
+those subscenario IDs), and which .tab files it wrote or modified. When
+writing inputs incrementally, we compare the fingerprints in the manifest
+with the current ones and only write the inputs of the modules whose
+fingerprints have changed.
+
+Several modules can write to the same file (e.g. many modules add columns
+to projects.tab), so modules that share files are grouped, and if any
+module in a group needs to write its inputs, the files of the group are
+deleted and all modules in the group write their inputs again.
+
+The manifest also records whether a module's files in each inputs
+directory were the same as in the first inputs directory (i.e. hard links
+to them, see *link_identical_files*), which means that the module's inputs
+don't depend on the subproblem and stage (e.g. projects.tab). When such a
+module's inputs need to be written again, they are only written to the
+first inputs directory and linked to the other directories (see
+*get_modules_to_link*).
+
+Note that the fingerprints are based on the subscenario IDs, so the data
+for a subscenario ID are assumed not to have changed since the inputs were
+written.
+"""
+
+import filecmp
+import hashlib
+import json
+import os.path
+import shutil
+
+MANIFEST_FILENAME = "inputs_manifest.json"
+
+
+class SubScenariosRecorder(object):
+    """
+    Wrap a SubScenarios object to record which subscenario IDs a module uses
+    when writing its inputs. All attributes are those of the wrapped
+    object. If a method of the object is used, we can't tell which IDs
+    the module depends on, so we record that it uses all of them ("*").
+    """
+    def __init__(self, subscenarios):
+        """
+        :param subscenarios: the SubScenarios object to wrap
+        """
+        self._subscenarios = subscenarios
+        self.used_subscenarios = set()
+
+    def __getattr__(self, name):
+        value = getattr(self._subscenarios, name)
+        if callable(value):
+            self.used_subscenarios.add("*")
+        else:
+            self.used_subscenarios.add(name)
+        return value
+
+
+def get_subscenario_values(subscenarios, used_subscenarios):
+    """
+    :param subscenarios: the SubScenarios object
+    :param used_subscenarios: iterable of the names of the subscenario ID
+        attributes (or "*" for all of them)
+    :return: dictionary with the current values of the subscenario IDs
+    """
+    if "*" in used_subscenarios:
+        return dict(vars(subscenarios))
+    else:
+        return {
+            name: getattr(subscenarios, name) for name in used_subscenarios
+        }
+
+
+def get_module_source_hash(module):
+    """
+    :param module: the imported module
+    :return: str, hash of the module's source file
+
+    Module code changes also change the module inputs fingerprint.
+    """
+    with open(module.__file__, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def get_module_fingerprint(
+    module, scenario_id, subproblem, stage, subscenario_values
+):
+    """
+    :param module: the imported module
+    :param scenario_id: the scenario ID
+    :param subproblem: the subproblem (or "" if there are no subproblems)
+    :param stage: the stage (or "" if there are no stages)
+    :param subscenario_values: dictionary with the values of the
+        subscenario IDs the module uses
+    :return: str, the fingerprint of the module's inputs
+    """
+    fingerprint_data = json.dumps(
+        {
+            "module": module.__name__,
+            "source": get_module_source_hash(module),
+            "scenario_id": scenario_id,
+            "subproblem": subproblem,
+            "stage": stage,
+            "subscenarios": subscenario_values
+        },
+        sort_keys=True, default=str
+    )
+
+    return hashlib.sha1(fingerprint_data.encode("utf-8")).hexdigest()
+
+
+def load_manifest(scenario_directory):
+    """
+    :param scenario_directory: the scenario directory
+    :return: dictionary with the manifest entries for each inputs directory
+        (empty if there is no manifest)
+    """
+    manifest_file = os.path.join(scenario_directory, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(scenario_directory, manifest):
+    """
+    :param scenario_directory: the scenario directory
+    :param manifest: dictionary with the manifest entries for each inputs
+        directory
+    """
+    with open(os.path.join(scenario_directory, MANIFEST_FILENAME), "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def snapshot_directory(directory):
+    """
+    :param directory: the directory
+    :return: dictionary with the modification time, size and inode of each
+        file in the directory, so that we can tell which files a module
+        wrote by comparing snapshots taken before and after
+    """
+    snapshot = dict()
+    for f in os.listdir(directory):
+        stat = os.stat(os.path.join(directory, f))
+        snapshot[f] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    return snapshot
+
+
+def get_module_groups(prior_entries, modules):
+    """
+    :param prior_entries: list of the manifest entries for the modules
+        from the last time inputs were written to the directory
+    :param modules: list of the imported modules that write inputs
+    :return: dictionary with the set of the names of the modules in each
+        module's group by module name
+
+    Modules that wrote to the same files are in the same group.
+    """
+    group = {m.__name__: {m.__name__} for m in modules}
+    file_owner = dict()
+    for entry in prior_entries:
+        for f in entry["files"]:
+            if f in file_owner:
+                merged = group[file_owner[f]] | group[entry["module"]]
+                for module_name in merged:
+                    group[module_name] = merged
+            else:
+                file_owner[f] = entry["module"]
+
+    return group
+
+
+def get_modules_to_write(
+    prior_entries, modules, fingerprints, inputs_directory
+):
+    """
+    :param prior_entries: list of the manifest entries for the modules
+        from the last time inputs were written to the directory
+    :param modules: list of the imported modules that write inputs
+    :param fingerprints: list of the current fingerprints of the modules'
+        inputs (computed based on the subscenario IDs in the prior entries)
+    :param inputs_directory: the inputs directory
+    :return: set of the names of the modules whose inputs need to be
+        written, and set of the files to delete before writing them
+
+    A module's inputs need to be written if its fingerprint has changed
+    or any of its files are missing, and then so do the inputs of all
+    modules that share files with it.
+    """
+    existing_files = set(os.listdir(inputs_directory))
+    group = get_module_groups(prior_entries=prior_entries, modules=modules)
+
+    modules_to_write = set()
+    for entry, fingerprint in zip(prior_entries, fingerprints):
+        if entry["fingerprint"] != fingerprint \
+                or not set(entry["files"]) <= existing_files:
+            modules_to_write |= group[entry["module"]]
+
+    files_to_delete = set()
+    for entry in prior_entries:
+        if entry["module"] in modules_to_write:
+            files_to_delete |= set(entry["files"]) & existing_files
+
+    return modules_to_write, files_to_delete
+
+
+def get_modules_to_link(
+    prior_entries, modules, modules_to_write, shared_entries
+):
+    """
+    :param prior_entries: list of the manifest entries for the modules
+        from the last time inputs were written to the directory
+    :param modules: list of the imported modules that write inputs
+    :param modules_to_write: set of the names of the modules whose inputs
+        need to be written (see *get_modules_to_write*)
+    :param shared_entries: list of the current manifest entries for the
+        modules in the first inputs directory
+    :return: set of the names of the modules whose files can be linked
+        from the first inputs directory instead of being written
+
+    A module's files can be linked if its files were the same as in the
+    first inputs directory the last time they were written, and if it
+    depends on the same subscenario IDs as in the first inputs directory.
+    As modules that share files are written together, the files of a group
+    of modules are only linked if they can be linked for all modules in
+    the group.
+    """
+    shared_entries = {e["module"]: e for e in shared_entries}
+    linkable = set(
+        entry["module"] for entry in prior_entries
+        if entry.get("shared", False)
+        and entry["module"] in shared_entries
+        and shared_entries[entry["module"]]["subscenarios"].keys()
+        == entry["subscenarios"].keys()
+    )
+    group = get_module_groups(prior_entries=prior_entries, modules=modules)
+
+    return set(
+        module_name for module_name in modules_to_write
+        if group[module_name] <= linkable
+    )
+
+
+def flag_shared_entries(directories, entries):
+    """
+    :param directories: list of the inputs directories
+    :param entries: list of the manifest entries for the modules of each
+        directory
+
+    Flag the entries of the second and later directories whose files are
+    all the same files as in the first directory (see
+    *link_identical_files*).
+    """
+    first_directory = directories[0]
+    for directory, directory_entries in zip(directories[1:], entries[1:]):
+        for entry in directory_entries:
+            entry["shared"] = bool(entry["files"]) and all(
+                os.path.isfile(os.path.join(first_directory, f))
+                and os.path.isfile(os.path.join(directory, f))
+                and os.path.samefile(os.path.join(first_directory, f),
+                                     os.path.join(directory, f))
+                for f in entry["files"]
+            )
+
+
+def link_file(source_file_path, file_path):
+    """
+    :param source_file_path: the file to link to
+    :param file_path: the path of the link
+
+    Hard-link the file, or copy it if the file system doesn't support hard
+    links.
+    """
+    try:
+        os.link(source_file_path, file_path)
+    except OSError:
+        shutil.copy2(source_file_path, file_path)
+
+
+def break_hard_links(directory):
+    """
+    :param directory: the directory
+
+    Replace files that are hard links to files in other directories (see
+    *link_identical_files*) with copies before writing to them, so that
+    writing to a file in one directory doesn't change the others.
+    """
+    for f in os.listdir(directory):
+        file_path = os.path.join(directory, f)
+        if os.stat(file_path).st_nlink > 1:
+            temp_file_path = file_path + ".tmp"
+            shutil.copy2(file_path, temp_file_path)
+            os.replace(temp_file_path, file_path)
+
+
+def link_identical_files(directories):
+    """
+    :param directories: list of the directories
+
+    Replace the files in the second and later directories that are identical
+    to the file with the same name in the first directory (e.g. non-temporal
+    inputs such as projects.tab) with hard links to that file. Files are
+    left as they are if the file system doesn't support hard links.
+    """
+    first_directory = directories[0]
+    for directory in directories[1:]:
+        for f in os.listdir(directory):
+            first_file_path = os.path.join(first_directory, f)
+            file_path = os.path.join(directory, f)
+            if os.path.isfile(first_file_path) \
+                    and not os.path.samefile(first_file_path, file_path) \
+                    and filecmp.cmp(first_file_path, file_path,
+                                    shallow=False):
+                try:
+                    temp_file_path = file_path + ".tmp"
+                    os.link(first_file_path, temp_file_path)
+                    os.replace(temp_file_path, file_path)
+                except OSError:
+                    pass
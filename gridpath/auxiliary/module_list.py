@@ -19,7 +19,9 @@ This module contains:
 2) the modules included in each optional feature;
 3) the 'cross-feature' modules;
 4) the method for determining the user-requested features for the scenarios;
-5) the method for loading modules.
+5) the method for loading modules;
+6) the module registry, which determines and loads a scenario's modules
+once per run.
 """
 
 from __future__ import print_function
@@ -29,6 +31,7 @@ from importlib import import_module
 import os.path
 import pandas as pd
 import sys
+import time
 
 from gridpath.auxiliary.auxiliary import check_for_integer_subdirectories
 
@@ -446,3 +449,61 @@ def load_modules(modules_to_use):
             sys.exit(1)
 
     return loaded_modules
+
+
+class ModuleRegistry(object):
+    """
+    Determine and load the modules for a scenario once and make them
+    available to all steps of the scenario run.
+
+    Each (sub)problem run needs the scenario modules when building the
+    model, exporting results, exporting pass-through inputs, saving duals,
+    and summarizing results. Determining the modules requires reading the
+    features file and scanning the scenario directory for subproblems and
+    stages, so rather than doing this for every step of every subproblem,
+    we do it once per scenario run and pass the registry through the
+    pipeline.
+
+    The registry also keeps track of how long it took to set up the modules
+    and how many times the modules were requested, so that we can report
+    the setup time saved by not re-determining the modules on each request.
+    """
+    def __init__(self, scenario_directory):
+        """
+        :param scenario_directory: the scenario directory, where we will
+            look for the list of requested features
+        """
+        start = time.time()
+        self.scenario_directory = scenario_directory
+        self.modules_to_use = determine_modules(
+            scenario_directory=scenario_directory
+        )
+        self.loaded_modules = load_modules(self.modules_to_use)
+        self.setup_seconds = time.time() - start
+        self.n_requests = 0
+
+    def get_modules(self):
+        """
+        :return: list of the names of the modules the scenario uses and
+            list of the loaded modules (Python objects)
+        """
+        self.n_requests += 1
+        return self.modules_to_use, self.loaded_modules
+
+    def saved_seconds(self):
+        """
+        :return: the estimated time saved by setting up the modules once
+            rather than on each request
+        """
+        return max(self.n_requests - 1, 0) * self.setup_seconds
+
+    def timing_summary(self):
+        """
+        :return: str, a summary of the module setup time and the estimated
+            time saved
+        """
+        return "Modules set up once in {:.3f} seconds and reused for {} " \
+               "requests; estimated setup time saved: {:.3f} " \
+               "seconds.".format(
+                   self.setup_seconds, self.n_requests, self.saved_seconds()
+               )
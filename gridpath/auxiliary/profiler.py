@@ -0,0 +1,286 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The profiler records the wall time and peak memory of each step of a
+(sub)problem run when the user requests profiling (the --profile option of
+run_scenario.py and run_end_to_end.py): each module's
+*add_model_components*, *load_model_data*, *fix_variables*,
+*export_results*, *export_pass_through_inputs*, *save_duals*, and
+*summarize_results*, the construction of each component of the problem
+instance (attributed to the module that added the component), the writing
+of the problem for the solver, and the solve. The steps are written to a
+profile.csv file in the (sub)problem results directory, which is then
+imported into the results_scenario_profile table along with the other
+results.
+
+The profiler also keeps the details of the construction of each component
+of the problem instance (its type, size, construction time, and the memory
+it takes up); when the user requests a construction report (the
+--report_construction option), the components are written to a
+construction_report.csv file in the (sub)problem logs directory, ranked
+by construction time.
+
+Peak memory is the peak of the memory allocated by Python (as traced by
+*tracemalloc*) during the step in excess of the memory allocated before the
+step; it does not include the memory used by the solver process. The
+memory a component takes up is approximated by the memory allocated during
+its construction that is still allocated at the end of its construction.
+Tracing memory allocations slows down the run, so the wall times of a
+profiled run are somewhat longer than those of a run without profiling.
+"""
+
+from contextlib import contextmanager, nullcontext
+from csv import reader, writer
+import os.path
+import time
+import tracemalloc
+
+from pyomo.core.base.PyomoModel import Model
+
+from db.common_functions import spin_on_database_lock
+
+PROFILE_FILENAME = "profile.csv"
+PROFILE_COLUMNS = ["step", "phase", "module", "component", "seconds",
+                   "peak_memory_mb"]
+CONSTRUCTION_REPORT_FILENAME = "construction_report.csv"
+CONSTRUCTION_REPORT_COLUMNS = ["rank", "component", "component_type",
+                               "module", "size", "seconds", "memory_mb",
+                               "peak_memory_mb"]
+
+
+class Profiler(object):
+    """
+    Keep the profile records of the (sub)problems of a scenario or chain of
+    subproblems. The modules that added each model component are also kept,
+    so that subproblems reusing an abstract model (see the --reuse_model
+    option) still get the module names for the component construction
+    steps.
+    """
+    def __init__(self):
+        self.records = list()
+        self.construction_records = list()
+        self.component_modules = dict()
+        self._started_tracing = False
+        self._inner_seconds = 0
+
+    def start(self):
+        """
+        Start tracing memory allocations if not already tracing.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        """
+        Stop tracing memory allocations if we started tracing.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def step(self, phase, module="", component=""):
+        """
+        :param phase: str, the phase of the run (e.g. "load_model_data")
+        :param module: str, the name of the module (if any)
+        :param component: str, the name of the model component (if any)
+
+        Context manager that records the wall time and peak memory of the
+        code run inside it. Steps can't be nested, as the memory
+        allocation peak is reset at the start of each step; parts of a step
+        can be timed separately with *add_inner_step* instead.
+        """
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.clear_traces()
+        self._inner_seconds = 0
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            # The inner steps are timed within this step, so the
+            # difference can only be negative through clock rounding
+            seconds = max(
+                time.perf_counter() - start_time - self._inner_seconds, 0.0
+            )
+            self._inner_seconds = 0
+            peak_memory_mb = \
+                tracemalloc.get_traced_memory()[1] / 1024 ** 2 if tracing \
+                else None
+            self.records.append(
+                (phase, module, component, seconds, peak_memory_mb)
+            )
+
+    def add_inner_step(self, phase, seconds, module="", component=""):
+        """
+        :param phase: str, the phase of the run (e.g. "write_problem")
+        :param seconds: float, the wall time of the inner step
+        :param module: str, the name of the module (if any)
+        :param component: str, the name of the model component (if any)
+
+        Record a part of the current step that was timed separately (e.g.
+        writing the problem file during the solve step); its time is
+        excluded from the time of the current step. The peak memory of the
+        inner step is not recorded.
+        """
+        self.records.append((phase, module, component, seconds, None))
+        self._inner_seconds += seconds
+
+    def add_component_modules(self, component_names, module):
+        """
+        :param component_names: iterable of the names of the model
+            components
+        :param module: str, the module name
+
+        Attribute the components that have not already been attributed to a
+        module to this module (call after each module's
+        *add_model_components*).
+        """
+        for component_name in component_names:
+            if component_name not in self.component_modules:
+                self.component_modules[component_name] = module
+
+    @contextmanager
+    def component_construction(self):
+        """
+        Context manager that records a step for the construction of each
+        component when creating a problem instance inside it, along with
+        the component's type, size (the number of members for sets and the
+        number of indices for other components), and memory.
+
+        Pyomo constructs the components of the instance one by one via the
+        *_initialize_component* method of the Model class, so we wrap that
+        method while creating the instance.
+        """
+        initialize_component = Model._initialize_component
+        profiler = self
+
+        def _initialize_component(
+            model, modeldata, namespaces, component_name, profile_memory
+        ):
+            module = profiler.component_modules.get(component_name, "")
+            with profiler.step(
+                "create_problem_instance", module, component_name
+            ):
+                initialize_component(
+                    model, modeldata, namespaces, component_name,
+                    profile_memory
+                )
+                memory_mb = \
+                    tracemalloc.get_traced_memory()[0] / 1024 ** 2 \
+                    if tracemalloc.is_tracing() else None
+
+            component = model.component(component_name)
+            seconds, peak_memory_mb = profiler.records[-1][3:]
+            profiler.construction_records.append(
+                (component_name, component.ctype.__name__, module,
+                 len(component), seconds, memory_mb, peak_memory_mb)
+            )
+
+        Model._initialize_component = _initialize_component
+        try:
+            yield
+        finally:
+            Model._initialize_component = initialize_component
+
+    def write_profile(self, results_directory):
+        """
+        :param results_directory: the (sub)problem results directory
+
+        Write the recorded steps to the profile file and clear the records
+        for the next (sub)problem.
+        """
+        with open(os.path.join(results_directory, PROFILE_FILENAME), "w",
+                  newline="") as f:
+            profile_writer = writer(f)
+            profile_writer.writerow(PROFILE_COLUMNS)
+            for step, record in enumerate(self.records, start=1):
+                profile_writer.writerow([step] + list(record))
+        self.records = list()
+
+    def write_construction_report(self, logs_directory):
+        """
+        :param logs_directory: the (sub)problem logs directory
+
+        Write the components, ranked by construction time, to the
+        construction report file and clear the construction records for the
+        next (sub)problem.
+        """
+        ranked_records = sorted(
+            self.construction_records, key=lambda record: -record[4]
+        )
+        with open(os.path.join(logs_directory, CONSTRUCTION_REPORT_FILENAME),
+                  "w", newline="") as f:
+            report_writer = writer(f)
+            report_writer.writerow(CONSTRUCTION_REPORT_COLUMNS)
+            for rank, record in enumerate(ranked_records, start=1):
+                report_writer.writerow([rank] + list(record))
+        self.construction_records = list()
+
+    def reset(self):
+        """
+        Clear the records without writing them.
+        """
+        self.records = list()
+        self.construction_records = list()
+
+
+def profile_step(profiler, phase, module="", component=""):
+    """
+    :param profiler: the Profiler, or None if not profiling
+    :param phase: str, the phase of the run
+    :param module: str, the name of the module (if any)
+    :param component: str, the name of the model component (if any)
+    :return: the profiler's step context manager, or a context manager
+        that does nothing if not profiling
+    """
+    if profiler is None:
+        return nullcontext()
+    else:
+        return profiler.step(phase, module, component)
+
+
+def import_profile_into_database(
+    scenario_id, subproblem, stage, db, results_directory
+):
+    """
+    :param scenario_id: the scenario ID
+    :param subproblem: the subproblem
+    :param stage: the stage
+    :param db: the database connection
+    :param results_directory: the (sub)problem results directory
+
+    Import the profile file into the results_scenario_profile table.
+    """
+    data = list()
+    with open(os.path.join(results_directory, PROFILE_FILENAME), "r") as f:
+        profile_reader = reader(f)
+        next(profile_reader)
+        for step, phase, module, component, seconds, peak_memory_mb \
+                in profile_reader:
+            data.append(
+                (scenario_id, subproblem, stage, int(step), phase, module,
+                 component, float(seconds),
+                 None if peak_memory_mb == "" else float(peak_memory_mb))
+            )
+
+    sql = """
+        INSERT INTO results_scenario_profile
+        (scenario_id, subproblem_id, stage_id, step_id, phase, module,
+        component, seconds, peak_memory_mb)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ;"""
+    spin_on_database_lock(conn=db, cursor=db.cursor(), sql=sql, data=data)
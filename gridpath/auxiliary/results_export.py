@@ -0,0 +1,178 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Columnar results export: rather than walking a model component one index at
+a time and writing each row as we go, we pull the values of whole indexed
+components at once into columns (lists ordered like the index), look up
+static attributes such as the period, horizon, technology, or load zone once
+per unique key, and write each results file in a single call.
+
+The columns contain the same Python values that the per-row approach would
+write, so the results files are unchanged.
+"""
+
+from functools import reduce
+import operator
+from pyomo.environ import Var, Param, value
+
+from gridpath.auxiliary.results_store import results_writer
+
+
+def get_index_column(index, position):
+    """
+    :param index: list of the index tuples (rows) of the results table
+    :param position: int, the position of the index element to get
+    :return: list with the index element in *position* for each row
+    """
+    return [idx[position] for idx in index]
+
+
+def get_param_column(param, keys):
+    """
+    :param param: the Pyomo Param (or any component or dictionary that can
+        be indexed with the keys)
+    :param keys: list of the keys to look up, one per row
+    :return: list with the value of *param* for each key
+
+    Look up the value of a static attribute for each row. Each unique key
+    is only looked up once, so attributes such as the project load zone
+    (indexed by project) or the timepoint period (indexed by timepoint) are
+    not looked up for every project-timepoint row.
+    """
+    lookup = {k: param[k] for k in set(keys)}
+    return [lookup[k] for k in keys]
+
+
+def get_membership_column(the_set, keys):
+    """
+    :param the_set: the Pyomo Set (or any container)
+    :param keys: list of the keys to check, one per row
+    :return: list of booleans indicating whether each key is in *the_set*
+
+    Like *get_param_column*, each unique key is only checked once.
+    """
+    lookup = {k: k in the_set for k in set(keys)}
+    return [lookup[k] for k in keys]
+
+
+def get_component_column(component, index, include=None):
+    """
+    :param component: the indexed Pyomo component (Var, Param,
+        or Expression)
+    :param index: list of the indices (rows) to get values for
+    :param include: list of booleans, one per row (optional); rows for
+        which this is False get None rather than the component value (e.g.
+        for costs that don't apply to a project)
+    :return: list with the value of the component for each index
+
+    Get the values of an indexed component for all rows in bulk. The values
+    of variables and params are extracted as a dictionary in a single call;
+    expressions must be evaluated for each index.
+    """
+    if include is None:
+        include = [True] * len(index)
+
+    if component.ctype is Var:
+        values = component.get_values()
+        return [values[idx] if inc else None
+                for idx, inc in zip(index, include)]
+    elif component.ctype is Param:
+        values = component.extract_values()
+        # Indices with the default value may not be in the dictionary
+        return [(values[idx] if idx in values else component[idx])
+                if inc else None
+                for idx, inc in zip(index, include)]
+    else:
+        return [value(component[idx]) if inc else None
+                for idx, inc in zip(index, include)]
+
+
+def get_prj_tmp_columns(mod, index):
+    """
+    :param mod: the model instance
+    :param index: list of the (project, timepoint) tuples (rows)
+    :return: dictionary with the static attribute columns of
+        project-timepoint results tables: project, period,
+        balancing_type_project, horizon, timepoint, timepoint_weight,
+        number_of_hours_in_timepoint, load_zone, technology,
+        and operational_type
+
+    The attributes are looked up once per project or timepoint (see
+    *get_param_column*).
+    """
+    projects = get_index_column(index, 0)
+    tmps = get_index_column(index, 1)
+    balancing_types = get_param_column(mod.balancing_type_project, projects)
+
+    return {
+        "project": projects,
+        "period": get_param_column(mod.period, tmps),
+        "balancing_type_project": balancing_types,
+        "horizon": get_param_column(
+            mod.horizon, list(zip(tmps, balancing_types))
+        ),
+        "timepoint": tmps,
+        "timepoint_weight": get_param_column(mod.tmp_weight, tmps),
+        "number_of_hours_in_timepoint": get_param_column(
+            mod.hrs_in_tmp, tmps
+        ),
+        "load_zone": get_param_column(mod.load_zone, projects),
+        "technology": get_param_column(mod.technology, projects),
+        "operational_type": get_param_column(mod.operational_type, projects)
+    }
+
+
+def get_product_column(*columns):
+    """
+    :param columns: the columns (lists of numbers) to multiply
+    :return: list with the element-wise product of the columns
+
+    The values are multiplied with Python arithmetic in the order of the
+    columns, like the per-row approach, so that integers remain integers
+    and missing (None) values raise an error.
+    """
+    return [reduce(operator.mul, row) for row in zip(*columns)]
+
+
+def get_difference_column(column, column_to_subtract):
+    """
+    :param column: the column (list of numbers) to subtract from
+    :param column_to_subtract: the column (list of numbers) to subtract
+    :return: list with the element-wise difference of the columns
+    """
+    return [x - y for x, y in zip(column, column_to_subtract)]
+
+
+def get_quotient_column(column, divisor_column):
+    """
+    :param column: the column (list of numbers) to divide
+    :param divisor_column: the column (list of numbers) to divide by
+    :return: list with the element-wise quotient of the columns
+    """
+    return [x / y for x, y in zip(column, divisor_column)]
+
+
+def write_results_file(file_path, header, columns):
+    """
+    :param file_path: the path of the results CSV file
+    :param header: list of the column names
+    :param columns: list of the columns (lists of values, all of the same
+        length), in the same order as the header
+
+    Write the header and all rows of a results file at once.
+    """
+    with results_writer(file_path) as writer:
+        writer.writerow(header)
+        writer.writerows(zip(*columns))
@@ -0,0 +1,442 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+By default, each module writes its results to CSV files in the
+(sub)problem results directories. With the parquet results format (the
+--results_format parquet option), the results tables are written directly
+to typed and compressed Parquet files instead, one dataset per results
+table, partitioned by subproblem and stage:
+
+    <scenario>/results_parquet/<table>/subproblem_id=<s>/stage_id=<t>/
+        part-0.parquet
+
+The results can then be read with *read_results_table*, which only reads
+the partitions and columns requested (predicate and projection pushdown).
+
+The modules write and read their results files with *results_writer*,
+*results_reader*, and *read_results_csv*. In the *parquet_results* context
+(used when exporting the results of a subproblem and stage with the
+parquet results format and when importing results into the database),
+these write the rows of a results file to its table's partition and read
+them back from it, with the values the CSV file would have had, rather
+than writing and reading the CSV file; the modules' export and import
+methods are the same for both results formats.
+
+The Parquet format requires the pyarrow package (install GridPath with the
+'parquet' extra).
+"""
+
+from contextlib import contextmanager
+import csv
+import os.path
+import pandas as pd
+import shutil
+
+from gridpath.auxiliary.profiler import PROFILE_FILENAME
+from gridpath.auxiliary.warm_start import WARM_START_VALUES_FILENAME
+
+RESULTS_FORMATS = ["csv", "parquet"]
+PARQUET_RESULTS_DIRECTORY = "results_parquet"
+PARQUET_FILENAME = "part-0.parquet"
+# Files that are read directly from the results directory (e.g. to
+# warm-start other scenarios), so we keep them as CSV files
+RESULTS_FILES_KEPT_AS_CSV = [PROFILE_FILENAME, WARM_START_VALUES_FILENAME]
+# The values of the results columns that are stored as numbers
+INTEGER_PATTERN = r"^(0|-?[1-9][0-9]*)$"
+FLOAT_PATTERN = r"^-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?$"
+# The results directories whose results tables are stored as Parquet (see
+# *parquet_results*), with the scenario directory, subproblem, and stage of
+# their partitions
+PARQUET_RESULTS_DIRECTORIES = dict()
+
+
+def import_pyarrow():
+    """
+    :return: the pyarrow package and its dataset and parquet modules
+
+    Import pyarrow, which is only required for the parquet results format.
+    """
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "The parquet results format requires the pyarrow package. "
+            "Install it with 'pip install pyarrow' or install GridPath with "
+            "the 'parquet' extra."
+        )
+    return pyarrow, pyarrow.dataset, pyarrow.parquet
+
+
+def get_partition_ids(subproblem, stage):
+    """
+    :param subproblem: the subproblem ("" if there are no subproblems)
+    :param stage: the stage ("" if there are no stages)
+    :return: tuple with the subproblem ID and stage ID of the partition (1
+        if there are no subproblems or stages, as in the database)
+    """
+    return (int(subproblem) if str(subproblem) != "" else 1,
+            int(stage) if str(stage) != "" else 1)
+
+
+def get_partition_directory(scenario_directory, table, subproblem, stage):
+    """
+    :param scenario_directory: the scenario directory
+    :param table: str, the name of the results table (the CSV file name
+        without the extension)
+    :param subproblem: the subproblem
+    :param stage: the stage
+    :return: the directory of the table's partition for the subproblem and
+        stage
+    """
+    subproblem_id, stage_id = get_partition_ids(subproblem, stage)
+    return os.path.join(
+        scenario_directory, PARQUET_RESULTS_DIRECTORY, table,
+        "subproblem_id={}".format(subproblem_id),
+        "stage_id={}".format(stage_id)
+    )
+
+
+def get_partition_tables(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the scenario directory
+    :param subproblem: the subproblem
+    :param stage: the stage
+    :return: list of the results tables with a partition for the
+        subproblem and stage
+    """
+    dataset_directory = os.path.join(
+        scenario_directory, PARQUET_RESULTS_DIRECTORY
+    )
+    if not os.path.exists(dataset_directory):
+        return []
+    return sorted(
+        table for table in os.listdir(dataset_directory)
+        if os.path.exists(get_partition_directory(
+            scenario_directory, table, subproblem, stage
+        ))
+    )
+
+
+@contextmanager
+def parquet_results(scenario_directory, subproblem, stage, results_directory):
+    """
+    :param scenario_directory: the scenario directory
+    :param subproblem: the subproblem
+    :param stage: the stage
+    :param results_directory: the results directory of the subproblem and
+        stage
+
+    Context manager within which the results files of the results
+    directory are written to and read from the partitions of their
+    results tables for the subproblem and stage (see *results_writer*,
+    *results_reader*, and *read_results_csv*).
+    """
+    results_directory = os.path.abspath(results_directory)
+    PARQUET_RESULTS_DIRECTORIES[results_directory] = \
+        (scenario_directory, subproblem, stage)
+    try:
+        yield
+    finally:
+        del PARQUET_RESULTS_DIRECTORIES[results_directory]
+
+
+def get_parquet_file(file_path):
+    """
+    :param file_path: the path to a results CSV file
+    :return: the path to the Parquet file of the results table's partition
+        if the results of the file's directory are stored as Parquet (see
+        *parquet_results*); None otherwise
+    """
+    results_directory, filename = os.path.split(os.path.abspath(file_path))
+    if results_directory not in PARQUET_RESULTS_DIRECTORIES \
+            or not filename.endswith(".csv") \
+            or filename in RESULTS_FILES_KEPT_AS_CSV:
+        return None
+
+    scenario_directory, subproblem, stage = \
+        PARQUET_RESULTS_DIRECTORIES[results_directory]
+    return os.path.join(
+        get_partition_directory(
+            scenario_directory, filename[:-len(".csv")], subproblem, stage
+        ),
+        PARQUET_FILENAME
+    )
+
+
+class ParquetResultsWriter(object):
+    """
+    Collect the rows of a results table like a CSV writer, so that they can
+    be written to Parquet at once.
+    """
+    def __init__(self):
+        self.rows = list()
+
+    def writerow(self, row):
+        self.rows.append(row)
+
+    def writerows(self, rows):
+        self.rows.extend(rows)
+
+
+@contextmanager
+def results_writer(file_path):
+    """
+    :param file_path: the path to the results CSV file
+
+    Context manager that returns a CSV writer for the results file. If the
+    results of the file's directory are stored as Parquet, the rows
+    written (the header first) are written to the partition of the
+    results table when the context exits instead (see
+    *write_parquet_file*), and any CSV file from a previous run is removed.
+    """
+    parquet_file = get_parquet_file(file_path)
+    if parquet_file is None:
+        with open(file_path, "w", newline="") as f:
+            yield csv.writer(f)
+    else:
+        writer = ParquetResultsWriter()
+        yield writer
+        write_parquet_file(parquet_file, writer.rows)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+@contextmanager
+def results_reader(file_path):
+    """
+    :param file_path: the path to the results CSV file
+
+    Context manager that returns a CSV reader for the results file. If the
+    results of the file's directory are stored as Parquet and there is no
+    CSV file, the rows (the header first) are read from the partition of
+    the results table instead (see *read_parquet_file*).
+    """
+    parquet_file = get_parquet_file(file_path)
+    if parquet_file is not None and not os.path.exists(file_path) \
+            and os.path.exists(parquet_file):
+        yield read_parquet_file(parquet_file)
+    else:
+        with open(file_path, "r") as f:
+            yield csv.reader(f)
+
+
+def results_file_exists(file_path):
+    """
+    :param file_path: the path to the results CSV file
+    :return: boolean, whether the results file exists, or, if the results
+        of the file's directory are stored as Parquet, whether the results
+        table has a partition for them
+    """
+    parquet_file = get_parquet_file(file_path)
+    return os.path.exists(file_path) \
+        or (parquet_file is not None and os.path.exists(parquet_file))
+
+
+def read_results_csv(file_path):
+    """
+    :param file_path: the path to the results CSV file
+    :return: pandas DataFrame with the results
+
+    Read a results file with pandas. If the results of the file's directory
+    are stored as Parquet and there is no CSV file, the results are read
+    from the partition of the results table instead.
+    """
+    parquet_file = get_parquet_file(file_path)
+    if parquet_file is not None and not os.path.exists(file_path) \
+            and os.path.exists(parquet_file):
+        pyarrow, pa_dataset, pa_parquet = import_pyarrow()
+        return pa_parquet.read_table(
+            parquet_file, partitioning=None
+        ).to_pandas()
+    else:
+        return pd.read_csv(file_path)
+
+
+def get_csv_value(value):
+    """
+    :param value: a value written to a results file
+    :return: the value as the CSV writer writes it, or None for an empty
+        value
+    """
+    if value is None or value == "":
+        return None
+    elif isinstance(value, float):
+        return repr(value)
+    else:
+        return str(value)
+
+
+def write_parquet_file(parquet_file, rows):
+    """
+    :param parquet_file: the path to the Parquet file
+    :param rows: list of the rows of the results table, the header first
+
+    Write the rows of a results table to a Parquet file. The values are
+    converted to the text the CSV writer would write and then to numbers
+    only if all values of their column are numbers (see
+    *get_typed_column*); only empty values are treated as missing.
+    """
+    pyarrow, pa_dataset, pa_parquet = import_pyarrow()
+
+    header = rows[0]
+    columns = list(zip(*rows[1:])) if len(rows) > 1 \
+        else [() for column in header]
+    table = pyarrow.table(
+        [get_typed_column(pyarrow, pyarrow.array(
+            [get_csv_value(v) for v in column], type=pyarrow.string()
+        )) for column in columns],
+        names=[str(column) for column in header]
+    )
+    os.makedirs(os.path.dirname(parquet_file), exist_ok=True)
+    pa_parquet.write_table(table, parquet_file, compression="zstd")
+
+
+def get_typed_column(pyarrow, column):
+    """
+    :param pyarrow: the pyarrow package
+    :param column: Arrow array of strings, the values of a results column
+    :return: Arrow array with the values converted to integers or floats if
+        all of them are numbers
+
+    We don't let pyarrow infer the column types, as its inference converts
+    all numeric-looking values and true/false values, so e.g. a load zone
+    named "007" would be read back as "7" and "true" as "True". Instead, a
+    column is converted to integers only if all its values are integers
+    without leading zeros and to floats only if all its values are decimal
+    numbers; all other columns (e.g. identifiers, booleans) are kept as
+    strings, so that their values are read back as they were written.
+    Columns with only missing values get the null type, so that they can
+    be unified with the type of the column in other partitions.
+    """
+    if column.null_count == len(column):
+        return pyarrow.nulls(len(column))
+
+    for pattern, column_type in [
+        (INTEGER_PATTERN, pyarrow.int64()),
+        (FLOAT_PATTERN, pyarrow.float64())
+    ]:
+        if pyarrow.compute.all(
+            pyarrow.compute.match_substring_regex(column, pattern)
+        ).as_py():
+            try:
+                return column.cast(column_type)
+            except pyarrow.ArrowInvalid:
+                # E.g. integers too large for 64 bits
+                continue
+
+    return column
+
+
+def read_parquet_file(parquet_file):
+    """
+    :param parquet_file: the path to the Parquet file
+    :return: iterator over the rows of the results table, the header first,
+        with the values as the CSV reader reads them from the CSV file
+    """
+    pyarrow, pa_dataset, pa_parquet = import_pyarrow()
+
+    table = pa_parquet.read_table(parquet_file, partitioning=None)
+    columns = list()
+    for column in table.columns:
+        to_text = repr if pyarrow.types.is_floating(column.type) else str
+        columns.append([
+            "" if v is None else to_text(v) for v in column.to_pylist()
+        ])
+    yield table.column_names
+    for row in zip(*columns):
+        yield list(row)
+
+
+def remove_parquet_results(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the scenario directory
+    :param subproblem: the subproblem
+    :param stage: the stage
+
+    Remove the partitions of the subproblem and stage from all results
+    tables (e.g. results from a previous run).
+    """
+    for table in get_partition_tables(scenario_directory, subproblem, stage):
+        shutil.rmtree(get_partition_directory(
+            scenario_directory, table, subproblem, stage
+        ))
+
+
+def read_results_table(
+    scenario_directory, table, subproblem=None, stage=None, columns=None
+):
+    """
+    :param scenario_directory: the scenario directory
+    :param table: str, the name of the results table (e.g. "dispatch_all")
+    :param subproblem: the subproblem to read (all subproblems if None)
+    :param stage: the stage to read (all stages if None)
+    :param columns: list of the columns to read (all columns if None)
+    :return: pandas DataFrame with the results, including the subproblem_id
+        and stage_id columns
+
+    Only the partitions of the requested subproblem and stage and the
+    requested columns are read. The schemas of the partitions are unified
+    (e.g. a column with only missing values in one partition and numbers in
+    another is read as numbers).
+    """
+    pyarrow, pa_dataset, pa_parquet = import_pyarrow()
+
+    table_directory = os.path.join(
+        scenario_directory, PARQUET_RESULTS_DIRECTORY, table
+    )
+    files = [
+        os.path.join(root, f) for root, dirs, files in os.walk(table_directory)
+        for f in files if f.endswith(".parquet")
+    ]
+    if not files:
+        raise IOError(
+            "No Parquet results found for table {} in {}.".format(
+                table, scenario_directory
+            )
+        )
+    file_schema = pyarrow.unify_schemas(
+        [pa_parquet.read_schema(f) for f in files],
+        promote_options="permissive"
+    )
+    # Some results tables already have subproblem and stage columns, in
+    # which case we don't add them from the partition directories
+    partitioning = pa_dataset.partitioning(
+        pyarrow.schema([
+            (field, pyarrow.int64()) for field in ["subproblem_id", "stage_id"]
+            if field not in file_schema.names
+        ]),
+        flavor="hive"
+    )
+    schema = pyarrow.unify_schemas(
+        [file_schema, partitioning.schema], promote_options="permissive"
+    )
+    dataset = pa_dataset.dataset(
+        files, schema=schema, format="parquet", partitioning=partitioning,
+        partition_base_dir=table_directory
+    )
+
+    row_filter = None
+    for field, value in [("subproblem_id", subproblem), ("stage_id", stage)]:
+        if value is not None:
+            expression = pa_dataset.field(field) == value
+            row_filter = expression if row_filter is None \
+                else row_filter & expression
+
+    return dataset.to_table(
+        columns=columns, filter=row_filter
+    ).to_pandas()
@@ -0,0 +1,269 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Warm starts seed the values of the variables of a problem instance before
+solving it, so that solvers that support warm starts (e.g. MIP starts for
+Cbc, CPLEX, and Gurobi) can start from a solution rather than from scratch.
+
+The values can come from the previous subproblem or stage solved in the
+same chain of subproblems (the --warm_start option), or from the solution
+of the same subproblem and stage of a reference scenario (the
+--warm_start_scenario option), which must have been run with the
+--save_warm_start_values option so that its variable values were saved to
+a warm_start_values.csv file in its results directories.
+
+Values are matched by variable name and index, so only the variables whose
+indices exist in both problems are seeded. This covers the variables
+across the stages of a subproblem, which share the same timepoints, and
+across scenarios with the same temporal structure. Rolling subproblems
+have different timepoints, so when warm-starting from the previous
+subproblem, the timepoints in the previous subproblem's variable indices
+are also mapped to the timepoints at the same position in the current
+subproblem's horizon (e.g. the first hour of the previous day to the first
+hour of the current day); the values of the timepoints the two
+subproblems share (e.g. the previous subproblem's lookahead) take
+precedence. Fixed variables are not changed, and the values of integer
+and binary variables are rounded.
+"""
+
+from csv import reader, writer
+import json
+import os.path
+
+from pyomo.environ import Var
+
+WARM_START_VALUES_FILENAME = "warm_start_values.csv"
+
+
+def get_variable_values(instance):
+    """
+    :param instance: the solved problem instance
+    :return: dictionary with the values of each variable by index (only
+        variables with a value)
+    """
+    values = dict()
+    for var in instance.component_objects(Var, active=True):
+        var_values = {
+            index: var_data.value for index, var_data in var.items()
+            if var_data.value is not None
+        }
+        if var_values:
+            values[var.name] = var_values
+    return values
+
+
+def get_timepoints(instance):
+    """
+    :param instance: the problem instance
+    :return: list of the instance's timepoints in order (empty if the
+        instance has no timepoints)
+    """
+    return list(instance.TMPS) if hasattr(instance, "TMPS") else list()
+
+
+def get_timepoint_map(previous_timepoints, timepoints):
+    """
+    :param previous_timepoints: list of the timepoints of the problem the
+        values come from, in order
+    :param timepoints: list of the timepoints of the problem to set the
+        values of, in order
+    :return: dictionary with the timepoint at the same position in the
+        problem to set the values of by previous timepoint
+
+    Timepoints at the same position are not included if they are the same.
+    """
+    return {
+        previous_tmp: tmp for previous_tmp, tmp
+        in zip(previous_timepoints, timepoints) if previous_tmp != tmp
+    }
+
+
+def map_index(index, timepoint_map):
+    """
+    :param index: the variable index
+    :param timepoint_map: dictionary with the timepoint to map each
+        timepoint to
+    :return: the index with its timepoints mapped
+    """
+    if isinstance(index, tuple):
+        return tuple(timepoint_map.get(i, i) for i in index)
+    return timepoint_map.get(index, index)
+
+
+def set_variable_values(instance, values, previous_timepoints=None):
+    """
+    :param instance: the problem instance
+    :param values: dictionary with the values of each variable by index
+    :param previous_timepoints: list of the timepoints of the problem the
+        values come from, in order, if they can differ from the instance's
+        (e.g. the previous rolling subproblem); optional
+    :return: the number of variables whose value was set
+
+    Set the values of the variables of the instance that have a value in
+    the values dictionary and are not fixed. If the previous timepoints are
+    specified, the values are also matched to the indices with their
+    timepoints mapped by position (see *get_timepoint_map*); the values
+    matched by their exact index take precedence.
+    """
+    timepoint_map = dict() if previous_timepoints is None \
+        else get_timepoint_map(previous_timepoints, get_timepoints(instance))
+
+    n_set = 0
+    for var in instance.component_objects(Var, active=True):
+        var_values = values.get(var.name)
+        if not var_values:
+            continue
+        # The values matched by the mapped indices are set first, so that
+        # they are overwritten by the values matched by the exact indices
+        index_values = list()
+        if timepoint_map:
+            for index, value in var_values.items():
+                mapped_index = map_index(index, timepoint_map)
+                if mapped_index != index:
+                    index_values.append((mapped_index, value))
+        index_values += list(var_values.items())
+
+        set_indices = set()
+        for index, value in index_values:
+            if index not in var:
+                continue
+            var_data = var[index]
+            if var_data.fixed:
+                continue
+            if var_data.is_integer() or var_data.is_binary():
+                value = round(value)
+            var_data.set_value(value, valid=True)
+            set_indices.add(index)
+        n_set += len(set_indices)
+    return n_set
+
+
+def save_variable_values(instance, results_directory):
+    """
+    :param instance: the solved problem instance
+    :param results_directory: the (sub)problem results directory
+
+    Save the values of the variables of the instance to the warm start
+    values file, so that they can be used to warm-start other scenarios.
+    The indices are saved as JSON lists.
+    """
+    with open(os.path.join(results_directory, WARM_START_VALUES_FILENAME),
+              "w", newline="") as f:
+        values_writer = writer(f)
+        values_writer.writerow(["variable", "index", "value"])
+        for var_name, var_values in get_variable_values(instance).items():
+            for index, value in var_values.items():
+                values_writer.writerow([
+                    var_name,
+                    json.dumps(list(index) if isinstance(index, tuple)
+                               else [index]),
+                    value
+                ])
+
+
+def load_variable_values(results_directory):
+    """
+    :param results_directory: the (sub)problem results directory
+    :return: dictionary with the values of each variable by index from the
+        warm start values file, or None if there is no file
+    """
+    values_file = os.path.join(results_directory, WARM_START_VALUES_FILENAME)
+    if not os.path.exists(values_file):
+        return None
+
+    values = dict()
+    with open(values_file, "r") as f:
+        values_reader = reader(f)
+        next(values_reader)
+        for var_name, index, value in values_reader:
+            index = json.loads(index)
+            index = index[0] if len(index) == 1 else tuple(index)
+            values.setdefault(var_name, dict())[index] = float(value)
+    return values
+
+
+class WarmStart(object):
+    """
+    Keep track of the warm start values for a chain of subproblems: the
+    values of the last (sub)problem solved if warm-starting from the
+    previous subproblem, and the results directories of the reference
+    scenario if warm-starting from a reference scenario.
+    """
+    def __init__(self, from_previous, reference_scenario_directory=None):
+        """
+        :param from_previous: boolean, whether to warm-start from the
+            previous subproblem or stage solved
+        :param reference_scenario_directory: the directory of the reference
+            scenario to warm-start from (optional)
+        """
+        self.from_previous = from_previous
+        self.reference_scenario_directory = reference_scenario_directory
+        self.previous_values = None
+        self.previous_timepoints = None
+
+    def get_values(self, subproblem, stage):
+        """
+        :param subproblem: the subproblem
+        :param stage: the stage
+        :return: dictionary with the values of each variable by index to
+            warm-start the (sub)problem with, or None if there are none
+
+        The reference scenario's values for the same subproblem and stage
+        take precedence over the values of the previous (sub)problem.
+        """
+        if self.reference_scenario_directory is not None:
+            values = load_variable_values(os.path.join(
+                self.reference_scenario_directory, str(subproblem),
+                str(stage), "results"
+            ))
+            if values is not None:
+                return values
+        if self.from_previous:
+            return self.previous_values
+        return None
+
+    def set_values(self, instance, subproblem, stage):
+        """
+        :param instance: the problem instance of the (sub)problem
+        :param subproblem: the subproblem
+        :param stage: the stage
+        :return: the number of variables whose value was set
+
+        Set the values to warm-start the (sub)problem with (see
+        *get_values*). The previous (sub)problem's values are also mapped
+        to the (sub)problem's timepoints by position, as its timepoints can
+        differ; the reference scenario's values are for the same
+        subproblem and stage, so they are only matched by exact index.
+        """
+        values = self.get_values(subproblem, stage)
+        if not values:
+            return 0
+        previous_timepoints = self.previous_timepoints \
+            if values is self.previous_values else None
+        return set_variable_values(
+            instance, values, previous_timepoints=previous_timepoints
+        )
+
+    def update(self, instance):
+        """
+        :param instance: the solved problem instance
+
+        Keep the values and the timepoints of the solved (sub)problem to
+        warm-start the next (sub)problem with if warm-starting from the
+        previous subproblem.
+        """
+        if self.from_previous:
+            self.previous_values = get_variable_values(instance)
+            self.previous_timepoints = get_timepoints(instance)
@@ -126,6 +126,37 @@ def get_db_parser():
     return parser
 
 
+def get_inputs_parser():
+    """
+    Create ArgumentParser object which has the common set of arguments for
+    writing the scenario inputs (see get_scenario_inputs.py and
+    run_end_to_end.py).
+
+    We can then simply add 'parents=[get_inputs_parser()]' when we create a
+    parser for a script to inherit these common arguments.
+
+    Note that 'add_help' is set to 'False' to avoid multiple `-h/--help` options
+    (one for parent and one for each child), which will throw an error.
+    :return:
+    """
+
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--incremental", default=False, action="store_true",
+                        help="Only write the inputs of modules whose "
+                             "subscenario IDs (or code) have changed since "
+                             "the inputs were last written, and hard-link "
+                             "input files that are the same for all "
+                             "subproblems and stages. Assumes the data "
+                             "for a subscenario ID have not changed.")
+    parser.add_argument("--n_parallel_get_inputs", default=1, type=int,
+                        help="The number of subproblem/stage input "
+                             "directories to write in parallel, each with "
+                             "its own read-only database connection. "
+                             "Defaults to 1.")
+
+    return parser
+
+
 def get_solve_parser():
     """
     Create ArgumentParser object which has the common set of arguments for
@@ -158,6 +189,17 @@ def get_solve_parser():
                              "your PATH. The solver specified with the "
                              "--solver option must be the same as the solver "
                              "for which you are providing an executable.")
+    parser.add_argument("--solver_interface", default="file",
+                        choices=["file", "direct", "persistent"],
+                        help="How to pass the problem to the solver: write "
+                             "it to a file for the solver executable "
+                             "('file', the default), or use the solver's "
+                             "in-memory 'direct' or 'persistent' interface "
+                             "(e.g. gurobi_direct, cplex_persistent), which "
+                             "avoids writing large problem files. Falls "
+                             "back to the file interface if the solver "
+                             "doesn't have the interface or its Python "
+                             "bindings are not installed.")
     parser.add_argument("--mute_solver_output", default=False,
                         action="store_true",
                         help="Don't print solver output.")
@@ -169,6 +211,72 @@ def get_solve_parser():
                         help="Save temporary solver files.")
     parser.add_argument("--symbolic", default=False, action="store_true",
                         help="Use symbolic labels in solver files.")
+    parser.add_argument("--reuse_model", default=False, action="store_true",
+                        help="Reuse the abstract model and solver across "
+                             "subproblems with the same model structure "
+                             "instead of rebuilding them for each "
+                             "subproblem. Use with a persistent solver "
+                             "interface (e.g. gurobi_persistent) to also "
+                             "keep the solver environment. The problem "
+                             "instance is still constructed from each "
+                             "subproblem's data as without this option, "
+                             "so the time saved is only the (usually "
+                             "small) abstract model build time.")
+    # Warm start options
+    parser.add_argument("--warm_start", default=False, action="store_true",
+                        help="Warm-start each subproblem and stage with "
+                             "the variable values of the previous "
+                             "subproblem or stage solved (for solvers that "
+                             "support warm starts, e.g. MIP starts).")
+    parser.add_argument("--warm_start_scenario",
+                        help="Warm-start each subproblem and stage with "
+                             "the variable values of the same subproblem "
+                             "and stage of this reference scenario in the "
+                             "scenario location. The reference scenario "
+                             "must have been run with "
+                             "--save_warm_start_values.")
+    parser.add_argument("--save_warm_start_values", default=False,
+                        action="store_true",
+                        help="Save the variable values of each subproblem "
+                             "to a 'warm_start_values.csv' file in its "
+                             "results directory, so that the scenario can "
+                             "be used with --warm_start_scenario.")
+    # Profiling options
+    parser.add_argument("--profile", default=False, action="store_true",
+                        help="Record the wall time and peak memory of each "
+                             "module's steps (adding model components, "
+                             "loading data, constructing each component, "
+                             "fixing variables, exporting results, saving "
+                             "duals, summarizing results) and of the solve "
+                             "in a 'profile.csv' file in each subproblem's "
+                             "results directory. The profile is imported "
+                             "into the results_scenario_profile table "
+                             "along with the other results.")
+    parser.add_argument("--report_construction", default=False,
+                        action="store_true",
+                        help="Write a report of the construction time, "
+                             "size and approximate memory of each component "
+                             "of the problem instance (sets, params, "
+                             "variables, expressions, constraints), ranked "
+                             "by construction time, to a "
+                             "'construction_report.csv' file in each "
+                             "subproblem's logs directory.")
+    # Results options
+    parser.add_argument("--results_format", default="csv",
+                        choices=["csv", "parquet"],
+                        help="The format of the results files: CSV files "
+                             "in each subproblem's results directory ('csv', "
+                             "the default), or compressed Parquet files in "
+                             "the scenario's 'results_parquet' directory, "
+                             "one dataset per results table partitioned by "
+                             "subproblem and stage ('parquet', requires the "
+                             "pyarrow package).")
+    # Parallel options
+    parser.add_argument("--n_parallel_subproblems", default=1, type=int,
+                        help="The number of subproblems to run in parallel. "
+                             "Subproblems that are linked (see "
+                             "'linked_subproblems_map.csv') are still run "
+                             "sequentially. Defaults to 1.")
     # Flag for test runs (various changes in behavior)
     parser.add_argument("--testing", default=False, action="store_true",
                         help="Flag for test suite runs. Results not saved.")
@@ -176,6 +284,29 @@ def get_solve_parser():
     return parser
 
 
+def get_process_results_parser():
+    """
+    Create ArgumentParser object which has the common set of arguments for
+    processing the scenario results (see process_results.py and
+    run_end_to_end.py).
+
+    We can then simply add 'parents=[get_process_results_parser()]' when we
+    create a parser for a script to inherit these common arguments.
+
+    Note that 'add_help' is set to 'False' to avoid multiple `-h/--help` options
+    (one for parent and one for each child), which will throw an error.
+    :return:
+    """
+
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--n_parallel_process_results", default=1, type=int,
+                        help="The number of modules whose results to "
+                             "process in parallel, each with its own "
+                             "database connection. Defaults to 1.")
+
+    return parser
+
+
 def create_logs_directory_if_not_exists(scenario_directory, subproblem, stage):
     """
     Create a logs directory if it doesn't exist already
@@ -205,10 +336,11 @@ class Logging(object):
         self.terminal = sys.stdout
 
         # If logging only run_scenario, print to a file starting with opt_
-        # and the datetime
+        # and the datetime (and the process ID if running subproblems in
+        # parallel)
         # If logging run_e2e, print to a file starting with e2e_, with the
         # datetime, and the process ID
-        if not e2e:
+        if not e2e and process_id is None:
             self.log_file_path = \
                 os.path.join(
                     logs_dir,
@@ -216,6 +348,15 @@ class Logging(object):
                         string_from_time(start_time)
                     )
                 )
+        elif not e2e:
+            self.log_file_path = \
+                os.path.join(
+                    logs_dir,
+                    "opt_{}_pid_{}.log".format(
+                        string_from_time(start_time),
+                        str(process_id)
+                    )
+                )
         else:
             self.log_file_path = \
                 os.path.join(
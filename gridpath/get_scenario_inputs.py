@@ -23,21 +23,32 @@ The main() function of this script can also be called with the
 
 from argparse import ArgumentParser
 import csv
+import importlib
+from multiprocessing import Pool
 import os.path
 import pandas as pd
 import sys
 
 from db.common_functions import connect_to_database
-from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from db.utilities.update_schema import check_database_schema
+from gridpath.auxiliary.db_interface import get_scenario_id_and_name, \
+    update_project_operational_timepoints
+from gridpath.auxiliary.input_manifest import SubScenariosRecorder, \
+    break_hard_links, flag_shared_entries, get_module_fingerprint, \
+    get_modules_to_link, get_modules_to_write, get_subscenario_values, \
+    link_file, link_identical_files, load_manifest, save_manifest, \
+    snapshot_directory
 from gridpath.common_functions import determine_scenario_directory, \
-    create_directory_if_not_exists, get_db_parser, get_required_e2e_arguments_parser
+    create_directory_if_not_exists, get_db_parser, \
+    get_required_e2e_arguments_parser, get_inputs_parser
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import OptionalFeatures, SubScenarios, \
     SubProblems, SolverOptions
 
 
 def write_model_inputs(scenario_directory, subproblems, loaded_modules,
-                       scenario_id, subscenarios, conn):
+                       scenario_id, subscenarios, conn, incremental=False,
+                       n_parallel=1, db_path=None):
     """
     For each module, load the inputs from the database and write out the inputs
     into .tab files, which will be used to construct the optimization problem.
@@ -49,12 +60,35 @@ def write_model_inputs(scenario_directory, subproblems, loaded_modules,
         objects)
     :param subscenarios: SubScenarios object with all subscenario info
     :param conn: database connection
+    :param incremental: boolean; if True, only write the inputs of the
+        modules whose inputs fingerprints don't match the input manifest
+        (see gridpath.auxiliary.input_manifest) and hard-link the input
+        files that are the same for all subproblems and stages
+    :param n_parallel: the number of subproblem/stage input directories to
+        write in parallel
+    :param db_path: the path to the database; required if n_parallel is
+        more than 1
 
 
     :return:
+
+    If more than one parallel process is requested, the inputs of each
+    subproblem and stage are written in a pool of processes, each with
+    its own read-only database connection. The modules of a subproblem and
+    stage are still called sequentially, as several modules write to the
+    same files (e.g. projects.tab). Before starting the processes, we make
+    sure that the inputs that are materialized in the database on demand
+    (see *update_project_operational_timepoints*) are up to date and switch
+    the database to WAL mode, so that the readers don't block and aren't
+    blocked by other processes writing to the database.
     """
     subproblems_list = subproblems.SUBPROBLEMS
 
+    prior_manifest = load_manifest(scenario_directory) if incremental else {}
+    manifest = dict()
+    inputs_directories = list()
+    subproblem_stages = list()
+
     for subproblem in subproblems_list:
         stages = subproblems.SUBPROBLEM_STAGE_DICT[subproblem]
 
@@ -75,29 +109,268 @@ def write_model_inputs(scenario_directory, subproblems, loaded_modules,
             if not os.path.exists(inputs_directory):
                 os.makedirs(inputs_directory)
 
-            # Delete auxiliary and input files that may have existed before to
-            # avoid phantom files/inputs
+            # Delete auxiliary files that may have existed before to avoid
+            # phantom files/inputs
             delete_prior_aux_files(scenario_directory=scenario_directory)
-            delete_prior_inputs(inputs_directory=inputs_directory)
-
-            # Write model input .tab files for each of the loaded_modules if
-            # appropriate. Note that all input files are saved in the
-            # input_directory, even the non-temporal inputs that are not
-            # dependent on the subproblem or stage. This simplifies the file
-            # structure at the expense of unnecessarily duplicating
-            # non-temporal input files such as projects.tab.
-            for m in loaded_modules:
-                if hasattr(m, "write_model_inputs"):
-                    m.write_model_inputs(
-                        scenario_directory=scenario_directory,
-                        scenario_id=scenario_id,
-                        subscenarios=subscenarios,
-                        subproblem=subproblem,
-                        stage=stage,
-                        conn=conn,
-                    )
-                else:
-                    pass
+
+            inputs_directories.append(inputs_directory)
+            subproblem_stages.append((subproblem, stage))
+
+    # Write model input .tab files for each of the loaded_modules if
+    # appropriate. Note that all input files are saved in the
+    # input_directory, even the non-temporal inputs that are not
+    # dependent on the subproblem or stage. This simplifies the file
+    # structure at the expense of unnecessarily duplicating
+    # non-temporal input files such as projects.tab (in
+    # incremental mode, the duplicates are hard links).
+    manifest_keys = [
+        os.path.relpath(inputs_directory, scenario_directory)
+        for inputs_directory in inputs_directories
+    ]
+
+    # In incremental mode, we write the first subproblem and stage first,
+    # so that the inputs that don't depend on the subproblem and stage can
+    # be linked from its directory rather than written again to the other
+    # directories (see gridpath.auxiliary.input_manifest)
+    all_entries = list()
+    shared_entries = None
+    if incremental:
+        all_entries.append(
+            write_subproblem_stage_model_inputs(
+                inputs_directory=inputs_directories[0],
+                scenario_directory=scenario_directory,
+                loaded_modules=loaded_modules,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios,
+                subproblem=subproblem_stages[0][0],
+                stage=subproblem_stages[0][1],
+                conn=conn,
+                prior_entries=prior_manifest.get(manifest_keys[0])
+            )
+        )
+        shared_entries = all_entries[0]
+    n_written = len(all_entries)
+
+    if n_parallel > 1 and len(inputs_directories) - n_written > 1:
+        update_project_operational_timepoints(
+            conn=conn, subscenarios=subscenarios
+        )
+        conn.execute("PRAGMA journal_mode=WAL;")
+
+        pool_args = [
+            (db_path, [m.__name__ for m in loaded_modules], inputs_directory,
+             scenario_directory, scenario_id, subscenarios, subproblem,
+             stage, prior_manifest.get(manifest_key),
+             inputs_directories[0], shared_entries)
+            for inputs_directory, (subproblem, stage), manifest_key
+            in list(zip(inputs_directories, subproblem_stages,
+                        manifest_keys))[n_written:]
+        ]
+        with Pool(
+            processes=min(n_parallel, len(pool_args))
+        ) as pool:
+            all_entries += pool.starmap(
+                write_subproblem_stage_model_inputs_in_worker, pool_args
+            )
+    else:
+        all_entries += [
+            write_subproblem_stage_model_inputs(
+                inputs_directory=inputs_directory,
+                scenario_directory=scenario_directory,
+                loaded_modules=loaded_modules,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios,
+                subproblem=subproblem,
+                stage=stage,
+                conn=conn,
+                prior_entries=prior_manifest.get(manifest_key),
+                shared_inputs_directory=inputs_directories[0],
+                shared_entries=shared_entries
+            )
+            for inputs_directory, (subproblem, stage), manifest_key
+            in list(zip(inputs_directories, subproblem_stages,
+                        manifest_keys))[n_written:]
+        ]
+
+    for manifest_key, entries in zip(manifest_keys, all_entries):
+        manifest[manifest_key] = entries
+
+    if incremental:
+        link_identical_files(directories=inputs_directories)
+        flag_shared_entries(
+            directories=inputs_directories, entries=all_entries
+        )
+
+    save_manifest(scenario_directory=scenario_directory, manifest=manifest)
+
+
+def write_subproblem_stage_model_inputs_in_worker(
+    db_path, module_names, inputs_directory, scenario_directory, scenario_id,
+    subscenarios, subproblem, stage, prior_entries, shared_inputs_directory,
+    shared_entries
+):
+    """
+    :param db_path: the path to the database
+    :param module_names: list of the names of the loaded modules
+    :return: list of the input manifest entries for the modules
+
+    Write the model input .tab files of a subproblem and stage in a worker
+    process (see *write_model_inputs*). Loaded modules and database
+    connections can't be passed to other processes, so the worker imports
+    the modules by name and opens its own read-only connection. See
+    *write_subproblem_stage_model_inputs* for the other parameters.
+    """
+    conn = connect_to_database(db_path=db_path, read_only=True)
+    try:
+        return write_subproblem_stage_model_inputs(
+            inputs_directory=inputs_directory,
+            scenario_directory=scenario_directory,
+            loaded_modules=[
+                importlib.import_module(m) for m in module_names
+            ],
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            subproblem=subproblem,
+            stage=stage,
+            conn=conn,
+            prior_entries=prior_entries,
+            shared_inputs_directory=shared_inputs_directory,
+            shared_entries=shared_entries
+        )
+    finally:
+        conn.close()
+
+
+def write_subproblem_stage_model_inputs(
+    inputs_directory, scenario_directory, loaded_modules, scenario_id,
+    subscenarios, subproblem, stage, conn, prior_entries,
+    shared_inputs_directory=None, shared_entries=None
+):
+    """
+    Write the model input .tab files of a subproblem and stage.
+
+    :param inputs_directory: the inputs directory of the subproblem and stage
+    :param scenario_directory: local scenario directory
+    :param loaded_modules: list of imported modules (Python <class 'module'>
+        objects)
+    :param scenario_id: the scenario ID
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param subproblem: the subproblem (or "" if there are no subproblems)
+    :param stage: the stage (or "" if there are no stages)
+    :param conn: database connection
+    :param prior_entries: list of the input manifest entries for the
+        modules from the last time inputs were written to this directory;
+        if None, all prior inputs are deleted and all modules write their
+        inputs
+    :param shared_inputs_directory: the first inputs directory of the
+        scenario, if already written; optional
+    :param shared_entries: list of the current input manifest entries for
+        the modules in the first inputs directory, if already written;
+        optional
+    :return: list of the input manifest entries for the modules
+
+    When prior entries are given, only the modules that need to (see
+    *get_modules_to_write*) write their inputs; the other modules' files
+    and manifest entries are kept. When the entries of the first inputs
+    directory are also given, the files of the modules whose inputs don't
+    depend on the subproblem and stage (see *get_modules_to_link*) are
+    linked from the first inputs directory instead of being written.
+    """
+    modules = [m for m in loaded_modules if hasattr(m, "write_model_inputs")]
+
+    modules_to_link = set()
+    if prior_entries is not None \
+            and [e["module"] for e in prior_entries] \
+            == [m.__name__ for m in modules]:
+        fingerprints = [
+            get_module_fingerprint(
+                module=m, scenario_id=scenario_id, subproblem=subproblem,
+                stage=stage,
+                subscenario_values=get_subscenario_values(
+                    subscenarios=subscenarios,
+                    used_subscenarios=e["subscenarios"].keys()
+                )
+            )
+            for m, e in zip(modules, prior_entries)
+        ]
+        modules_to_write, files_to_delete = get_modules_to_write(
+            prior_entries=prior_entries, modules=modules,
+            fingerprints=fingerprints, inputs_directory=inputs_directory
+        )
+        if shared_entries is not None:
+            modules_to_link = get_modules_to_link(
+                prior_entries=prior_entries, modules=modules,
+                modules_to_write=modules_to_write,
+                shared_entries=shared_entries
+            )
+        for f in files_to_delete:
+            os.remove(os.path.join(inputs_directory, f))
+        # Files that are written (rather than linked) must not be hard
+        # links to other directories' files
+        if modules_to_write - modules_to_link:
+            break_hard_links(directory=inputs_directory)
+    else:
+        prior_entries = [None] * len(modules)
+        modules_to_write = set(m.__name__ for m in modules)
+        delete_prior_inputs(inputs_directory=inputs_directory)
+
+    entries = list()
+    for m, prior_entry in zip(modules, prior_entries):
+        if m.__name__ in modules_to_link:
+            # The module's inputs are the same as in the first inputs
+            # directory, so we link its files (modules in the same group
+            # share files, so they may already be linked)
+            shared_entry = [
+                e for e in shared_entries if e["module"] == m.__name__
+            ][0]
+            for f in shared_entry["files"]:
+                if not os.path.exists(os.path.join(inputs_directory, f)):
+                    link_file(os.path.join(shared_inputs_directory, f),
+                              os.path.join(inputs_directory, f))
+            entries.append(dict(
+                shared_entry,
+                fingerprint=get_module_fingerprint(
+                    module=m, scenario_id=scenario_id,
+                    subproblem=subproblem, stage=stage,
+                    subscenario_values=shared_entry["subscenarios"]
+                )
+            ))
+        elif m.__name__ in modules_to_write:
+            # Record which subscenarios the module uses and which files it
+            # writes
+            subscenarios_recorder = SubScenariosRecorder(subscenarios)
+            files_before = snapshot_directory(inputs_directory)
+            m.write_model_inputs(
+                scenario_directory=scenario_directory,
+                scenario_id=scenario_id,
+                subscenarios=subscenarios_recorder,
+                subproblem=subproblem,
+                stage=stage,
+                conn=conn,
+            )
+            files_after = snapshot_directory(inputs_directory)
+
+            subscenario_values = get_subscenario_values(
+                subscenarios=subscenarios,
+                used_subscenarios=subscenarios_recorder.used_subscenarios
+            )
+            entries.append({
+                "module": m.__name__,
+                "subscenarios": subscenario_values,
+                "fingerprint": get_module_fingerprint(
+                    module=m, scenario_id=scenario_id,
+                    subproblem=subproblem, stage=stage,
+                    subscenario_values=subscenario_values
+                ),
+                "files": sorted(
+                    f for f in files_after.keys()
+                    if files_before.get(f) != files_after[f]
+                )
+            })
+        else:
+            entries.append(prior_entry)
+
+    return entries
 
 
 def delete_prior_aux_files(scenario_directory):
@@ -142,7 +415,8 @@ def parse_arguments(args):
     """
     parser = ArgumentParser(
         add_help=True,
-        parents=[get_db_parser(), get_required_e2e_arguments_parser()]
+        parents=[get_db_parser(), get_required_e2e_arguments_parser(),
+                 get_inputs_parser()]
     )
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
@@ -291,6 +565,10 @@ def main(args=None):
     if not parsed_arguments.quiet:
         print("Getting inputs... (connected to database {})".format(db_path))
 
+    # Databases created before tables used to get the inputs were added to
+    # the schema must be migrated first (see db.utilities.update_schema)
+    check_database_schema(conn=conn)
+
     scenario_id, scenario_name = get_scenario_id_and_name(
         scenario_id_arg=scenario_id_arg,
         scenario_name_arg=scenario_name_arg,
@@ -337,7 +615,10 @@ def main(args=None):
         loaded_modules=loaded_modules,
         scenario_id=scenario_id,
         subscenarios=subscenarios,
-        conn=conn)
+        conn=conn,
+        incremental=parsed_arguments.incremental,
+        n_parallel=parsed_arguments.n_parallel_get_inputs,
+        db_path=db_path)
 
     # Save the list of optional features to a file (will be used to determine
     # modules without database connection)
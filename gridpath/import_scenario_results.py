@@ -29,18 +29,24 @@ import os.path
 import pandas as pd
 import sys
 
-from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from gridpath.auxiliary.db_interface import get_scenario_id_and_name, \
+    update_results_version
 from gridpath.common_functions import determine_scenario_directory, \
     get_db_parser, get_required_e2e_arguments_parser
-from db.common_functions import connect_to_database, spin_on_database_lock
+from db.common_functions import connect_to_database, \
+    spin_on_database_lock, single_transaction
 from db.utilities.scenario import delete_scenario_results
+from db.utilities.update_schema import check_database_schema
 from gridpath.auxiliary.module_list import determine_modules, load_modules
+from gridpath.auxiliary.profiler import PROFILE_FILENAME, \
+    import_profile_into_database
+from gridpath.auxiliary.results_store import parquet_results
 from gridpath.auxiliary.scenario_chars import SubProblems
 
 
 def import_results_into_database(
         loaded_modules, scenario_id, subproblems, cursor, db,
-        scenario_directory, quiet
+        scenario_directory, quiet, subproblem_id=None, stage_id=None
 ):
     """
 
@@ -51,13 +57,20 @@ def import_results_into_database(
     :param db:
     :param scenario_directory:
     :param quiet: boolean
+    :param subproblem_id: only import the results of this subproblem if
+        specified
+    :param stage_id: only import the results of this stage if specified
     :return:
     """
 
     subproblems_list = subproblems.SUBPROBLEMS
     for subproblem in subproblems_list:
+        if subproblem_id is not None and subproblem != subproblem_id:
+            continue
         stages = subproblems.SUBPROBLEM_STAGE_DICT[subproblem]
         for stage in stages:
+            if stage_id is not None and stage != stage_id:
+                continue
             # if there are subproblems/stages, input directory will be nested
             if len(subproblems_list) > 1 and len(stages) > 1:
                 results_directory = os.path.join(scenario_directory,
@@ -87,70 +100,96 @@ def import_results_into_database(
             if not os.path.exists(results_directory):
                 os.makedirs(results_directory)
 
-            # Import results_scenario data
-            c = db.cursor()
-            with open(os.path.join(results_directory, "solver_status.txt"),
-                      "r") as f:
-                solver_status = f.read()
-
-
-            solver_status_sql = """
-                INSERT INTO results_scenario
-                (scenario_id, subproblem_id, stage_id, 
-                solver_termination_condition)
-                VALUES (?, ?, ?, ?)
-            ;"""
-            solver_status_data = \
-                (scenario_id, subproblem, stage, solver_status)
-            spin_on_database_lock(
-                conn=db, cursor=c, sql=solver_status_sql,
-                data=solver_status_data, many=False
-            )
-
-            # Only import other results if solver status was "optimal"
-            # If there's no solution, variables remain uninitialized,
-            # throwing an error at some point during results-export,
-            # so we don't attempt importing missing results into the database
-            if solver_status == "optimal":
-                # TODO: implement this in a separate commit
-                # # Import the objective function value
-                # with open(os.path.join(results_directory,
-                #                        "objective_function_value.txt"),
-                #           "r") as f:
-                #     objective_function = f.read()
-                #
-                # obj_sql = """
-                #     UPDATE results_scenario
-                #     SET objective_function_value = ?
-                #     WHERE scenario_id = ?
-                #     AND subproblem_id = ?
-                #     AND stage_id = ?
-                # ;"""
-                #
-                # obj_data = \
-                #     (objective_function, scenario_id, subproblem,  stage)
-                # spin_on_database_lock(
-                #     conn=db, cursor=c, sql=obj_sql,
-                #     data=obj_data, many=False
-                # )
-
-                for m in loaded_modules:
-                    if hasattr(m, "import_results_into_database"):
-                        m.import_results_into_database(
-                            scenario_id=scenario_id,
-                            subproblem=subproblem,
-                            stage=stage,
-                            c=cursor,
-                            db=db,
-                            results_directory=results_directory,
-                            quiet=quiet
-                        )
-                    else:
-                        pass
-            else:
-                if not quiet:
-                    print("Subproblem {}, stage {} was not optimal. Results "
-                          "not imported".format(subproblem, stage))
+            # Each subproblem/stage is imported in its own transaction
+            # rather than committing after each statement; if the import
+            # fails, no partial results of the subproblem/stage are left
+            # behind, and the results of the subproblems/stages imported
+            # before are kept
+            with single_transaction(db) as transaction_conn:
+                # Import results_scenario data
+                c = transaction_conn.cursor()
+                with open(os.path.join(results_directory,
+                                       "solver_status.txt"), "r") as f:
+                    solver_status = f.read()
+
+
+                solver_status_sql = """
+                    INSERT INTO results_scenario
+                    (scenario_id, subproblem_id, stage_id, 
+                    solver_termination_condition)
+                    VALUES (?, ?, ?, ?)
+                ;"""
+                solver_status_data = \
+                    (scenario_id, subproblem, stage, solver_status)
+                spin_on_database_lock(
+                    conn=transaction_conn, cursor=c, sql=solver_status_sql,
+                    data=solver_status_data, many=False
+                )
+
+                # Import the profile if the scenario was run with profiling
+                if os.path.exists(
+                        os.path.join(results_directory, PROFILE_FILENAME)
+                ):
+                    import_profile_into_database(
+                        scenario_id=scenario_id,
+                        subproblem=subproblem,
+                        stage=stage,
+                        db=transaction_conn,
+                        results_directory=results_directory
+                    )
+
+                # Only import other results if solver status was "optimal"
+                # If there's no solution, variables remain uninitialized,
+                # throwing an error at some point during results-export,
+                # so we don't attempt importing missing results into the
+                # database
+                if solver_status == "optimal":
+                    # TODO: implement this in a separate commit
+                    # # Import the objective function value
+                    # with open(os.path.join(results_directory,
+                    #                        "objective_function_value.txt"),
+                    #           "r") as f:
+                    #     objective_function = f.read()
+                    #
+                    # obj_sql = """
+                    #     UPDATE results_scenario
+                    #     SET objective_function_value = ?
+                    #     WHERE scenario_id = ?
+                    #     AND subproblem_id = ?
+                    #     AND stage_id = ?
+                    # ;"""
+                    #
+                    # obj_data = \
+                    #     (objective_function, scenario_id, subproblem,  stage)
+                    # spin_on_database_lock(
+                    #     conn=transaction_conn, cursor=c, sql=obj_sql,
+                    #     data=obj_data, many=False
+                    # )
+
+                    # If the results were written to Parquet, the modules
+                    # read them from the subproblem's and stage's partitions
+                    with parquet_results(
+                        scenario_directory, subproblem, stage,
+                        results_directory
+                    ):
+                        for m in loaded_modules:
+                            if hasattr(m, "import_results_into_database"):
+                                m.import_results_into_database(
+                                    scenario_id=scenario_id,
+                                    subproblem=subproblem,
+                                    stage=stage,
+                                    c=cursor,
+                                    db=transaction_conn,
+                                    results_directory=results_directory,
+                                    quiet=quiet
+                                )
+                            else:
+                                pass
+                else:
+                    if not quiet:
+                        print("Subproblem {}, stage {} was not optimal. "
+                              "Results not imported".format(subproblem,
+                                                            stage))
 
 
 def parse_arguments(args):
@@ -167,6 +206,14 @@ def parse_arguments(args):
         add_help=True,
         parents=[get_db_parser(), get_required_e2e_arguments_parser()]
     )
+    parser.add_argument("--subproblem", type=int,
+                        help="Only (re-)import the results of this "
+                             "subproblem; the scenario's other results are "
+                             "kept. Defaults to all subproblems.")
+    parser.add_argument("--stage", type=int,
+                        help="Only (re-)import the results of this stage; "
+                             "the scenario's other results are kept. "
+                             "Defaults to all stages.")
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
     return parsed_arguments
@@ -194,6 +241,10 @@ def main(args=None):
     if not parsed_arguments.quiet:
         print("Importing results... (connected to database {})".format(db_path))
 
+    # Databases created before tables used to import the results were added
+    # to the schema must be migrated first (see db.utilities.update_schema)
+    check_database_schema(conn=conn)
+
     scenario_id, scenario_name = get_scenario_id_and_name(
         scenario_id_arg=scenario_id_arg, scenario_name_arg=scenario_name_arg,
         c=c, script="import_scenario_results")
@@ -215,11 +266,17 @@ def main(args=None):
     if scenario_id_saved != scenario_id:
         raise AssertionError("ERROR: saved scenario_id does not match")
 
-    # Delete all previous results for this scenario_id
+    # Delete all previous results for this scenario_id (or only those of
+    # the subproblem/stage to import if specified)
     # Each module also makes sure results are deleted, but this step ensures
     # that if a scenario_id was run with different modules before, we also
     # delete previously imported "phantom" results
-    delete_scenario_results(conn=conn, scenario_id=scenario_id)
+    # This also deletes the record of which subproblems/stages have been
+    # processed, so process_results will (re-)process the imported ones
+    delete_scenario_results(
+        conn=conn, scenario_id=scenario_id,
+        subproblem=parsed_arguments.subproblem, stage=parsed_arguments.stage
+    )
 
     # Go through modules
     modules_to_use = determine_modules(scenario_directory=scenario_directory)
@@ -233,9 +290,14 @@ def main(args=None):
         cursor=c,
         db=conn,
         scenario_directory=scenario_directory,
-        quiet=quiet
+        quiet=quiet,
+        subproblem_id=parsed_arguments.subproblem,
+        stage_id=parsed_arguments.stage
     )
 
+    # The scenario's results have changed
+    update_results_version(conn=conn, scenario_id=scenario_id)
+
     # Close the database connection
     conn.close()
 
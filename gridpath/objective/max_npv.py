@@ -41,8 +41,6 @@ All revenue and costs are in net present value terms, with a user-specified
 discount factor applied depending on the period.
 """
 
-import csv
-import pandas as pd
 import sqlite3
 import numpy as np
 import os
@@ -54,6 +52,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import cost_components, \
     revenue_components
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_store import read_results_csv, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -109,15 +108,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     Nothing
     """
-    with open(
-            os.path.join(
-                scenario_directory, str(subproblem), str(stage), "results",
-                "npv.csv"
-            ),
-            "w",
-            newline=""
-    ) as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "npv.csv"
+    )) as writer:
         components = \
             getattr(d, revenue_components) + getattr(d, cost_components)
         writer.writerow(components)
@@ -149,7 +143,7 @@ def import_results_into_database(
         scenario_id=scenario_id, subproblem=subproblem, stage=stage
     )
 
-    df = pd.read_csv(os.path.join(results_directory, "npv.csv"))
+    df = read_results_csv(os.path.join(results_directory, "npv.csv"))
     df['scenario_id'] = scenario_id
     df['subproblem_id'] = subproblem
     df['stage_id'] = stage
@@ -17,6 +17,13 @@ This script iterates over all modules required for a GridPath scenario and
 calls their *process_results()* method, which makes updates to database
 tables.
 
+Results are processed incrementally: each module only processes the
+subproblems and stages that have been imported since it last processed the
+scenario's results (see the results_scenario_processed table), so
+re-running the script after importing the results of a single subproblem
+or stage only processes that subproblem/stage, and re-running it without
+importing new results does nothing.
+
 The main() function of this script can also be called with the
 *gridpath_process_results* command when GridPath is installed.
 """
@@ -25,18 +32,30 @@ The main() function of this script can also be called with the
 from __future__ import print_function
 
 from argparse import ArgumentParser
+import importlib
+from multiprocessing import Pool
 import sys
 
 from db.common_functions import connect_to_database
+from db.utilities.update_schema import check_database_schema
 from gridpath.common_functions import determine_scenario_directory, \
-    get_db_parser, get_required_e2e_arguments_parser
-from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+    get_db_parser, get_required_e2e_arguments_parser, \
+    get_process_results_parser
+from gridpath.auxiliary.db_interface import get_scenario_id_and_name, \
+    update_results_version, get_subproblem_stages_to_process, \
+    record_processed_subproblem_stages
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import SubScenarios
 
+# The timepoints module adds the spinup_or_lookahead flags to the results
+# tables, which the other modules use when aggregating results, so its
+# results are processed before those of the other modules
+PROCESS_FIRST_MODULES = ["gridpath.temporal.operations.timepoints"]
+
 
 def process_results(
-        loaded_modules, db, cursor, scenario_id, subscenarios, quiet
+        loaded_modules, db, cursor, scenario_id, subscenarios, quiet,
+        n_parallel=1, db_path=None
 ):
     """
     
@@ -45,15 +64,120 @@ def process_results(
     :param cursor: 
     :param subscenarios:
     :param quiet:
-    :return: 
+    :param n_parallel: the number of modules whose results to process in
+        parallel
+    :param db_path: the path to the database; required if n_parallel is
+        more than 1
+    :return: True if any results were processed
+
+    Each module only processes the subproblems and stages whose results it
+    hasn't processed yet. Other than the PROCESS_FIRST_MODULES, the modules
+    process their results independently of each other, so if more than one
+    parallel process is requested, they are processed in a pool of
+    processes, each with its own database connection. The database is
+    switched to WAL mode first, so that the modules' queries aren't blocked
+    by the other processes writing to the database; SQLite still only
+    allows one writer at a time.
     """
+    modules_to_process = list()
     for m in loaded_modules:
         if hasattr(m, "process_results"):
-            m.process_results(
-                db, cursor, scenario_id, subscenarios, quiet)
+            subproblem_stages = get_subproblem_stages_to_process(
+                conn=db, scenario_id=scenario_id, gridpath_module=m.__name__
+            )
+            if subproblem_stages:
+                modules_to_process.append((m, subproblem_stages))
+            elif not quiet:
+                print("{}: no new results to process".format(m.__name__))
         else:
             pass
 
+    other_modules = list()
+    for m, subproblem_stages in modules_to_process:
+        if m.__name__ in PROCESS_FIRST_MODULES:
+            process_module_results(
+                module=m, db=db, cursor=cursor, scenario_id=scenario_id,
+                subscenarios=subscenarios, quiet=quiet,
+                subproblem_stages=subproblem_stages
+            )
+        else:
+            other_modules.append((m, subproblem_stages))
+
+    if n_parallel > 1 and len(other_modules) > 1:
+        db.execute("PRAGMA journal_mode=WAL;")
+
+        pool_args = [
+            (db_path, m.__name__, scenario_id, subscenarios, quiet,
+             subproblem_stages)
+            for m, subproblem_stages in other_modules
+        ]
+        with Pool(processes=min(n_parallel, len(other_modules))) as pool:
+            pool.starmap(process_module_results_in_worker, pool_args)
+    else:
+        for m, subproblem_stages in other_modules:
+            process_module_results(
+                module=m, db=db, cursor=cursor, scenario_id=scenario_id,
+                subscenarios=subscenarios, quiet=quiet,
+                subproblem_stages=subproblem_stages
+            )
+
+    return len(modules_to_process) > 0
+
+
+def process_module_results_in_worker(
+    db_path, module_name, scenario_id, subscenarios, quiet, subproblem_stages
+):
+    """
+    :param db_path: the path to the database
+    :param module_name: the name of the module
+
+    Process a module's results in a worker process (see *process_results*).
+    Loaded modules and database connections can't be passed to other
+    processes, so the worker imports the module by name and opens its own
+    database connection. The connection waits longer for the database to be
+    unlocked than the default, as the other workers may be writing to it.
+    See *process_module_results* for the other parameters.
+    """
+    conn = connect_to_database(db_path=db_path, timeout=60)
+    try:
+        process_module_results(
+            module=importlib.import_module(module_name),
+            db=conn,
+            cursor=conn.cursor(),
+            scenario_id=scenario_id,
+            subscenarios=subscenarios,
+            quiet=quiet,
+            subproblem_stages=subproblem_stages
+        )
+    finally:
+        conn.close()
+
+
+def process_module_results(
+    module, db, cursor, scenario_id, subscenarios, quiet, subproblem_stages
+):
+    """
+    :param module: the loaded module
+    :param db:
+    :param cursor:
+    :param scenario_id:
+    :param subscenarios:
+    :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
+
+    Process the module's results for the subproblems and stages and record
+    that they have been processed. If processing fails, the subproblems and
+    stages aren't recorded and will be processed again on the next run.
+    """
+    module.process_results(
+        db, cursor, scenario_id, subscenarios, quiet, subproblem_stages
+    )
+    record_processed_subproblem_stages(
+        conn=db, scenario_id=scenario_id, gridpath_module=module.__name__,
+        subproblem_stages=subproblem_stages
+    )
+
 
 def parse_arguments(args):
     """
@@ -65,7 +189,8 @@ def parse_arguments(args):
     """
     parser = ArgumentParser(
         add_help=True,
-        parents=[get_db_parser(), get_required_e2e_arguments_parser()]
+        parents=[get_db_parser(), get_required_e2e_arguments_parser(),
+                 get_process_results_parser()]
     )
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
@@ -93,6 +218,11 @@ def main(args=None):
     if not parsed_arguments.quiet:
         print("Processing results... (connected to database {})".format(db_path))
 
+    # Databases created before tables used to process the results were added
+    # to or changed in the schema must be migrated first (see
+    # db.utilities.update_schema)
+    check_database_schema(conn=conn)
+
     scenario_id, scenario_name = get_scenario_id_and_name(
         scenario_id_arg=scenario_id_arg, scenario_name_arg=scenario_name_arg,
         c=c, script="process_results"
@@ -111,12 +241,18 @@ def main(args=None):
     # Subscenarios
     subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
 
-    process_results(
+    processed = process_results(
         loaded_modules=loaded_modules, db=conn, cursor=c,
         scenario_id=scenario_id, subscenarios=subscenarios,
-        quiet=parsed_arguments.quiet
+        quiet=parsed_arguments.quiet,
+        n_parallel=parsed_arguments.n_parallel_process_results,
+        db_path=db_path
     )
 
+    # The scenario's results have changed
+    if processed:
+        update_results_version(conn=conn, scenario_id=scenario_id)
+
     # Close the database connection
     conn.close()
 
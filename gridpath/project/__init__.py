@@ -20,10 +20,10 @@ and demand-side infrastructure 'projects' in the optimization problem.
 
 import csv
 import os.path
-import pandas as pd
 from pyomo.environ import Set, Param, Any
 
 from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_dtypes, get_expected_dtypes, validate_values, validate_columns, \
     validate_missing_inputs
@@ -150,7 +150,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     )
 
     # Technology column is optional (default param value is 'unspecified')
-    header = pd.read_csv(
+    header = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t", header=None, nrows=1
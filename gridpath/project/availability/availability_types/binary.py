@@ -29,6 +29,7 @@ from pyomo.environ import Param, Set, Var, Constraint, Binary, value, \
     NonNegativeReals
 
 from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.results_store import results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, validate_dtypes, validate_missing_inputs, \
     validate_column_monotonicity
@@ -382,10 +383,10 @@ def export_module_specific_results(
     :return: Nothing
     """
 
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "project_availability_endogenous_binary.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "project_availability_endogenous_binary.csv"
+    )) as writer:
         writer.writerow(["project", "period", "subproblem_id", "stage_id",
                          "availability_type", "timepoint",
                          "timepoint_weight", "number_of_hours_in_timepoint",
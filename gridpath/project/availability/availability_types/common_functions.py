@@ -12,19 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import csv
 import os.path
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.results_store import results_reader
 
 
 def insert_availability_results(
      db, c, results_directory, scenario_id, results_file
 ):
     results = []
-    with open(os.path.join(results_directory, results_file), "r") as \
-            capacity_file:
-        reader = csv.reader(capacity_file)
+    with results_reader(os.path.join(
+            results_directory, results_file
+    )) as reader:
         header = next(reader)
 
         for row in reader:
@@ -27,6 +27,8 @@ import os.path
 from pyomo.environ import Param, Set, PercentFraction
 
 from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.db_interface import \
+    update_project_operational_timepoints
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, validate_dtypes, validate_values, \
     validate_missing_inputs
@@ -160,6 +162,12 @@ def get_inputs_from_database(
     subproblem = 1 if subproblem == "" else subproblem
     stage = 1 if stage == "" else stage
 
+    # Make sure the project-timepoints for this scenario's subscenarios are
+    # materialized
+    update_project_operational_timepoints(
+        conn=conn, subscenarios=subscenarios
+    )
+
     sql = """
         SELECT project, timepoint, availability_derate
         -- Select only projects, periods, timepoints from the relevant 
@@ -167,12 +175,12 @@ def get_inputs_from_database(
         -- and temporal scenario id
         FROM 
             (SELECT project, stage_id, timepoint
-            FROM project_operational_timepoints
-            WHERE project_portfolio_scenario_id = {}
-            AND project_operational_chars_scenario_id = {}
-            AND temporal_scenario_id = {}
-            AND (project_specified_capacity_scenario_id = {}
-                 OR project_new_cost_scenario_id = {})
+            FROM project_operational_timepoints_materialized
+            WHERE project_portfolio_scenario_id IS {}
+            AND project_operational_chars_scenario_id IS {}
+            AND project_specified_capacity_scenario_id IS {}
+            AND project_new_cost_scenario_id IS {}
+            AND temporal_scenario_id IS {}
             AND subproblem_id = {}
             AND stage_id = {}
             ) as projects_periods_timepoints_tbl
@@ -201,9 +209,9 @@ def get_inputs_from_database(
     """.format(
         subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
         subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
-        subscenarios.TEMPORAL_SCENARIO_ID,
         subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
         subscenarios.PROJECT_NEW_COST_SCENARIO_ID,
+        subscenarios.TEMPORAL_SCENARIO_ID,
         subproblem,
         stage,
         subscenarios.PROJECT_AVAILABILITY_SCENARIO_ID,
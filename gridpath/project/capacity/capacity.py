@@ -21,13 +21,12 @@ project capacity can then be used to constrain operations, contribute to
 reliability constraints, etc.
 """
 
-import csv
 import os.path
-import pandas as pd
 from pyomo.environ import Set, Expression, value
 
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file, \
-    join_sets
+    join_sets, get_set_index_by_position
+from gridpath.auxiliary.results_store import read_results_csv, results_writer
 from gridpath.project.capacity.common_functions import \
     load_gen_storage_capacity_type_modules
 from gridpath.auxiliary.dynamic_components import \
@@ -153,11 +152,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.OPR_PRDS_BY_PRJ = Set(
         m.PROJECTS,
-        initialize=lambda mod, project:
-        operational_periods_by_project(
-            prj=project,
-            project_operational_periods=mod.PRJ_OPR_PRDS
-        )
+        initialize=lambda mod, project: sorted(get_set_index_by_position(
+            mod=mod, set_name="PRJ_OPR_PRDS", key_position=0,
+            value_position=1
+        ).get(project, []))
     )
 
     m.PRJ_OPR_TMPS = Set(
@@ -208,20 +206,15 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 # Set Rules
 ###############################################################################
 
-# TODO: the creation of the OPR_PRJS_IN_TMPS is by far
-#  the most time-consuming step in instantiating the problem; is there
-#  any way to speed it up? It is perhaps inefficient to iterate over all
-#  (g, t) for every timepoint, but how do we get around having to do that?
-#  Also, this is a more general problem with all the indexed sets,
-#  but the larger timepoints-based sets are more of a problem
 def op_gens_by_tmp(mod, tmp):
     """
-    Figure out which generators are operational in each timepoins.
+    Figure out which generators are operational in each timepoint. The
+    timepoint-to-projects index of PRJ_OPR_TMPS is built only once (on the
+    first call), so we don't iterate over all (g, t) for every timepoint.
     """
-    gens = list(
-        g for (g, t) in mod.PRJ_OPR_TMPS if t == tmp
-    )
-    return gens
+    return get_set_index_by_position(
+        mod=mod, set_name="PRJ_OPR_TMPS", key_position=1, value_position=0
+    ).get(tmp, [])
 
 
 def operational_periods_by_project(prj, project_operational_periods):
@@ -270,9 +263,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     """
 
     # Total capacity for all projects
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_all.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "capacity_all.csv"
+    )) as writer:
         writer.writerow(["project", "period",
                          "capacity_type", "technology", "load_zone",
                          "capacity_mw", "capacity_mwh"])
@@ -333,7 +327,7 @@ def summarize_results(scenario_directory, subproblem, stage):
         )
 
     # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
+    capacity_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage), "results",
                      "capacity_all.csv")
     )
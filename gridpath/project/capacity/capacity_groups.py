@@ -24,6 +24,8 @@ from pyomo.environ import Set, Param, Constraint, NonNegativeReals, \
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.results_store import results_file_exists, \
+    results_reader, results_writer
 from gridpath.project.capacity.common_functions import \
     load_gen_storage_capacity_type_modules
 from gridpath.auxiliary.db_interface import setup_results_import
@@ -312,11 +314,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     )
 
     if os.path.exists(req_file) and os.path.exists(prj_file):
-        with open(os.path.join(
+        with results_writer(os.path.join(
                 scenario_directory, str(subproblem), str(stage), "results",
                 "capacity_groups.csv"
-        ), "w", newline="") as f:
-            writer = csv.writer(f)
+        )) as writer:
             writer.writerow(
                 ["capacity_group", "period",
                  "new_capacity", "total_capacity",
@@ -426,7 +427,7 @@ def import_results_into_database(
 ):
     # Import only if a results-file was exported
     results_file = os.path.join(results_directory, "capacity_groups.csv")
-    if os.path.exists(results_file):
+    if results_file_exists(results_file):
         if not quiet:
             print("group capacity")
 
@@ -439,9 +440,7 @@ def import_results_into_database(
 
         # Load results into the temporary table
         results = []
-        with open(results_file, "r") as f:
-            reader = csv.reader(f)
-
+        with results_reader(results_file) as reader:
             next(reader)  # skip header
             for row in reader:
                 results.append(
@@ -18,10 +18,10 @@ describe the various ways in which project capacity can be treated in the
 optimization problem, e.g. as specified, available to be built, available to
 be retired, etc.
 """
-import csv
 import os.path
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.results_store import results_reader
 from gridpath.project.capacity.common_functions import \
     load_gen_storage_capacity_type_modules
 from gridpath.auxiliary.db_interface import \
@@ -113,10 +113,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "capacity_all.csv"), "r") as \
-            capacity_file:
-        reader = csv.reader(capacity_file)
-
+    with results_reader(os.path.join(
+            results_directory, "capacity_all.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
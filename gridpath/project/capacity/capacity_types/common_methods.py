@@ -12,11 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import csv
 import os.path
 
-from db.common_functions import spin_on_database_lock
-from gridpath.project.common_functions import get_column_row_value
+from gridpath.auxiliary.db_interface import \
+    update_results_from_staging_table
+from gridpath.auxiliary.results_store import results_reader
 
 
 # TODO: if vintage is 2020 and lifetime is 30, is the project available in
@@ -89,43 +89,36 @@ def project_vintages_operational_in_period(
 def update_capacity_results_table(
      db, c, results_directory, scenario_id, subproblem, stage, results_file
 ):
-    results = []
-    with open(os.path.join(results_directory, results_file), "r") as \
-            capacity_file:
-        reader = csv.reader(capacity_file)
+    """
+    Update the results_project_capacity table with the capacity type's
+    module-specific results in bulk (see *update_dispatch_results_table*
+    in *gridpath.project.operations.operational_types.common_functions*).
+    """
+    update_columns = ["new_build_mw", "new_build_mwh", "new_build_binary",
+                      "retired_mw", "retired_binary"]
 
+    results = []
+    with results_reader(os.path.join(
+            results_directory, results_file
+    )) as reader:
         header = next(reader)
+        column_indices = [
+            header.index(column) if column in header else None
+            for column in update_columns
+        ]
 
         for row in reader:
-            project = row[0]
-            period = row[1]
-            new_build_mw = get_column_row_value(header, "new_build_mw", row)
-            new_build_mwh = get_column_row_value(header, "new_build_mwh", row)
-            new_build_binary = get_column_row_value(header,
-                                                    "new_build_binary", row)
-            retired_mw = get_column_row_value(header, "retired_mw", row)
-            retired_binary = get_column_row_value(header, "retired_binary",
-                                                  row)
-
+            # project and period are in the first and second columns
             results.append(
-                (new_build_mw, new_build_mwh, new_build_binary,
-                 retired_mw, retired_binary,
-                 scenario_id, project, period, subproblem, stage)
+                (scenario_id, row[0], row[1], subproblem, stage)
+                + tuple(None if i is None else row[i]
+                        for i in column_indices)
             )
 
-    # Update the results table with the module-specific results
-    update_sql = """
-        UPDATE results_project_capacity
-        SET new_build_mw = ?,
-        new_build_mwh = ?,
-        new_build_binary = ?,
-        retired_mw = ?,
-        retired_binary = ?
-        WHERE scenario_id = ?
-        AND project = ?
-        AND period = ?
-        AND subproblem_id = ?
-        AND stage_id = ?;
-        """
-
-    spin_on_database_lock(conn=db, cursor=c, sql=update_sql, data=results)
+    update_results_from_staging_table(
+        conn=db, cursor=c, table="results_project_capacity",
+        key_columns=["scenario_id", "project", "period", "subproblem_id",
+                     "stage_id"],
+        update_columns=update_columns,
+        rows=results
+    )
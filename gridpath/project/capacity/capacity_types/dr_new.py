@@ -46,6 +46,9 @@ from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets, \
     storage_only_capacity_type_operational_period_sets
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import read_results_csv, \
+    results_reader, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_missing_inputs, validate_idxs, get_projects
 
@@ -362,7 +365,7 @@ def load_module_specific_data(
         projects = list()
         max_fraction = dict()
 
-        df = pd.read_csv(
+        df = read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
             sep="\t",
@@ -415,9 +418,10 @@ def export_module_specific_results(
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_dr_new.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "capacity_dr_new.csv"
+    )) as writer:
         writer.writerow(["project", "period", "technology", "load_zone",
                          "new_build_mw", "new_build_mwh"])
         for (prj, p) in m.DR_NEW_OPR_PRDS:
@@ -444,7 +448,7 @@ def summarize_module_specific_results(
     """
 
     # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
+    capacity_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "results", "capacity_dr_new.csv")
     )
@@ -656,10 +660,9 @@ def import_module_specific_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "capacity_dr_new.csv"),
-              "r") as capacity_file:
-        reader = csv.reader(capacity_file)
-
+    with results_reader(os.path.join(
+            results_directory, "capacity_dr_new.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
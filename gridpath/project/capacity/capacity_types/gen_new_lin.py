@@ -42,6 +42,7 @@ from pyomo.environ import Set, Param, Var, Expression, NonNegativeReals, \
 from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets
+from gridpath.auxiliary.results_store import read_results_csv, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_values, get_expected_dtypes, get_projects, validate_dtypes, \
     validate_idxs, validate_row_monotonicity, validate_column_monotonicity
@@ -532,10 +533,10 @@ def export_module_specific_results(
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_gen_new_lin.csv"), "w", newline="") as f:
-
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "capacity_gen_new_lin.csv"
+    )) as writer:
         writer.writerow(["project", "vintage", "technology", "load_zone",
                          "new_build_mw"])
         for (prj, p) in m.GEN_NEW_LIN_VNTS:
@@ -561,7 +562,7 @@ def summarize_module_specific_results(
     """
 
     # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
+    capacity_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "results", "capacity_gen_new_lin.csv")
     )
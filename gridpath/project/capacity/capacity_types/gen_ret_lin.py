@@ -36,9 +36,12 @@ import pandas as pd
 from pyomo.environ import Set, Param, Var, Constraint, Expression, \
     NonNegativeReals, value
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, \
+    get_set_index_by_position
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import read_results_csv, results_writer
 from gridpath.auxiliary.validations import get_projects, get_expected_dtypes, \
     write_validation_to_database, validate_dtypes, validate_values, \
     validate_idxs, validate_row_monotonicity, validate_missing_inputs
@@ -132,10 +135,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.OPR_PRDS_BY_GEN_RET_LIN = Set(
         m.GEN_RET_LIN,
-        initialize=lambda mod, prj: list(
-            set(period for (project, period) in mod.GEN_RET_LIN_OPR_PRDS
-                if project == prj)
-        )
+        initialize=lambda mod, prj: sorted(get_set_index_by_position(
+            mod=mod, set_name="GEN_RET_LIN_OPR_PRDS", key_position=0,
+            value_position=1
+        ).get(prj, []))
     )
 
     # Required Params
@@ -291,7 +294,7 @@ def load_module_specific_data(
     def determine_gen_ret_lin_projects():
         gen_ret_lin_projects = list()
 
-        df = pd.read_csv(
+        df = read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                          "projects.tab"),
             sep="\t",
@@ -361,10 +364,10 @@ def export_module_specific_results(
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_gen_ret_lin"
-                           ".csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "capacity_gen_ret_lin.csv"
+    )) as writer:
         writer.writerow(["project", "period", "technology", "load_zone",
                          "retired_mw"])
         for (prj, p) in m.GEN_RET_LIN_OPR_PRDS:
@@ -390,7 +393,7 @@ def summarize_module_specific_results(
     """
 
     # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
+    capacity_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage), "results",
                      "capacity_gen_ret_lin.csv")
     )
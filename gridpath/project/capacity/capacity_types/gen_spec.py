@@ -36,6 +36,7 @@ from pyomo.environ import Set, Param, NonNegativeReals
 from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.auxiliary.validations import get_projects, get_expected_dtypes, \
     write_validation_to_database, validate_dtypes, validate_values, \
     validate_idxs, validate_missing_inputs
@@ -160,7 +161,7 @@ def load_module_specific_data(
 
         gen_spec_projects = list()
 
-        df = pd.read_csv(
+        df = read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                          "projects.tab"),
             sep="\t",
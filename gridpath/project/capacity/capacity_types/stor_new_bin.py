@@ -40,6 +40,7 @@ from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets, \
     storage_only_capacity_type_operational_period_sets
+from gridpath.auxiliary.results_store import read_results_csv, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, get_projects, validate_dtypes, validate_values, \
     validate_idxs
@@ -426,9 +427,10 @@ def export_module_specific_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_stor_new_bin.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "capacity_stor_new_bin.csv"
+    )) as writer:
         writer.writerow(["project", "vintage", "technology", "load_zone",
                          "new_build_binary", "new_build_mw", "new_build_mwh"])
         for (prj, v) in m.STOR_NEW_BIN_VNTS:
@@ -458,7 +460,7 @@ def summarize_module_specific_results(
     """
 
     # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
+    capacity_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "results", "capacity_stor_new_bin.csv")
     )
@@ -41,6 +41,8 @@ from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets, \
     storage_only_capacity_type_operational_period_sets
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import read_results_csv, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_values, get_expected_dtypes, get_projects, validate_dtypes, \
     validate_idxs, validate_row_monotonicity, validate_column_monotonicity
@@ -679,7 +681,7 @@ def load_module_specific_data(
         stor_min_duration = dict()
         stor_max_duration = dict()
 
-        _df = pd.read_csv(
+        _df = read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
             sep="\t",
@@ -855,9 +857,10 @@ def export_module_specific_results(
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_stor_new_lin.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "capacity_stor_new_lin.csv"
+    )) as writer:
         writer.writerow(["project", "vintage", "technology", "load_zone",
                          "new_build_mw", "new_build_mwh"])
         for (prj, v) in m.STOR_NEW_LIN_VNTS:
@@ -884,7 +887,7 @@ def summarize_module_specific_results(
     """
 
     # Get the results CSV as dataframe
-    capacity_results_df = pd.read_csv(
+    capacity_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "results", "capacity_stor_new_lin.csv")
     )
@@ -23,15 +23,16 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
 from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.project.capacity.common_functions import \
     load_gen_storage_capacity_type_modules
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -106,10 +107,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     """
 
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "costs_capacity_all_projects.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "costs_capacity_all_projects.csv"
+    )) as writer:
         writer.writerow(
             ["project", "period", "hours_in_full_period",
              "hours_in_subproblem_period", "technology", "load_zone",
@@ -152,11 +153,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "costs_capacity_all_projects.csv"),
-              "r") as capacity_costs_file:
-        reader = csv.reader(capacity_costs_file)
-
+    with results_reader(os.path.join(
+            results_directory, "costs_capacity_all_projects.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -199,7 +198,9 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate capacity costs by load zone, and break out into
     spinup_or_lookahead.
@@ -207,8 +208,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate capacity costs by load zone")
 
@@ -216,17 +221,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_project_costs_capacity_agg 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Insert new results
     agg_sql = """
-        INSERT INTO results_project_costs_capacity_agg
-        (scenario_id, load_zone, period, subproblem_id, stage_id,
-        spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost)
-        
         SELECT scenario_id, load_zone, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem,
         (capacity_cost * fraction_of_hours_in_subproblem) AS capacity_cost
@@ -250,12 +252,17 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         (SELECT scenario_id, subproblem_id, stage_id, period, load_zone,
         SUM(capacity_cost) AS capacity_cost
         FROM results_project_costs_capacity
+        WHERE scenario_id = ?
+        AND {}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period, load_zone)
-        ;"""
+        ;""".format(subproblem_stage_filter)
 
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,),
-                          many=False)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_project_costs_capacity_agg",
+        columns="""scenario_id, load_zone, period, subproblem_id, stage_id,
+        spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost""",
+        sql=agg_sql, data=(scenario_id, scenario_id)
+    )
 
@@ -18,7 +18,8 @@
 
 import csv
 import os.path
-import pandas as pd
+
+from gridpath.auxiliary.input_file_cache import read_input_file
 
 
 # TODO: use this in capacity and operational type project subset
@@ -39,7 +40,7 @@ def determine_project_subset(
     project_subset = list()
 
     dynamic_components = \
-        pd.read_csv(
+        read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
             sep="\t", usecols=["project", column]
@@ -45,10 +45,13 @@ from pyomo.environ import Set, Param, Any, NonNegativeReals, Reals, \
 from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_values, get_expected_dtypes, validate_dtypes, \
     validate_piecewise_curves, validate_startup_shutdown_rate_inputs
 from gridpath.project.common_functions import append_to_input_file
+from gridpath.project.operations.operational_types.common_functions import \
+    df_to_index_list, df_to_param_dict
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -454,7 +457,7 @@ def record_dynamic_components(d, scenario_directory, subproblem, stage):
     'footroom_variables' dictionary.
     """
 
-    project_df = pd.read_csv(
+    project_df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "projects.tab"),
         sep="\t"
@@ -562,7 +565,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     )
 
     if os.path.exists(vom_curves_file):
-        periods = pd.read_csv(periods_file, sep="\t")
+        periods = read_input_file(periods_file, sep="\t")
         vom_df = pd.read_csv(vom_curves_file, sep="\t")
 
         periods = set(periods["period"])
@@ -591,22 +594,24 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     if os.path.exists(startup_chars_file):
         df = pd.read_csv(startup_chars_file, sep="\t")
 
+        startup_ramp_projects_types = list()
+        startup_cost_dict = dict()
+
         # Note: the rank function requires at least one numeric input in the
         # down_time_cutoff_hours column (can't be all NULL/None).
         if len(df) > 0:
             df["startup_type_id"] = df.groupby("project")[
                 "down_time_cutoff_hours"].rank()
 
-        startup_ramp_projects_types = list()
-        startup_cost_dict = dict()
-        for i, row in df.iterrows():
-            project = row["project"]
-            startup_type_id = row["startup_type_id"]
-            startup_cost = row["startup_cost_per_mw"]
-
-            startup_ramp_projects_types.append((project, startup_type_id))
-            startup_cost_dict[(project, startup_type_id)] = \
-                float(startup_cost)
+            index_columns = ["project", "startup_type_id"]
+            startup_ramp_projects_types = df_to_index_list(
+                df=df, index_columns=index_columns
+            )
+            startup_cost_dict = df_to_param_dict(
+                df=df, index_columns=index_columns,
+                column_name="startup_cost_per_mw", cast_as_type=float,
+                missing_value=None
+            )
 
         data_portal.data()["STARTUP_BY_ST_PRJS_TYPES"] = \
             {None: startup_ramp_projects_types}
@@ -628,14 +633,14 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
 
     # Get column names as a few columns will be optional;
     # won't load data if fuel column does not exist
-    headers = pd.read_csv(projects_file, nrows=0, sep="\t").columns
+    headers = read_input_file(projects_file, nrows=0, sep="\t").columns
     if os.path.exists(hr_curves_file) and "fuel" in headers:
 
         hr_df = pd.read_csv(hr_curves_file, sep="\t")
         projects = set(hr_df["project"].unique())
         
-        periods_df = pd.read_csv(periods_file, sep="\t")
-        pr_df = pd.read_csv(projects_file, sep="\t", usecols=["project", "fuel"])
+        periods_df = read_input_file(periods_file, sep="\t")
+        pr_df = read_input_file(projects_file, sep="\t", usecols=["project", "fuel"])
         pr_df = pr_df[(pr_df["fuel"] != ".") & (pr_df["project"].isin(projects))]
 
         periods = set(periods_df["period"])
@@ -1136,60 +1141,134 @@ def get_slopes_intercept_by_project_period_segment(
         intercept_dict a dictionary of the fuel burn / variable O&M cost slope
         and intercept by (project, period, segment).
 
+    The curves of all projects and periods are processed together: we sort
+    the DataFrame once, compute the segment slopes and intercepts with
+    grouped differences, and run the curve checks on whole columns. Only if
+    a check fails do we go back to the curve of the first failing project
+    and period (in the order they would have been processed one by one)
+    and raise the error via *calculate_slope_intercept*. Curves with
+    period 0 are broadcast to all modeling periods with a merge.
     """
+    projects = list(projects)
+    period_list = list(periods)
+    project_order = {prj: i for i, prj in enumerate(projects)}
+    period_order = {prd: i for i, prd in enumerate(period_list)}
+
+    df = df[df["project"].isin(projects)]
+
+    # Determine whether to use the period-0 curve or the curves for each
+    # of the modeling periods for each project
+    periods_by_project = df.groupby("project")["period"].agg(set).to_dict()
+    zero_period_projects = set(
+        prj for prj, prj_periods in periods_by_project.items()
+        if prj_periods == {0}
+    )
 
-    slope_dict = {}
-    intercept_dict = {}
+    df = df[
+        (df["project"].isin(zero_period_projects) & (df["period"] == 0))
+        | (~df["project"].isin(zero_period_projects)
+           & df["period"].isin(periods))
+    ]
 
+    # Sort by project and period in processing order, then by load point
+    curves = pd.DataFrame({
+        "project": df["project"],
+        "period": df["period"],
+        "project_order": df["project"].map(project_order),
+        "period_order": df["period"].map(period_order).fillna(-1),
+        "load_point": df["load_point_fraction"],
+        "average": df[input_col]
+    }).sort_values(
+        by=["project_order", "period_order", "load_point"], kind="mergesort"
+    ).reset_index(drop=True)
+
+    curves["fuel_burn"] = curves["load_point"] * curves["average"]
+    groups = curves.groupby(["project_order", "period_order"], sort=False)
+    curves["n_points"] = groups["load_point"].transform("size")
+    curves["point"] = groups.cumcount()
+    prior_load_point = groups["load_point"].shift(1)
+    prior_fuel_burn = groups["fuel_burn"].shift(1)
+    curves["incr_load"] = curves["load_point"] - prior_load_point
+    curves["incr_fuel_burn"] = curves["fuel_burn"] - prior_fuel_burn
+    curves["slope"] = curves["incr_fuel_burn"] / curves["incr_load"]
+    curves["intercept"] = prior_fuel_burn - curves["slope"] * prior_load_point
+    curves["incr_slope"] = curves["slope"] - curves.groupby(
+        ["project_order", "period_order"], sort=False
+    )["slope"].shift(1)
+
+    # Data checks (see calculate_slope_intercept)
+    curves["invalid"] = \
+        (curves["load_point"] <= 0) | (curves["average"] <= 0) \
+        | ((curves["n_points"] > 1)
+           & ((curves["incr_load"] <= 0) | (curves["incr_fuel_burn"] <= 0)
+              | (curves["incr_slope"] <= 0)))
+    invalid_curves = set(curves.loc[curves["invalid"], "project"])
+
+    # Raise the error for the first project with missing periods or an
+    # invalid curve
     for project in projects:
-        df_slice = df[df["project"] == project]
-        slice_periods = set(df_slice["period"])
-
-        if slice_periods == set([0]):
-            p_iterable = [0]
-        elif periods.issubset(slice_periods):
-            p_iterable = periods
-        else:
+        slice_periods = periods_by_project.get(project, set())
+        if slice_periods != {0} and not periods.issubset(slice_periods):
             raise ValueError(
                 """{} for project '{}' isn't specified for all 
                 modelled periods. Set period to 0 if inputs are the 
                 same for each period or make sure all modelled periods 
                 are included.""".format(input_col, project)
             )
+        if project in invalid_curves:
+            project_curves = curves[curves["project"] == project]
+            for _, curve in project_curves.groupby(
+                "period_order", sort=True
+            ):
+                calculate_slope_intercept(
+                    project, curve["load_point"].values,
+                    curve["average"].values
+                )
 
-        for period in p_iterable:
-            df_slice_p = df_slice[df_slice["period"] == period]
-            df_slice_p = df_slice_p.sort_values(by=["load_point_fraction"])
-            load_points = df_slice_p["load_point_fraction"].values
-            averages = df_slice_p[input_col].values
+    # Segments: with one load point, assume a constant heat rate or
+    # variable O&M rate (no intercept); otherwise, segment i is between
+    # load points i and i+1
+    single_point = curves["n_points"] == 1
+    curves.loc[single_point, "slope"] = curves.loc[single_point, "average"]
+    curves.loc[single_point, "intercept"] = 0
+    segments = curves[single_point | (curves["point"] > 0)].copy()
+    segments["segment"] = \
+        segments["point"] - (segments["n_points"] > 1).astype(int)
+
+    # Create the same inputs for all periods if the period is 0
+    zero_period_segments = segments[segments["period"] == 0].drop(
+        columns=["period", "period_order"]
+    )
+    zero_period_segments["merge_key"] = 0
+    modeling_periods = pd.DataFrame({
+        "period": period_list,
+        "period_order": range(len(period_list)),
+        "merge_key": 0
+    })
+    zero_period_segments = zero_period_segments.merge(
+        modeling_periods, on="merge_key", sort=False
+    )
+    # For period-0 curves, periods vary within segments; otherwise,
+    # segments vary within periods
+    zero_period_segments["order"] = zero_period_segments["segment"]
+    zero_period_segments["suborder"] = zero_period_segments["period_order"]
+    segments = segments[segments["period"] != 0]
+    segments["order"] = segments["period_order"]
+    segments["suborder"] = segments["segment"]
+
+    segments = pd.concat(
+        [segments, zero_period_segments], sort=False
+    ).sort_values(
+        by=["project_order", "order", "suborder"], kind="mergesort"
+    )
 
-            slopes, intercepts = calculate_slope_intercept(
-                project, load_points, averages
-            )
-            sgms = range(len(slopes))
-
-            # If period is 0, create same inputs for all periods
-            if period == 0:
-                slope_dict.update(
-                    {(project, p, sgms[i]): slope
-                     for i, slope in enumerate(slopes)
-                     for p in periods}
-                )
-                intercept_dict.update(
-                    {(project, p, sgms[i]): intercept
-                     for i, intercept in enumerate(intercepts)
-                     for p in periods}
-                )
-            # If not, create inputs for just this period
-            else:
-                slope_dict.update(
-                    {(project, period, sgms[i]): slope
-                     for i, slope in enumerate(slopes)}
-                )
-                intercept_dict.update(
-                    {(project, period, sgms[i]): intercept
-                     for i, intercept in enumerate(intercepts)}
-                )
+    keys = list(zip(
+        segments["project"].tolist(),
+        segments["period"].tolist(),
+        segments["segment"].tolist()
+    ))
+    slope_dict = dict(zip(keys, segments["slope"].tolist()))
+    intercept_dict = dict(zip(keys, segments["intercept"].tolist()))
 
     return slope_dict, intercept_dict
 
@@ -27,6 +27,7 @@ from pyomo.environ import Param, Set
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import cursor_to_df, \
     subset_init_by_param_value
+from gridpath.auxiliary.db_interface import get_subproblem_stage_filter
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 
@@ -234,15 +235,21 @@ def write_model_inputs(scenario_directory, scenario_id, subscenarios, subproblem
         writer.writerows(new_rows)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("update carbon cap zones")
     # Figure out carbon_cap zone for each project
@@ -281,8 +288,9 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             UPDATE {}
             SET carbon_cap_zone = ?
             WHERE scenario_id = ?
-            AND project = ?;
-            """.format(tbl)
+            AND project = ?
+            AND {};
+            """.format(tbl, subproblem_stage_filter)
         spin_on_database_lock(conn=db, cursor=c, sql=sql, data=updates)
 
     # Set carbon_cap_zone to 'no_carbon_cap' for all other projects
@@ -292,8 +300,9 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             UPDATE {}
             SET carbon_cap_zone = 'no_carbon_cap'
             WHERE scenario_id = ?
-            AND carbon_cap_zone IS NULL;
-            """.format(tbl)
+            AND carbon_cap_zone IS NULL
+            AND {};
+            """.format(tbl, subproblem_stage_filter)
         spin_on_database_lock(conn=db, cursor=c, sql=no_cc_sql,
                               data=(scenario_id,),
                               many=False)
@@ -20,12 +20,15 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
-from pyomo.environ import Expression, value
+from pyomo.environ import Expression
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_prj_tmp_columns, write_results_file
+from gridpath.auxiliary.results_store import results_reader
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -77,26 +80,26 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
-                           "results", "carbon_emissions_by_project.csv"),
-              "w", newline="") as carbon_emissions_results_file:
-        writer = csv.writer(carbon_emissions_results_file)
-        writer.writerow(["project", "period", "horizon", "timepoint",
-                         "timepoint_weight",
-                         "number_of_hours_in_timepoint", "load_zone",
-                         "technology", "carbon_emissions_tons"])
-        for (p, tmp) in m.FUEL_PRJ_OPR_TMPS:
-            writer.writerow([
-                p,
-                m.period[tmp],
-                m.horizon[tmp, m.balancing_type_project[p]],
-                tmp,
-                m.tmp_weight[tmp],
-                m.hrs_in_tmp[tmp],
-                m.load_zone[p],
-                m.technology[p],
-                value(m.Project_Carbon_Emissions[p, tmp])
-            ])
+    index = list(m.FUEL_PRJ_OPR_TMPS)
+    columns = get_prj_tmp_columns(m, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "carbon_emissions_by_project.csv"),
+        header=["project", "period", "horizon", "timepoint",
+                "timepoint_weight", "number_of_hours_in_timepoint",
+                "load_zone", "technology", "carbon_emissions_tons"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["load_zone"],
+            columns["technology"],
+            get_component_column(m.Project_Carbon_Emissions, index)
+        ]
+    )
 
 
 # Database
@@ -127,11 +130,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "carbon_emissions_by_project.csv"),
-              "r") as emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "carbon_emissions_by_project.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -179,15 +180,21 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate emissions by technology, period, and spinup_or_lookahead
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate emissions by technology-period")
 
@@ -195,26 +202,29 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_project_carbon_emissions_by_technology_period 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate emissions by technology, period, and spinup_or_lookahead
     agg_sql = """
-        INSERT INTO results_project_carbon_emissions_by_technology_period
-        (scenario_id, subproblem_id, stage_id, period, load_zone, technology, 
-        spinup_or_lookahead, carbon_emission_tons)
         SELECT
         scenario_id, subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead, SUM(carbon_emission_tons * timepoint_weight
         * number_of_hours_in_timepoint ) AS carbon_emission_tons 
         FROM results_project_carbon_emissions
         WHERE scenario_id = ?
+        AND {}
         GROUP BY subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, technology, 
-        spinup_or_lookahead;"""
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,),
-                          many=False)
+        spinup_or_lookahead;""".format(subproblem_stage_filter)
+    insert_aggregated_results(
+        conn=db, cursor=c,
+        table="results_project_carbon_emissions_by_technology_period",
+        columns="""scenario_id, subproblem_id, stage_id, period, load_zone,
+        technology, spinup_or_lookahead, carbon_emission_tons""",
+        sql=agg_sql, data=(scenario_id,)
+    )
@@ -22,16 +22,19 @@ For the purpose, this module calls the respective method from the
 operational type modules.
 """
 
-import csv
 import os.path
 from pyomo.environ import Set, Var, Expression, Constraint, \
-    NonNegativeReals, value
+    NonNegativeReals
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.results_store import results_reader
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_membership_column, get_prj_tmp_columns, write_results_file
 import gridpath.project.operations.operational_types as op_type
 
 
@@ -463,38 +466,52 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     Nothing
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
-                           "results",
-                           "costs_operations.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            ["project", "period", "horizon", "timepoint", "timepoint_weight",
-             "number_of_hours_in_timepoint", "load_zone", "technology",
-             "variable_om_cost", "fuel_cost", "startup_cost", "shutdown_cost",
-             "operational_violation_cost", "curtailment_cost"]
-        )
-        for (p, tmp) in m.PRJ_OPR_TMPS:
-            writer.writerow([
-                p,
-                m.period[tmp],
-                m.horizon[tmp, m.balancing_type_project[p]],
-                tmp,
-                m.tmp_weight[tmp],
-                m.hrs_in_tmp[tmp],
-                m.load_zone[p],
-                m.technology[p],
-                value(m.Variable_OM_Cost[p, tmp])
-                if p in m.VAR_OM_COST_ALL_PRJS else None,
-                value(m.Fuel_Cost[p, tmp]) if p in m.FUEL_PRJS else None,
-                value(m.Startup_Cost[p, tmp])
-                if p in m.STARTUP_COST_PRJS else None,
-                value(m.Shutdown_Cost[p, tmp])
-                if p in m.SHUTDOWN_COST_PRJS else None,
-                value(m.Operational_Violation_Cost[p, tmp])
-                if p in m.VIOL_ALL_PRJ_OPR_TMPS else None,
-                value(m.Curtailment_Cost[p, tmp])
-                if p in m.CURTAILMENT_COST_PRJS else None,
-            ])
+    index = list(m.PRJ_OPR_TMPS)
+    columns = get_prj_tmp_columns(m, index)
+    projects = columns["project"]
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "costs_operations.csv"),
+        header=["project", "period", "horizon", "timepoint",
+                "timepoint_weight", "number_of_hours_in_timepoint",
+                "load_zone", "technology", "variable_om_cost", "fuel_cost",
+                "startup_cost", "shutdown_cost", "operational_violation_cost",
+                "curtailment_cost"],
+        columns=[
+            projects,
+            columns["period"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["load_zone"],
+            columns["technology"],
+            get_component_column(
+                m.Variable_OM_Cost, index,
+                get_membership_column(m.VAR_OM_COST_ALL_PRJS, projects)
+            ),
+            get_component_column(
+                m.Fuel_Cost, index,
+                get_membership_column(m.FUEL_PRJS, projects)
+            ),
+            get_component_column(
+                m.Startup_Cost, index,
+                get_membership_column(m.STARTUP_COST_PRJS, projects)
+            ),
+            get_component_column(
+                m.Shutdown_Cost, index,
+                get_membership_column(m.SHUTDOWN_COST_PRJS, projects)
+            ),
+            get_component_column(
+                m.Operational_Violation_Cost, index,
+                get_membership_column(m.VIOL_ALL_PRJ_OPR_TMPS, projects)
+            ),
+            get_component_column(
+                m.Curtailment_Cost, index,
+                get_membership_column(m.CURTAILMENT_COST_PRJS, projects)
+            )
+        ]
+    )
 
 
 # Database
@@ -524,10 +541,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "costs_operations.csv"),
-              "r") as dispatch_file:
-        reader = csv.reader(dispatch_file)
-
+    with results_reader(os.path.join(
+            results_directory, "costs_operations.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -581,7 +597,9 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate costs by zone and period
     TODO: by technology too?
@@ -589,8 +607,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate costs")
 
@@ -598,17 +620,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_project_costs_operations_agg
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate operational costs by period and load zone
     agg_sql = """
-        INSERT INTO results_project_costs_operations_agg
-        (scenario_id, subproblem_id, stage_id, period, 
-        load_zone, spinup_or_lookahead, 
-        variable_om_cost, fuel_cost, startup_cost, shutdown_cost)
         SELECT scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead,
         SUM(fuel_cost * timepoint_weight * number_of_hours_in_timepoint) 
@@ -619,9 +638,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         SUM(shutdown_cost * timepoint_weight) AS shutdown_cost
         FROM results_project_costs_operations
         WHERE scenario_id = ?
+        AND {}
         GROUP BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
-        ;"""
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,),
-                          many=False)
+        ;""".format(subproblem_stage_filter)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_project_costs_operations_agg",
+        columns="""scenario_id, subproblem_id, stage_id, period, 
+        load_zone, spinup_or_lookahead, 
+        variable_om_cost, fuel_cost, startup_cost, shutdown_cost""",
+        sql=agg_sql, data=(scenario_id,)
+    )
@@ -27,6 +27,7 @@ from pyomo.environ import Set, Param, NonNegativeReals, Expression
 
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file, \
     check_for_integer_subdirectories
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 
@@ -217,7 +218,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
         final commitment stage.
         """
         fnl_commit_prjs = list()
-        df = read_csv(
+        df = read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
             sep="\t",
@@ -274,7 +275,7 @@ def export_pass_through_inputs(scenario_directory, subproblem, stage, m):
     :return:
     """
 
-    df = read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t",
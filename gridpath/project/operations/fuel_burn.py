@@ -18,14 +18,17 @@ both operational fuel burn for power production, and startup fuel burn (if
 applicable).
 """
 
-import csv
 import os.path
 from pyomo.environ import Set, Var, Expression, Constraint, \
-    NonNegativeReals, value
+    NonNegativeReals
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_membership_column, get_param_column, get_prj_tmp_columns, \
+    write_results_file
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.results_store import results_reader
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 import gridpath.project.operations.operational_types as op_type
@@ -283,31 +286,35 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     Nothing
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-              "fuel_burn.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            ["project", "period", "horizon", "timepoint", "timepoint_weight",
-             "number_of_hours_in_timepoint", "load_zone", "technology", "fuel",
-             "fuel_burn_operations_mmbtu", "fuel_burn_startup_mmbtu",
-             "total_fuel_burn_mmbtu"]
-        )
-        for (p, tmp) in m.FUEL_PRJ_OPR_TMPS:
-            writer.writerow([
-                p,
-                m.period[tmp],
-                m.horizon[tmp, m.balancing_type_project[p]],
-                tmp,
-                m.tmp_weight[tmp],
-                m.hrs_in_tmp[tmp],
-                m.load_zone[p],
-                m.technology[p],
-                m.fuel[p],
-                value(m.Operations_Fuel_Burn_MMBtu[p, tmp]),
-                value(m.Startup_Fuel_Burn_MMBtu[p, tmp])
-                if p in m.STARTUP_FUEL_PRJS else None,
-                value(m.Total_Fuel_Burn_MMBtu[p, tmp])
-            ])
+    index = list(m.FUEL_PRJ_OPR_TMPS)
+    columns = get_prj_tmp_columns(m, index)
+    projects = columns["project"]
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "fuel_burn.csv"),
+        header=["project", "period", "horizon", "timepoint",
+                "timepoint_weight", "number_of_hours_in_timepoint",
+                "load_zone", "technology", "fuel",
+                "fuel_burn_operations_mmbtu", "fuel_burn_startup_mmbtu",
+                "total_fuel_burn_mmbtu"],
+        columns=[
+            projects,
+            columns["period"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["load_zone"],
+            columns["technology"],
+            get_param_column(m.fuel, projects),
+            get_component_column(m.Operations_Fuel_Burn_MMBtu, index),
+            get_component_column(
+                m.Startup_Fuel_Burn_MMBtu, index,
+                get_membership_column(m.STARTUP_FUEL_PRJS, projects)
+            ),
+            get_component_column(m.Total_Fuel_Burn_MMBtu, index)
+        ]
+    )
 
 
 # Database
@@ -337,10 +344,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "fuel_burn.csv"),
-              "r") as fuel_burn_file:
-        reader = csv.reader(fuel_burn_file)
-
+    with results_reader(os.path.join(
+            results_directory, "fuel_burn.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
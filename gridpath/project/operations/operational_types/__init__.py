@@ -22,11 +22,11 @@ If an operational type module method is not specified in an operational type
 module, these defaults are used.
 """
 
-import csv
 import os.path
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.results_store import results_reader
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 from gridpath.auxiliary.db_interface import setup_results_import
@@ -257,10 +257,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "dispatch_all.csv"), "r") as \
-            dispatch_file:
-        reader = csv.reader(dispatch_file)
-
+    with results_reader(os.path.join(
+            results_directory, "dispatch_all.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -327,13 +326,17 @@ def import_results_into_database(
             pass
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
 
@@ -349,7 +352,8 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                    "process_module_specific_results"):
             imported_operational_modules[op_m]. \
                 process_module_specific_results(
-                    db, c, scenario_id, subscenarios, quiet)
+                    db, c, scenario_id, subscenarios, quiet,
+                    subproblem_stages)
         else:
             pass
 
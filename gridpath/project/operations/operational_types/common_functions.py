@@ -18,14 +18,17 @@ import numpy as np
 import pandas as pd
 import warnings
 
-from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import results_reader
 from gridpath.project.common_functions import \
-    check_if_boundary_type_and_first_timepoint, get_column_row_value, \
-    check_boundary_type
+    check_if_boundary_type_and_first_timepoint, check_boundary_type
 from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.db_interface import \
+    update_project_operational_timepoints, update_results_from_staging_table
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_req_cols, validate_missing_inputs, validate_values, \
     validate_column_monotonicity
+from gridpath.temporal.operations.horizons import get_tmp_sequence
 
 
 def determine_relevant_timepoints(mod, g, tmp, min_time):
@@ -69,7 +72,46 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
     t-2. By the time we reach t-3, we will have reached the 4-hour minimum
     up/down time, so t-3 will not be relevant for the minimum up time
     constraint in timepoint *t*.
+
+    The relevant timepoints only depend on the project's balancing type,
+    the timepoint, and the min time, so we determine them once for each
+    (balancing type, timepoint, min time) combination and cache them on the
+    model instance. Projects with the same balancing type and min up/down
+    time, as well as the different constraints that need the relevant
+    timepoints (min up time, min down time, startup types) across the
+    commitment operational types, then share the result.
+    """
+    try:
+        cache = mod._relevant_tmps_cache
+    except AttributeError:
+        cache = mod._relevant_tmps_cache = dict()
+
+    key = (mod.balancing_type_project[g], tmp, min_time)
+    if key not in cache:
+        cache[key] = _determine_relevant_timepoints(
+            mod=mod, bt=key[0], tmp=tmp, min_time=min_time
+        )
+    relevant_tmps, relevant_linked_tmps = cache[key]
+
+    # Return copies, so that the cached lists can't be modified
+    return list(relevant_tmps), list(relevant_linked_tmps)
+
+
+def _determine_relevant_timepoints(mod, bt, tmp, min_time):
     """
+    :param mod:
+    :param bt: the balancing type
+    :param tmp:
+    :param min_time:
+    :return: the relevant timepoints and relevant linked timepoints
+
+    Walk backwards from *tmp* through the previous timepoints of balancing
+    type *bt* to find the relevant timepoints for the minimum up/down time
+    constraints (see :func:`determine_relevant_timepoints`).
+    """
+    # Use the previous timepoint map derived in the horizons module rather
+    # than indexing the prev_tmp param
+    prev_tmp = get_tmp_sequence(mod)["prev_tmp"]
 
     # The first possible relevant timepoint is the current timepoint
     relevant_tmps = [tmp]
@@ -81,7 +123,7 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
     # linear boundary type we'll just pass, as there are no more relevant
     # timepoints to add
     if check_if_boundary_type_and_first_timepoint(
-        mod=mod, tmp=tmp, balancing_type=mod.balancing_type_project[g],
+        mod=mod, tmp=tmp, balancing_type=bt,
         boundary_type="linear"
     ):
         pass  # no more relevant timepoints, keep list limited to *t*
@@ -89,7 +131,7 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
     # setting, we'll immediately move on to the linked timepoints without
     # looking for a previous timepoint
     elif check_if_boundary_type_and_first_timepoint(
-        mod=mod, tmp=tmp, balancing_type=mod.balancing_type_project[g],
+        mod=mod, tmp=tmp, balancing_type=bt,
         boundary_type="linked"
     ):
         # Add the first linked timepoint's duration to hours_from_tmp
@@ -113,10 +155,8 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
         # The next possible relevant timepoint is the previous timepoint,
         # so we'll check its duration (if it's longer than or equal to the
         # minimum up/down time, we'll break out of the loop immediately)
-        relevant_tmp = mod.prev_tmp[tmp, mod.balancing_type_project[g]]
-        hours_from_tmp = \
-            mod.hrs_in_tmp[
-                mod.prev_tmp[tmp, mod.balancing_type_project[g]]]
+        relevant_tmp = prev_tmp[tmp, bt]
+        hours_from_tmp = mod.hrs_in_tmp[relevant_tmp]
 
         while hours_from_tmp < min_time:
             # If we haven't exceed the minimum up/down time yet, this timepoint
@@ -127,7 +167,7 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
             # timepoint of the horizon, we break out of the loop since there
             # are no more timepoints to consider
             if check_if_boundary_type_and_first_timepoint(
-                mod=mod, tmp=relevant_tmp, balancing_type=mod.balancing_type_project[g],
+                mod=mod, tmp=relevant_tmp, balancing_type=bt,
                 boundary_type="linear"
             ):
                 break
@@ -136,7 +176,7 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
             # consider (we have already added all horizon timepoints as
             # relevant)
             elif check_boundary_type(
-                mod=mod, tmp=tmp, balancing_type=mod.balancing_type_project[g],
+                mod=mod, tmp=tmp, balancing_type=bt,
                 boundary_type="circular"
             ) and relevant_tmp == tmp:
                 break
@@ -146,7 +186,7 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
             # timepoint of the horizon, we'll start adding the linked
             # timepoints until we reach the target min time
             elif check_if_boundary_type_and_first_timepoint(
-                mod=mod, tmp=relevant_tmp, balancing_type=mod.balancing_type_project[g],
+                mod=mod, tmp=relevant_tmp, balancing_type=bt,
                 boundary_type="linked"
             ):
                 # Add the first linked timepoint's duration to hours_from_tmp
@@ -171,14 +211,8 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
             # timepoint and will add that timepoint's duration to
             # hours_from_tmp
             else:
-                hours_from_tmp += \
-                    mod.hrs_in_tmp[
-                        mod.prev_tmp[
-                            relevant_tmp, mod.balancing_type_project[g]
-                        ]
-                    ]
-                relevant_tmp = mod.prev_tmp[
-                    relevant_tmp, mod.balancing_type_project[g]]
+                relevant_tmp = prev_tmp[relevant_tmp, bt]
+                hours_from_tmp += mod.hrs_in_tmp[relevant_tmp]
 
     return relevant_tmps, relevant_linked_tmps
 
@@ -186,90 +220,57 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
 def update_dispatch_results_table(
      db, c, results_directory, scenario_id, subproblem, stage, results_file
 ):
-    results = []
-    with open(os.path.join(results_directory, results_file), "r") as \
-            dispatch_file:
-        reader = csv.reader(dispatch_file)
+    """
+    :param db: the database connection object
+    :param c: the database cursor object
+    :param results_directory: the results directory
+    :param scenario_id: the scenario ID
+    :param subproblem: the subproblem ID
+    :param stage: the stage ID
+    :param results_file: the name of the operational type's dispatch
+        results file
+
+    Update the results_project_dispatch table with the operational type's
+    module-specific results. Results columns that are not in the file are
+    set to NULL. The positions of the results columns are determined once
+    from the header and all rows are applied in bulk via a staging table
+    (see *update_results_from_staging_table*).
+    """
+    update_columns = [
+        "scheduled_curtailment_mw", "subhourly_curtailment_mw",
+        "subhourly_energy_delivered_mw", "total_curtailment_mw",
+        "committed_mw", "committed_units", "started_units", "stopped_units",
+        "synced_units", "auxiliary_consumption_mw", "gross_power_mw",
+        "ramp_up_violation", "ramp_down_violation", "min_up_time_violation",
+        "min_down_time_violation"
+    ]
 
+    results = []
+    with results_reader(os.path.join(
+            results_directory, results_file
+    )) as reader:
         header = next(reader)
+        column_indices = [
+            header.index(column) if column in header else None
+            for column in update_columns
+        ]
 
         for row in reader:
-            project = row[0]
-            period = row[1]
-            balancing_type = row[2]
-            horizon = row[3]
-            timepoint = row[4]
-            timepoint_weight = row[5]
-            n_hours_in_tmp = row[6]
-            technology = row[7]
-            load_zone = row[8]
-            power = row[9]
-            scheduled_curtailment_mw = get_column_row_value(
-                header, "scheduled_curtailment_mw", row)
-            subhourly_curtailment_mw = get_column_row_value(
-                header,"subhourly_curtailment_mw", row)
-            subhourly_energy_delivered_mw = get_column_row_value(
-                header, "subhourly_energy_delivered_mw", row)
-            total_curtailment_mw = get_column_row_value(
-                header, "total_curtailment_mw", row)
-            committed_mw = get_column_row_value(header, "committed_mw", row)
-            committed_units = get_column_row_value(header, "committed_units", row)
-            started_units = get_column_row_value(header, "started_units", row)
-            stopped_units = get_column_row_value(header, "stopped_units", row)
-            synced_units = get_column_row_value(header, "synced_units", row)
-            auxiliary_consumption = get_column_row_value(
-                header, "auxiliary_consumption_mw", row)
-            gross_power = get_column_row_value(header, "gross_power_mw", row)
-            ramp_up_violation = get_column_row_value(
-                header, "ramp_up_violation", row
-            )
-            ramp_down_violation = get_column_row_value(
-                header, "ramp_down_violation", row
-            )
-            min_up_time_violation = get_column_row_value(
-                header, "min_up_time_violation", row
-            )
-            min_down_time_violation = get_column_row_value(
-                header, "min_down_time_violation", row
-            )
-
+            # project, period, and timepoint are in the first, second,
+            # and fifth columns respectively
             results.append(
-                (scheduled_curtailment_mw, subhourly_curtailment_mw,
-                 subhourly_energy_delivered_mw, total_curtailment_mw,
-                 committed_mw, committed_units, started_units,
-                 stopped_units, synced_units, auxiliary_consumption,
-                 gross_power, ramp_up_violation, ramp_down_violation,
-                 min_up_time_violation, min_down_time_violation,
-                 scenario_id, project, period, subproblem, stage, timepoint)
+                (scenario_id, row[0], row[1], subproblem, stage, row[4])
+                + tuple(None if i is None else row[i]
+                        for i in column_indices)
             )
 
-    # Update the results table with the module-specific results
-    update_sql = """
-        UPDATE results_project_dispatch
-        SET scheduled_curtailment_mw = ?,
-        subhourly_curtailment_mw = ?,
-        subhourly_energy_delivered_mw = ?,
-        total_curtailment_mw = ?,
-        committed_mw = ?,
-        committed_units = ?,
-        started_units = ?,
-        stopped_units = ?,
-        synced_units = ?,
-        auxiliary_consumption_mw = ?,
-        gross_power_mw = ?,
-        ramp_up_violation = ?,
-        ramp_down_violation = ?,
-        min_up_time_violation = ?,
-        min_down_time_violation = ?
-        WHERE scenario_id = ?
-        AND project = ?
-        AND period = ?
-        AND subproblem_id = ?
-        AND stage_id = ?
-        AND timepoint = ?;
-        """
-
-    spin_on_database_lock(conn=db, cursor=c, sql=update_sql, data=results)
+    update_results_from_staging_table(
+        conn=db, cursor=c, table="results_project_dispatch",
+        key_columns=["scenario_id", "project", "period", "subproblem_id",
+                     "stage_id", "timepoint"],
+        update_columns=update_columns,
+        rows=results
+    )
 
 
 def get_optype_inputs_as_df(
@@ -292,7 +293,7 @@ def get_optype_inputs_as_df(
     """
 
     # Figure out which headers we have
-    header = pd.read_csv(
+    header = read_input_file(
         os.path.join(
             scenario_directory, subproblem, stage, "inputs", "projects.tab"
         ),
@@ -304,7 +305,7 @@ def get_optype_inputs_as_df(
 
     # Read in the appropriate columns for the operational type from
     # projects.tab
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t",
@@ -328,20 +329,54 @@ def get_param_dict(df, column_name, cast_as_type):
 
     Create a dictionary for the parameter to load into Pyomo.
     """
-    param_dict = dict()
-
-    for row in zip(df["project"],
-                   df[column_name]):
-        [prj, param_val] = row
-        # Add to the param dictionary if a value is specified
-        # Otherwise, we'll use the default value (or Pyomo will throw an
-        # error if no default value)
-        if param_val != ".":
-            param_dict[prj] = cast_as_type(row[1])
-        else:
-            pass
+    return df_to_param_dict(
+        df=df, index_columns=["project"], column_name=column_name,
+        cast_as_type=cast_as_type
+    )
 
-    return param_dict
+
+def df_to_index_list(df, index_columns):
+    """
+    :param df: the dataframe
+    :param index_columns: list of the index column names
+    :return: list of the index values (tuples if there is more than one
+        index column) to load into Pyomo, in the order of the rows
+    """
+    if len(index_columns) == 1:
+        return df[index_columns[0]].tolist()
+    else:
+        return list(zip(*[df[c].tolist() for c in index_columns]))
+
+
+def df_to_param_dict(df, index_columns, column_name, cast_as_type,
+                     missing_value="."):
+    """
+    :param df: the dataframe
+    :param index_columns: list of the index column names
+    :param column_name: string, column name of the parameter
+    :param cast_as_type: the type for the parameter
+    :param missing_value: the value used for unspecified params (None if
+        all params must be specified)
+    :return: dictionary, {index: param_value}
+
+    Create a dictionary for the parameter to load into Pyomo. Rows where
+    the param is not specified (set to the missing value) are skipped, so
+    that we'll use the default value (or Pyomo will throw an error if there
+    is no default value). The whole column is filtered and cast at once
+    rather than row by row.
+    """
+    index_df = df[index_columns]
+    values = df[column_name]
+    # Only columns read in as strings can have the missing value
+    if missing_value is not None and values.dtype == object:
+        specified = values != missing_value
+        index_df = index_df[specified]
+        values = values[specified]
+
+    return dict(zip(
+        df_to_index_list(df=index_df, index_columns=index_columns),
+        values.astype(cast_as_type).tolist()
+    ))
 
 
 def get_optype_param_requirements(op_type):
@@ -511,7 +546,7 @@ def load_var_profile_inputs(
 
     # Determine projects of this op_type and other var op_types
     # TODO: re-factor getting projects of certain op-type?
-    prj_df = pd.read_csv(
+    prj_df = read_input_file(
         os.path.join(scenario_directory, subproblem, stage,
                      "inputs", "projects.tab"),
         sep="\t",
@@ -574,10 +609,13 @@ def get_var_profile_inputs_from_database(
     subproblem = 1 if subproblem == "" else subproblem
     stage = 1 if stage == "" else stage
 
+    # Make sure the project-timepoints for this scenario's subscenarios are
+    # materialized
+    update_project_operational_timepoints(
+        conn=conn, subscenarios=subscenarios
+    )
+
     c = conn.cursor()
-    # NOTE: There can be cases where a resource is both in specified capacity
-    # table and in new build table, but depending on capacity type you'd only
-    # use one of them, so filtering with OR is not 100% correct.
 
     sql = """
         SELECT project, timepoint, cap_factor
@@ -587,15 +625,15 @@ def get_var_profile_inputs_from_database(
         FROM 
             (SELECT project, stage_id, timepoint, 
             variable_generator_profile_scenario_id
-            FROM project_operational_timepoints
-            WHERE project_portfolio_scenario_id = {}
-            AND project_operational_chars_scenario_id = {}
-            AND operational_type = '{}'
-            AND temporal_scenario_id = {}
-            AND (project_specified_capacity_scenario_id = {}
-                 OR project_new_cost_scenario_id = {})
+            FROM project_operational_timepoints_materialized
+            WHERE project_portfolio_scenario_id IS {}
+            AND project_operational_chars_scenario_id IS {}
+            AND project_specified_capacity_scenario_id IS {}
+            AND project_new_cost_scenario_id IS {}
+            AND temporal_scenario_id IS {}
             AND subproblem_id = {}
             AND stage_id = {}
+            AND operational_type = '{}'
             ) as projects_periods_timepoints_tbl
         -- Now that we have the relevant projects and timepoints, get the 
         -- respective cap factors (and no others) from 
@@ -608,12 +646,12 @@ def get_var_profile_inputs_from_database(
         """.format(
         subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
         subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
-        op_type,
-        subscenarios.TEMPORAL_SCENARIO_ID,
         subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
         subscenarios.PROJECT_NEW_COST_SCENARIO_ID,
+        subscenarios.TEMPORAL_SCENARIO_ID,
         subproblem,
-        stage
+        stage,
+        op_type
     )
 
     variable_profiles = c.execute(sql)
@@ -680,11 +718,6 @@ def load_hydro_opchars(data_portal, scenario_directory, subproblem,
     :return:
     """
 
-    project_horizons = list()
-    avg = dict()
-    min = dict()
-    max = dict()
-
     prj_hor_opchar_df = pd.read_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "hydro_conventional_horizon_params.tab"),
@@ -692,25 +725,23 @@ def load_hydro_opchars(data_portal, scenario_directory, subproblem,
         usecols=["project", "horizon", "average_power_fraction",
                  "min_power_fraction", "max_power_fraction"]
     )
-    for row in zip(prj_hor_opchar_df["project"],
-                   prj_hor_opchar_df["horizon"],
-                   prj_hor_opchar_df["average_power_fraction"],
-                   prj_hor_opchar_df["min_power_fraction"],
-                   prj_hor_opchar_df["max_power_fraction"]):
-        if row[0] in projects:
-            project_horizons.append((row[0], row[1]))
-            avg[(row[0], row[1])] = float(row[2])
-            min[(row[0], row[1])] = float(row[3])
-            max[(row[0], row[1])] = float(row[4])
-        else:
-            pass
+    prj_hor_opchar_df = prj_hor_opchar_df[
+        prj_hor_opchar_df["project"].isin(projects)
+    ]
 
     # Load data
+    index_columns = ["project", "horizon"]
     data_portal.data()["{}_OPR_HRZS".format(op_type.upper())] = \
-        {None: project_horizons}
-    data_portal.data()["{}_average_power_fraction".format(op_type)] = avg
-    data_portal.data()["{}_min_power_fraction".format(op_type)] = min
-    data_portal.data()["{}_max_power_fraction".format(op_type)] = max
+        {None: df_to_index_list(
+            df=prj_hor_opchar_df, index_columns=index_columns
+        )}
+    for param in ["average_power_fraction", "min_power_fraction",
+                  "max_power_fraction"]:
+        data_portal.data()["{}_{}".format(op_type, param)] = \
+            df_to_param_dict(
+                df=prj_hor_opchar_df, index_columns=index_columns,
+                column_name=param, cast_as_type=float, missing_value=None
+            )
 
 
 def get_hydro_inputs_from_database(
@@ -872,32 +903,25 @@ def load_startup_chars(data_portal, scenario_directory, subproblem,
             df["startup_type_id"] = df.groupby("project")[
                 "down_time_cutoff_hours"].rank()
 
-        startup_ramp_projects = set()
-        startup_ramp_projects_types = list()
-        down_time_cutoff_hours_dict = dict()
-        startup_plus_ramp_up_rate_dict = dict()
-
-        for i, row in df.iterrows():
-            project = row["project"]
-            startup_type_id = row["startup_type_id"]
-            down_time_cutoff_hours = row["down_time_cutoff_hours"]
-            startup_plus_ramp_up_rate = row["startup_plus_ramp_up_rate"]
-
-            if down_time_cutoff_hours != "." \
-                    and startup_plus_ramp_up_rate != "." \
-                    and project in projects:
-                startup_ramp_projects.add(project)
-                startup_ramp_projects_types.append((project, startup_type_id))
-                down_time_cutoff_hours_dict[(project, startup_type_id)] = \
-                    float(down_time_cutoff_hours)
-                startup_plus_ramp_up_rate_dict[(project, startup_type_id)] = \
-                    float(startup_plus_ramp_up_rate)
-
-        if startup_ramp_projects:
+        # Only load data for projects of this operational type with both
+        # params specified
+        df = df[(df["down_time_cutoff_hours"] != ".")
+                & (df["startup_plus_ramp_up_rate"] != ".")
+                & df["project"].isin(projects)]
+
+        if len(df) > 0:
+            index_columns = ["project", "startup_type_id"]
             data_portal.data()["{}_down_time_cutoff_hours".format(op_type)] = \
-                down_time_cutoff_hours_dict
+                df_to_param_dict(
+                    df=df, index_columns=index_columns,
+                    column_name="down_time_cutoff_hours", cast_as_type=float
+                )
             data_portal.data()["{}_startup_plus_ramp_up_rate_by_st".format(
-                op_type)] = startup_plus_ramp_up_rate_dict
+                op_type)] = df_to_param_dict(
+                    df=df, index_columns=index_columns,
+                    column_name="startup_plus_ramp_up_rate",
+                    cast_as_type=float
+                )
 
 
 def check_for_tmps_to_link(
@@ -914,7 +938,7 @@ def check_for_tmps_to_link(
     subproblem and pass that; otherwise, pass empty list.
     """
     try:
-        map_df = pd.read_csv(
+        map_df = read_input_file(
             os.path.join(scenario_directory, "linked_subproblems_map.csv"),
             sep=","
         )
@@ -55,6 +55,9 @@ from pyomo.environ import Var, Set, Param, Constraint, NonNegativeReals, \
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_difference_column, get_prj_tmp_columns, get_product_column, \
+    write_results_file
 from gridpath.project.operations.operational_types.common_functions import \
     determine_relevant_timepoints, update_dispatch_results_table, \
     load_optype_module_specific_data, load_startup_chars, \
@@ -2333,49 +2336,53 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_binary_commit.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint", "technology",
-                         "load_zone", "gross_power_mw",
-                         "auxiliary_consumption_mw", "net_power_mw",
-                         "committed_mw", "committed_units",
-                         "started_units", "stopped_units",
-                         "synced_units", "active_startup_type",
-                         "ramp_up_violation", "ramp_down_violation",
-                         "min_up_time_violation", "min_down_time_violation"
-                         ])
-
-        for (p, tmp) in mod.GEN_COMMIT_BIN_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenCommitBin_Provide_Power_MW[p, tmp]),
-                value(mod.GenCommitBin_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitBin_Provide_Power_MW[p, tmp]) -
-                value(mod.GenCommitBin_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitBin_Pmax_MW[p, tmp])
-                * value(mod.GenCommitBin_Commit[p, tmp]),
-                value(mod.GenCommitBin_Commit[p, tmp]),
-                value(mod.GenCommitBin_Startup[p, tmp]),
-                value(mod.GenCommitBin_Shutdown[p, tmp]),
-                value(mod.GenCommitBin_Synced[p, tmp]),
-                value(mod.GenCommitBin_Active_Startup_Type[p, tmp]),
-                value(mod.GenCommitBin_Ramp_Up_Violation_MW[p, tmp]),
-                value(mod.GenCommitBin_Ramp_Down_Violation_MW[p, tmp]),
-                value(mod.GenCommitBin_Min_Up_Time_Violation[p, tmp]),
-                value(mod.GenCommitBin_Min_Down_Time_Violation[p, tmp])
-            ])
+    index = list(mod.GEN_COMMIT_BIN_OPR_TMPS)
+    columns = get_prj_tmp_columns(mod, index)
+    gross_power = get_component_column(
+        mod.GenCommitBin_Provide_Power_MW, index
+    )
+    auxiliary_consumption = get_component_column(
+        mod.GenCommitBin_Auxiliary_Consumption_MW, index
+    )
+    commit = get_component_column(mod.GenCommitBin_Commit, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_binary_commit.csv"),
+        header=["project", "period", "balancing_type_project", "horizon",
+                "timepoint", "timepoint_weight",
+                "number_of_hours_in_timepoint", "technology", "load_zone",
+                "gross_power_mw", "auxiliary_consumption_mw", "net_power_mw",
+                "committed_mw", "committed_units", "started_units",
+                "stopped_units", "synced_units", "active_startup_type",
+                "ramp_up_violation", "ramp_down_violation",
+                "min_up_time_violation", "min_down_time_violation"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["balancing_type_project"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["technology"],
+            columns["load_zone"],
+            gross_power,
+            auxiliary_consumption,
+            get_difference_column(gross_power, auxiliary_consumption),
+            get_product_column(
+                get_component_column(mod.GenCommitBin_Pmax_MW, index), commit
+            ),
+            commit,
+            get_component_column(mod.GenCommitBin_Startup, index),
+            get_component_column(mod.GenCommitBin_Shutdown, index),
+            get_component_column(mod.GenCommitBin_Synced, index),
+            get_component_column(mod.GenCommitBin_Active_Startup_Type, index),
+            get_component_column(mod.GenCommitBin_Ramp_Up_Violation_MW, index),
+            get_component_column(mod.GenCommitBin_Ramp_Down_Violation_MW, index),
+            get_component_column(mod.GenCommitBin_Min_Up_Time_Violation, index),
+            get_component_column(mod.GenCommitBin_Min_Down_Time_Violation, index)
+        ]
+    )
 
     # Export any results that will be become inputs to a linked subproblem
     export_linked_subproblem_inputs(
@@ -56,6 +56,9 @@ from pyomo.environ import Var, Set, Constraint, Param, NonNegativeReals, \
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_difference_column, get_param_column, get_prj_tmp_columns, \
+    get_quotient_column, write_results_file
 from gridpath.project.operations.operational_types.common_functions import \
     determine_relevant_timepoints, update_dispatch_results_table, \
     load_optype_module_specific_data, check_for_tmps_to_link, \
@@ -1436,40 +1439,45 @@ def export_module_specific_results(
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_capacity_commit.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "gross_power_mw",
-                         "auxiliary_consumption_mw", "net_power_mw",
-                         "committed_mw", "committed_units"
-                         ])
-
-        for (p, tmp) \
-                in mod. \
-                GEN_COMMIT_CAP_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenCommitCap_Provide_Power_MW[p, tmp]),
-                value(mod.GenCommitCap_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitCap_Provide_Power_MW[p, tmp]) -
-                value(mod.GenCommitCap_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.Commit_Capacity_MW[p, tmp]),
-                value(mod.Commit_Capacity_MW[p, tmp]) /
-                mod.gen_commit_cap_unit_size_mw[p]
-            ])
+    index = list(mod.GEN_COMMIT_CAP_OPR_TMPS)
+    columns = get_prj_tmp_columns(mod, index)
+    gross_power = get_component_column(
+        mod.GenCommitCap_Provide_Power_MW, index
+    )
+    auxiliary_consumption = get_component_column(
+        mod.GenCommitCap_Auxiliary_Consumption_MW, index
+    )
+    committed_capacity = get_component_column(mod.Commit_Capacity_MW, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_capacity_commit.csv"),
+        header=["project", "period", "balancing_type_project", "horizon",
+                "timepoint", "timepoint_weight",
+                "number_of_hours_in_timepoint", "technology", "load_zone",
+                "gross_power_mw", "auxiliary_consumption_mw", "net_power_mw",
+                "committed_mw", "committed_units"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["balancing_type_project"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["technology"],
+            columns["load_zone"],
+            gross_power,
+            auxiliary_consumption,
+            get_difference_column(gross_power, auxiliary_consumption),
+            committed_capacity,
+            get_quotient_column(
+                committed_capacity,
+                get_param_column(
+                    mod.gen_commit_cap_unit_size_mw, columns["project"]
+                )
+            )
+        ]
+    )
 
     # If there's a linked_subproblems_map CSV file, check which of the
     # current subproblem TMPS we should export results for to link to the
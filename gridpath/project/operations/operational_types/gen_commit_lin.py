@@ -32,6 +32,9 @@ from pyomo.environ import Var, Set, Param, Constraint, NonNegativeReals, \
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_difference_column, get_prj_tmp_columns, get_product_column, \
+    write_results_file
 from gridpath.project.operations.operational_types.common_functions import \
     determine_relevant_timepoints, update_dispatch_results_table, \
     load_optype_module_specific_data, load_startup_chars, \
@@ -2313,49 +2316,53 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_continuous_commit.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint", "technology",
-                         "load_zone", "gross_power_mw",
-                         "auxiliary_consumption_mw", "net_power_mw",
-                         "committed_mw", "committed_units",
-                         "started_units", "stopped_units",
-                         "synced_units", "active_startup_type",
-                         "ramp_up_violation", "ramp_down_violation",
-                         "min_up_time_violation", "min_down_time_violation"
-                         ])
-
-        for (p, tmp) in mod.GEN_COMMIT_LIN_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenCommitLin_Provide_Power_MW[p, tmp]),
-                value(mod.GenCommitLin_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitLin_Provide_Power_MW[p, tmp]) -
-                value(mod.GenCommitLin_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitLin_Pmax_MW[p, tmp])
-                * value(mod.GenCommitLin_Commit[p, tmp]),
-                value(mod.GenCommitLin_Commit[p, tmp]),
-                value(mod.GenCommitLin_Startup[p, tmp]),
-                value(mod.GenCommitLin_Shutdown[p, tmp]),
-                value(mod.GenCommitLin_Synced[p, tmp]),
-                value(mod.GenCommitLin_Active_Startup_Type[p, tmp]),
-                value(mod.GenCommitLin_Ramp_Up_Violation_MW[p, tmp]),
-                value(mod.GenCommitLin_Ramp_Down_Violation_MW[p, tmp]),
-                value(mod.GenCommitLin_Min_Up_Time_Violation[p, tmp]),
-                value(mod.GenCommitLin_Min_Down_Time_Violation[p, tmp])
-            ])
+    index = list(mod.GEN_COMMIT_LIN_OPR_TMPS)
+    columns = get_prj_tmp_columns(mod, index)
+    gross_power = get_component_column(
+        mod.GenCommitLin_Provide_Power_MW, index
+    )
+    auxiliary_consumption = get_component_column(
+        mod.GenCommitLin_Auxiliary_Consumption_MW, index
+    )
+    commit = get_component_column(mod.GenCommitLin_Commit, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_continuous_commit.csv"),
+        header=["project", "period", "balancing_type_project", "horizon",
+                "timepoint", "timepoint_weight",
+                "number_of_hours_in_timepoint", "technology", "load_zone",
+                "gross_power_mw", "auxiliary_consumption_mw", "net_power_mw",
+                "committed_mw", "committed_units", "started_units",
+                "stopped_units", "synced_units", "active_startup_type",
+                "ramp_up_violation", "ramp_down_violation",
+                "min_up_time_violation", "min_down_time_violation"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["balancing_type_project"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["technology"],
+            columns["load_zone"],
+            gross_power,
+            auxiliary_consumption,
+            get_difference_column(gross_power, auxiliary_consumption),
+            get_product_column(
+                get_component_column(mod.GenCommitLin_Pmax_MW, index), commit
+            ),
+            commit,
+            get_component_column(mod.GenCommitLin_Startup, index),
+            get_component_column(mod.GenCommitLin_Shutdown, index),
+            get_component_column(mod.GenCommitLin_Synced, index),
+            get_component_column(mod.GenCommitLin_Active_Startup_Type, index),
+            get_component_column(mod.GenCommitLin_Ramp_Up_Violation_MW, index),
+            get_component_column(mod.GenCommitLin_Ramp_Down_Violation_MW, index),
+            get_component_column(mod.GenCommitLin_Min_Up_Time_Violation, index),
+            get_component_column(mod.GenCommitLin_Min_Down_Time_Violation, index)
+        ]
+    )
 
     # Export any results that will be become inputs to a linked subproblem
     export_linked_subproblem_inputs(
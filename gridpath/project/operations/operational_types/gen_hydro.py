@@ -33,8 +33,12 @@ from pyomo.environ import Var, Set, Param, Constraint, \
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.db_interface import get_subproblem_stage_filter, \
+    insert_aggregated_results
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_prj_tmp_columns, write_results_file
 from gridpath.project.common_functions import \
     check_if_boundary_type_and_first_timepoint, check_if_first_timepoint, \
     check_boundary_type
@@ -695,31 +699,29 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_gen_hydro.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "power_mw", "scheduled_curtailment_mw"
-                         ])
-
-        for (p, tmp) in mod.GEN_HYDRO_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenHydro_Provide_Power_MW[p, tmp]),
-                value(mod.GenHydro_Curtail_MW[p, tmp])
-            ])
+    index = list(mod.GEN_HYDRO_OPR_TMPS)
+    columns = get_prj_tmp_columns(mod, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_gen_hydro.csv"),
+        header=["project", "period", "balancing_type_project", "horizon",
+                "timepoint", "timepoint_weight",
+                "number_of_hours_in_timepoint", "technology", "load_zone",
+                "power_mw", "scheduled_curtailment_mw"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["balancing_type_project"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["technology"],
+            columns["load_zone"],
+            get_component_column(mod.GenHydro_Provide_Power_MW, index),
+            get_component_column(mod.GenHydro_Curtail_MW, index)
+        ]
+    )
 
     # If there's a linked_subproblems_map CSV file, check which of the
     # current subproblem TMPS we should export results for to link to the
@@ -829,15 +831,21 @@ def import_module_specific_results_to_database(
     )
 
 
-def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
+def process_module_specific_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate scheduled curtailment.
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate hydro curtailment")
 
@@ -845,17 +853,14 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_project_curtailment_hydro 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate hydro curtailment (just scheduled curtailment)
     agg_sql = """
-        INSERT INTO results_project_curtailment_hydro
-        (scenario_id, subproblem_id, stage_id, period, timepoint, 
-        timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
-        load_zone, scheduled_curtailment_mw)
         SELECT
         scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -867,6 +872,8 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
             sum(scheduled_curtailment_mw) AS scheduled_curtailment_mw
             FROM results_project_dispatch
             WHERE operational_type = 'gen_hydro'
+            AND scenario_id = ?
+            AND {}
             GROUP BY scenario_id, subproblem_id, stage_id, timepoint, load_zone
         ) as agg_curtailment_tbl
         JOIN (
@@ -881,11 +888,14 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
         USING (subproblem_id, stage_id, timepoint)
         WHERE scenario_id = ?
         ORDER BY subproblem_id, stage_id, load_zone, timepoint;
-        """
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,
-                                scenario_id),
-                          many=False)
+        """.format(subproblem_stage_filter)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_project_curtailment_hydro",
+        columns="""scenario_id, subproblem_id, stage_id, period, timepoint, 
+        timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
+        load_zone, scheduled_curtailment_mw""",
+        sql=agg_sql, data=(scenario_id, scenario_id, scenario_id)
+    )
 
 
 # Validation
@@ -34,8 +34,12 @@ from pyomo.environ import Param, Set, Var, Constraint, NonNegativeReals, \
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.db_interface import get_subproblem_stage_filter, \
+    insert_aggregated_results
 from gridpath.auxiliary.dynamic_components import \
     footroom_variables, headroom_variables, reserve_variable_derate_params
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_prj_tmp_columns, write_results_file
 from gridpath.project.operations.reserves.subhourly_energy_adjustment import \
     footroom_subhourly_energy_adjustment_rule, \
     headroom_subhourly_energy_adjustment_rule
@@ -460,36 +464,34 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_variable.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "power_mw", "scheduled_curtailment_mw",
-                         "subhourly_curtailment_mw",
-                         "subhourly_energy_delivered_mw",
-                         "total_curtailment_mw"
-                         ])
-
-        for (p, tmp) in mod.GEN_VAR_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenVar_Provide_Power_MW[p, tmp]),
-                value(mod.GenVar_Scheduled_Curtailment_MW[p, tmp]),
-                value(mod.GenVar_Subhourly_Curtailment_MW[p, tmp]),
-                value(mod.GenVar_Subhourly_Energy_Delivered_MW[p, tmp]),
-                value(mod.GenVar_Total_Curtailment_MW[p, tmp])
-            ])
+    index = list(mod.GEN_VAR_OPR_TMPS)
+    columns = get_prj_tmp_columns(mod, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_variable.csv"),
+        header=["project", "period", "balancing_type_project", "horizon",
+                "timepoint", "timepoint_weight",
+                "number_of_hours_in_timepoint", "technology", "load_zone",
+                "power_mw", "scheduled_curtailment_mw",
+                "subhourly_curtailment_mw", "subhourly_energy_delivered_mw",
+                "total_curtailment_mw"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["balancing_type_project"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["technology"],
+            columns["load_zone"],
+            get_component_column(mod.GenVar_Provide_Power_MW, index),
+            get_component_column(mod.GenVar_Scheduled_Curtailment_MW, index),
+            get_component_column(mod.GenVar_Subhourly_Curtailment_MW, index),
+            get_component_column(mod.GenVar_Subhourly_Energy_Delivered_MW, index),
+            get_component_column(mod.GenVar_Total_Curtailment_MW, index)
+        ]
+    )
 
 
 # Database
@@ -558,33 +560,36 @@ def import_module_specific_results_to_database(
     )
 
 
-def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
+def process_module_specific_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate scheduled curtailment
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate variable curtailment")
 
     # Delete old aggregated variable curtailment results
     del_sql = """
         DELETE FROM results_project_curtailment_variable 
-        WHERE scenario_id = ?;
-        """
+        WHERE scenario_id = ?
+        AND {};
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate variable curtailment (just scheduled curtailment)
     insert_sql = """
-        INSERT INTO results_project_curtailment_variable
-        (scenario_id, subproblem_id, stage_id, period, timepoint, 
-        timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
-        load_zone, scheduled_curtailment_mw)
         SELECT
         scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
@@ -596,6 +601,8 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
             sum(scheduled_curtailment_mw) AS scheduled_curtailment_mw
             FROM results_project_dispatch
             WHERE operational_type = 'gen_var'
+            AND scenario_id = ?
+            AND {}
             GROUP BY scenario_id, subproblem_id, stage_id, timepoint, load_zone
         ) as agg_curtailment_tbl
         JOIN (
@@ -609,12 +616,15 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
         ) as tmp_info_tbl
         USING (subproblem_id, stage_id, timepoint)
         WHERE scenario_id = ?
-        ORDER BY subproblem_id, stage_id, load_zone, timepoint;"""
+        ORDER BY subproblem_id, stage_id, load_zone, timepoint;""".format(
+        subproblem_stage_filter)
 
-    spin_on_database_lock(
-        conn=db, cursor=c, sql=insert_sql,
-        data=(scenario_id, scenario_id),
-        many=False
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_project_curtailment_variable",
+        columns="""scenario_id, subproblem_id, stage_id, period, timepoint, 
+        timepoint_weight, number_of_hours_in_timepoint, month, hour_of_day,
+        load_zone, scheduled_curtailment_mw""",
+        sql=insert_sql, data=(scenario_id, scenario_id, scenario_id)
     )
 
 
@@ -41,6 +41,8 @@ from pyomo.environ import Var, Set, Constraint, Param, Expression, \
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_prj_tmp_columns, write_results_file
 from gridpath.project.common_functions import \
     check_if_first_timepoint, check_boundary_type
 from gridpath.project.operations.operational_types.common_functions import \
@@ -659,30 +661,32 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_stor.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "starting_energy_mwh",
-                         "charge_mw", "discharge_mw"])
-        for (p, tmp) in mod.STOR_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.Stor_Starting_Energy_in_Storage_MWh[p, tmp]),
-                value(mod.Stor_Charge_MW[p, tmp]),
-                value(mod.Stor_Discharge_MW[p, tmp])
-            ])
+    index = list(mod.STOR_OPR_TMPS)
+    columns = get_prj_tmp_columns(mod, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_stor.csv"),
+        header=["project", "period", "balancing_type_project", "horizon",
+                "timepoint", "timepoint_weight",
+                "number_of_hours_in_timepoint", "technology", "load_zone",
+                "starting_energy_mwh", "charge_mw", "discharge_mw"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["balancing_type_project"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["technology"],
+            columns["load_zone"],
+            get_component_column(
+                mod.Stor_Starting_Energy_in_Storage_MWh, index
+            ),
+            get_component_column(mod.Stor_Charge_MW, index),
+            get_component_column(mod.Stor_Discharge_MW, index)
+        ]
+    )
 
     # If there's a linked_subproblems_map CSV file, check which of the
     # current subproblem TMPS we should export results for to link to the
@@ -23,13 +23,17 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
 import pandas as pd
-from pyomo.environ import Expression, value
+from pyomo.environ import Expression
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_subproblem_stage_filter, \
+    insert_aggregated_results
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_prj_tmp_columns, write_results_file
+from gridpath.auxiliary.results_store import read_results_csv
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 import gridpath.project.operations.operational_types as op_type
@@ -113,27 +117,29 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     """
 
     # First power
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_all.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "horizon", "timepoint",
-                         "operational_type", "balancing_type",
-                         "timepoint_weight", "number_of_hours_in_timepoint",
-                         "load_zone", "technology", "power_mw"])
-        for (p, tmp) in m.PRJ_OPR_TMPS:
-            writer.writerow([
-                p,
-                m.period[tmp],
-                m.horizon[tmp, m.balancing_type_project[p]],
-                tmp,
-                m.operational_type[p],
-                m.balancing_type_project[p],
-                m.tmp_weight[tmp],
-                m.hrs_in_tmp[tmp],
-                m.load_zone[p],
-                m.technology[p],
-                value(m.Power_Provision_MW[p, tmp])
-            ])
+    index = list(m.PRJ_OPR_TMPS)
+    columns = get_prj_tmp_columns(m, index)
+    write_results_file(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "results", "dispatch_all.csv"),
+        header=["project", "period", "horizon", "timepoint",
+                "operational_type", "balancing_type",
+                "timepoint_weight", "number_of_hours_in_timepoint",
+                "load_zone", "technology", "power_mw"],
+        columns=[
+            columns["project"],
+            columns["period"],
+            columns["horizon"],
+            columns["timepoint"],
+            columns["operational_type"],
+            columns["balancing_type_project"],
+            columns["timepoint_weight"],
+            columns["number_of_hours_in_timepoint"],
+            columns["load_zone"],
+            columns["technology"],
+            get_component_column(m.Power_Provision_MW, index)
+        ]
+    )
 
 
 def summarize_results(scenario_directory, subproblem, stage):
@@ -162,7 +168,7 @@ def summarize_results(scenario_directory, subproblem, stage):
     # Note: this includes power from spinup_or_lookahead timepoints as well!
 
     # Get the results CSV as dataframe
-    operational_results_df = pd.read_csv(
+    operational_results_df = read_results_csv(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "results", "dispatch_all.csv")
     )
@@ -246,16 +252,23 @@ def import_results_into_database(
     pass
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate dispatch by technology
     Aggregate dispatch by technology and period
+    Aggregate dispatch by project and period
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate dispatch by technology")
 
@@ -263,30 +276,32 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_project_dispatch_by_technology 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate dispatch by technology
     agg_sql = """
-        INSERT INTO results_project_dispatch_by_technology
-        (scenario_id, subproblem_id, stage_id, period, timepoint, 
-        timepoint_weight, number_of_hours_in_timepoint, spinup_or_lookahead,
-        load_zone, technology, power_mw)
         SELECT
         scenario_id, subproblem_id, stage_id, period, timepoint, 
         timepoint_weight, number_of_hours_in_timepoint, spinup_or_lookahead,
         load_zone, technology, sum(power_mw) AS power_mw
         FROM results_project_dispatch
         WHERE scenario_id = ?
+        AND {}
         GROUP BY subproblem_id, stage_id, timepoint, 
         load_zone, technology
         ORDER BY subproblem_id, stage_id, timepoint, 
-        load_zone, technology;"""
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,),
-                          many=False)
+        load_zone, technology;""".format(subproblem_stage_filter)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_project_dispatch_by_technology",
+        columns="""scenario_id, subproblem_id, stage_id, period, timepoint, 
+        timepoint_weight, number_of_hours_in_timepoint, spinup_or_lookahead,
+        load_zone, technology, power_mw""",
+        sql=agg_sql, data=(scenario_id,)
+    )
 
     if not quiet:
         print("aggregate dispatch by technology-period")
@@ -295,16 +310,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_project_dispatch_by_technology_period 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate dispatch by technology, period, and spinup_or_lookahead
     agg_sql = """
-        INSERT INTO results_project_dispatch_by_technology_period
-        (scenario_id, subproblem_id, stage_id, period, load_zone, technology, 
-        spinup_or_lookahead, energy_mwh)
         SELECT
         scenario_id, subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead,
@@ -312,10 +325,126 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         energy_mwh 
         FROM results_project_dispatch_by_technology
         WHERE scenario_id = ?
+        AND {}
         GROUP BY subproblem_id, stage_id, period, load_zone, technology, 
         spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, technology, 
-        spinup_or_lookahead;"""
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
+        spinup_or_lookahead;""".format(subproblem_stage_filter)
+    insert_aggregated_results(
+        conn=db, cursor=c,
+        table="results_project_dispatch_by_technology_period",
+        columns="""scenario_id, subproblem_id, stage_id, period, load_zone,
+        technology, spinup_or_lookahead, energy_mwh""",
+        sql=agg_sql, data=(scenario_id,)
+    )
+
+    if not quiet:
+        print("aggregate dispatch by project-period")
+
+    aggregate_dispatch_by_period(
+        db=db, c=c, scenario_id=scenario_id,
+        subproblem_stages=subproblem_stages
+    )
+
+
+def aggregate_dispatch_by_period(db, c, scenario_id, subproblem_stages):
+    """
+    :param db:
+    :param c:
+    :param scenario_id:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to aggregate
+    :return:
+
+    Aggregate the energy and weighted hours by project and period (used by
+    the capacity factor plot).
+    """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
+    # Delete old dispatch by project and period
+    del_sql = """
+        DELETE FROM results_project_dispatch_by_period
+        WHERE scenario_id = ?
+        AND {}
+        """.format(subproblem_stage_filter)
+    spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
+
+    # Aggregate energy and weighted hours by project, period, subproblem,
+    # and stage, ignoring spinup/lookahead timepoints (used for capacity
+    # factors)
+    agg_sql = """
+        SELECT
+        scenario_id, project, period, subproblem_id, stage_id, load_zone,
+        technology,
+        SUM(power_mw * timepoint_weight * number_of_hours_in_timepoint)
+        AS energy_mwh,
+        SUM(timepoint_weight * number_of_hours_in_timepoint)
+        AS weighted_hours
+        FROM results_project_dispatch
+
+        -- add temporal scenario id so we can join timepoints table
+        INNER JOIN
+
+        (SELECT temporal_scenario_id, scenario_id FROM scenarios)
+        USING (scenario_id)
+
+        -- filter out spinup_or_lookahead timepoints
+        INNER JOIN
+
+        (SELECT temporal_scenario_id, stage_id, subproblem_id, timepoint
+        FROM inputs_temporal
+        WHERE spinup_or_lookahead is NULL)
+        USING (temporal_scenario_id, stage_id, subproblem_id, timepoint)
+
+        WHERE scenario_id = ?
+        AND {}
+        GROUP BY project, period, subproblem_id, stage_id
+        ORDER BY project, period, subproblem_id, stage_id;""".format(
+        subproblem_stage_filter)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_project_dispatch_by_period",
+        columns="""scenario_id, project, period, subproblem_id, stage_id,
+        load_zone, technology, energy_mwh, weighted_hours""",
+        sql=agg_sql, data=(scenario_id,)
+    )
+
+
+def backfill_dispatch_by_period(db, quiet):
+    """
+    :param db:
+    :param quiet:
+    :return: list of the scenario_ids whose dispatch was aggregated
+
+    Aggregate the energy and weighted hours by project and period for the
+    scenarios with dispatch results but no aggregated results, e.g. the
+    scenarios whose results were processed before the
+    results_project_dispatch_by_period table was added to the schema.
+    """
+    c = db.cursor()
+    scenario_ids = [r[0] for r in c.execute(
+        """SELECT DISTINCT scenario_id
+        FROM results_project_dispatch
+        WHERE scenario_id NOT IN (
+            SELECT scenario_id FROM results_project_dispatch_by_period
+        )
+        ORDER BY scenario_id;"""
+    ).fetchall()]
+
+    for scenario_id in scenario_ids:
+        if not quiet:
+            print("aggregate dispatch by project-period for scenario_id "
+                  "{}".format(scenario_id))
+        subproblem_stages = c.execute(
+            """SELECT DISTINCT subproblem_id, stage_id
+            FROM results_project_dispatch
+            WHERE scenario_id = ?;""",
+            (scenario_id,)
+        ).fetchall()
+        aggregate_dispatch_by_period(
+            db=db, c=c, scenario_id=scenario_id,
+            subproblem_stages=subproblem_stages
+        )
+
+    return scenario_ids
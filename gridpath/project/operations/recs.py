@@ -27,9 +27,11 @@ from pyomo.environ import Param, Set, Expression, value
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file, \
     cursor_to_df
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 import gridpath.project.operations.operational_types as op_type
@@ -266,10 +268,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "rps_by_project.csv"),
-              "w", newline="") as rps_results_file:
-        writer = csv.writer(rps_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "rps_by_project.csv"
+    )) as writer:
         writer.writerow(["project", "load_zone", "rps_zone",
                          "timepoint", "period", "horizon", "timepoint_weight",
                          "number_of_hours_in_timepoint", "technology",
@@ -295,10 +297,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
             ])
 
     # Export list of RPS projects and their zones for later use
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "rps_project_zones.csv"),
-              "w", newline="") as rps_project_zones_file:
-        writer = csv.writer(rps_project_zones_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "rps_project_zones.csv"
+    )) as writer:
         writer.writerow(["project", "rps_zone"])
         for p in m.RPS_PRJS:
             writer.writerow([p, m.rps_zone[p]])
@@ -428,10 +430,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "rps_by_project.csv"),
-              "r") as rps_file:
-        reader = csv.reader(rps_file)
-
+    with results_reader(os.path.join(
+            results_directory, "rps_by_project.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -490,15 +491,21 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("update rps zones")
     # Figure out RPS zone for each project
@@ -538,8 +545,9 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             UPDATE {}
             SET rps_zone = ?
             WHERE scenario_id = ?
-            AND project = ?;
-            """.format(tbl)
+            AND project = ?
+            AND {};
+            """.format(tbl, subproblem_stage_filter)
         spin_on_database_lock(conn=db, cursor=c, sql=sql, data=results)
 
 
@@ -18,12 +18,13 @@ Add project-level components for frequency response reserves
 
 import csv
 import os.path
-import pandas as pd
 from pyomo.environ import Set, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import headroom_variables
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.project.operations.reserves.reserve_provision import \
     generic_record_dynamic_components, generic_add_model_components, \
     generic_load_model_data, generic_get_inputs_from_database, \
@@ -148,7 +149,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     # requirement
     project_fr_partial_list = list()
     projects = \
-        pd.read_csv(
+        read_input_file(
             os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                          "projects.tab"),
             sep="\t"
@@ -187,10 +188,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
         else:
             partial_proj[prj] = 0
 
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "reserves_provision_frequency_response.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "reserves_provision_frequency_response.csv"
+    )) as writer:
         writer.writerow(["project", "period", "horizon", "timepoint",
                          "timepoint_weight", "number_of_hours_in_timepoint",
                          "reserve_provision_mw", "partial"])
@@ -380,11 +381,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "reserves_provision_frequency_response.csv"), "r") \
-            as reserve_provision_file:
-        reader = csv.reader(reserve_provision_file)
-
+    with results_reader(os.path.join(
+            results_directory, "reserves_provision_frequency_response.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -17,10 +17,10 @@
 """
 
 import os.path
-import pandas as pd
 from pyomo.environ import Param, PercentFraction, Constraint
 
 from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 import gridpath.project.operations.operational_types as op_type
@@ -122,7 +122,7 @@ def generic_load_model_data(
 
     columns_to_import = ("project",)
     params_to_import = ()
-    projects_file_header = pd.read_csv(
+    projects_file_header = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "projects.tab"),
         sep="\t", header=None, nrows=1
@@ -22,6 +22,8 @@ from pyomo.environ import Set, Param, Var, NonNegativeReals, \
     PercentFraction, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 from gridpath.auxiliary.auxiliary import check_list_items_are_unique, \
@@ -276,7 +278,7 @@ def generic_load_model_data(
 
     columns_to_import = ("project", ba_column_name,)
     params_to_import = (getattr(m, reserve_balancing_area_param),)
-    projects_file_header = pd.read_csv(
+    projects_file_header = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "projects.tab"),
         sep="\t", header=None, nrows=1
@@ -340,10 +342,10 @@ def generic_export_module_specific_results(
     :param reserve_ba_param_name:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "reserves_provision_" + module_name + ".csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "reserves_provision_" + module_name + ".csv"
+    )) as writer:
         writer.writerow(["project", "period", "horizon", "timepoint",
                          "timepoint_weight", "number_of_hours_in_timepoint",
                          "balancing_area", "load_zone", "technology",
@@ -551,11 +553,9 @@ def generic_import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "reserves_provision_" + reserve_type + ".csv"
-                           ), "r") as reserve_provision_file:
-        reader = csv.reader(reserve_provision_file)
-
+    with results_reader(os.path.join(
+            results_directory, "reserves_provision_" + reserve_type + ".csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
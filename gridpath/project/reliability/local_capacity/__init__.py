@@ -21,7 +21,7 @@ import csv
 import os.path
 from pyomo.environ import Param, Set
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_set_index_by_param
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 
@@ -42,9 +42,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.LOCAL_CAPACITY_PROJECTS_BY_LOCAL_CAPACITY_ZONE = \
         Set(m.LOCAL_CAPACITY_ZONES, within=m.LOCAL_CAPACITY_PROJECTS,
-            initialize=lambda mod, local_capacity_z:
-            [p for p in mod.LOCAL_CAPACITY_PROJECTS
-             if mod.local_capacity_zone[p] == local_capacity_z])
+            initialize=lambda mod, local_capacity_z: get_set_index_by_param(
+                mod=mod, set_name="LOCAL_CAPACITY_PROJECTS",
+                param_name="local_capacity_zone"
+            ).get(local_capacity_z, []))
 
     # Get operational local capacity projects - timepoints combinations
     m.LOCAL_CAPACITY_PRJ_OPR_PRDS = Set(
@@ -26,6 +26,7 @@ from pyomo.environ import Param, PercentFraction, Expression, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -83,11 +84,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "project_local_capacity_contribution.csv"),
-              "w", newline="") as \
-            results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "project_local_capacity_contribution.csv"
+    )) as writer:
         writer.writerow(["project", "period", "local_capacity_zone", 
                          "technology",
                          "load_zone",
@@ -221,12 +221,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(
-            results_directory,
-            "project_local_capacity_contribution.csv"), "r"
-    ) as local_capacity_results_file:
-        reader = csv.reader(local_capacity_results_file)
-
+    with results_reader(os.path.join(
+            results_directory, "project_local_capacity_contribution.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
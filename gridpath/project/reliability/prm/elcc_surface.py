@@ -18,13 +18,14 @@ Contributions to ELCC surface
 
 import csv
 import os.path
-import pandas as pd
 from pyomo.environ import Param, Set, NonNegativeReals, Binary, Expression, \
     value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.project.operations.operational_types.common_functions import \
     get_param_dict
 
@@ -132,7 +133,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
         param=(m.contributes_to_elcc_surface,)
     )
 
-    elcc_df = pd.read_csv(
+    elcc_df = read_input_file(
         os.path.join(scenario_directory, subproblem, stage, "inputs",
                      "projects.tab"),
         sep="\t",
@@ -179,11 +180,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "prm_project_elcc_surface_contribution.csv"),
-              "w", newline="") as \
-            results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "prm_project_elcc_surface_contribution.csv"
+    )) as writer:
         writer.writerow(["project", "period", "prm_zone", "facet",
                          "load_zone", "technology", "capacity_mw",
                          "elcc_eligible_capacity_mw",
@@ -423,11 +423,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "prm_project_elcc_surface_contribution.csv"), "r") \
-            as elcc_file:
-        reader = csv.reader(elcc_file)
-
+    with results_reader(os.path.join(
+            results_directory, "prm_project_elcc_surface_contribution.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
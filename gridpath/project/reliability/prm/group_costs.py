@@ -14,10 +14,10 @@
 
 
 import os.path
-import pandas as pd
 from pyomo.environ import Set, Expression, Param
 
 from gridpath.auxiliary.auxiliary import join_sets
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.project.reliability.prm.common_functions import \
     load_prm_type_modules
 from gridpath.auxiliary.dynamic_components import prm_cost_group_sets, \
@@ -55,7 +55,7 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     )
 
     # Import all possible PRM modules
-    project_df = pd.read_csv(
+    project_df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t",
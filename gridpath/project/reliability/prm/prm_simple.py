@@ -27,6 +27,7 @@ from pyomo.environ import Param, PercentFraction, Expression, value
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_values, validate_missing_inputs
 
@@ -87,11 +88,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "prm_project_elcc_simple_contribution.csv"),
-              "w", newline="") as \
-            results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "prm_project_elcc_simple_contribution.csv"
+    )) as writer:
         writer.writerow(["project", "period", "prm_zone", "technology",
                          "load_zone",
                          "capacity_mw",
@@ -254,11 +254,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "prm_project_elcc_simple_contribution.csv"), "r") \
-            as elcc_file:
-        reader = csv.reader(elcc_file)
-
+    with results_reader(os.path.join(
+            results_directory, "prm_project_elcc_simple_contribution.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
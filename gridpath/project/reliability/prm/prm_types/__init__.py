@@ -17,9 +17,9 @@ Describe ELCC-eligibility constraints on infrastructure.
 """
 
 import os.path
-import pandas as pd
 from pyomo.environ import Expression
 
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.project.reliability.prm.common_functions import \
     load_prm_type_modules
 
@@ -34,7 +34,7 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     :return:
     """
     # Import needed PRM modules
-    project_df = pd.read_csv(
+    project_df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t",
@@ -78,7 +78,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :param stage:
     :return:
     """
-    project_df = pd.read_csv(
+    project_df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t",
@@ -116,7 +116,7 @@ def export_results(scenario_directory, subproblem, stage, m, d):
 
     # Export module-specific results
     # Operational type modules
-    project_df = pd.read_csv(
+    project_df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
         sep="\t",
@@ -299,13 +299,17 @@ def import_results_into_database(
             pass
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
     # Required modules are the unique set of generator PRM types in
@@ -331,7 +335,8 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             imported_prm_modules[prm_m]. \
                 process_module_specific_results(
                 db=db, c=c, scenario_id=scenario_id,
-                subscenarios=subscenarios, quiet=quiet
+                subscenarios=subscenarios, quiet=quiet,
+                subproblem_stages=subproblem_stages
             )
         else:
             pass
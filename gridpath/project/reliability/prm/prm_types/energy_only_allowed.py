@@ -28,9 +28,11 @@ from pyomo.environ import Var, Set, Param, Constraint, NonNegativeReals, \
     Expression, value
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
 from gridpath.auxiliary.dynamic_components import prm_cost_group_sets, \
     prm_cost_group_prm_type
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 # TODO: rename deliverability_group_deliverability_cost_per_mw --> deliverability_group_deliverability_cost_per_mw_yr
@@ -313,11 +315,10 @@ def export_module_specific_results(m, d, scenario_directory, subproblem, stage,)
     """
 
     # Energy-only vs deliverable capacity by project
-    with open(os.path.join(
+    with results_writer(os.path.join(
             scenario_directory, subproblem, stage, "results",
             "project_prm_energy_only_and_deliverable_capacity.csv"
-    ), "w", newline="") as f:
-        writer = csv.writer(f)
+    )) as writer:
         writer.writerow([
             "project", "period", "prm_zone",
             "total_capacity_mw",
@@ -334,9 +335,10 @@ def export_module_specific_results(m, d, scenario_directory, subproblem, stage,)
             ])
 
     # Total capacity for all projects in group
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "deliverability_group_capacity_and_costs.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "deliverability_group_capacity_and_costs.csv"
+    )) as writer:
         writer.writerow([
             "deliverability_group", "period",
             "deliverability_group_no_cost_deliverable_capacity_mw",
@@ -516,12 +518,10 @@ def import_module_specific_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(
+    with results_reader(os.path.join(
             results_directory,
-            "project_prm_energy_only_and_deliverable_capacity.csv"),
-              "r") as deliv_file:
-        reader = csv.reader(deliv_file)
-
+            "project_prm_energy_only_and_deliverable_capacity.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             project = row[0]
@@ -576,11 +576,9 @@ def import_module_specific_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(
-            results_directory, "deliverability_group_capacity_and_costs.csv"),
-              "r") as capacity_costs_file:
-        reader = csv.reader(capacity_costs_file)
-
+    with results_reader(os.path.join(
+            results_directory, "deliverability_group_capacity_and_costs.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             group = row[0]
@@ -642,24 +640,32 @@ def import_module_specific_results_into_database(
                           many=False)
 
 
-def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
+def process_module_specific_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("update energy-only capacities")
 
     # Figure out RPS zone for each project
     project_period_eocap = c.execute(
-        """SELECT project, period, energy_only_capacity_mw
+        """SELECT project, period, subproblem_id, stage_id,
+        energy_only_capacity_mw
         FROM results_project_prm_deliverability
-            WHERE scenario_id = {};""".format(
-            scenario_id
+            WHERE scenario_id = {}
+            AND {};""".format(
+            scenario_id, subproblem_stage_filter
         )
     ).fetchall()
 
@@ -671,7 +677,7 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
     results = []
     for row in project_period_eocap:
         results.append(
-            (row[2], scenario_id, row[0], row[1])
+            (row[4], scenario_id, row[0], row[1], row[2], row[3])
         )
 
     for table in tables_to_update:
@@ -680,7 +686,9 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
             SET energy_only_capacity_mw = ?
             WHERE scenario_id = ?
             AND project = ?
-            AND period = ?;""".format(table)
+            AND period = ?
+            AND subproblem_id = ?
+            AND stage_id = ?;""".format(table)
 
         spin_on_database_lock(conn=db, cursor=c, sql=sql, data=results)
 
@@ -691,19 +699,14 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
         DELETE FROM 
         results_project_prm_deliverability_group_capacity_and_costs_agg 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Insert new results
     agg_sql = """
-        INSERT INTO 
-        results_project_prm_deliverability_group_capacity_and_costs_agg
-        (scenario_id, period, subproblem_id, stage_id,
-        spinup_or_lookahead, fraction_of_hours_in_subproblem, 
-        deliverable_capacity_cost)
-
         SELECT scenario_id, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem,
         (deliverable_capacity_cost * fraction_of_hours_in_subproblem) 
@@ -718,11 +721,17 @@ def process_module_specific_results(db, c, scenario_id, subscenarios, quiet):
         SUM(deliverable_capacity_cost) AS deliverable_capacity_cost
         FROM results_project_prm_deliverability_group_capacity_and_costs
         WHERE scenario_id = ?
+        AND {}
         GROUP BY scenario_id, subproblem_id, stage_id, period
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period)
-        ;"""
+        ;""".format(subproblem_stage_filter)
 
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,),
-                          many=False)
+    insert_aggregated_results(
+        conn=db, cursor=c,
+        table="results_project_prm_deliverability_group_capacity_and_costs_agg",
+        columns="""scenario_id, period, subproblem_id, stage_id,
+        spinup_or_lookahead, fraction_of_hours_in_subproblem, 
+        deliverable_capacity_cost""",
+        sql=agg_sql, data=(scenario_id,)
+    )
@@ -21,14 +21,21 @@ The main() function of this script can also be called with the
 """
 
 import argparse
+from contextlib import contextmanager, nullcontext
 from csv import reader, writer
 import datetime
+import hashlib
+from multiprocessing import Pool
 import os.path
 from pyomo.environ import AbstractModel, Suffix, DataPortal, SolverFactory, \
     SolverStatus, TerminationCondition
+from pyomo.solvers.plugins.solvers.direct_or_persistent_solver import \
+    DirectOrPersistentSolver
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 # from pyomo.util.infeasible import log_infeasible_constraints
 from pyutilib.services import TempfileManager
 import sys
+import time
 import warnings
 
 from gridpath.auxiliary.auxiliary import check_for_integer_subdirectories
@@ -36,7 +43,14 @@ from gridpath.common_functions import determine_scenario_directory, \
     get_scenario_name_parser, get_required_e2e_arguments_parser, get_solve_parser, \
     create_logs_directory_if_not_exists, Logging
 from gridpath.auxiliary.dynamic_components import DynamicComponents
-from gridpath.auxiliary.module_list import determine_modules, load_modules
+from gridpath.auxiliary.input_file_cache import INPUT_FILE_CACHE
+from gridpath.auxiliary.module_list import determine_modules, \
+    load_modules, ModuleRegistry
+from gridpath.auxiliary.profiler import PROFILE_FILENAME, Profiler, \
+    profile_step
+from gridpath.auxiliary.results_store import PARQUET_RESULTS_DIRECTORY, \
+    parquet_results, remove_parquet_results, results_writer
+from gridpath.auxiliary.warm_start import WarmStart, save_variable_values
 
 
 class ScenarioStructure(object):
@@ -111,13 +125,121 @@ class ScenarioStructure(object):
                              "final_commitment_stage", "commitment"])
 
 
+# The input files that modules read when adding their components to the
+# abstract model (e.g. to determine the projects' and transmission lines'
+# capacity and operational types); (sub)problems with identical model
+# structure input files have the same abstract model
+MODEL_STRUCTURE_INPUT_FILES = ["projects.tab", "transmission_lines.tab"]
+
+
+class ModelTemplates(object):
+    """
+    Keep the abstract models built for a chain of subproblems (along with
+    their dynamic components) by model structure, so that subproblems with
+    the same structure as a previous subproblem can reuse its abstract model
+    rather than rebuilding it; subproblems with a different structure get a
+    new abstract model. The solver is also kept so that it is reused across
+    subproblems, which avoids setting up persistent solver interfaces
+    (e.g. gurobi_persistent) for each subproblem.
+
+    The problem instance itself is still created for each subproblem from
+    the subproblem's data, as the sets (e.g. the timepoints) differ across
+    subproblems and the GridPath params are not mutable.
+    """
+    def __init__(self):
+        self.templates = dict()
+        self.solver = None
+        self.n_builds = 0
+        self.n_reuses = 0
+        self.build_seconds = 0
+
+    def get_template(self, structure_key):
+        """
+        :param structure_key: the model structure key of the subproblem (see
+            *get_model_structure_key*)
+        :return: tuple with the abstract model and dynamic components for
+            the structure key if already built, None otherwise
+        """
+        if structure_key in self.templates:
+            self.n_reuses += 1
+            return self.templates[structure_key]
+        else:
+            return None
+
+    def add_template(
+        self, structure_key, model, dynamic_components, build_seconds
+    ):
+        """
+        :param structure_key: the model structure key of the subproblem
+        :param model: the abstract model
+        :param dynamic_components: the populated dynamic components
+        :param build_seconds: the time it took to build the abstract model
+
+        Add an abstract model to the templates.
+        """
+        self.templates[structure_key] = (model, dynamic_components)
+        self.n_builds += 1
+        self.build_seconds += build_seconds
+
+    def timing_summary(self):
+        """
+        :return: str, a summary of the model builds and reuses and the
+            estimated time saved
+        """
+        avg_build_seconds = \
+            self.build_seconds / self.n_builds if self.n_builds else 0
+        return "Abstract model built {} time(s) in {:.3f} seconds and " \
+               "reused {} time(s); estimated build time saved: {:.3f} " \
+               "seconds.".format(
+                   self.n_builds, self.build_seconds, self.n_reuses,
+                   self.n_reuses * avg_build_seconds
+               )
+
+
+def get_model_structure_key(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem name
+    :param stage: the stage subproblem name
+    :return: tuple with the hash of the contents of each model structure
+        input file (None if the file doesn't exist)
+
+    The abstract model can be reused by (sub)problems with the same key.
+    """
+    key = list()
+    for input_file in MODEL_STRUCTURE_INPUT_FILES:
+        file_path = os.path.join(
+            scenario_directory, str(subproblem), str(stage), "inputs",
+            input_file
+        )
+        if os.path.exists(file_path):
+            with open(file_path, "rb") as f:
+                key.append(hashlib.sha1(f.read()).hexdigest())
+        else:
+            key.append(None)
+
+    return tuple(key)
+
+
 def create_and_solve_problem(scenario_directory, subproblem, stage,
-                             parsed_arguments):
+                             parsed_arguments, module_registry=None,
+                             model_templates=None, profiler=None,
+                             warm_start=None):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem: the horizon subproblem name
     :param stage: the stage subproblem name
     :param parsed_arguments: the user-defined script arguments
+    :param module_registry: the scenario's ModuleRegistry; if not
+        specified, the modules are determined and loaded here
+    :param model_templates: the ModelTemplates to get the abstract model
+        and solver from if the user requested model reuse; if not
+        specified, the abstract model is built here
+    :param profiler: the Profiler to record the steps with if the user
+        requested profiling or a construction report (optional)
+    :param warm_start: the WarmStart to get the variable values to
+        warm-start the problem with if the user requested a warm start
+        (optional)
     :return: modules_to_use (list of module names used in scenario),
         loaded_modules (Python objects), dynamic_inputs (the populated
         dynamic components class), instance (the problem instance), results
@@ -133,73 +255,130 @@ def create_and_solve_problem(scenario_directory, subproblem, stage,
     *determine_modules* method (imported from
     *gridpath.auxiilary.module_list*) and import those modules (via the
     *load_modules* method imported from *gridpath.auxiliary.module_list*).
+    If a module registry is passed, we get the modules from it instead, as
+    they have already been determined and loaded for the scenario.
 
     We then determine the dynamic model components based on the selected
     modules and input data. See *populate_dynamic_components* method.
 
     The next step is to create the abstract model (see *create_abstract_model*
     method) and load the input data into its components (see
-    *load_scenario_data*).
+    *load_scenario_data*). If the user requested model reuse and a
+    previous subproblem had the same model structure (see
+    *get_model_structure_key*), we reuse its abstract model and only load
+    this subproblem's data.
 
     Finally, we compile and solve the problem (*create_problem_instance* and
     *solve* methods respectively). If any variables need to be fixed,
-    this is done before solving (see the *fix_variables* method).
+    this is done before solving (see the *fix_variables* method). If the
+    user requested a warm start, the values of the variables are also set
+    before solving (see *gridpath.auxiliary.warm_start*).
     """
-    # Create pyomo abstract model class
-    model = AbstractModel()
-    dynamic_components = DynamicComponents()
-
     # Determine/load modules and dynamic components
     modules_to_use, loaded_modules = \
         set_up_gridpath_modules(
             scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
+            subproblem=subproblem, stage=stage,
+            module_registry=module_registry
         )
 
-    # Create the abstract model; some components are initialized here
-    if not parsed_arguments.quiet:
-        print("Building model...")
-    create_abstract_model(
-        model, dynamic_components, loaded_modules, scenario_directory,
-        subproblem, stage
-    )
+    # Check if we can reuse the abstract model from a previous subproblem
+    template = None
+    if model_templates is not None:
+        structure_key = get_model_structure_key(
+            scenario_directory, subproblem, stage
+        )
+        template = model_templates.get_template(structure_key)
+
+    if template is not None:
+        if not parsed_arguments.quiet:
+            print("Reusing model...")
+        model, dynamic_components = template
+    else:
+        build_start = time.time()
+
+        # Create pyomo abstract model class
+        model = AbstractModel()
+        dynamic_components = DynamicComponents()
+
+        # Create the abstract model; some components are initialized here
+        if not parsed_arguments.quiet:
+            print("Building model...")
+        create_abstract_model(
+            model, dynamic_components, loaded_modules, scenario_directory,
+            subproblem, stage, profiler
+        )
 
-    # Create a dual suffix component
-    # TODO: maybe this shouldn't always be needed
-    model.dual = Suffix(direction=Suffix.IMPORT)
+        # Create a dual suffix component
+        # TODO: maybe this shouldn't always be needed
+        model.dual = Suffix(direction=Suffix.IMPORT)
+
+        if model_templates is not None:
+            model_templates.add_template(
+                structure_key, model, dynamic_components,
+                time.time() - build_start
+            )
 
     # Load the scenario data
     if not parsed_arguments.quiet:
         print("Loading data...")
     scenario_data = load_scenario_data(
         model, dynamic_components, loaded_modules,
-        scenario_directory, subproblem, stage
+        scenario_directory, subproblem, stage, profiler
     )
 
     if not parsed_arguments.quiet:
         print("Creating problem instance...")
-    instance = create_problem_instance(model, scenario_data)
+    instance = create_problem_instance(model, scenario_data, profiler)
 
     # Fix variables if modules request so
     instance = fix_variables(
         instance, dynamic_components, scenario_directory, subproblem, stage,
-        loaded_modules
+        loaded_modules, profiler
     )
 
+    # Set the variable values to warm-start from if requested
+    n_warm_start_values = 0 if warm_start is None \
+        else warm_start.set_values(instance, subproblem, stage)
+    if n_warm_start_values > 0 and not parsed_arguments.quiet:
+        print("Warm-starting with {} variable values...".format(
+            n_warm_start_values))
+
     # Solve
     if not parsed_arguments.quiet:
         print("Solving...")
-    results = solve(instance, parsed_arguments)
+    with profile_step(profiler, "solve"):
+        if model_templates is not None:
+            if model_templates.solver is None:
+                model_templates.solver = get_solver(parsed_arguments)
+            results = solve(
+                instance, parsed_arguments, model_templates.solver, profiler,
+                n_warm_start_values > 0
+            )
+        else:
+            results = solve(instance, parsed_arguments, profiler=profiler,
+                            warm_start=n_warm_start_values > 0)
 
     return instance, results, dynamic_components
 
 
-def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
+def run_optimization(scenario_directory, subproblem, stage, parsed_arguments,
+                     module_registry=None, model_templates=None,
+                     profiler=None, warm_start=None):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem: if there are horizon subproblems, the horizon
     :param stage: if there are stage subproblems, the stage
     :param parsed_arguments: the parsed script arguments
+    :param module_registry: the scenario's ModuleRegistry; if not
+        specified, the modules are determined and loaded for each step
+    :param model_templates: the ModelTemplates to reuse abstract models
+        from (optional)
+    :param profiler: the Profiler to record the steps with if the user
+        requested profiling or a construction report (optional)
+    :param warm_start: the WarmStart to warm-start the (sub)problem from
+        and to keep the solution in for the next (sub)problem if the user
+        requested a warm start (optional)
     :return: return the objective function value (Total_Cost); only used in
         testing
 
@@ -211,12 +390,25 @@ def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
 
     Summarize results. See *summarize_results()* method.
 
+    If profiling, write the (sub)problem profile to the results directory,
+    and if the user requested a construction report, write the report of
+    the construction of the instance components to the logs directory (see
+    *gridpath.auxiliary.profiler*).
+
+    If the user requested the parquet results format, the results tables
+    are written to Parquet rather than CSV files (see
+    *gridpath.auxiliary.results_store*).
+
     Return the objective function (Total_Cost) value; only used in testing mode
 
     """
 
     # If directed to do so, log optimization run
-    if parsed_arguments.log:
+    # If running subproblems in parallel, always log, as the output of the
+    # different processes is interleaved in the terminal; each process
+    # writes to its own log file
+    parallel = parsed_arguments.n_parallel_subproblems > 1
+    if parsed_arguments.log or parallel:
         logs_directory = create_logs_directory_if_not_exists(
             scenario_directory, subproblem, stage)
 
@@ -230,7 +422,8 @@ def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
         # (see auxiliary/auxiliary.py)
         logger = Logging(
             logs_dir=logs_directory,
-            start_time=datetime.datetime.now(), e2e=False, process_id=None
+            start_time=datetime.datetime.now(), e2e=False,
+            process_id=os.getpid() if parallel else None
         )
         sys.stdout = logger
         sys.stderr = logger
@@ -255,20 +448,68 @@ def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
     # Create problem instance and solve it
     solved_instance, results, dynamic_components = \
         create_and_solve_problem(scenario_directory, subproblem, stage,
-                                 parsed_arguments)
+                                 parsed_arguments, module_registry,
+                                 model_templates, profiler, warm_start)
+
+    # Keep the solution to warm-start the next (sub)problem from
+    if warm_start is not None and results.solver.termination_condition \
+            == TerminationCondition.optimal:
+        warm_start.update(solved_instance)
 
-    # Save the scenario results to disk
-    save_results(
-        scenario_directory, subproblem, stage, solved_instance, results,
-        dynamic_components, parsed_arguments
+    # Remove any Parquet results from a previous run, so that they don't get
+    # imported with this run's results
+    results_directory = os.path.join(
+        scenario_directory, str(subproblem), str(stage), "results"
     )
+    remove_parquet_results(scenario_directory, subproblem, stage)
+
+    # Save the scenario results to disk and summarize them; with the parquet
+    # results format, the results tables are written to Parquet instead of
+    # CSV files
+    if parsed_arguments.results_format == "parquet":
+        results_context = parquet_results(
+            scenario_directory, subproblem, stage, results_directory
+        )
+    else:
+        results_context = nullcontext()
+    with results_context:
+        save_results(
+            scenario_directory, subproblem, stage, solved_instance, results,
+            dynamic_components, parsed_arguments, module_registry, profiler
+        )
+        summarize_results(scenario_directory, subproblem, stage,
+                          parsed_arguments, module_registry, profiler)
+
+    if parsed_arguments.results_format == "parquet" \
+            and not parsed_arguments.quiet:
+        print("Results written to Parquet in {}.".format(
+            os.path.join(scenario_directory, PARQUET_RESULTS_DIRECTORY)
+        ))
+
+    # Write the profile; otherwise, remove any profile from a previous run,
+    # so that it doesn't get imported with this run's results
+    if parsed_arguments.profile:
+        profiler.write_profile(results_directory)
+        if not parsed_arguments.quiet:
+            print("Profile written to {}.".format(results_directory))
+    elif os.path.exists(os.path.join(results_directory, PROFILE_FILENAME)):
+        os.remove(os.path.join(results_directory, PROFILE_FILENAME))
+
+    # Write the component construction report
+    if parsed_arguments.report_construction:
+        logs_directory = create_logs_directory_if_not_exists(
+            scenario_directory, subproblem, stage)
+        profiler.write_construction_report(logs_directory)
+        if not parsed_arguments.quiet:
+            print("Construction report written to {}.".format(
+                logs_directory))
 
-    # Summarize results
-    summarize_results(scenario_directory, subproblem, stage, parsed_arguments)
+    if profiler is not None:
+        profiler.reset()
 
     # If logging, we need to return sys.stdout to original (i.e. stop writing
     # to log file)
-    if parsed_arguments.log:
+    if parsed_arguments.log or parallel:
         sys.stdout = stdout_original
         sys.stderr = stderr_original
 
@@ -290,38 +531,214 @@ def run_scenario(structure, parsed_arguments):
     Check the scenario structure, iterate over all subproblems if they
     exist, and run the subproblem optimization.
 
+    If the user has requested more than one parallel subproblem, we group
+    the subproblems into chains of linked subproblems (see
+    *get_linked_subproblem_chains*) and run the chains in a pool of
+    processes. The subproblems within a chain, as well as the stages within a
+    subproblem, are still run sequentially.
+
+    The scenario's modules are determined and loaded once (see the
+    *ModuleRegistry* class in *gridpath.auxiliary.module_list*) and reused
+    by all subproblems; when running in parallel, each chain of subproblems
+    sets up its own module registry, as loaded modules can't be passed to
+    other processes.
+
     The objective function is returned, but it's only really used if we
     are in 'testing' mode.
     """
     # If no subproblem directories (empty list), run main problem
     if not structure.subproblems:
+        module_registry = ModuleRegistry(structure.main_scenario_directory)
+        profiler = Profiler() if parsed_arguments.profile \
+            or parsed_arguments.report_construction else None
+        if profiler is not None:
+            profiler.start()
         objective_values = run_optimization(
-            structure.main_scenario_directory, "", "", parsed_arguments)
+            structure.main_scenario_directory, "", "", parsed_arguments,
+            module_registry, profiler=profiler,
+            warm_start=get_warm_start(parsed_arguments))
+        if profiler is not None:
+            profiler.stop()
+        if not parsed_arguments.quiet:
+            print(module_registry.timing_summary())
+            print(INPUT_FILE_CACHE.summary())
+    # Otherwise, run the subproblems in parallel if requested
+    elif parsed_arguments.n_parallel_subproblems > 1:
+        chains = get_linked_subproblem_chains(
+            scenario_directory=structure.main_scenario_directory,
+            subproblems=structure.subproblems
+        )
+        pool_args = [
+            (structure.main_scenario_directory, chain,
+             structure.stages_by_subproblem, parsed_arguments)
+            for chain in chains
+        ]
+        with Pool(
+            processes=min(parsed_arguments.n_parallel_subproblems, len(chains))
+        ) as pool:
+            chain_objective_values = pool.starmap(
+                run_subproblem_chain, pool_args
+            )
+
+        # Combine the chain results, keeping the subproblem order
+        objective_values_by_subproblem = dict()
+        for chain_values in chain_objective_values:
+            objective_values_by_subproblem.update(chain_values)
+        objective_values = {
+            subproblem: objective_values_by_subproblem[subproblem]
+            for subproblem in structure.subproblems
+        }
+    # Or sequentially
     else:
-        # Create dictionary with which we'll keep track
-        # of subproblem objective function values
-        objective_values = {}
-        for subproblem in structure.subproblems:
-            # If no stages in this subproblem (empty list), run the subproblem
-            if not structure.stages_by_subproblem[subproblem]:
-                objective_values[subproblem] = run_optimization(
-                    structure.main_scenario_directory, subproblem, "",
-                    parsed_arguments)
-            # Otherwise, run the stage problem
-            else:
-                objective_values[subproblem] = {}
-                for stage in structure.stages_by_subproblem[subproblem]:
-                    objective_values[subproblem][stage] = \
-                        run_optimization(
-                            structure.main_scenario_directory,
-                            subproblem, stage,
-                            parsed_arguments)
+        objective_values = run_subproblem_chain(
+            structure.main_scenario_directory, structure.subproblems,
+            structure.stages_by_subproblem, parsed_arguments
+        )
+    return objective_values
+
+
+def get_warm_start(parsed_arguments):
+    """
+    :param parsed_arguments: the parsed script arguments
+    :return: the WarmStart for a chain of subproblems, or None if the user
+        didn't request a warm start
+    """
+    if not parsed_arguments.warm_start \
+            and parsed_arguments.warm_start_scenario is None:
+        return None
+
+    if parsed_arguments.warm_start_scenario is not None:
+        reference_scenario_directory = determine_scenario_directory(
+            scenario_location=parsed_arguments.scenario_location,
+            scenario_name=parsed_arguments.warm_start_scenario
+        )
+    else:
+        reference_scenario_directory = None
+
+    return WarmStart(
+        from_previous=parsed_arguments.warm_start,
+        reference_scenario_directory=reference_scenario_directory
+    )
+
+
+def run_subproblem_chain(
+    scenario_directory, subproblems, stages_by_subproblem, parsed_arguments,
+    module_registry=None
+):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblems: list of the subproblems to run in order
+    :param stages_by_subproblem: dictionary with the list of stages (if
+        any) for each subproblem
+    :param parsed_arguments: the parsed script arguments
+    :param module_registry: the scenario's ModuleRegistry; if not
+        specified, a registry is set up for the chain
+    :return: dictionary with the objective function value (or a dictionary
+        of objective function values by stage) for each subproblem
+
+    Run the subproblems (and their stages) one after the other. If the user
+    requested model reuse, the subproblems of the chain share the abstract
+    models and solver (see *ModelTemplates*). If the user requested
+    profiling or a construction report, the subproblems of the chain share a
+    *Profiler*, and if the user requested a warm start from the previous
+    subproblem, each subproblem and stage is warm-started from the solution
+    of the one before it in the chain.
+    """
+    if module_registry is None:
+        module_registry = ModuleRegistry(scenario_directory)
+
+    model_templates = \
+        ModelTemplates() if parsed_arguments.reuse_model else None
+    profiler = Profiler() if parsed_arguments.profile \
+            or parsed_arguments.report_construction else None
+    if profiler is not None:
+        profiler.start()
+    warm_start = get_warm_start(parsed_arguments)
+
+    # Create dictionary with which we'll keep track
+    # of subproblem objective function values
+    objective_values = {}
+    for subproblem in subproblems:
+        # If no stages in this subproblem (empty list), run the subproblem
+        if not stages_by_subproblem[subproblem]:
+            objective_values[subproblem] = run_optimization(
+                scenario_directory, subproblem, "", parsed_arguments,
+                module_registry, model_templates, profiler, warm_start)
+        # Otherwise, run the stage problem
+        else:
+            objective_values[subproblem] = {}
+            for stage in stages_by_subproblem[subproblem]:
+                objective_values[subproblem][stage] = \
+                    run_optimization(
+                        scenario_directory, subproblem, stage,
+                        parsed_arguments, module_registry, model_templates,
+                        profiler, warm_start)
+
+    if profiler is not None:
+        profiler.stop()
+
+    if not parsed_arguments.quiet:
+        print(module_registry.timing_summary())
+        if model_templates is not None:
+            print(model_templates.timing_summary())
+        print(INPUT_FILE_CACHE.summary())
+
     return objective_values
 
 
+def get_linked_subproblem_chains(scenario_directory, subproblems):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblems: list of the scenario's subproblems (in order)
+    :return: list of lists of subproblems (in order) that must be run
+        sequentially
+
+    Subproblems are independent unless the linked_subproblems_map.csv file
+    links the timepoints of one subproblem to the next. Group the
+    subproblems that are linked (directly or via other subproblems) into
+    chains; each chain must be run sequentially but different chains can be
+    run in parallel. Without a map file, each subproblem is its own chain.
+    """
+    # Each subproblem starts out in its own chain
+    chain_by_subproblem = {subproblem: [subproblem]
+                           for subproblem in subproblems}
+
+    # The map file has the subproblem IDs as integers
+    subproblem_by_id = {int(subproblem): subproblem
+                        for subproblem in subproblems}
+
+    map_file = os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    if os.path.exists(map_file):
+        with open(map_file, "r") as f:
+            map_reader = reader(f, delimiter=",")
+            header = next(map_reader)
+            for row in map_reader:
+                subproblem = \
+                    subproblem_by_id[int(row[header.index("subproblem")])]
+                subproblem_to_link = subproblem_by_id[
+                    int(row[header.index("subproblem_to_link")])
+                ]
+                chain = chain_by_subproblem[subproblem]
+                chain_to_link = chain_by_subproblem[subproblem_to_link]
+                # Merge the chains if they are not already the same chain
+                if chain is not chain_to_link:
+                    chain.extend(chain_to_link)
+                    for s in chain_to_link:
+                        chain_by_subproblem[s] = chain
+
+    # Get the unique chains with the subproblems in the scenario order
+    chains = []
+    for subproblem in subproblems:
+        chain = chain_by_subproblem[subproblem]
+        if subproblem == min(chain, key=subproblems.index):
+            chains.append(sorted(chain, key=subproblems.index))
+
+    return chains
+
+
 def save_results(
     scenario_directory, subproblem, stage, instance, results,
-    dynamic_components, parsed_arguments
+    dynamic_components, parsed_arguments, module_registry=None, profiler=None
 ):
     """
     :param scenario_directory:
@@ -330,6 +747,8 @@ def save_results(
     :param instance: model instance (solution loaded after solving by default)
     :param dynamic_components:
     :param parsed_arguments:
+    :param module_registry: the scenario's ModuleRegistry (optional)
+    :param profiler: the Profiler (optional)
     :return:
 
     Create a results directory for the (sub)problem.
@@ -337,6 +756,8 @@ def save_results(
     Export pass through imports.
     Save objective function value.
     Save constraint duals.
+    Save the variable values if requested (see
+    *gridpath.auxiliary.warm_start*).
     """
     if not parsed_arguments.quiet:
         print("Saving results...")
@@ -363,16 +784,21 @@ def save_results(
             f.write("optimal")
 
         export_results(scenario_directory, subproblem, stage, instance,
-                       dynamic_components)
+                       dynamic_components, module_registry, profiler)
 
         export_pass_through_inputs(scenario_directory, subproblem, stage,
-                                   instance)
+                                   instance, module_registry, profiler)
 
         save_objective_function_value(
             scenario_directory, subproblem, stage, instance
         )
 
-        save_duals(scenario_directory, subproblem, stage, instance)
+        save_duals(scenario_directory, subproblem, stage, instance,
+                   module_registry, profiler)
+
+        # Save the variable values to warm-start other scenarios with
+        if parsed_arguments.save_warm_start_values:
+            save_variable_values(instance, results_directory)
 
     # If solver status wasn't optimal record that
     else:
@@ -417,7 +843,7 @@ def save_results(
 
 def create_abstract_model(
     model, dynamic_components, loaded_modules, scenario_directory, subproblem,
-    stage
+    stage, profiler=None
 ):
     """
     :param model: the Pyomo AbstractModel object
@@ -426,6 +852,7 @@ def create_abstract_model(
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param profiler: the Profiler (optional)
 
     To create the abstract model, we iterate over all required modules and
     call their *add_model_components* method to add components to the Pyomo
@@ -435,14 +862,19 @@ def create_abstract_model(
     """
     for m in loaded_modules:
         if hasattr(m, 'add_model_components'):
-            m.add_model_components(
-                model, dynamic_components, scenario_directory, subproblem,
-                stage
-            )
+            with profile_step(profiler, "add_model_components", m.__name__):
+                m.add_model_components(
+                    model, dynamic_components, scenario_directory, subproblem,
+                    stage
+                )
+            if profiler is not None:
+                profiler.add_component_modules(
+                    model.component_map().keys(), m.__name__
+                )
 
 
 def load_scenario_data(model, dynamic_components, loaded_modules,
-                       scenario_directory, subproblem, stage):
+                       scenario_directory, subproblem, stage, profiler=None):
     """
     :param model: the Pyomo abstract model object with components added
     :param dynamic_components: the dynamic components class
@@ -451,6 +883,7 @@ def load_scenario_data(model, dynamic_components, loaded_modules,
     :param scenario_directory: the main scenario directory
     :param subproblem: the horizon subproblem
     :param stage: the stage subproblem
+    :param profiler: the Profiler (optional)
     :return: the DataPortal object populated with the input data
 
     Iterate over all required GridPath modules and call their
@@ -462,31 +895,38 @@ def load_scenario_data(model, dynamic_components, loaded_modules,
     data_portal = DataPortal()
     for m in loaded_modules:
         if hasattr(m, "load_model_data"):
-            m.load_model_data(model, dynamic_components, data_portal,
-                              scenario_directory, subproblem, stage)
+            with profile_step(profiler, "load_model_data", m.__name__):
+                m.load_model_data(model, dynamic_components, data_portal,
+                                  scenario_directory, subproblem, stage)
         else:
             pass
     return data_portal
 
 
-def create_problem_instance(model, loaded_data):
+def create_problem_instance(model, loaded_data, profiler=None):
     """
     :param model: the AbstractModel Pyomo object with components added
     :param loaded_data: the DataPortal object with the data loaded in and
         linked to the relevant model components
+    :param profiler: the Profiler (optional); if specified, the
+        construction of each component is profiled
     :return: the compiled problem instance
 
     Compile the problem based on the abstract model formulation and the data
     loaded into the model components.
     """
     # Create problem instance
-    instance = model.create_instance(loaded_data)
+    if profiler is not None:
+        with profiler.component_construction():
+            instance = model.create_instance(loaded_data)
+    else:
+        instance = model.create_instance(loaded_data)
     return instance
 
 
 def fix_variables(
     instance, dynamic_components, scenario_directory, subproblem, stage,
-    loaded_modules
+    loaded_modules, profiler=None
 ):
     """
     :param instance: the compiled problem instance
@@ -495,6 +935,7 @@ def fix_variables(
     :param subproblem: str
     :param stage: str
     :param loaded_modules: list of imported GridPath modules as Python objects
+    :param profiler: the Profiler (optional)
     :return: the problem instance with the relevant variables fixed
 
     Iterate over the required GridPath modules and fix variables by calling
@@ -503,8 +944,9 @@ def fix_variables(
     """
     for m in loaded_modules:
         if hasattr(m, "fix_variables"):
-            m.fix_variables(instance, dynamic_components,
-                            scenario_directory, subproblem, stage)
+            with profile_step(profiler, "fix_variables", m.__name__):
+                m.fix_variables(instance, dynamic_components,
+                                scenario_directory, subproblem, stage)
         else:
             pass
 
@@ -524,13 +966,17 @@ def view_loaded_data(loaded_modules, instance):
             m.view_loaded_data(instance)
 
 
-def solve(instance, parsed_arguments):
+def get_solver(parsed_arguments):
     """
-    :param instance: the compiled problem instance
     :param parsed_arguments: the user-defined arguments (parsed)
-    :return: the problem results
+    :return: the solver object with the user-requested options applied
 
-    Send the compiled problem instance to the solver and solve.
+    Get the solver specified on the command line or in the
+    solver_options.csv file (Cbc if neither) and apply the solver options.
+
+    If the user requested a direct or persistent solver interface (see
+    *get_solver_interface_name*), we use the solver's in-memory interface
+    instead of writing the problem to a file for the solver executable.
     """
     # Start with solver name specified on command line
     solver_name = parsed_arguments.solver
@@ -568,6 +1014,11 @@ def solve(instance, parsed_arguments):
         if parsed_arguments.solver is None:
             solver_name = "cbc"
 
+    # Use the direct or persistent interface if requested and available
+    solver_name = get_solver_interface_name(
+        solver_name, parsed_arguments.solver_interface
+    )
+
     # Get solver
     # If a solver executable is specified, pass it to Pyomo
     if parsed_arguments.solver_executable is not None:
@@ -585,19 +1036,156 @@ def solve(instance, parsed_arguments):
         else:
             solver.options[opt] = solver_options[opt]
 
+    return solver
+
+
+def get_solver_interface_name(solver_name, solver_interface):
+    """
+    :param solver_name: str, the name of the solver (e.g. "gurobi")
+    :param solver_interface: str, the requested solver interface: "file",
+        "direct", or "persistent"
+    :return: str, the name of the solver to get from Pyomo's SolverFactory
+
+    With the default "file" interface, Pyomo writes the problem to an LP or
+    NL file and calls the solver executable. The "direct" and "persistent"
+    interfaces instead pass the problem to the solver's Python bindings in
+    memory (e.g. gurobi_direct, cplex_persistent), which avoids writing
+    and parsing large problem files; the persistent interface also keeps the
+    solver's model between solves. If the solver doesn't have the requested
+    interface or the solver's Python bindings are not available, we warn
+    the user and fall back to the file interface.
+    """
+    if solver_interface == "file" or solver_name.endswith(
+            ("_direct", "_persistent")
+    ):
+        return solver_name
+
+    interface_solver_name = "{}_{}".format(solver_name, solver_interface)
+    if interface_solver_name in SolverFactory \
+            and SolverFactory(interface_solver_name).available(
+                exception_flag=False
+            ):
+        return interface_solver_name
+    else:
+        warnings.warn(
+            "Solver interface {} is not available for solver {}. Writing "
+            "the problem to a file for the solver instead.".format(
+                solver_interface, solver_name
+            )
+        )
+        return solver_name
+
+
+@contextmanager
+def record_problem_write_times(solver, write_times):
+    """
+    :param solver: the solver object
+    :param write_times: list to append the problem write times to
+
+    Context manager that records the time the solver spends writing the
+    problem to a file (file interfaces) or passing the problem to the
+    solver's in-memory model (direct and persistent interfaces), so that it
+    can be reported separately from the solve time.
+
+    Pyomo does this in the solver's *_convert_problem* and *_set_instance*
+    methods respectively, so we wrap the method of the solver object while
+    solving.
+    """
+    method_name = "_set_instance" \
+        if isinstance(solver, DirectOrPersistentSolver) \
+        else "_convert_problem"
+    method = getattr(solver, method_name, None)
+
+    if method is None:
+        yield
+    else:
+        def timed_method(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                write_times.append(time.perf_counter() - start_time)
+
+        setattr(solver, method_name, timed_method)
+        try:
+            yield
+        finally:
+            delattr(solver, method_name)
+
+
+def solve(instance, parsed_arguments, solver=None, profiler=None,
+          warm_start=False):
+    """
+    :param instance: the compiled problem instance
+    :param parsed_arguments: the user-defined arguments (parsed)
+    :param solver: the solver object to use (optional); if not specified,
+        the solver is created here (see *get_solver*)
+    :param profiler: the Profiler (optional); if specified, the problem
+        write time is recorded as its own step
+    :param warm_start: boolean, whether to pass the values of the variables
+        to the solver as a warm start (if the solver supports warm starts)
+    :return: the problem results
+
+    Send the compiled problem instance to the solver and solve. Persistent
+    solver interfaces (e.g. gurobi_persistent) are given the instance
+    before solving.
+
+    The time it takes to write the problem to a file or to pass it to the
+    solver's in-memory interface is reported separately from the solve
+    time (see *record_problem_write_times*).
+    """
+    if solver is None:
+        solver = get_solver(parsed_arguments)
+
     # Solve
     # Note: Pyomo moves the results to the instance object by default.
     # If you want the results to stay into a results object, set the
     # load_solutions argument to False:
     # >>> results = solver.solve(instance, load_solutions=False)
 
-    results = solver.solve(
-        instance,
-        tee=not parsed_arguments.mute_solver_output,
-        keepfiles=parsed_arguments.keepfiles,
-        symbolic_solver_labels=parsed_arguments.symbolic
+    # Only pass the warm start to solvers that support it
+    warm_start_kwargs = dict()
+    if warm_start:
+        if solver.available(exception_flag=False) \
+                and solver.warm_start_capable():
+            warm_start_kwargs["warmstart"] = True
+        elif not parsed_arguments.quiet:
+            print("Solver does not support warm starts. Solving without "
+                  "warm start.")
+
+    write_times = list()
+    solve_start_time = time.perf_counter()
+    with record_problem_write_times(solver, write_times):
+        if isinstance(solver, PersistentSolver):
+            solver.set_instance(
+                instance, symbolic_solver_labels=parsed_arguments.symbolic
+            )
+            results = solver.solve(
+                tee=not parsed_arguments.mute_solver_output,
+                keepfiles=parsed_arguments.keepfiles,
+                **warm_start_kwargs
+            )
+        else:
+            results = solver.solve(
+                instance,
+                tee=not parsed_arguments.mute_solver_output,
+                keepfiles=parsed_arguments.keepfiles,
+                symbolic_solver_labels=parsed_arguments.symbolic,
+                **warm_start_kwargs
+            )
+    write_seconds = sum(write_times)
+    solve_seconds = max(
+        time.perf_counter() - solve_start_time - write_seconds, 0.0
     )
 
+    if not parsed_arguments.quiet:
+        print("Problem {} in {:.3f} seconds; solved in {:.3f} seconds."
+              .format("passed to the solver interface"
+                      if isinstance(solver, DirectOrPersistentSolver)
+                      else "written to file", write_seconds, solve_seconds))
+    if profiler is not None:
+        profiler.add_inner_step("write_problem", write_seconds)
+
     # Can optionally log infeasibilities but this has resulted in false
     # positives due to rounding errors larger than the default tolerance
     # of 1E-6.
@@ -607,7 +1195,8 @@ def solve(instance, parsed_arguments):
 
 
 def export_results(
-    scenario_directory, subproblem, stage, instance, dynamic_components
+    scenario_directory, subproblem, stage, instance, dynamic_components,
+    module_registry=None, profiler=None
 ):
     """
     :param scenario_directory:
@@ -615,6 +1204,8 @@ def export_results(
     :param stage:
     :param instance:
     :param dynamic_components:
+    :param module_registry: the scenario's ModuleRegistry (optional)
+    :param profiler: the Profiler (optional)
     :return:
 
     Export results for each loaded module (if applicable)
@@ -623,29 +1214,32 @@ def export_results(
     modules_to_use, loaded_modules = \
         set_up_gridpath_modules(
             scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
+            subproblem=subproblem, stage=stage,
+            module_registry=module_registry
         )
 
     for m in loaded_modules:
         if hasattr(m, "export_results"):
-            m.export_results(
-                scenario_directory, subproblem, stage, instance,
-                dynamic_components
-            )
+            with profile_step(profiler, "export_results", m.__name__):
+                m.export_results(
+                    scenario_directory, subproblem, stage, instance,
+                    dynamic_components
+                )
     else:
         pass
 
 
 def export_pass_through_inputs(
-        scenario_directory, subproblem, stage, instance
+        scenario_directory, subproblem, stage, instance, module_registry=None,
+        profiler=None
 ):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
     :param instance:
-    :param dynamic_components:
-    :param loaded_modules:
+    :param module_registry: the scenario's ModuleRegistry (optional)
+    :param profiler: the Profiler (optional)
     :return:
 
     Export pass through inputs for each loaded module (if applicable)
@@ -654,14 +1248,18 @@ def export_pass_through_inputs(
     modules_to_use, loaded_modules = \
         set_up_gridpath_modules(
             scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
+            subproblem=subproblem, stage=stage,
+            module_registry=module_registry
         )
 
     for m in loaded_modules:
         if hasattr(m, "export_pass_through_inputs"):
-            m.export_pass_through_inputs(
-                scenario_directory, subproblem, stage, instance
-            )
+            with profile_step(
+                profiler, "export_pass_through_inputs", m.__name__
+            ):
+                m.export_pass_through_inputs(
+                    scenario_directory, subproblem, stage, instance
+                )
     else:
         pass
 
@@ -694,61 +1292,88 @@ def save_objective_function_value(scenario_directory, subproblem, stage,
         # objective_file.write(str(objective_function_value))
 
 
-def save_duals(scenario_directory, subproblem, stage, instance):
+def save_duals(scenario_directory, subproblem, stage, instance,
+               module_registry=None, profiler=None):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
     :param instance:
+    :param module_registry: the scenario's ModuleRegistry (optional)
+    :param profiler: the Profiler (optional)
     :return:
 
-    Save the duals of various constraints.
+    Save the duals of various constraints. If profiling, writing the duals
+    of each constraint is recorded as a step of the module that requested
+    it.
     """
     # Determine/load modules and dynamic components
     modules_to_use, loaded_modules = \
         set_up_gridpath_modules(
             scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
+            subproblem=subproblem, stage=stage,
+            module_registry=module_registry
         )
 
     instance.constraint_indices = {}
+    constraint_modules = {}
     for m in loaded_modules:
         if hasattr(m, "save_duals"):
             m.save_duals(instance)
+            for c in instance.constraint_indices.keys():
+                constraint_modules.setdefault(c, m.__name__)
         else:
             pass
 
     for c in list(instance.constraint_indices.keys()):
-        constraint_object = getattr(instance, c)
-        with open(os.path.join(
-            scenario_directory, subproblem, stage, "results", str(c) + ".csv"),
-            "w", newline=""
-        ) as duals_results_file:
-            duals_writer = writer(duals_results_file)
-            duals_writer.writerow(instance.constraint_indices[c])
-            for index in constraint_object:
-                try:
-                    duals_writer.writerow(list(index) +
-                                          [instance.dual[constraint_object[index]]]
-                                          )
-                # We get an error when trying to export duals with CPLEX
-                # when solving MIPs, so catch it here and ignore to avoid
-                # breaking the script, but throw a warning
-                except KeyError:
-                    warnings.warn("""
-                    KeyError caught when saving duals. Duals were not exported.
-                    This is expected if solving a MIP with CPLEX, 
-                    not otherwise.
-                    """)
-                    pass
-
-
-def summarize_results(scenario_directory, subproblem, stage, parsed_arguments):
+        with profile_step(profiler, "save_duals", constraint_modules[c], c):
+            write_constraint_duals(
+                scenario_directory, subproblem, stage, instance, c
+            )
+
+
+def write_constraint_duals(scenario_directory, subproblem, stage, instance,
+                           c):
+    """
+    :param scenario_directory:
+    :param subproblem:
+    :param stage:
+    :param instance:
+    :param c: the name of the constraint
+
+    Write the duals of a constraint to a results file.
+    """
+    constraint_object = getattr(instance, c)
+    with results_writer(os.path.join(
+        scenario_directory, subproblem, stage, "results", str(c) + ".csv")
+    ) as duals_writer:
+        duals_writer.writerow(instance.constraint_indices[c])
+        for index in constraint_object:
+            try:
+                duals_writer.writerow(list(index) +
+                                      [instance.dual[constraint_object[index]]]
+                                      )
+            # We get an error when trying to export duals with CPLEX
+            # when solving MIPs, so catch it here and ignore to avoid
+            # breaking the script, but throw a warning
+            except KeyError:
+                warnings.warn("""
+                KeyError caught when saving duals. Duals were not exported.
+                This is expected if solving a MIP with CPLEX, 
+                not otherwise.
+                """)
+                pass
+
+
+def summarize_results(scenario_directory, subproblem, stage, parsed_arguments,
+                      module_registry=None, profiler=None):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
     :param parsed_arguments:
+    :param module_registry: the scenario's ModuleRegistry (optional)
+    :param profiler: the Profiler (optional)
     :return:
 
     Summarize results (after results export)
@@ -768,7 +1393,8 @@ def summarize_results(scenario_directory, subproblem, stage, parsed_arguments):
         modules_to_use, loaded_modules = \
             set_up_gridpath_modules(
                 scenario_directory=scenario_directory,
-                subproblem=subproblem, stage=stage
+                subproblem=subproblem, stage=stage,
+                module_registry=module_registry
             )
 
         # Make the summary results file
@@ -786,21 +1412,27 @@ def summarize_results(scenario_directory, subproblem, stage, parsed_arguments):
         # Go through the modules and get the appropriate results
         for m in loaded_modules:
             if hasattr(m, "summarize_results"):
-                m.summarize_results(scenario_directory, subproblem, stage)
+                with profile_step(profiler, "summarize_results", m.__name__):
+                    m.summarize_results(scenario_directory, subproblem, stage)
         else:
             pass
     else:
         pass
 
 
-def set_up_gridpath_modules(scenario_directory, subproblem, stage):
+def set_up_gridpath_modules(scenario_directory, subproblem, stage,
+                            module_registry=None):
     """
     :return: list of the names of the modules the scenario uses, list of the
         loaded modules, and the populated dynamic components for the scenario
 
     Set up the modules and dynamic components for a scenario run problem
-    instance.
+    instance. If a module registry is passed, get the already determined
+    and loaded modules from it.
     """
+    if module_registry is not None:
+        return module_registry.get_modules()
+
     # Determine and load modules
     modules_to_use = determine_modules(scenario_directory=scenario_directory)
     loaded_modules = load_modules(modules_to_use)
@@ -22,14 +22,15 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
 from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.auxiliary import get_zone_tmp_index
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     load_balance_production_components, load_balance_consumption_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -51,8 +52,9 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
         return sum(
             (mod.Transmit_Power_MW[tx, tmp]
              - mod.Tx_Losses_LZ_To_MW[tx, tmp])
-            for tx in mod.TX_LINES_OPR_IN_TMP[tmp]
-            if mod.load_zone_to[tx] == z
+            for tx in get_zone_tmp_index(
+                mod=mod, set_name="TX_OPR_TMPS", zone_param_name="load_zone_to"
+            ).get((z, tmp), [])
         )
     m.Transmission_to_Zone_MW = Expression(m.LOAD_ZONES, m.TMPS,
                                            rule=total_transmission_to_rule)
@@ -68,8 +70,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
         return sum(
             (mod.Transmit_Power_MW[tx, tmp]
              + mod.Tx_Losses_LZ_From_MW[tx, tmp])
-            for tx in mod.TX_LINES_OPR_IN_TMP[tmp]
-            if mod.load_zone_from[tx] == z
+            for tx in get_zone_tmp_index(
+                mod=mod, set_name="TX_OPR_TMPS",
+                zone_param_name="load_zone_from"
+            ).get((z, tmp), [])
         )
     m.Transmission_from_Zone_MW = Expression(m.LOAD_ZONES, m.TMPS,
                                              rule=total_transmission_from_rule)
@@ -106,9 +110,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     """
 
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "imports_exports.csv"), "w", newline="") as imp_exp_file:
-        writer = csv.writer(imp_exp_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "imports_exports.csv"
+    )) as writer:
         writer.writerow(
             ["load_zone", "timepoint", "period", "timepoint_weight",
              "number_of_hours_in_timepoint",
@@ -153,11 +158,9 @@ def import_results_into_database(
     
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "imports_exports.csv"),
-              "r") as tx_op_file:
-        reader = csv.reader(tx_op_file)
-
+    with results_reader(os.path.join(
+            results_directory, "imports_exports.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             load_zone = row[0]
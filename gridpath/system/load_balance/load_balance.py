@@ -39,7 +39,6 @@ load-balance violation type.
 from __future__ import print_function
 
 from builtins import next
-import csv
 import os.path
 from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
 
@@ -47,6 +46,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     load_balance_consumption_components, load_balance_production_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -158,9 +158,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "load_balance.csv"), "w", newline="") as results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "load_balance.csv"
+    )) as writer:
         writer.writerow(["zone", "period", "timepoint",
                          "discount_factor", "number_years_represented",
                          "timepoint_weight", "number_of_hours_in_timepoint",
@@ -212,10 +213,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "load_balance.csv"),
-              "r") as load_balance_file:
-        reader = csv.reader(load_balance_file)
-
+    with results_reader(os.path.join(
+            results_directory, "load_balance.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             ba = row[0]
@@ -266,10 +266,9 @@ def import_results_into_database(
 
     # Update duals
     duals_results = []
-    with open(os.path.join(results_directory, "Meet_Load_Constraint.csv"),
-              "r") as load_balance_duals_file:
-        reader = csv.reader(load_balance_duals_file)
-
+    with results_reader(os.path.join(
+            results_directory, "Meet_Load_Constraint.csv"
+    )) as reader:
         next(reader)  # skip header
 
         for row in reader:
@@ -20,6 +20,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import \
     load_balance_production_components, load_balance_consumption_components
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -187,12 +188,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(
-            os.path.join(
-                scenario_directory, str(subproblem), str(stage), "results",
-                "market_participation.csv"
-            ), "w", newline="") as results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "market_participation.csv"
+    )) as writer:
         writer.writerow([
             "load_zone",
             "market",
@@ -245,10 +244,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "market_participation.csv"),
-              "r") as results_file:
-        reader = csv.reader(results_file)
-
+    with results_reader(os.path.join(
+            results_directory, "market_participation.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             lz = row[0]
@@ -21,7 +21,6 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
 from pyomo.environ import Param, Set, Expression, value
 
@@ -29,6 +28,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     carbon_cap_balance_emission_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -85,10 +85,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
-                           "results", "carbon_cap_total_project.csv"),
-              "w", newline="") as carbon_results_file:
-        writer = csv.writer(carbon_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "carbon_cap_total_project.csv"
+    )) as writer:
         writer.writerow(["carbon_cap_zone", "period",
                          "discount_factor", "number_years_represented",
                          "carbon_cap_target",
@@ -129,11 +129,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "carbon_cap_total_project.csv"), "r") as \
-            emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "carbon_cap_total_project.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             carbon_cap_zone = row[0]
@@ -20,7 +20,6 @@ from __future__ import division
 from __future__ import print_function
 
 from builtins import next
-import csv
 import os.path
 from pyomo.environ import Param, Set, Var, Constraint, Expression, \
     NonNegativeReals, value
@@ -28,6 +27,7 @@ from pyomo.environ import Param, Set, Var, Constraint, Expression, \
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import \
     carbon_cap_balance_emission_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.transmission.operations.carbon_emissions import \
     calculate_carbon_emissions_imports
 
@@ -111,10 +111,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
-                           "results", "carbon_cap_total_transmission.csv"),
-              "w", newline="") as carbon_results_file:
-        writer = csv.writer(carbon_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "carbon_cap_total_transmission.csv"
+    )) as writer:
         writer.writerow(["carbon_cap_zone", "period", "carbon_cap_target",
                          "transmission_carbon_emissions",
                          "transmission_carbon_emissions_degen"])
@@ -161,11 +161,9 @@ def import_results_into_database(
                           many=False)
 
     results = []
-    with open(os.path.join(results_directory,
-                           "carbon_cap_total_transmission.csv"), "r") as \
-            emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "carbon_cap_total_transmission.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             carbon_cap_zone = row[0]
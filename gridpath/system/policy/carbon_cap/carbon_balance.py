@@ -19,7 +19,6 @@ from __future__ import division
 from __future__ import print_function
 
 from builtins import next
-import csv
 import os.path
 
 from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
@@ -27,6 +26,7 @@ from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import \
     carbon_cap_balance_emission_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -86,10 +86,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
-                           "results", "carbon_cap.csv"),
-              "w", newline="") as carbon_cap_results_file:
-        writer = csv.writer(carbon_cap_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "carbon_cap.csv"
+    )) as writer:
         writer.writerow(["carbon_cap_zone", "period",
                          "discount_factor", "number_years_represented",
                          "carbon_cap_target",
@@ -145,11 +145,9 @@ def import_results_into_database(
                           many=False)
 
     results = []
-    with open(os.path.join(results_directory,
-                           "carbon_cap.csv"), "r") as \
-            emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "carbon_cap.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             carbon_cap_zone = row[0]
@@ -181,10 +179,9 @@ def import_results_into_database(
 
     # Update duals
     duals_results = []
-    with open(os.path.join(results_directory, "Carbon_Cap_Constraint.csv"),
-              "r") as carbon_cap_duals_file:
-        reader = csv.reader(carbon_cap_duals_file)
-
+    with results_reader(os.path.join(
+            results_directory, "Carbon_Cap_Constraint.csv"
+    )) as reader:
         next(reader)  # skip header
 
         for row in reader:
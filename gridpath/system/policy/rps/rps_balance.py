@@ -20,7 +20,6 @@ from __future__ import division
 from __future__ import print_function
 
 from builtins import next
-import csv
 import os.path
 import pandas as pd
 
@@ -28,6 +27,8 @@ from pyomo.environ import Var, Constraint, NonNegativeReals, Expression, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_store import read_results_csv, \
+    results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -75,9 +76,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "rps.csv"), "w", newline="") as rps_results_file:
-        writer = csv.writer(rps_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "rps.csv"
+    )) as writer:
         writer.writerow(["rps_zone", "period",
                          "discount_factor", "number_years_represented",
                          "rps_target_mwh",
@@ -141,15 +143,14 @@ def summarize_results(scenario_directory, subproblem, stage):
 
     # Get the main RPS results file
     rps_df = \
-        pd.read_csv(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                                 "rps.csv")
-                    )
+        read_results_csv(os.path.join(scenario_directory, str(subproblem),
+                                      str(stage), "results", "rps.csv"))
 
     # Get the RPS dual results
     rps_duals_df = \
-        pd.read_csv(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                                 "RPS_Target_Constraint.csv")
-                    )
+        read_results_csv(os.path.join(scenario_directory, str(subproblem),
+                                      str(stage), "results",
+                                      "RPS_Target_Constraint.csv"))
 
     # # Get the input metadata for periods
     # periods_df = \
@@ -237,11 +238,7 @@ def import_results_into_database(
     
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "rps.csv"), "r") as \
-            rps_file:
-        reader = csv.reader(rps_file)
-
+    with results_reader(os.path.join(results_directory, "rps.csv")) as reader:
         next(reader)  # skip header
         for row in reader:
             rps_zone = row[0]
@@ -298,10 +295,9 @@ def import_results_into_database(
 
     # Update duals
     duals_results = []
-    with open(os.path.join(results_directory, "RPS_Target_Constraint.csv"),
-              "r") as rps_duals_file:
-        reader = csv.reader(rps_duals_file)
-
+    with results_reader(os.path.join(
+            results_directory, "RPS_Target_Constraint.csv"
+    )) as reader:
         next(reader)  # skip header
 
         for row in reader:
@@ -20,7 +20,6 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
 from pyomo.environ import Expression, value
 
@@ -28,6 +27,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     local_capacity_balance_provision_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -83,10 +83,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "local_capacity_contribution.csv"), "w", newline="") as \
-            results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "local_capacity_contribution.csv"
+    )) as writer:
         writer.writerow(["local_capacity_zone", "period", "contribution_mw"])
         for (z, p) in m.LOCAL_CAPACITY_ZONE_PERIODS_WITH_REQUIREMENT:
             writer.writerow([
@@ -119,11 +119,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "local_capacity_contribution.csv"), "r") as \
-            emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "local_capacity_contribution.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             local_capacity_zone = row[0]
@@ -19,7 +19,6 @@ requirement.
 from __future__ import print_function
 
 from builtins import next
-import csv
 import os.path
 
 from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
@@ -27,6 +26,7 @@ from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import \
     local_capacity_balance_provision_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -88,9 +88,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "local_capacity.csv"), "w", newline="") as rps_results_file:
-        writer = csv.writer(rps_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "local_capacity.csv"
+    )) as writer:
         writer.writerow(["local_capacity_zone", "period",
                          "discount_factor", "number_years_represented",
                          "local_capacity_requirement_mw",
@@ -145,11 +146,9 @@ def import_results_into_database(
                           many=False)
 
     results = []
-    with open(os.path.join(results_directory,
-                           "local_capacity.csv"), "r") as \
-            surface_file:
-        reader = csv.reader(surface_file)
-
+    with results_reader(os.path.join(
+            results_directory, "local_capacity.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             local_capacity_zone = row[0]
@@ -181,10 +180,9 @@ def import_results_into_database(
 
     # Update duals
     duals_results = []
-    with open(os.path.join(results_directory, "Local_Capacity_Constraint.csv"),
-              "r") as local_capacity_duals_file:
-        reader = csv.reader(local_capacity_duals_file)
-
+    with results_reader(os.path.join(
+            results_directory, "Local_Capacity_Constraint.csv"
+    )) as reader:
         next(reader)  # skip header
 
         for row in reader:
@@ -20,7 +20,6 @@ from __future__ import print_function
 
 from builtins import next
 from builtins import str
-import csv
 import os.path
 from pyomo.environ import Expression, value
 
@@ -28,6 +27,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     prm_balance_provision_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -71,10 +71,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "prm_elcc_simple.csv"), "w", newline="") as \
-            results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "prm_elcc_simple.csv"
+    )) as writer:
         writer.writerow(["prm_zone", "period", "elcc_mw"])
         for (z, p) in m.PRM_ZONE_PERIODS_WITH_REQUIREMENT:
             writer.writerow([
@@ -108,11 +108,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "prm_elcc_simple.csv"), "r") as \
-            emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "prm_elcc_simple.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             prm_zone = row[0]
@@ -27,6 +27,7 @@ from pyomo.environ import Param, Var, Set, NonNegativeReals, Constraint, \
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import \
     prm_balance_provision_components, cost_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -118,10 +119,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "prm_elcc_surface.csv"), "w", newline="") as \
-            results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "prm_elcc_surface.csv"
+    )) as writer:
         writer.writerow(["prm_zone", "period", "elcc_mw"])
         for (z, p) in m.PRM_ZONE_PERIODS_WITH_REQUIREMENT:
             writer.writerow([
@@ -238,11 +239,9 @@ def import_results_into_database(
                           many=False)
     
     results = []
-    with open(os.path.join(results_directory,
-                           "prm_elcc_surface.csv"), "r") as \
-            surface_file:
-        reader = csv.reader(surface_file)
-
+    with results_reader(os.path.join(
+            results_directory, "prm_elcc_surface.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             prm_zone = row[0]
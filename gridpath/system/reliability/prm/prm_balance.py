@@ -19,7 +19,6 @@ Constraint total PRM contribution to be more than or equal to the requirement.
 from __future__ import print_function
 
 from builtins import next
-import csv
 import os.path
 
 from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
@@ -27,6 +26,7 @@ from pyomo.environ import Var, Constraint, Expression, NonNegativeReals, value
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.dynamic_components import \
     prm_balance_provision_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -84,9 +84,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "prm.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "prm.csv"
+    )) as writer:
         writer.writerow(["prm_zone", "period",
                          "discount_factor", "number_years_represented",
                          "prm_requirement_mw",
@@ -144,11 +145,7 @@ def import_results_into_database(
                           many=False)
 
     results = []
-    with open(os.path.join(results_directory,
-                           "prm.csv"), "r") as \
-            surface_file:
-        reader = csv.reader(surface_file)
-
+    with results_reader(os.path.join(results_directory, "prm.csv")) as reader:
         next(reader)  # skip header
         for row in reader:
             prm_zone = row[0]
@@ -182,10 +179,9 @@ def import_results_into_database(
 
     # Update duals
     duals_results = []
-    with open(os.path.join(results_directory, "PRM_Constraint.csv"),
-              "r") as prm_duals_file:
-        reader = csv.reader(prm_duals_file)
-
+    with results_reader(os.path.join(
+            results_directory, "PRM_Constraint.csv"
+    )) as reader:
         next(reader)  # skip header
 
         for row in reader:
@@ -16,6 +16,7 @@ from __future__ import absolute_import
 
 from pyomo.environ import Set, Expression
 
+from gridpath.auxiliary.auxiliary import get_zone_tmp_index
 from .reserve_aggregation import generic_add_model_components
 
 
@@ -47,12 +48,12 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     def total_partial_frequency_response_rule(mod, ba, tmp):
         return \
             sum(mod.Provide_Frequency_Response_MW[g, tmp]
-                for g in
-                mod.
-                FREQUENCY_RESPONSE_PARTIAL_PROJECTS_OPERATIONAL_IN_TIMEPOINT[
-                    tmp]
-                if mod.frequency_response_ba[g] == ba
-                   )
+                for g in get_zone_tmp_index(
+                    mod=mod, set_name="PRJ_OPR_TMPS",
+                    zone_param_name="frequency_response_ba"
+                ).get((ba, tmp), [])
+                if g in mod.FREQUENCY_RESPONSE_PARTIAL_PROJECTS
+                )
     m.Total_Partial_Frequency_Response_Provision_MW = \
         Expression(m.FREQUENCY_RESPONSE_BAS, m.TMPS,
                    rule=total_partial_frequency_response_rule)
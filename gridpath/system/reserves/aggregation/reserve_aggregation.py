@@ -15,6 +15,8 @@
 from builtins import str
 from pyomo.environ import Set, Expression
 
+from gridpath.auxiliary.auxiliary import get_zone_tmp_index
+
 
 def generic_add_model_components(
         m,
@@ -50,10 +52,15 @@ def generic_add_model_components(
                     mod.OPR_PRJS_IN_TMP[tmp]))
 
     # Reserve provision
+    # The reserve zone param is only defined for the reserve generators, so
+    # indexing the operational project-timepoints by reserve zone gives the
+    # operational reserve generators in each zone and timepoint
     def total_reserve_rule(mod, ba, tmp):
         return sum(getattr(mod, generator_reserve_provision_variable)[g, tmp]
-                   for g in getattr(mod, op_set)[tmp]
-                   if getattr(mod, reserve_zone_param)[g] == ba
+                   for g in get_zone_tmp_index(
+                       mod=mod, set_name="PRJ_OPR_TMPS",
+                       zone_param_name=reserve_zone_param
+                   ).get((ba, tmp), [])
                    )
     setattr(m, total_reserve_provision_expression,
             Expression(getattr(m, reserve_zone_set), m.TMPS,
@@ -13,12 +13,12 @@
 # limitations under the License.
 
 from builtins import next
-import csv
 import os.path
 from pyomo.environ import Var, Constraint, NonNegativeReals, Expression, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def generic_add_model_components(
@@ -97,10 +97,10 @@ def generic_export_results(scenario_directory, subproblem, stage, m, d,
     :param reserve_violation_expression:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           filename), "w", newline="") \
-            as results_file:
-        writer = csv.writer(results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            filename
+    )) as writer:
         writer.writerow(["ba", "period", "timepoint",
                          "discount_factor", "number_years_represented",
                          "timepoint_weight", "number_of_hours_in_timepoint",
@@ -154,11 +154,9 @@ def generic_import_results_to_database(scenario_id, subproblem, stage,
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           reserve_type + "_violation.csv"),
-              "r") as violation_file:
-        reader = csv.reader(violation_file)
-
+    with results_reader(os.path.join(
+            results_directory, reserve_type + "_violation.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             ba = row[0]
@@ -222,10 +220,9 @@ def generic_import_results_to_database(scenario_id, subproblem, stage,
     }
 
     duals_results = []
-    with open(os.path.join(results_directory, dual_files[reserve_type]),
-              "r") as reserve_balance_duals_file:
-        reader = csv.reader(reserve_balance_duals_file)
-
+    with results_reader(os.path.join(
+            results_directory, dual_files[reserve_type]
+    )) as reader:
         next(reader)  # skip header
 
         for row in reader:
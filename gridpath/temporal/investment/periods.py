@@ -39,7 +39,7 @@ import os.path
 
 from pyomo.environ import Set, Param, PositiveIntegers, NonNegativeReals
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_set_index_by_param
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, validate_dtypes, validate_values, validate_columns
 
@@ -184,9 +184,9 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.TMPS_IN_PRD = Set(
         m.PERIODS,
-        initialize=lambda mod, p: list(
-            set(tmp for tmp in mod.TMPS if mod.period[tmp] == p)
-        )
+        initialize=lambda mod, p: get_set_index_by_param(
+            mod=mod, set_name="TMPS", param_name="period"
+        ).get(p, [])
     )
 
     m.NOT_FIRST_PRDS = Set(
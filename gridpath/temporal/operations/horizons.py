@@ -198,14 +198,14 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
         m.BLN_TYPE_HRZS,
         within=PositiveIntegers,
         initialize=lambda mod, b, h:
-        list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[0]
+        get_tmp_sequence(mod)["first_hrz_tmp"][b, h]
     )
 
     m.last_hrz_tmp = Param(
         m.BLN_TYPE_HRZS,
         within=PositiveIntegers,
         initialize=lambda mod, b, h:
-        list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[-1]
+        get_tmp_sequence(mod)["last_hrz_tmp"][b, h]
     )
 
     m.prev_tmp = Param(
@@ -273,29 +273,7 @@ def prev_tmp_init(mod, tmp, balancing_type_horizon):
     timepoint is defined. In all other cases, the previous timepoints is the
     one with an index of tmp-1.
     """
-    prev_tmp_dict = {}
-    for (bt, hrz) in mod.BLN_TYPE_HRZS:
-        for tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]:
-            if tmp == mod.first_hrz_tmp[bt, hrz]:
-                if mod.boundary[bt, hrz] == "circular":
-                    prev_tmp_dict[tmp, bt] = mod.last_hrz_tmp[bt, hrz]
-                elif mod.boundary[bt, hrz] in ["linear", "linked"]:
-                    prev_tmp_dict[tmp, bt] = None
-                else:
-                    raise ValueError(
-                        "Invalid boundary value '{}' for balancing type "
-                        "horizon '{} {}'".
-                        format(mod.boundary[bt, hrz], bt, hrz)
-                        + "\n" +
-                        "Horizon boundary must be 'circular,' 'linear,' "
-                        "or 'linked.'"
-                    )
-            else:
-                prev_tmp_dict[tmp, bt] = list(
-                    mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]
-                )[list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]).index(tmp) - 1]
-
-    return prev_tmp_dict
+    return get_tmp_sequence(mod)["prev_tmp"][tmp, balancing_type_horizon]
 
 
 def next_tmp_init(mod, tmp, balancing_type_horizon):
@@ -310,29 +288,69 @@ def next_tmp_init(mod, tmp, balancing_type_horizon):
     horizon boundary is linear, then no next timepoint is defined. In all
     other cases, the next timepoint is the one with an index of tmp+1.
     """
-    next_tmp_dict = {}
-    for (bt, hrz) in mod.BLN_TYPE_HRZS:
-        for tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]:
-            if tmp == mod.last_hrz_tmp[bt, hrz]:
-                if mod.boundary[bt, hrz] == "circular":
-                    next_tmp_dict[tmp, bt] = mod.first_hrz_tmp[bt, hrz]
-                elif mod.boundary[bt, hrz] in ["linear", "linked"]:
-                    next_tmp_dict[tmp, bt] = None
-                else:
-                    raise ValueError(
-                        "Invalid boundary value '{}' for balancing "
-                        "type horizon '{} {}'".
-                        format(mod.boundary[bt, hrz], bt, hrz)
-                        + "\n" +
-                        "Horizon boundary must be 'circular,' 'linear,' "
-                        "or 'linked.'"
-                    )
-            else:
-                next_tmp_dict[tmp, bt] = list(
-                    mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]
-                )[list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]).index(tmp) + 1]
+    return get_tmp_sequence(mod)["next_tmp"][tmp, balancing_type_horizon]
 
-    return next_tmp_dict
+
+def get_tmp_sequence(mod):
+    """
+    Derive the first and last timepoint of each balancing type-horizon and
+    the previous and next timepoint of each timepoint in each balancing type
+    (see :func:`prev_tmp_init` and :func:`next_tmp_init` for the boundary
+    handling) in a single ordered pass over the timepoints of each horizon.
+
+    The result is cached on the model instance, so that the first_hrz_tmp,
+    last_hrz_tmp, prev_tmp, and next_tmp initializers, as well as any
+    downstream modules that need to walk through the timepoints of a
+    horizon, can reuse it.
+
+    :param mod: the model instance
+    :return: dictionary with the "first_hrz_tmp" and "last_hrz_tmp"
+        dictionaries indexed by (balancing type, horizon) and the "prev_tmp"
+        and "next_tmp" dictionaries indexed by (timepoint, balancing type)
+    """
+    try:
+        return mod._tmp_sequence
+    except AttributeError:
+        pass
+
+    first_hrz_tmp = dict()
+    last_hrz_tmp = dict()
+    prev_tmp = dict()
+    next_tmp = dict()
+    for (bt, hrz) in mod.BLN_TYPE_HRZS:
+        tmps = list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz])
+        first_hrz_tmp[bt, hrz] = tmps[0]
+        last_hrz_tmp[bt, hrz] = tmps[-1]
+
+        boundary = mod.boundary[bt, hrz]
+        if boundary == "circular":
+            prev_tmp[tmps[0], bt] = tmps[-1]
+            next_tmp[tmps[-1], bt] = tmps[0]
+        elif boundary in ["linear", "linked"]:
+            prev_tmp[tmps[0], bt] = None
+            next_tmp[tmps[-1], bt] = None
+        else:
+            raise ValueError(
+                "Invalid boundary value '{}' for balancing type "
+                "horizon '{} {}'".
+                format(boundary, bt, hrz)
+                + "\n" +
+                "Horizon boundary must be 'circular,' 'linear,' "
+                "or 'linked.'"
+            )
+
+        for prev, tmp in zip(tmps[:-1], tmps[1:]):
+            prev_tmp[tmp, bt] = prev
+            next_tmp[prev, bt] = tmp
+
+    mod._tmp_sequence = {
+        "first_hrz_tmp": first_hrz_tmp,
+        "last_hrz_tmp": last_hrz_tmp,
+        "prev_tmp": prev_tmp,
+        "next_tmp": next_tmp
+    }
+
+    return mod._tmp_sequence
 
 
 # Input-Output
@@ -37,12 +37,13 @@ as annual emissions, energy, or cost.
 
 import csv
 import os.path
-import pandas as pd
 
 from pyomo.environ import Param, Set, NonNegativeReals, NonNegativeIntegers,\
     PositiveIntegers, NonPositiveIntegers, Any
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.db_interface import get_subproblem_stage_filter
+from gridpath.auxiliary.input_file_cache import read_input_file
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -204,7 +205,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     # timepoints from a previous subproblem
     # Try to load in the map CSV
     try:
-        map_df = pd.read_csv(
+        map_df = read_input_file(
             os.path.join(scenario_directory, "linked_subproblems_map.csv"),
             sep=","
         )
@@ -295,13 +296,17 @@ def write_model_inputs(scenario_directory, scenario_id, subscenarios, subproblem
             writer.writerow(replace_nulls)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
 
     :param db:
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
     if not quiet:
@@ -342,7 +347,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         if not quiet:
             print("... {}".format(tbl))
         sql = """
-            UPDATE results_project_dispatch
+            UPDATE {tbl}
             SET spinup_or_lookahead = (
             SELECT spinup_or_lookahead
             FROM inputs_temporal
@@ -351,14 +356,19 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 FROM scenarios 
                 WHERE scenario_id = ?
                 )
-            AND results_project_dispatch.subproblem_id = 
-            inputs_temporal.subproblem_id
-            AND results_project_dispatch.stage_id = inputs_temporal.stage_id
-            AND results_project_dispatch.timepoint = inputs_temporal.timepoint
-            );
-            """.format(tbl)
+            AND {tbl}.subproblem_id = inputs_temporal.subproblem_id
+            AND {tbl}.stage_id = inputs_temporal.stage_id
+            AND {tbl}.timepoint = inputs_temporal.timepoint
+            )
+            WHERE scenario_id = ?
+            AND {subproblem_stage_filter};
+            """.format(
+                tbl=tbl,
+                subproblem_stage_filter=get_subproblem_stage_filter(
+                    subproblem_stages)
+            )
         spin_on_database_lock(
-            conn=db, cursor=c, sql=sql, data=(scenario_id, ),
+            conn=db, cursor=c, sql=sql, data=(scenario_id, scenario_id),
             many=False
         )
 
@@ -22,17 +22,18 @@ reliability constraints, etc. The module also adds transmission costs which
 again depend on the line's *capacity_type*.
 """
 
-import csv
 from functools import reduce
 import os.path
-import pandas as pd
 from pyomo.environ import Set, Expression, value
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import join_sets
+from gridpath.auxiliary.auxiliary import join_sets, get_set_index_by_position
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.transmission.capacity.common_functions import \
     load_tx_capacity_type_modules
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
 from gridpath.auxiliary.dynamic_components import \
     tx_capacity_type_operational_period_sets
 
@@ -114,7 +115,7 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Dynamic Inputs
     ###########################################################################
 
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -150,16 +151,16 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.TX_LINES_OPR_IN_PRD = Set(
         m.PERIODS,
-        initialize=lambda mod, period: list(
-            set(tx for (tx, p) in mod.TX_OPR_PRDS if p == period)
-        )
+        initialize=lambda mod, period: get_set_index_by_position(
+            mod=mod, set_name="TX_OPR_PRDS", key_position=1, value_position=0
+        ).get(period, [])
     )
 
     m.OPR_PRDS_BY_TX_LINE = Set(
         m.TX_LINES,
-        initialize=lambda mod, tx: list(
-            set(p for (l, p) in mod.TX_OPR_PRDS if l == tx)
-        )
+        initialize=lambda mod, tx: sorted(get_set_index_by_position(
+            mod=mod, set_name="TX_OPR_PRDS", key_position=0, value_position=1
+        ).get(tx, []))
     )
 
     m.TX_OPR_TMPS = Set(
@@ -173,9 +174,9 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.TX_LINES_OPR_IN_TMP = Set(
         m.TMPS,
-        initialize=lambda mod, tmp: list(
-            set(tx for (tx, t) in mod.TX_OPR_TMPS if t == tmp)
-        )
+        initialize=lambda mod, tmp: get_set_index_by_position(
+            mod=mod, set_name="TX_OPR_TMPS", key_position=1, value_position=0
+        ).get(tmp, [])
     )
 
     # Expressions
@@ -228,7 +229,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :param stage:
     :return:
     """
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -266,7 +267,7 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     """
 
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -295,9 +296,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
             pass
 
     # Export transmission capacity
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "transmission_capacity.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "transmission_capacity.csv"
+    )) as writer:
         writer.writerow(["tx_line", "period", "load_zone_from", "load_zone_to",
                          "transmission_min_capacity_mw",
                          "transmission_max_capacity_mw"])
@@ -312,9 +314,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
             ])
 
     # Export transmission capacity costs
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-              "costs_transmission_capacity.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "costs_transmission_capacity.csv"
+    )) as writer:
         writer.writerow(
             ["tx_line", "period", "hours_in_full_period",
              "hours_in_subproblem_period", "load_zone_from",
@@ -360,11 +363,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "transmission_capacity.csv"),
-              "r") as capacity_costs_file:
-        reader = csv.reader(capacity_costs_file)
-
+    with results_reader(os.path.join(
+            results_directory, "transmission_capacity.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             tx_line = row[0]
@@ -415,11 +416,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "costs_transmission_capacity.csv"),
-              "r") as capacity_costs_file:
-        reader = csv.reader(capacity_costs_file)
-
+    with results_reader(os.path.join(
+            results_directory, "costs_transmission_capacity.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             tx_line = row[0]
@@ -462,7 +461,9 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate capacity costs by "to_zone" load zone, and break out into
     spinup_or_lookahead.
@@ -470,8 +471,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate tx capacity costs by load zone")
 
@@ -479,17 +484,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_transmission_costs_capacity_agg 
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Insert new results
     agg_sql = """
-        INSERT INTO results_transmission_costs_capacity_agg
-        (scenario_id, load_zone, period, subproblem_id, stage_id,
-        spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost)
-
         SELECT scenario_id, load_zone, period, subproblem_id, stage_id,
         spinup_or_lookahead, fraction_of_hours_in_subproblem,
         (capacity_cost * fraction_of_hours_in_subproblem) AS capacity_cost
@@ -514,12 +516,17 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         load_zone_to AS load_zone,
         SUM(capacity_cost) AS capacity_cost
         FROM results_transmission_costs_capacity
+        WHERE scenario_id = ?
+        AND {}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone
         ) AS cap_table
         USING (scenario_id, subproblem_id, stage_id, period, load_zone)
-        ;"""
+        ;""".format(subproblem_stage_filter)
 
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,),
-                          many=False)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_transmission_costs_capacity_agg",
+        columns="""scenario_id, load_zone, period, subproblem_id, stage_id,
+        spinup_or_lookahead, fraction_of_hours_in_subproblem, capacity_cost""",
+        sql=agg_sql, data=(scenario_id, scenario_id)
+    )
 
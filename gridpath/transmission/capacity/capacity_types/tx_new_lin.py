@@ -39,6 +39,7 @@ from gridpath.auxiliary.auxiliary import cursor_to_df
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     tx_capacity_type_operational_period_sets
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, get_tx_lines, validate_dtypes, validate_values, \
     validate_idxs
@@ -331,10 +332,10 @@ def export_module_specific_results(
     """
 
     # Export transmission capacity
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "transmission_new_capacity.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "transmission_new_capacity.csv"
+    )) as writer:
         writer.writerow(["transmission_line", "period",
                          "load_zone_from", "load_zone_to",
                          "new_build_transmission_capacity_mw"])
@@ -444,11 +445,9 @@ def import_module_specific_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "transmission_new_capacity.csv"),
-              "r") as capacity_file:
-        reader = csv.reader(capacity_file)
-
+    with results_reader(os.path.join(
+            results_directory, "transmission_new_capacity.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             transmission_line = row[0]
@@ -27,9 +27,11 @@ from pyomo.environ import Param, Set, Var, Constraint, Expression, \
     NonNegativeReals, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.auxiliary import get_set_index_by_param
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     carbon_cap_balance_emission_components
+from gridpath.auxiliary.results_store import results_reader, results_writer
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -159,8 +161,9 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     m.CRB_TX_LINES_BY_CARBON_CAP_ZONE = Set(
         m.CARBON_CAP_ZONES,
         within=m.CRB_TX_LINES,
-        initialize=lambda mod, co2_z:
-        [tx for tx in mod.CRB_TX_LINES if mod.tx_carbon_cap_zone[tx] == co2_z]
+        initialize=lambda mod, co2_z: get_set_index_by_param(
+            mod=mod, set_name="CRB_TX_LINES", param_name="tx_carbon_cap_zone"
+        ).get(co2_z, [])
     )
 
     # Variables
@@ -275,10 +278,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "carbon_emission_imports_by_tx_line.csv"),
-              "w", newline="") as carbon_emission_imports__results_file:
-        writer = csv.writer(carbon_emission_imports__results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "carbon_emission_imports_by_tx_line.csv"
+    )) as writer:
         writer.writerow(["tx_line", "period", "timepoint",
                          "timepoint_weight", "number_of_hours_in_timepoint",
                          "carbon_emission_imports_tons",
@@ -406,11 +409,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory,
-                           "carbon_emission_imports_by_tx_line.csv"),
-              "r") as emissions_file:
-        reader = csv.reader(emissions_file)
-
+    with results_reader(os.path.join(
+            results_directory, "carbon_emission_imports_by_tx_line.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             tx_line = row[0]
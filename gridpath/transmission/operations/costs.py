@@ -30,7 +30,9 @@ from pyomo.environ import Param, Var, Constraint, NonNegativeReals, \
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import cursor_to_df
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, validate_dtypes, validate_values, \
     validate_missing_inputs
@@ -220,9 +222,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d: Dynamic components
     :return: Nothing
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-              "costs_transmission_hurdle.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "costs_transmission_hurdle.csv"
+    )) as writer:
         writer.writerow(
             ["tx_line", "period", "timepoint", "timepoint_weight",
              "number_of_hours_in_timepoint", "load_zone_from", "load_zone_to",
@@ -342,10 +345,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "costs_transmission_hurdle.csv"),
-              "r") as tx_op_file:
-        reader = csv.reader(tx_op_file)
-
+    with results_reader(os.path.join(
+            results_directory, "costs_transmission_hurdle.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             tx_line = row[0]
@@ -397,7 +399,9 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate costs by zone and period. Costs are allocated to the destination
     zone. I.e. positive direction hurdle costs are allocated to the to-zone
@@ -406,8 +410,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate hurdle costs")
 
@@ -415,17 +423,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_transmission_hurdle_costs_agg
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate hurdle costs by period, load zone, and spinup_or_lookahead
     agg_sql = """
-        INSERT INTO results_transmission_hurdle_costs_agg
-        (scenario_id, subproblem_id, stage_id, period, load_zone, 
-        spinup_or_lookahead, tx_hurdle_cost)
-        
         SELECT scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead,
         (pos_dir_hurdle_cost + neg_dir_hurdle_cost) AS tx_hurdle_cost
@@ -438,6 +443,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         number_of_hours_in_timepoint) AS pos_dir_hurdle_cost
         FROM results_transmission_hurdle_costs
         WHERE scenario_id = ?
+        AND {subproblem_stage_filter}
         GROUP BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ) AS pos_dir_hurdle_costs
@@ -450,18 +456,21 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         number_of_hours_in_timepoint) AS neg_dir_hurdle_cost
         FROM results_transmission_hurdle_costs
         WHERE scenario_id = ?
+        AND {subproblem_stage_filter}
         GROUP BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
         ) AS neg_dir_hurdle_costs
         
         USING (scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead)
-        ;"""
+        ;""".format(subproblem_stage_filter=subproblem_stage_filter)
 
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=(scenario_id,
-                                scenario_id),
-                          many=False)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_transmission_hurdle_costs_agg",
+        columns="""scenario_id, subproblem_id, stage_id, period, load_zone, 
+        spinup_or_lookahead, tx_hurdle_cost""",
+        sql=agg_sql, data=(scenario_id, scenario_id)
+    )
 
 
 # Validation
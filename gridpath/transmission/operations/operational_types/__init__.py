@@ -19,8 +19,8 @@ constrained in optimization problem, e.g. as a simple transport model, or DC
 OPF.
 """
 import os.path
-import pandas as pd
 
+from gridpath.auxiliary.input_file_cache import read_input_file
 from gridpath.transmission.operations.common_functions import \
     load_tx_operational_type_modules
 
@@ -33,7 +33,7 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     for that operational type.
     """
     # Import needed transmission operational type modules
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -73,7 +73,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :return:
     """
     # Import needed operational modules
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -216,7 +216,9 @@ def import_results_into_database(
             pass
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Go through each relevant operational type and process the results
     for that operational type.
@@ -225,6 +227,8 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
 
@@ -240,7 +244,8 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                    "process_module_specific_results"):
             imported_tx_operational_modules[op_m]. \
                 process_module_specific_results(
-                    db, c, scenario_id, subscenarios, quiet)
+                    db, c, scenario_id, subscenarios, quiet,
+                    subproblem_stages)
         else:
             pass
 
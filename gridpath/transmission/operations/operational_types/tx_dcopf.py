@@ -56,6 +56,8 @@ import pandas as pd
 
 from pyomo.environ import Set, Var, Constraint, Reals, Param
 
+from gridpath.auxiliary.input_file_cache import read_input_file
+
 
 def add_model_components(
         m, d, scenario_directory, subproblem, stage
@@ -540,7 +542,7 @@ def load_module_specific_data(m, data_portal, scenario_directory,
     """
 
     # Get the DC OPF lines
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -22,10 +22,11 @@ of line flow.
 """
 
 import os
-import pandas as pd
 from pyomo.environ import Set, Param, Var, Constraint, NonNegativeReals, \
     Reals, PercentFraction
 
+from gridpath.auxiliary.input_file_cache import read_input_file
+
 
 def add_model_components(
         m, d, scenario_directory, subproblem, stage
@@ -371,7 +372,7 @@ def load_module_specific_data(m, data_portal, scenario_directory,
     """
 
     # Get the simple transport model lines
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
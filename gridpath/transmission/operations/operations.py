@@ -17,13 +17,14 @@ This is a line-level module that adds to the formulation components that
 describe the amount of power flowing on each line.
 """
 
-import csv
 import os.path
-import pandas as pd
 from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import setup_results_import, \
+    get_subproblem_stage_filter, insert_aggregated_results
+from gridpath.auxiliary.input_file_cache import read_input_file
+from gridpath.auxiliary.results_store import results_reader, results_writer
 from gridpath.transmission.operations.common_functions import \
     load_tx_operational_type_modules
 
@@ -62,7 +63,7 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Dynamic Inputs
     ###########################################################################
 
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -130,10 +131,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     """
 
     # Transmission flows for all lines
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "transmission_operations.csv"), "w", newline="") as \
-            tx_op_results_file:
-        writer = csv.writer(tx_op_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "transmission_operations.csv"
+    )) as writer:
         writer.writerow(["tx_line", "lz_from", "lz_to", "timepoint", "period",
                          "timepoint_weight",
                          "number_of_hours_in_timepoint",
@@ -157,7 +158,7 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     # TODO: does this belong here or in operational_types/__init__.py?
     #  (putting it here to be in line with projects/operations/power.py)
     # Module-specific transmission operational results
-    df = pd.read_csv(
+    df = read_input_file(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "transmission_lines.tab"),
         sep="\t",
@@ -211,10 +212,9 @@ def import_results_into_database(
 
     # Load results into the temporary table
     results = []
-    with open(os.path.join(results_directory, "transmission_operations.csv"),
-              "r") as tx_op_file:
-        reader = csv.reader(tx_op_file)
-
+    with results_reader(os.path.join(
+            results_directory, "transmission_operations.csv"
+    )) as reader:
         next(reader)  # skip header
         for row in reader:
             tx_line = row[0]
@@ -266,7 +266,9 @@ def import_results_into_database(
                           many=False)
 
 
-def process_results(db, c, scenario_id, subscenarios, quiet):
+def process_results(
+        db, c, scenario_id, subscenarios, quiet, subproblem_stages
+):
     """
     Aggregate imports/exports by zone, period and spinup_or_lookahead
     (numbers are based on flows without accounting for losses!)
@@ -275,8 +277,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     :param c:
     :param subscenarios:
     :param quiet:
+    :param subproblem_stages: list of the (subproblem_id, stage_id) tuples
+        whose results to process
     :return:
     """
+    subproblem_stage_filter = get_subproblem_stage_filter(subproblem_stages)
+
     if not quiet:
         print("aggregate transmission imports exports")
 
@@ -284,17 +290,14 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
     del_sql = """
         DELETE FROM results_transmission_imports_exports_agg
         WHERE scenario_id = ?
-        """
+        AND {}
+        """.format(subproblem_stage_filter)
     spin_on_database_lock(conn=db, cursor=c, sql=del_sql,
                           data=(scenario_id,),
                           many=False)
 
     # Aggregate imports/exports by period, load zone, and spinup_or_lookahead
     agg_sql = """
-        INSERT INTO results_transmission_imports_exports_agg
-        (scenario_id, subproblem_id, stage_id, period, 
-        load_zone, spinup_or_lookahead, imports, exports)
-        
         SELECT scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead,
         (IFNULL(imports_pos_dir,0) + IFNULL(imports_neg_dir,0)) AS imports,
@@ -314,14 +317,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_to AS load_zone, spinup_or_lookahead
                 FROM results_transmission_operations
-                WHERE scenario_id = ?) AS dummy
+                WHERE scenario_id = ?
+                AND {subproblem_stage_filter}) AS dummy
                 
                 LEFT JOIN 
                 
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_from AS load_zone, spinup_or_lookahead
                 FROM results_transmission_operations
-                WHERE scenario_id = ?) AS dummy2
+                WHERE scenario_id = ?
+                AND {subproblem_stage_filter}) AS dummy2
                 USING (scenario_id, subproblem_id, stage_id, period, load_zone,
                 spinup_or_lookahead)
             ) AS left_join1
@@ -334,14 +339,16 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_from AS load_zone, spinup_or_lookahead
                 FROM results_transmission_operations
-                WHERE scenario_id = ?) AS dummy3
+                WHERE scenario_id = ?
+                AND {subproblem_stage_filter}) AS dummy3
                 
                 LEFT JOIN 
                 
                 (SELECT DISTINCT scenario_id, subproblem_id, stage_id, period, 
                 load_zone_to AS load_zone, spinup_or_lookahead
                 FROM results_transmission_operations
-                WHERE scenario_id = ?) AS dummy4
+                WHERE scenario_id = ?
+                AND {subproblem_stage_filter}) AS dummy4
                 USING (scenario_id, subproblem_id, stage_id, period, load_zone,
                 spinup_or_lookahead)
             
@@ -360,6 +367,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_operations
         WHERE transmission_flow_mw > 0
         AND scenario_id = ?
+        AND {subproblem_stage_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead) 
         AS imports_pos_dir
@@ -375,6 +383,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_operations
         WHERE transmission_flow_mw > 0
         AND scenario_id = ?
+        AND {subproblem_stage_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone, 
         spinup_or_lookahead) 
         AS exports_pos_dir
@@ -390,6 +399,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_operations
         WHERE transmission_flow_mw < 0
         AND scenario_id = ?
+        AND {subproblem_stage_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead) 
         AS imports_neg_dir
@@ -405,6 +415,7 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         FROM results_transmission_operations
         WHERE transmission_flow_mw < 0
         AND scenario_id = ?
+        AND {subproblem_stage_filter}
         GROUP BY scenario_id, subproblem_id, stage_id, period, load_zone,
         spinup_or_lookahead) 
         AS exports_neg_dir
@@ -412,9 +423,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
         spinup_or_lookahead)
         
         ORDER BY subproblem_id, stage_id, period, load_zone, spinup_or_lookahead
-        ;"""
+        ;""".format(subproblem_stage_filter=subproblem_stage_filter)
 
     scenario_ids = tuple([scenario_id] * 8)
-    spin_on_database_lock(conn=db, cursor=c, sql=agg_sql,
-                          data=scenario_ids,
-                          many=False)
+    insert_aggregated_results(
+        conn=db, cursor=c, table="results_transmission_imports_exports_agg",
+        columns="""scenario_id, subproblem_id, stage_id, period, 
+        load_zone, spinup_or_lookahead, imports, exports""",
+        sql=agg_sql, data=scenario_ids
+    )
@@ -29,6 +29,8 @@ import os.path
 from pyomo.environ import Set, Param, Constraint, NonNegativeReals, \
     Integers, Expression, value
 
+from gridpath.auxiliary.results_store import results_writer
+
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
     """
@@ -244,10 +246,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "transmission_simultaneous_flow_limits.csv"),
-              "w", newline="") as tx_op_results_file:
-        writer = csv.writer(tx_op_results_file)
+    with results_writer(os.path.join(
+            scenario_directory, str(subproblem), str(stage), "results",
+            "transmission_simultaneous_flow_limits.csv"
+    )) as writer:
         writer.writerow(["simultaneous_flow_limit", "timepoint", "period",
                          "timepoint_weight", "simultaneous_flow_mw"])
         for (g, tmp) in m.SIM_FLOW_LMT_TMPS:
@@ -18,7 +18,10 @@ extras_ui = [
     "psutil",  # Process management
     "python-socketio[client]",  # SocketIO Python client
 ]
-extras_all = extras_ui + extras_doc
+extras_parquet = [
+    "pyarrow>=14.0"  # Parquet results format
+]
+extras_all = extras_ui + extras_doc + extras_parquet
 
 
 setup(name="GridPath",
@@ -44,6 +47,7 @@ setup(name="GridPath",
       extras_require={
           "doc": extras_doc,
           "ui": extras_ui,
+          "parquet": extras_parquet,
           "all": extras_all
       },
       include_package_data=True,
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pyomo.environ import AbstractModel
+from pyomo.environ import AbstractModel, ConcreteModel, Set, Param
 import unittest
 
 import gridpath.auxiliary.auxiliary as auxiliary_module_to_test
@@ -96,6 +96,79 @@ class TestAuxiliary(unittest.TestCase):
         self.assertEqual(True, auxiliary_module_to_test.is_number(100.5))
         self.assertEqual(False, auxiliary_module_to_test.is_number("string"))
 
+    def test_get_set_index_by_position(self):
+        """
+
+        :return:
+        """
+        mod = ConcreteModel()
+        mod.PRJ_OPR_TMPS = Set(
+            dimen=2,
+            initialize=[("a", 1), ("b", 1), ("a", 2), ("c", 3), ("a", 3)]
+        )
+
+        expected_prj_by_tmp = {1: ["a", "b"], 2: ["a"], 3: ["c", "a"]}
+        actual_prj_by_tmp = auxiliary_module_to_test.get_set_index_by_position(
+            mod=mod, set_name="PRJ_OPR_TMPS", key_position=1, value_position=0
+        )
+        self.assertDictEqual(expected_prj_by_tmp, actual_prj_by_tmp)
+
+        expected_tmp_by_prj = {"a": [1, 2, 3], "b": [1], "c": [3]}
+        actual_tmp_by_prj = auxiliary_module_to_test.get_set_index_by_position(
+            mod=mod, set_name="PRJ_OPR_TMPS", key_position=0, value_position=1
+        )
+        self.assertDictEqual(expected_tmp_by_prj, actual_tmp_by_prj)
+
+        # The index is rebuilt if the set changes
+        mod.PRJ_OPR_TMPS.add(("d", 2))
+        self.assertListEqual(
+            ["a", "d"],
+            auxiliary_module_to_test.get_set_index_by_position(
+                mod=mod, set_name="PRJ_OPR_TMPS", key_position=1,
+                value_position=0
+            )[2]
+        )
+
+    def test_get_set_index_by_param(self):
+        """
+
+        :return:
+        """
+        mod = ConcreteModel()
+        mod.TMPS = Set(initialize=[1, 2, 3, 4])
+        mod.period = Param(
+            mod.TMPS, initialize={1: 2020, 2: 2020, 3: 2030, 4: 2030}
+        )
+
+        expected_tmps_in_prd = {2020: [1, 2], 2030: [3, 4]}
+        actual_tmps_in_prd = auxiliary_module_to_test.get_set_index_by_param(
+            mod=mod, set_name="TMPS", param_name="period"
+        )
+        self.assertDictEqual(expected_tmps_in_prd, actual_tmps_in_prd)
+
+    def test_get_zone_tmp_index(self):
+        """
+
+        :return:
+        """
+        mod = ConcreteModel()
+        mod.PRJ_OPR_TMPS = Set(
+            dimen=2,
+            initialize=[("a", 1), ("b", 1), ("c", 1), ("a", 2), ("c", 2)]
+        )
+        # Project "b" has no zone
+        mod.PRJS_W_ZONE = Set(initialize=["a", "c"])
+        mod.zone = Param(mod.PRJS_W_ZONE, initialize={"a": "z1", "c": "z2"})
+
+        expected_prj_by_zone_tmp = {
+            ("z1", 1): ["a"], ("z2", 1): ["c"],
+            ("z1", 2): ["a"], ("z2", 2): ["c"]
+        }
+        actual_prj_by_zone_tmp = auxiliary_module_to_test.get_zone_tmp_index(
+            mod=mod, set_name="PRJ_OPR_TMPS", zone_param_name="zone"
+        )
+        self.assertDictEqual(expected_prj_by_zone_tmp, actual_prj_by_zone_tmp)
+
 
 if __name__ == "__main__":
     unittest.main()
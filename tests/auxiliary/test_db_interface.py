@@ -0,0 +1,436 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from db.common_functions import connect_to_database, single_transaction
+from db.utilities.scenario import delete_scenario_results
+from db.utilities.update_schema import create_missing_schema_objects
+import gridpath.auxiliary.db_interface as db_interface_to_test
+
+DB_SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "db", "db_schema.sql"
+)
+
+
+class MockSubScenarios(object):
+    """
+    The subscenario IDs used to materialize project-timepoints
+    """
+    PROJECT_PORTFOLIO_SCENARIO_ID = 1
+    PROJECT_OPERATIONAL_CHARS_SCENARIO_ID = 1
+    PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID = 1
+    PROJECT_NEW_COST_SCENARIO_ID = "NULL"
+    TEMPORAL_SCENARIO_ID = 1
+
+
+def create_results_table(conn):
+    """
+    Create and populate a small results table like results_project_dispatch
+    """
+    conn.execute("""
+        CREATE TABLE results_project_dispatch (
+        scenario_id INTEGER,
+        project VARCHAR(64),
+        timepoint INTEGER,
+        power_mw FLOAT,
+        committed_mw FLOAT,
+        PRIMARY KEY (scenario_id, project, timepoint)
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO results_project_dispatch VALUES (?, ?, ?, ?, NULL);",
+        [(1, "Coal", 1, 4.0), (1, "Coal", 2, 6.0), (1, "Gas", 1, 2.0),
+         (2, "Coal", 1, 3.0)]
+    )
+    conn.commit()
+
+
+def create_project_inputs(conn):
+    """
+    Create the database and populate the inputs of a small portfolio with
+    a variable and a thermal project
+    """
+    with open(DB_SCHEMA, "r") as f:
+        conn.executescript(f.read())
+    c = conn.cursor()
+    c.executemany(
+        "INSERT INTO inputs_project_portfolios "
+        "(project_portfolio_scenario_id, project) VALUES (1, ?);",
+        [("Wind",), ("Coal",)]
+    )
+    c.executemany(
+        "INSERT INTO inputs_project_operational_chars "
+        "(project_operational_chars_scenario_id, project, "
+        "operational_type, variable_generator_profile_scenario_id) "
+        "VALUES (1, ?, ?, ?);",
+        [("Wind", "gen_var", 1), ("Coal", "gen_commit_cap", None)]
+    )
+    c.executemany(
+        "INSERT INTO inputs_project_specified_capacity "
+        "(project_specified_capacity_scenario_id, project, period) "
+        "VALUES (1, ?, 2020);",
+        [("Wind",), ("Coal",)]
+    )
+    c.executemany(
+        "INSERT INTO inputs_temporal_periods (temporal_scenario_id, "
+        "period) VALUES (1, ?);",
+        [(2020,), (2030,)]
+    )
+    c.executemany(
+        "INSERT INTO inputs_temporal (temporal_scenario_id, "
+        "subproblem_id, stage_id, timepoint, period) "
+        "VALUES (1, 1, 1, ?, ?);",
+        [(20200101, 2020), (20200102, 2020), (20300101, 2030)]
+    )
+    conn.commit()
+
+
+class TestDBInterface(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.conn = sqlite3.connect(os.path.join(self.temp_dir, "test.db"))
+        create_results_table(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_update_results_from_staging_table(self):
+        """
+        Only the rows matching the keys should be updated; values should be
+        stored with the column types of the results table
+        """
+        c = self.conn.cursor()
+        db_interface_to_test.update_results_from_staging_table(
+            conn=self.conn, cursor=c, table="results_project_dispatch",
+            key_columns=["scenario_id", "project", "timepoint"],
+            update_columns=["committed_mw"],
+            rows=[(1, "Coal", "1", "5.5"), (1, "Coal", "2", "6")]
+        )
+
+        self.assertListEqual(
+            c.execute("""SELECT * FROM results_project_dispatch
+                      ORDER BY scenario_id, project, timepoint;""").fetchall(),
+            [(1, "Coal", 1, 4.0, 5.5), (1, "Coal", 2, 6.0, 6.0),
+             (1, "Gas", 1, 2.0, None), (2, "Coal", 1, 3.0, None)]
+        )
+
+        # The staging table should have been dropped
+        self.assertListEqual(
+            c.execute("""SELECT name FROM sqlite_temp_master
+                      WHERE type = 'table';""").fetchall(),
+            []
+        )
+
+    def test_single_transaction(self):
+        """
+        Statements in the block should only be visible to other connections
+        once the block exits; if the block fails, they should be rolled back
+        """
+        other_conn = sqlite3.connect(
+            os.path.join(self.temp_dir, "test.db")
+        )
+        sql = "DELETE FROM results_project_dispatch WHERE scenario_id = ?;"
+        count_sql = "SELECT COUNT(*) FROM results_project_dispatch;"
+
+        with single_transaction(self.conn) as transaction_conn:
+            transaction_conn.execute(sql, (2,))
+            # Commits are deferred
+            transaction_conn.commit()
+            self.assertEqual(other_conn.execute(count_sql).fetchone()[0], 4)
+        self.assertEqual(other_conn.execute(count_sql).fetchone()[0], 3)
+
+        with self.assertRaises(ValueError):
+            with single_transaction(self.conn) as transaction_conn:
+                transaction_conn.execute(sql, (1,))
+                raise ValueError
+        self.assertEqual(self.conn.execute(count_sql).fetchone()[0], 3)
+
+        other_conn.close()
+
+    def test_read_only_connection(self):
+        """
+        A read-only connection should be able to read but not write
+        """
+        ro_conn = connect_to_database(
+            db_path=os.path.join(self.temp_dir, "test.db"), read_only=True
+        )
+        self.assertEqual(
+            ro_conn.execute(
+                "SELECT COUNT(*) FROM results_project_dispatch;"
+            ).fetchone()[0],
+            4
+        )
+        with self.assertRaises(sqlite3.OperationalError):
+            ro_conn.execute("DELETE FROM results_project_dispatch;")
+        ro_conn.close()
+
+    def test_update_project_operational_timepoints(self):
+        """
+        The materialized project-timepoints should match the
+        project_operational_timepoints view and be materialized again only
+        when the inputs change
+        """
+        create_project_inputs(self.conn)
+        c = self.conn.cursor()
+
+        materialized_sql = """
+            SELECT operational_type, project, timepoint
+            FROM project_operational_timepoints_materialized
+            WHERE project_portfolio_scenario_id IS 1
+            AND project_operational_chars_scenario_id IS 1
+            AND project_specified_capacity_scenario_id IS 1
+            AND project_new_cost_scenario_id IS NULL
+            AND temporal_scenario_id IS 1
+            ORDER BY project, timepoint;
+            """
+        n_combinations_sql = """
+            SELECT COUNT(*) FROM project_operational_timepoints_subscenarios;
+            """
+
+        db_interface_to_test.update_project_operational_timepoints(
+            conn=self.conn, subscenarios=MockSubScenarios
+        )
+        self.assertListEqual(
+            c.execute(materialized_sql).fetchall(),
+            [("gen_commit_cap", "Coal", 20200101),
+             ("gen_commit_cap", "Coal", 20200102),
+             ("gen_var", "Wind", 20200101),
+             ("gen_var", "Wind", 20200102)]
+        )
+        self.assertEqual(c.execute(n_combinations_sql).fetchone()[0], 1)
+
+        # Changing the inputs of another temporal subscenario should not
+        # affect the materialized project-timepoints
+        c.execute("INSERT INTO inputs_temporal_periods "
+                  "(temporal_scenario_id, period) VALUES (2, 2020);")
+        self.assertEqual(c.execute(n_combinations_sql).fetchone()[0], 1)
+
+        # Changing the inputs of the scenario's temporal subscenario should
+        # invalidate them and they should be materialized again
+        c.execute("INSERT INTO inputs_temporal (temporal_scenario_id, "
+                  "subproblem_id, stage_id, timepoint, period) "
+                  "VALUES (1, 1, 1, 20200103, 2020);")
+        self.conn.commit()
+        self.assertEqual(c.execute(n_combinations_sql).fetchone()[0], 0)
+
+        db_interface_to_test.update_project_operational_timepoints(
+            conn=self.conn, subscenarios=MockSubScenarios
+        )
+        self.assertListEqual(
+            c.execute(materialized_sql).fetchall(),
+            [("gen_commit_cap", "Coal", 20200101),
+             ("gen_commit_cap", "Coal", 20200102),
+             ("gen_commit_cap", "Coal", 20200103),
+             ("gen_var", "Wind", 20200101),
+             ("gen_var", "Wind", 20200102),
+             ("gen_var", "Wind", 20200103)]
+        )
+        self.assertEqual(c.execute(n_combinations_sql).fetchone()[0], 1)
+
+    def test_update_project_operational_timepoints_purge(self):
+        """
+        When materializing, the combinations that no scenario uses anymore
+        should be forgotten and their project-timepoints removed; the
+        combinations in use should be kept
+        """
+        create_project_inputs(self.conn)
+        c = self.conn.cursor()
+        c.execute(
+            "INSERT INTO scenarios (scenario_id, scenario_name, "
+            "project_portfolio_scenario_id, "
+            "project_operational_chars_scenario_id, "
+            "project_specified_capacity_scenario_id, "
+            "temporal_scenario_id) VALUES (1, 'test', 1, 1, 1, 1);"
+        )
+        self.conn.commit()
+
+        def materialize(temporal_scenario_id):
+            class TemporalSubScenarios(MockSubScenarios):
+                TEMPORAL_SCENARIO_ID = temporal_scenario_id
+            db_interface_to_test.update_project_operational_timepoints(
+                conn=self.conn, subscenarios=TemporalSubScenarios
+            )
+
+        def get_materialized():
+            return (
+                [r[0] for r in c.execute(
+                    "SELECT temporal_scenario_id "
+                    "FROM project_operational_timepoints_subscenarios "
+                    "ORDER BY temporal_scenario_id;"
+                ).fetchall()],
+                [r[0] for r in c.execute(
+                    "SELECT DISTINCT temporal_scenario_id "
+                    "FROM project_operational_timepoints_materialized "
+                    "ORDER BY temporal_scenario_id;"
+                ).fetchall()]
+            )
+
+        # The combination being materialized is kept even if no scenario
+        # uses it
+        materialize(1)
+        materialize(2)
+        self.assertTupleEqual(get_materialized(), ([1, 2], [1]))
+
+        # The scenario now uses the second combination, so the first one is
+        # purged the next time a combination is materialized
+        c.execute("UPDATE scenarios SET temporal_scenario_id = 2;")
+        self.conn.commit()
+        materialize(3)
+        self.assertTupleEqual(get_materialized(), ([2, 3], []))
+
+    def test_results_versions(self):
+        """
+        The scenarios should have no results version if the
+        results_scenario_version table doesn't exist (i.e. before the
+        database is migrated); once it exists, the scenarios should get a
+        version when their results change, and the scenarios with results
+        but no version should be given one
+        """
+        with open(DB_SCHEMA, "r") as f:
+            self.conn.executescript(f.read())
+        self.conn.execute("DROP TABLE results_scenario_version;")
+        self.conn.executemany(
+            "INSERT INTO results_scenario (scenario_id, subproblem_id, "
+            "stage_id) VALUES (?, 1, 1);",
+            [(1,), (2,)]
+        )
+        self.conn.commit()
+        self.assertIsNone(db_interface_to_test.get_results_version(
+            conn=self.conn, scenario_id=1
+        ))
+
+        create_missing_schema_objects(
+            conn=self.conn, tables=["results_scenario_version"], quiet=True
+        )
+        db_interface_to_test.update_results_version(
+            conn=self.conn, scenario_id=1
+        )
+        version = db_interface_to_test.get_results_version(
+            conn=self.conn, scenario_id=1
+        )
+        self.assertIsNone(db_interface_to_test.get_results_version(
+            conn=self.conn, scenario_id=2
+        ))
+
+        self.assertListEqual(
+            db_interface_to_test.add_missing_results_versions(
+                conn=self.conn
+            ),
+            [2]
+        )
+        self.assertIsNotNone(db_interface_to_test.get_results_version(
+            conn=self.conn, scenario_id=2
+        ))
+        self.assertEqual(
+            db_interface_to_test.get_results_version(
+                conn=self.conn, scenario_id=1
+            ),
+            version
+        )
+
+    def test_subproblem_stages_to_process(self):
+        """
+        Only the subproblems and stages that haven't been processed by the
+        module should be processed; deleting the results of a subproblem
+        and stage should mark it for processing again
+        """
+        with open(DB_SCHEMA, "r") as f:
+            self.conn.executescript(f.read())
+        self.conn.executemany(
+            "INSERT INTO results_scenario (scenario_id, subproblem_id, "
+            "stage_id) VALUES (?, ?, ?);",
+            [(1, 1, 1), (1, 1, 2), (1, 2, 1), (2, 1, 1)]
+        )
+        self.conn.commit()
+
+        def get_subproblem_stages(module):
+            return db_interface_to_test.get_subproblem_stages_to_process(
+                conn=self.conn, scenario_id=1, gridpath_module=module
+            )
+
+        self.assertListEqual(get_subproblem_stages("power"),
+                             [(1, 1), (1, 2), (2, 1)])
+
+        db_interface_to_test.record_processed_subproblem_stages(
+            conn=self.conn, scenario_id=1, gridpath_module="power",
+            subproblem_stages=[(1, 1), (2, 1)]
+        )
+        self.assertListEqual(get_subproblem_stages("power"), [(1, 2)])
+        self.assertListEqual(get_subproblem_stages("costs"),
+                             [(1, 1), (1, 2), (2, 1)])
+
+        delete_scenario_results(conn=self.conn, scenario_id=1,
+                                subproblem=1, stage=1)
+        self.conn.execute(
+            "INSERT INTO results_scenario (scenario_id, subproblem_id, "
+            "stage_id) VALUES (1, 1, 1);"
+        )
+        self.assertListEqual(get_subproblem_stages("power"),
+                             [(1, 1), (1, 2)])
+
+        # The filter should select the rows of the subproblems and stages
+        self.assertListEqual(
+            self.conn.execute(
+                """SELECT scenario_id, subproblem_id, stage_id
+                FROM results_scenario WHERE {}
+                ORDER BY scenario_id, subproblem_id, stage_id;""".format(
+                    db_interface_to_test.get_subproblem_stage_filter(
+                        [(1, 2), (1, 1)])
+                )
+            ).fetchall(),
+            [(1, 1, 1), (1, 1, 2), (2, 1, 1)]
+        )
+
+    def test_insert_aggregated_results(self):
+        """
+        The rows selected by the query should be inserted into the table and
+        the temporary table dropped
+        """
+        c = self.conn.cursor()
+        c.execute("""CREATE TABLE results_project_dispatch_agg (
+                  scenario_id INTEGER, project VARCHAR(64), power_mw FLOAT
+                  );""")
+        db_interface_to_test.insert_aggregated_results(
+            conn=self.conn, cursor=c, table="results_project_dispatch_agg",
+            columns="scenario_id, project, power_mw",
+            sql="""SELECT scenario_id, project, SUM(power_mw)
+                FROM results_project_dispatch
+                WHERE scenario_id = ?
+                GROUP BY scenario_id, project;""",
+            data=(1,)
+        )
+
+        self.assertListEqual(
+            c.execute("""SELECT * FROM results_project_dispatch_agg
+                      ORDER BY project;""").fetchall(),
+            [(1, "Coal", 10.0), (1, "Gas", 2.0)]
+        )
+        self.assertListEqual(
+            c.execute("""SELECT name FROM sqlite_temp_master
+                      WHERE type = 'table';""").fetchall(),
+            []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
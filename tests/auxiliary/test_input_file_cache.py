@@ -0,0 +1,102 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from gridpath.auxiliary.input_file_cache import InputFileCache
+
+
+class TestInputFileCache(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "projects.tab")
+        with open(self.file_path, "w") as f:
+            f.write("project\toperational_type\nCoal\tgen_commit_bin\n"
+                    "Wind\tgen_var\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_csv(self):
+        """
+        Cached reads should return the same DataFrames as pandas' read_csv
+        and avoid reading and parsing the file again
+        """
+        cache = InputFileCache()
+        for kwargs in [{"sep": "\t"},
+                       {"sep": "\t", "usecols": ["project"]},
+                       {"sep": "\t", "usecols": ["project"]},
+                       {"sep": "\t", "header": None, "nrows": 1}]:
+            pd.testing.assert_frame_equal(
+                cache.read_csv(self.file_path, **kwargs),
+                pd.read_csv(self.file_path, **kwargs)
+            )
+        self.assertEqual(cache.n_disk_reads, 1)
+        self.assertEqual(cache.n_disk_reads_avoided, 3)
+        self.assertEqual(cache.n_parses_avoided, 1)
+
+        # Modifying the returned DataFrame should not affect the cache
+        df = cache.read_csv(self.file_path, sep="\t")
+        df["project"] = "Gas"
+        self.assertListEqual(
+            cache.read_csv(self.file_path, sep="\t")["project"].tolist(),
+            ["Coal", "Wind"]
+        )
+
+    def test_invalidation(self):
+        """
+        Changed files should be read again
+        """
+        cache = InputFileCache()
+        cache.read_csv(self.file_path, sep="\t")
+        with open(self.file_path, "a") as f:
+            f.write("Gas\tgen_commit_cap\n")
+        os.utime(self.file_path, ns=(0, 0))
+
+        self.assertListEqual(
+            cache.read_csv(self.file_path, sep="\t")["project"].tolist(),
+            ["Coal", "Wind", "Gas"]
+        )
+        self.assertEqual(cache.n_disk_reads, 2)
+
+        with self.assertRaises(FileNotFoundError):
+            cache.read_csv(os.path.join(self.temp_dir, "periods.tab"))
+
+    def test_eviction(self):
+        """
+        The least recently used files should be dropped when the cached
+        contents exceed the size limit
+        """
+        other_file_path = os.path.join(self.temp_dir, "periods.tab")
+        with open(other_file_path, "w") as f:
+            f.write("period\n2020\n")
+
+        cache = InputFileCache(max_bytes=os.path.getsize(self.file_path))
+        cache.read_csv(self.file_path, sep="\t")
+        cache.read_csv(other_file_path, sep="\t")
+        self.assertListEqual(
+            list(cache.files.keys()), [os.path.abspath(other_file_path)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
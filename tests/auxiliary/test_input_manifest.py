@@ -0,0 +1,203 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import shutil
+import tempfile
+import types
+import unittest
+
+import gridpath.auxiliary.input_manifest as input_manifest_to_test
+
+
+class MockSubScenarios(object):
+    def __init__(self):
+        self.PROJECT_PORTFOLIO_SCENARIO_ID = 1
+        self.TEMPORAL_SCENARIO_ID = 2
+
+    def get_project_capacity_types(self, c):
+        return []
+
+
+def write_file(directory, filename, content):
+    with open(os.path.join(directory, filename), "w") as f:
+        f.write(content)
+
+
+class TestInputManifest(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_subscenarios_recorder(self):
+        """
+        Record the subscenario IDs accessed, and "*" if a method is used
+        """
+        recorder = input_manifest_to_test.SubScenariosRecorder(
+            MockSubScenarios()
+        )
+        self.assertEqual(recorder.TEMPORAL_SCENARIO_ID, 2)
+        self.assertSetEqual(recorder.used_subscenarios,
+                            {"TEMPORAL_SCENARIO_ID"})
+        self.assertDictEqual(
+            input_manifest_to_test.get_subscenario_values(
+                MockSubScenarios(), recorder.used_subscenarios
+            ),
+            {"TEMPORAL_SCENARIO_ID": 2}
+        )
+
+        recorder.get_project_capacity_types(None)
+        self.assertSetEqual(recorder.used_subscenarios,
+                            {"TEMPORAL_SCENARIO_ID", "*"})
+        self.assertDictEqual(
+            input_manifest_to_test.get_subscenario_values(
+                MockSubScenarios(), recorder.used_subscenarios
+            ),
+            {"PROJECT_PORTFOLIO_SCENARIO_ID": 1, "TEMPORAL_SCENARIO_ID": 2}
+        )
+
+    def test_get_modules_to_write(self):
+        """
+        Modules that share files with a changed module should be written
+        again; modules with missing files should be written again
+        """
+        modules = [types.ModuleType(name) for name in ["a", "b", "c", "d"]]
+        prior_entries = [
+            {"module": "a", "fingerprint": "1", "files": ["projects.tab"]},
+            {"module": "b", "fingerprint": "2",
+             "files": ["projects.tab", "heat_rates.tab"]},
+            {"module": "c", "fingerprint": "3", "files": ["periods.tab"]},
+            {"module": "d", "fingerprint": "4", "files": ["loads.tab"]}
+        ]
+        for f in ["projects.tab", "heat_rates.tab", "periods.tab"]:
+            write_file(self.temp_dir, f, "")
+
+        # Nothing changed except that loads.tab is missing
+        self.assertTupleEqual(
+            input_manifest_to_test.get_modules_to_write(
+                prior_entries, modules, ["1", "2", "3", "4"], self.temp_dir
+            ),
+            ({"d"}, set())
+        )
+
+        # Module a changed, so b needs to be written too
+        self.assertTupleEqual(
+            input_manifest_to_test.get_modules_to_write(
+                prior_entries, modules, ["new", "2", "3", "4"], self.temp_dir
+            ),
+            ({"a", "b", "d"}, {"projects.tab", "heat_rates.tab"})
+        )
+
+    def test_get_modules_to_link(self):
+        """
+        Modules to write should be linked if their files were shared with
+        the first directory and they depend on the same subscenarios; a
+        group of modules sharing files is only linked if all its modules
+        can be linked
+        """
+        modules = [types.ModuleType(name) for name in ["a", "b", "c", "d"]]
+        prior_entries = [
+            {"module": "a", "subscenarios": {"PROJECT": 1},
+             "files": ["projects.tab"], "shared": True},
+            {"module": "b", "subscenarios": {"TEMPORAL": 1},
+             "files": ["projects.tab", "heat_rates.tab"], "shared": False},
+            {"module": "c", "subscenarios": {"PROJECT": 1},
+             "files": ["periods.tab"], "shared": True},
+            {"module": "d", "subscenarios": {"LOAD": 1},
+             "files": ["loads.tab"], "shared": True}
+        ]
+        shared_entries = [
+            {"module": "a", "subscenarios": {"PROJECT": 2},
+             "files": ["projects.tab"]},
+            {"module": "b", "subscenarios": {"TEMPORAL": 1},
+             "files": ["projects.tab", "heat_rates.tab"]},
+            {"module": "c", "subscenarios": {"PROJECT": 2},
+             "files": ["periods.tab"]},
+            {"module": "d", "subscenarios": {"LOAD": 1, "TEMPORAL": 1},
+             "files": ["loads.tab"]}
+        ]
+
+        self.assertSetEqual(
+            input_manifest_to_test.get_modules_to_link(
+                prior_entries, modules, {"a", "b", "c", "d"}, shared_entries
+            ),
+            {"c"}
+        )
+
+    def test_flag_shared_entries(self):
+        """
+        Entries should be flagged as shared if all their files are the
+        same files as in the first directory
+        """
+        directories = [os.path.join(self.temp_dir, d) for d in ["1", "2"]]
+        for d in directories:
+            os.makedirs(d)
+        write_file(directories[0], "projects.tab", "project\nWind\n")
+        input_manifest_to_test.link_file(
+            os.path.join(directories[0], "projects.tab"),
+            os.path.join(directories[1], "projects.tab")
+        )
+        for d in directories:
+            write_file(d, "timepoints.tab", "timepoint\n1\n")
+        entries = [
+            [{"module": "a", "files": ["projects.tab"]},
+             {"module": "b", "files": ["projects.tab", "timepoints.tab"]},
+             {"module": "c", "files": []}]
+            for d in directories
+        ]
+
+        input_manifest_to_test.flag_shared_entries(directories, entries)
+        self.assertListEqual([e.get("shared") for e in entries[0]],
+                             [None, None, None])
+        self.assertListEqual([e["shared"] for e in entries[1]],
+                             [True, False, False])
+
+    def test_link_identical_files(self):
+        """
+        Identical files should be hard-linked to the first directory's copy;
+        breaking the links should make independent copies again
+        """
+        directories = [os.path.join(self.temp_dir, d) for d in ["1", "2"]]
+        for d in directories:
+            os.makedirs(d)
+            write_file(d, "projects.tab", "project\nWind\n")
+        write_file(directories[0], "timepoints.tab", "timepoint\n1\n")
+        write_file(directories[1], "timepoints.tab", "timepoint\n2\n")
+
+        input_manifest_to_test.link_identical_files(directories)
+        self.assertTrue(os.path.samefile(
+            os.path.join(directories[0], "projects.tab"),
+            os.path.join(directories[1], "projects.tab")
+        ))
+        self.assertFalse(os.path.samefile(
+            os.path.join(directories[0], "timepoints.tab"),
+            os.path.join(directories[1], "timepoints.tab")
+        ))
+
+        input_manifest_to_test.break_hard_links(directories[1])
+        self.assertFalse(os.path.samefile(
+            os.path.join(directories[0], "projects.tab"),
+            os.path.join(directories[1], "projects.tab")
+        ))
+        with open(os.path.join(directories[1], "projects.tab")) as f:
+            self.assertEqual(f.read(), "project\nWind\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
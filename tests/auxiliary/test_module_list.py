@@ -0,0 +1,60 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import unittest
+
+import gridpath.auxiliary.module_list as module_list_to_test
+
+EXAMPLE_SCENARIO_DIRECTORY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "examples", "test"
+)
+
+
+class TestModuleList(unittest.TestCase):
+    """
+
+    """
+    def test_module_registry(self):
+        """
+        The registry should determine and load the same modules as
+        determine_modules and load_modules, and return them on each request
+        without determining them again
+        """
+        expected_modules_to_use = module_list_to_test.determine_modules(
+            scenario_directory=EXAMPLE_SCENARIO_DIRECTORY
+        )
+        expected_loaded_modules = module_list_to_test.load_modules(
+            expected_modules_to_use
+        )
+
+        registry = module_list_to_test.ModuleRegistry(
+            EXAMPLE_SCENARIO_DIRECTORY
+        )
+        self.assertEqual(registry.n_requests, 0)
+        self.assertEqual(registry.saved_seconds(), 0)
+
+        for n in range(1, 4):
+            modules_to_use, loaded_modules = registry.get_modules()
+            self.assertListEqual(modules_to_use, expected_modules_to_use)
+            self.assertListEqual(loaded_modules, expected_loaded_modules)
+            self.assertEqual(registry.n_requests, n)
+
+        self.assertAlmostEqual(
+            registry.saved_seconds(), 2 * registry.setup_seconds
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from csv import reader
+import os.path
+import shutil
+import tempfile
+import time
+import unittest
+
+from pyomo.environ import AbstractModel, Set, Param
+from pyomo.core.base.PyomoModel import Model
+
+from gridpath.auxiliary.profiler import Profiler, profile_step, \
+    PROFILE_FILENAME, PROFILE_COLUMNS, CONSTRUCTION_REPORT_FILENAME, \
+    CONSTRUCTION_REPORT_COLUMNS
+
+
+class TestProfiler(unittest.TestCase):
+    """
+
+    """
+    def test_step(self):
+        """
+        Steps should be recorded with their wall time and peak memory; peak
+        memory should be None if not tracing memory allocations
+        """
+        profiler = Profiler()
+        profiler.start()
+        try:
+            with profiler.step("load_model_data", "gridpath.project"):
+                data = [0] * 10 ** 6
+            del data
+            with profile_step(profiler, "solve"):
+                write_start_time = time.perf_counter()
+                time.sleep(0.01)
+                profiler.add_inner_step(
+                    "write_problem", time.perf_counter() - write_start_time
+                )
+        finally:
+            profiler.stop()
+        with profiler.step("export_results", "gridpath.project"):
+            pass
+
+        # Doesn't record anything if not profiling
+        with profile_step(None, "solve"):
+            pass
+
+        self.assertListEqual(
+            [record[:3] for record in profiler.records],
+            [("load_model_data", "gridpath.project", ""),
+             ("write_problem", "", ""),
+             ("solve", "", ""),
+             ("export_results", "gridpath.project", "")]
+        )
+        # The inner step's time is excluded from the enclosing step's time
+        self.assertGreaterEqual(profiler.records[1][3], 0.01)
+        self.assertGreaterEqual(profiler.records[2][3], 0)
+        self.assertLess(profiler.records[2][3], profiler.records[1][3])
+        # The list of a million elements takes about 8 MB
+        self.assertGreater(profiler.records[0][4], 7)
+        self.assertIsNone(profiler.records[1][4])
+        self.assertLess(profiler.records[2][4], 1)
+        self.assertIsNone(profiler.records[3][4])
+
+    def test_component_construction(self):
+        """
+        The construction of each component should be recorded with the
+        module that added the component; Pyomo's construction method should
+        be restored afterwards
+        """
+        initialize_component = Model._initialize_component
+        profiler = Profiler()
+
+        model = AbstractModel()
+        model.PROJECTS = Set()
+        profiler.add_component_modules(
+            model.component_map().keys(), "gridpath.project"
+        )
+        model.capacity_mw = Param(model.PROJECTS)
+        profiler.add_component_modules(
+            model.component_map().keys(), "gridpath.project.capacity"
+        )
+
+        data = {None: {"PROJECTS": {None: ["Wind", "Coal"]},
+                       "capacity_mw": {"Wind": 10, "Coal": 20}}}
+        with profiler.component_construction():
+            instance = model.create_instance(data)
+
+        self.assertIs(Model._initialize_component, initialize_component)
+        self.assertEqual(instance.capacity_mw["Wind"], 10)
+        self.assertListEqual(
+            [record[:3] for record in profiler.records],
+            [("create_problem_instance", "gridpath.project", "PROJECTS"),
+             ("create_problem_instance", "gridpath.project.capacity",
+              "capacity_mw")]
+        )
+        self.assertListEqual(
+            [record[:4] for record in profiler.construction_records],
+            [("PROJECTS", "Set", "gridpath.project", 2),
+             ("capacity_mw", "Param", "gridpath.project.capacity", 2)]
+        )
+
+    def test_write_construction_report(self):
+        """
+        The components should be ranked by construction time and the
+        construction records cleared afterwards
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            profiler = Profiler()
+            profiler.construction_records = [
+                ("PROJECTS", "Set", "gridpath.project", 2, 0.5, 0.25, 1.0),
+                ("Min_Up_Time_Constraint", "Constraint",
+                 "gridpath.project.operations", 100, 2.0, 3.0, 4.0)
+            ]
+            profiler.write_construction_report(temp_dir)
+            with open(os.path.join(temp_dir, CONSTRUCTION_REPORT_FILENAME),
+                      "r") as f:
+                rows = list(reader(f))
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertListEqual(
+            rows,
+            [CONSTRUCTION_REPORT_COLUMNS,
+             ["1", "Min_Up_Time_Constraint", "Constraint",
+              "gridpath.project.operations", "100", "2.0", "3.0", "4.0"],
+             ["2", "PROJECTS", "Set", "gridpath.project", "2", "0.5", "0.25",
+              "1.0"]]
+        )
+        self.assertListEqual(profiler.construction_records, [])
+
+    def test_write_profile(self):
+        """
+        The steps should be written in order and cleared afterwards
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            profiler = Profiler()
+            profiler.records = [
+                ("load_model_data", "gridpath.project", "", 0.5, None),
+                ("solve", "", "", 2.0, 1.5)
+            ]
+            profiler.write_profile(temp_dir)
+            with open(os.path.join(temp_dir, PROFILE_FILENAME), "r") as f:
+                rows = list(reader(f))
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertListEqual(
+            rows,
+            [PROFILE_COLUMNS,
+             ["1", "load_model_data", "gridpath.project", "", "0.5", ""],
+             ["2", "solve", "", "", "2.0", "1.5"]]
+        )
+        self.assertListEqual(profiler.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import os.path
+import shutil
+import tempfile
+import unittest
+
+from pyomo.environ import ConcreteModel, Set, Param, Var, Expression, Any, \
+    value
+
+import gridpath.auxiliary.results_export as results_export_to_test
+
+
+def build_model():
+    """
+    Build a small model instance with the static project and timepoint
+    params that project-timepoint results tables include
+    """
+    m = ConcreteModel()
+    m.PROJECTS = Set(initialize=["Nuclear", "Gas_CT"], ordered=True)
+    m.TMPS = Set(initialize=[20200101, 20200102], ordered=True)
+    m.PRJ_OPR_TMPS = Set(
+        dimen=2, ordered=True,
+        initialize=[(p, tmp) for p in m.PROJECTS for tmp in m.TMPS]
+    )
+    m.period = Param(m.TMPS, initialize=2020)
+    m.tmp_weight = Param(m.TMPS, initialize=1.0)
+    m.hrs_in_tmp = Param(m.TMPS, initialize=1)
+    m.horizon = Param(
+        m.TMPS, ["day"], initialize={(20200101, "day"): 202001,
+                                     (20200102, "day"): 202001}
+    )
+    m.balancing_type_project = Param(m.PROJECTS, initialize="day", within=Any)
+    m.load_zone = Param(m.PROJECTS, initialize="Zone1", within=Any)
+    m.technology = Param(
+        m.PROJECTS, initialize={"Nuclear": "Nuclear", "Gas_CT": "Gas"},
+        within=Any
+    )
+    m.operational_type = Param(
+        m.PROJECTS,
+        initialize={"Nuclear": "gen_must_run", "Gas_CT": "gen_commit_cap"},
+        within=Any
+    )
+    m.unit_size = Param(m.PROJECTS, initialize={"Gas_CT": 2}, default=1)
+    m.Power = Var(
+        m.PRJ_OPR_TMPS,
+        initialize={("Nuclear", 20200101): 6, ("Nuclear", 20200102): 6,
+                    ("Gas_CT", 20200101): 1.5, ("Gas_CT", 20200102): 0}
+    )
+    m.Double_Power = Expression(
+        m.PRJ_OPR_TMPS, rule=lambda mod, p, tmp: 2 * mod.Power[p, tmp]
+    )
+
+    return m
+
+
+class TestResultsExport(unittest.TestCase):
+    """
+
+    """
+    def test_get_param_column(self):
+        """
+        Look up a param value for each key, including repeated keys
+        """
+        m = build_model()
+        self.assertListEqual(
+            results_export_to_test.get_param_column(
+                m.technology, ["Gas_CT", "Nuclear", "Gas_CT"]
+            ),
+            ["Gas", "Nuclear", "Gas"]
+        )
+        self.assertListEqual(
+            results_export_to_test.get_membership_column(
+                ["Gas_CT"], ["Gas_CT", "Nuclear", "Gas_CT"]
+            ),
+            [True, False, True]
+        )
+
+    def test_get_component_column(self):
+        """
+        Bulk values should be the same as the values by index for
+        variables, params (including default values) and expressions; rows
+        that are not included should get None
+        """
+        m = build_model()
+        index = list(m.PRJ_OPR_TMPS)
+        projects = results_export_to_test.get_index_column(index, 0)
+
+        self.assertListEqual(
+            results_export_to_test.get_component_column(m.Power, index),
+            [value(m.Power[idx]) for idx in index]
+        )
+        self.assertListEqual(
+            results_export_to_test.get_component_column(
+                m.Double_Power, index
+            ),
+            [value(m.Double_Power[idx]) for idx in index]
+        )
+        self.assertListEqual(
+            results_export_to_test.get_component_column(
+                m.unit_size, projects
+            ),
+            [1, 1, 2, 2]
+        )
+        self.assertListEqual(
+            results_export_to_test.get_component_column(
+                m.Power, index, include=[True, False, True, False]
+            ),
+            [6, None, 1.5, None]
+        )
+
+    def test_get_prj_tmp_columns(self):
+        """
+        Check the static project-timepoint attribute columns
+        """
+        m = build_model()
+        index = list(m.PRJ_OPR_TMPS)
+        columns = results_export_to_test.get_prj_tmp_columns(m, index)
+
+        expected_columns = {
+            "project": ["Nuclear", "Nuclear", "Gas_CT", "Gas_CT"],
+            "period": [2020] * 4,
+            "balancing_type_project": ["day"] * 4,
+            "horizon": [202001] * 4,
+            "timepoint": [20200101, 20200102] * 2,
+            "timepoint_weight": [1.0] * 4,
+            "number_of_hours_in_timepoint": [1] * 4,
+            "load_zone": ["Zone1"] * 4,
+            "technology": ["Nuclear", "Nuclear", "Gas", "Gas"],
+            "operational_type": ["gen_must_run"] * 2 + ["gen_commit_cap"] * 2
+        }
+        self.assertDictEqual(columns, expected_columns)
+
+    def test_arithmetic_columns(self):
+        """
+        Element-wise products, differences, and quotients, with the same
+        values (and types) as Python arithmetic on each row
+        """
+        product = results_export_to_test.get_product_column(
+            [1, 2.5], [3, 2]
+        )
+        self.assertListEqual(product, [3, 5.0])
+        # Integers are not converted to floats, so they are written to the
+        # results files as before (e.g. "3" rather than "3.0")
+        self.assertListEqual([type(v) for v in product], [int, float])
+
+        difference = results_export_to_test.get_difference_column(
+            [1, 2.5], [3, 2]
+        )
+        self.assertListEqual(difference, [-2, 0.5])
+        self.assertListEqual([type(v) for v in difference], [int, float])
+
+        self.assertListEqual(
+            results_export_to_test.get_quotient_column([1, 2.5], [4, 2]),
+            [0.25, 1.25]
+        )
+
+        # Missing values raise an error rather than becoming NaN
+        with self.assertRaises(TypeError):
+            results_export_to_test.get_product_column([1, None], [3, 2])
+        with self.assertRaises(TypeError):
+            results_export_to_test.get_difference_column([1, 2], [None, 2])
+
+    def test_write_results_file(self):
+        """
+        The results file should be the same as one written row by row
+        """
+        m = build_model()
+        index = list(m.PRJ_OPR_TMPS)
+        header = ["project", "timepoint", "power_mw"]
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            expected_file = os.path.join(temp_dir, "expected.csv")
+            with open(expected_file, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for (p, tmp) in index:
+                    writer.writerow([p, tmp, value(m.Power[p, tmp])])
+
+            actual_file = os.path.join(temp_dir, "actual.csv")
+            results_export_to_test.write_results_file(
+                actual_file, header,
+                [results_export_to_test.get_index_column(index, 0),
+                 results_export_to_test.get_index_column(index, 1),
+                 results_export_to_test.get_component_column(m.Power, index)]
+            )
+
+            with open(expected_file, "r") as f:
+                expected = f.read()
+            with open(actual_file, "r") as f:
+                actual = f.read()
+            self.assertEqual(actual, expected)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
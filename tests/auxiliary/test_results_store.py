@@ -0,0 +1,222 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import os.path
+import shutil
+import tempfile
+import unittest
+
+import gridpath.auxiliary.results_store as results_store_to_test
+from gridpath.auxiliary.profiler import PROFILE_FILENAME
+
+DISPATCH_RESULTS = {
+    ("1", ""): [["project", "timepoint", "power_mw", "startup_type"],
+                ["Coal", 20200101, 10.5, None],
+                ["Coal", 20200102, 0, 1]],
+    ("2", ""): [["project", "timepoint", "power_mw", "startup_type"],
+                ["Coal", 20200103, 20.0, None]],
+}
+
+
+class TestResultsStore(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        try:
+            import pyarrow
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+
+        self.scenario_directory = tempfile.mkdtemp()
+        for subproblem, stage in DISPATCH_RESULTS.keys():
+            os.makedirs(self.get_results_directory(subproblem, stage))
+
+    def tearDown(self):
+        shutil.rmtree(self.scenario_directory)
+
+    def get_results_directory(self, subproblem, stage):
+        return os.path.join(
+            self.scenario_directory, subproblem, stage, "results"
+        )
+
+    def write_results(self, subproblem, stage, filename, rows):
+        results_directory = self.get_results_directory(subproblem, stage)
+        with results_store_to_test.parquet_results(
+            self.scenario_directory, subproblem, stage, results_directory
+        ):
+            with results_store_to_test.results_writer(
+                os.path.join(results_directory, filename)
+            ) as writer:
+                writer.writerow(rows[0])
+                writer.writerows(rows[1:])
+
+    def read_results(self, subproblem, stage, filename):
+        results_directory = self.get_results_directory(subproblem, stage)
+        with results_store_to_test.parquet_results(
+            self.scenario_directory, subproblem, stage, results_directory
+        ):
+            with results_store_to_test.results_reader(
+                os.path.join(results_directory, filename)
+            ) as reader:
+                return list(reader)
+
+    def test_get_partition_directory(self):
+        """
+        Subproblems and stages should be partitioned by ID, with ID 1 if
+        there are no subproblems or stages
+        """
+        self.assertEqual(
+            results_store_to_test.get_partition_directory(
+                self.scenario_directory, "dispatch", "2", ""
+            ),
+            os.path.join(self.scenario_directory, "results_parquet",
+                         "dispatch", "subproblem_id=2", "stage_id=1")
+        )
+
+    def test_write_and_read_results(self):
+        """
+        The results should be written to Parquet partitions rather than
+        CSV files (except the files kept as CSV); reading should only
+        return the requested partitions and columns
+        """
+        for (subproblem, stage), rows in DISPATCH_RESULTS.items():
+            self.write_results(subproblem, stage, "dispatch.csv", rows)
+            self.write_results(subproblem, stage, PROFILE_FILENAME,
+                               [["step", "phase"], [1, "solve"]])
+            results_directory = self.get_results_directory(subproblem, stage)
+            self.assertListEqual(os.listdir(results_directory),
+                                 [PROFILE_FILENAME])
+
+        df = results_store_to_test.read_results_table(
+            self.scenario_directory, "dispatch"
+        )
+        self.assertListEqual(
+            sorted(df["timepoint"]), [20200101, 20200102, 20200103]
+        )
+
+        df = results_store_to_test.read_results_table(
+            self.scenario_directory, "dispatch", subproblem=1, stage=1,
+            columns=["timepoint", "power_mw", "subproblem_id"]
+        )
+        self.assertListEqual(list(df.columns),
+                             ["timepoint", "power_mw", "subproblem_id"])
+        self.assertListEqual(df.values.tolist(),
+                             [[20200101, 10.5, 1], [20200102, 0, 1]])
+
+        # Remove the partitions of a subproblem
+        results_store_to_test.remove_parquet_results(
+            self.scenario_directory, "1", ""
+        )
+        self.assertListEqual(
+            results_store_to_test.get_partition_tables(
+                self.scenario_directory, "1", ""
+            ),
+            []
+        )
+        self.assertListEqual(
+            results_store_to_test.get_partition_tables(
+                self.scenario_directory, "2", ""
+            ),
+            ["dispatch"]
+        )
+
+    def test_csv_results(self):
+        """
+        Outside of the parquet results context, the results should be
+        written to and read from CSV files
+        """
+        results_file = os.path.join(
+            self.get_results_directory("1", ""), "dispatch.csv"
+        )
+        with results_store_to_test.results_writer(results_file) as writer:
+            writer.writerows(DISPATCH_RESULTS["1", ""])
+        with open(results_file, "r") as f:
+            self.assertEqual(
+                f.read(),
+                "project,timepoint,power_mw,startup_type\n"
+                "Coal,20200101,10.5,\n"
+                "Coal,20200102,0,1\n"
+            )
+        with results_store_to_test.results_reader(results_file) as reader:
+            self.assertListEqual(next(reader), DISPATCH_RESULTS["1", ""][0])
+        self.assertFalse(
+            os.path.exists(os.path.join(self.scenario_directory,
+                                        "results_parquet"))
+        )
+
+    def test_parquet_results_round_trip(self):
+        """
+        The rows read from Parquet should be the rows the CSV reader reads
+        from the CSV file: numeric-looking strings (e.g. zones with leading
+        zeros) and booleans should be read back exactly as they were
+        written; columns are stored as numbers only if all their values are
+        numbers
+        """
+        rows = [
+            ["load_zone", "timepoint", "spinup_or_lookahead", "flag",
+             "power_mw"],
+            ["007", 20200101, "true", 1, -0.5],
+            ["7", 20200102, "false", True, 1e-05],
+            [None, 20200103, None, False, 2.25]
+        ]
+        self.write_results("1", "", "zones.csv", rows)
+
+        df = results_store_to_test.read_results_table(
+            self.scenario_directory, "zones"
+        )
+        self.assertListEqual(
+            [str(df[column].dtype) for column in df.columns],
+            ["object", "int64", "object", "object", "float64", "int64",
+             "int64"]
+        )
+
+        csv_file = os.path.join(self.scenario_directory, "zones.csv")
+        with open(csv_file, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+        with open(csv_file, "r") as f:
+            csv_rows = list(csv.reader(f))
+        self.assertListEqual(self.read_results("1", "", "zones.csv"),
+                             csv_rows)
+
+    def test_read_results_csv(self):
+        """
+        Modules should be able to check for and read the results from
+        Parquet like from a CSV file
+        """
+        self.write_results("1", "", "dispatch.csv", DISPATCH_RESULTS["1", ""])
+        results_directory = self.get_results_directory("1", "")
+        results_file = os.path.join(results_directory, "dispatch.csv")
+        with results_store_to_test.parquet_results(
+            self.scenario_directory, "1", "", results_directory
+        ):
+            self.assertTrue(
+                results_store_to_test.results_file_exists(results_file)
+            )
+            self.assertFalse(results_store_to_test.results_file_exists(
+                os.path.join(results_directory, "capacity.csv")
+            ))
+            df = results_store_to_test.read_results_csv(results_file)
+        self.assertListEqual(df["power_mw"].tolist(), [10.5, 0])
+
+        # Outside of the parquet results context, we only look for the CSV
+        # file
+        self.assertFalse(
+            results_store_to_test.results_file_exists(results_file)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
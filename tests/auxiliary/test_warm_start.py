@@ -0,0 +1,172 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyomo.environ import ConcreteModel, Set, Var, Binary, NonNegativeReals
+
+import gridpath.auxiliary.warm_start as warm_start_to_test
+
+
+def create_instance(timepoints):
+    """
+    :param timepoints: list of the timepoints
+    :return: a small problem instance with timepoints, a scalar variable,
+        a variable indexed by project and timepoint, and a binary variable
+    """
+    instance = ConcreteModel()
+    instance.TMPS = Set(initialize=timepoints, ordered=True)
+    instance.PRJ_OPR_TMPS = Set(
+        dimen=2, initialize=[("Coal", tmp) for tmp in timepoints]
+    )
+    instance.Total_Cost = Var(within=NonNegativeReals)
+    instance.Provide_Power_MW = Var(instance.PRJ_OPR_TMPS,
+                                    within=NonNegativeReals)
+    instance.Commit = Var(instance.PRJ_OPR_TMPS, within=Binary)
+    return instance
+
+
+class TestWarmStart(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_and_set_variable_values(self):
+        """
+        Values should be set only for the indices in both instances and for
+        variables that are not fixed; integer values should be rounded
+        """
+        solved_instance = create_instance([1, 2])
+        solved_instance.Total_Cost.value = 100
+        solved_instance.Provide_Power_MW["Coal", 1].value = 10
+        solved_instance.Provide_Power_MW["Coal", 2].value = 20
+        solved_instance.Commit["Coal", 2].value = 0.9999999
+
+        values = warm_start_to_test.get_variable_values(solved_instance)
+        self.assertDictEqual(
+            values,
+            {"Total_Cost": {None: 100},
+             "Provide_Power_MW": {("Coal", 1): 10, ("Coal", 2): 20},
+             "Commit": {("Coal", 2): 0.9999999}}
+        )
+
+        instance = create_instance([2, 3])
+        instance.Total_Cost.fix(50)
+        self.assertEqual(
+            warm_start_to_test.set_variable_values(instance, values), 2
+        )
+        self.assertEqual(instance.Total_Cost.value, 50)
+        self.assertEqual(instance.Provide_Power_MW["Coal", 2].value, 20)
+        self.assertIsNone(instance.Provide_Power_MW["Coal", 3].value)
+        self.assertEqual(instance.Commit["Coal", 2].value, 1)
+
+    def test_set_variable_values_by_timepoint_position(self):
+        """
+        With the previous timepoints, the values should also be set for the
+        timepoints at the same position; the values of the timepoints in
+        both instances should take precedence
+        """
+        previous_instance = create_instance([1, 2, 3])
+        for tmp, value in [(1, 10), (2, 20), (3, 30)]:
+            previous_instance.Provide_Power_MW["Coal", tmp].value = value
+        values = warm_start_to_test.get_variable_values(previous_instance)
+
+        # The next subproblem starts at the previous subproblem's lookahead
+        # timepoint 3
+        instance = create_instance([3, 4, 5])
+        self.assertEqual(
+            warm_start_to_test.set_variable_values(
+                instance, values, previous_timepoints=[1, 2, 3]
+            ),
+            3
+        )
+        self.assertListEqual(
+            [instance.Provide_Power_MW["Coal", tmp].value
+             for tmp in [3, 4, 5]],
+            [30, 20, 30]
+        )
+
+        # Without the previous timepoints, only the shared timepoint is set
+        instance = create_instance([3, 4, 5])
+        self.assertEqual(
+            warm_start_to_test.set_variable_values(instance, values), 1
+        )
+
+    def test_save_and_load_variable_values(self):
+        """
+        Saved values should be loaded with the same variable names and
+        indices
+        """
+        instance = create_instance([20200101, 20200102])
+        instance.Total_Cost.value = 100.5
+        instance.Provide_Power_MW["Coal", 20200102].value = 20.25
+
+        self.assertIsNone(
+            warm_start_to_test.load_variable_values(self.temp_dir)
+        )
+        warm_start_to_test.save_variable_values(instance, self.temp_dir)
+        self.assertDictEqual(
+            warm_start_to_test.load_variable_values(self.temp_dir),
+            warm_start_to_test.get_variable_values(instance)
+        )
+
+    def test_warm_start(self):
+        """
+        The reference scenario's values should take precedence over the
+        previous (sub)problem's values
+        """
+        results_directory = os.path.join(self.temp_dir, "1", "", "results")
+        os.makedirs(results_directory)
+        reference_instance = create_instance([1])
+        reference_instance.Total_Cost.value = 1
+        warm_start_to_test.save_variable_values(
+            reference_instance, results_directory
+        )
+
+        previous_instance = create_instance([1])
+        previous_instance.Total_Cost.value = 2
+
+        warm_start = warm_start_to_test.WarmStart(
+            from_previous=True, reference_scenario_directory=self.temp_dir
+        )
+        self.assertIsNone(warm_start.get_values("2", ""))
+        warm_start.update(previous_instance)
+        self.assertDictEqual(warm_start.get_values("1", ""),
+                             {"Total_Cost": {None: 1}})
+        self.assertDictEqual(warm_start.get_values("2", ""),
+                             {"Total_Cost": {None: 2}})
+
+        # The previous (sub)problem's values are mapped to the
+        # (sub)problem's timepoints
+        previous_instance.Provide_Power_MW["Coal", 1].value = 10
+        warm_start.update(previous_instance)
+        instance = create_instance([2])
+        self.assertEqual(warm_start.set_values(instance, "2", ""), 2)
+        self.assertEqual(instance.Provide_Power_MW["Coal", 2].value, 10)
+
+        warm_start = warm_start_to_test.WarmStart(from_previous=False)
+        warm_start.update(previous_instance)
+        self.assertIsNone(warm_start.get_values("1", ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
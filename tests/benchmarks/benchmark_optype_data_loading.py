@@ -0,0 +1,129 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark converting the projects.tab params of each operational
+type into Pyomo param dictionaries. For each operational type, we create
+a projects DataFrame with the type's required and optional columns (with
+some params unspecified, i.e. set to "."), and time the row-by-row
+conversion that get_param_dict used to do against the column-wise
+df_to_param_dict, checking that the dictionaries are identical.
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_optype_data_loading
+"""
+
+from argparse import ArgumentParser
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from gridpath.project.operations.operational_types.common_functions import \
+    df_to_param_dict, get_optype_param_requirements, get_types_dict
+
+OP_TYPES = [
+    "dr", "gen_always_on", "gen_commit_bin", "gen_commit_cap",
+    "gen_commit_lin", "gen_hydro", "gen_hydro_must_take", "gen_must_run",
+    "gen_simple", "gen_var", "gen_var_must_take", "stor"
+]
+
+
+def get_param_dict_by_row(df, column_name, cast_as_type):
+    """
+    The row-by-row conversion (for comparison).
+    """
+    param_dict = dict()
+    for prj, param_val in zip(df["project"], df[column_name]):
+        if param_val != ".":
+            param_dict[prj] = cast_as_type(param_val)
+    return param_dict
+
+
+def create_projects_df(columns, n_projects):
+    """
+    Create a projects DataFrame with random params, a fifth of them
+    unspecified. Columns have strings, like when read from projects.tab
+    with "." values.
+    """
+    data = {"project": ["prj_{}".format(i) for i in range(n_projects)]}
+    for column in columns:
+        values = np.random.rand(n_projects).round(4).astype(str).astype(object)
+        values[np.random.rand(n_projects) < 0.2] = "."
+        data[column] = values
+    return pd.DataFrame(data)
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_projects", default=20000, type=int)
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+
+    types_dict = get_types_dict()
+
+    print("{:<20} {:>8} {:>10} {:>10} {:>8}  {}".format(
+        "op type", "params", "by row (s)", "by col (s)", "speedup",
+        "identical"))
+    for op_type in OP_TYPES:
+        required, optional, _ = get_optype_param_requirements(op_type)
+        columns_types = dict(required, **optional)
+        if not columns_types:
+            print("{:<20} {:>8}".format(op_type, 0))
+            continue
+        df = create_projects_df(
+            columns=list(columns_types.keys()),
+            n_projects=parsed_args.n_projects
+        )
+
+        start = time.time()
+        by_row = {
+            c: get_param_dict_by_row(df, c, types_dict[t])
+            for c, t in columns_types.items()
+        }
+        by_row_seconds = time.time() - start
+
+        start = time.time()
+        by_column = {
+            c: df_to_param_dict(
+                df=df, index_columns=["project"], column_name=c,
+                cast_as_type=types_dict[t]
+            )
+            for c, t in columns_types.items()
+        }
+        by_column_seconds = time.time() - start
+
+        print("{:<20} {:>8} {:>10.3f} {:>10.3f} {:>7.1f}x  {}".format(
+            op_type, len(columns_types), by_row_seconds, by_column_seconds,
+            by_row_seconds / by_column_seconds, by_row == by_column
+        ))
+
+
+if __name__ == "__main__":
+    main()
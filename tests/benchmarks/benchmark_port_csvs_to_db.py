@@ -0,0 +1,155 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark porting hourly variable generator profiles (one CSV per project,
+several years of hourly timepoints) from CSVs to the database. We time the
+default row-by-row loading in db.utilities.port_csvs_to_db against the
+bulk-load mode, and check that the resulting tables are identical.
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_port_csvs_to_db
+"""
+
+from argparse import ArgumentParser
+import os.path
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from db.utilities.port_csvs_to_db import load_all_from_master_csv, \
+    bulk_load_all_from_master_csv
+
+DB_SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "db", "db_schema.sql"
+)
+TABLE = "project_variable_generator_profiles"
+
+
+def write_csvs(csv_path, n_projects, n_years):
+    """
+    Write the CSV master file and a profile CSV for each project.
+    """
+    profiles_dir = os.path.join(csv_path, TABLE)
+    os.makedirs(profiles_dir)
+    pd.DataFrame(
+        [[TABLE, "variable_generator_profile_scenario_id", TABLE, "simple",
+          np.nan, 1, np.nan, np.nan]],
+        columns=["path", "subscenario", "table", "subscenario_type",
+                 "custom_method", "project_input", "filename",
+                 "cols_to_exclude_str"]
+    ).to_csv(os.path.join(csv_path, "csv_data_master.csv"), index=False)
+
+    timepoints = [
+        year * 10**6 + hour for year in range(2020, 2020 + n_years)
+        for hour in range(1, 8761)
+    ]
+    for p in range(n_projects):
+        pd.DataFrame({
+            "stage_id": 1,
+            "timepoint": timepoints,
+            "cap_factor": np.random.rand(len(timepoints)).round(4)
+        }).to_csv(
+            os.path.join(profiles_dir, "Wind_{}-1-base.csv".format(p)),
+            index=False
+        )
+
+
+def create_database(db_path):
+    conn = sqlite3.connect(db_path)
+    with open(DB_SCHEMA, "r") as f:
+        conn.executescript(f.read())
+    return conn
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_projects", default=20, type=int)
+    parser.add_argument("--n_years", default=5, type=int)
+    parser.add_argument("--n_parallel_parsers", default=4, type=int)
+    parser.add_argument("--chunk_size", default=100000, type=int)
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+
+    # Register numpy types with sqlite like port_csvs_to_db.main does
+    sqlite3.register_adapter(np.int64, lambda val: int(val))
+    sqlite3.register_adapter(np.float64, lambda val: float(val))
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(temp_dir, "csvs")
+        write_csvs(csv_path, parsed_args.n_projects, parsed_args.n_years)
+        csv_data_master = pd.read_csv(
+            os.path.join(csv_path, "csv_data_master.csv")
+        )
+
+        by_row_conn = create_database(os.path.join(temp_dir, "by_row.db"))
+        start = time.time()
+        load_all_from_master_csv(
+            conn=by_row_conn, csv_path=csv_path,
+            csv_data_master=csv_data_master, quiet=True
+        )
+        by_row = time.time() - start
+
+        bulk_conn = create_database(os.path.join(temp_dir, "bulk.db"))
+        start = time.time()
+        bulk_load_all_from_master_csv(
+            conn=bulk_conn, csv_path=csv_path,
+            csv_data_master=csv_data_master,
+            n_parallel_parsers=parsed_args.n_parallel_parsers,
+            chunk_size=parsed_args.chunk_size, quiet=True
+        )
+        bulk = time.time() - start
+
+        sql = "SELECT * FROM inputs_{} ORDER BY project, timepoint;".format(
+            TABLE
+        )
+        by_row_rows = by_row_conn.execute(sql).fetchall()
+        identical = by_row_rows == bulk_conn.execute(sql).fetchall()
+        by_row_conn.close()
+        bulk_conn.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("{} CSVs, {:,} rows".format(
+        parsed_args.n_projects, len(by_row_rows)))
+    print("Default load: {:.2f} s ({:,.0f} rows per second)".format(
+        by_row, len(by_row_rows) / by_row))
+    print("Bulk load:    {:.2f} s ({:,.0f} rows per second)".format(
+        bulk, len(by_row_rows) / bulk))
+    print("Speedup: {:.1f}x; identical tables: {}".format(
+        by_row / bulk, identical))
+
+
+if __name__ == "__main__":
+    main()
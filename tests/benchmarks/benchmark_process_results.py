@@ -0,0 +1,252 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark processing the results of a scenario with many subproblems (e.g.
+a year of weekly production-cost subproblems). We time processing all of
+the results sequentially and with the modules processed in parallel, then
+processing the results again after re-importing a single subproblem and
+without any new results, and check that the processed results are
+identical.
+
+Only the modules whose results processing doesn't depend on other
+subscenario data are included (timepoints, project power, costs, and
+emissions, and transmission operations); results are randomly generated.
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_process_results
+"""
+
+from argparse import ArgumentParser
+import importlib
+import os.path
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from db.utilities.scenario import delete_scenario_results
+from gridpath.process_results import process_results
+
+DB_SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "db", "db_schema.sql"
+)
+MODULES = [
+    "gridpath.temporal.operations.timepoints",
+    "gridpath.project.operations.power",
+    "gridpath.project.operations.costs",
+    "gridpath.project.operations.carbon_emissions",
+    "gridpath.transmission.operations.operations"
+]
+AGGREGATED_TABLES = [
+    "results_project_dispatch_by_technology",
+    "results_project_dispatch_by_technology_period",
+    "results_project_dispatch_by_period",
+    "results_project_costs_operations_agg",
+    "results_project_carbon_emissions_by_technology_period",
+    "results_transmission_imports_exports_agg"
+]
+
+
+def get_subproblem_rows(subproblem, n_timepoints, n_projects, n_lines):
+    """
+    Get the randomly generated results of a subproblem by table.
+    """
+    timepoints = [subproblem * 1000 + tmp for tmp in range(n_timepoints)]
+    zones = ["Zone{}".format(z) for z in range(5)]
+    project_rows = [
+        (1, "Project{}".format(p), 2030, subproblem, 1, tmp, 1.0, 1.0,
+         zones[p % len(zones)], "Tech{}".format(p % 10))
+        for p in range(n_projects) for tmp in timepoints
+    ]
+    n = len(project_rows)
+    values = np.random.rand(4, n).round(4).tolist()
+    flows = (np.random.rand(n_lines * n_timepoints) - 0.5).round(4).tolist()
+
+    return {
+        "results_project_dispatch": (
+            "scenario_id, project, period, subproblem_id, stage_id, "
+            "timepoint, timepoint_weight, number_of_hours_in_timepoint, "
+            "load_zone, technology, power_mw",
+            [row + (v,) for row, v in zip(project_rows, values[0])]
+        ),
+        "results_project_costs_operations": (
+            "scenario_id, project, period, subproblem_id, stage_id, "
+            "timepoint, timepoint_weight, number_of_hours_in_timepoint, "
+            "load_zone, technology, variable_om_cost, fuel_cost, "
+            "startup_cost, shutdown_cost",
+            [row + (v1, v2, 0.0, 0.0) for row, v1, v2
+             in zip(project_rows, values[1], values[2])]
+        ),
+        "results_project_carbon_emissions": (
+            "scenario_id, project, period, subproblem_id, stage_id, "
+            "timepoint, timepoint_weight, number_of_hours_in_timepoint, "
+            "load_zone, technology, carbon_emission_tons",
+            [row + (v,) for row, v in zip(project_rows, values[3])]
+        ),
+        "results_transmission_operations": (
+            "scenario_id, transmission_line, load_zone_from, load_zone_to, "
+            "period, subproblem_id, stage_id, timepoint, timepoint_weight, "
+            "number_of_hours_in_timepoint, transmission_flow_mw",
+            [(1, "Line{}".format(l), zones[l % len(zones)],
+              zones[(l + 1) % len(zones)], 2030, subproblem, 1, tmp, 1.0,
+              1.0, flows[l * n_timepoints + i])
+             for l in range(n_lines) for i, tmp in enumerate(timepoints)]
+        ),
+        "results_scenario": (
+            "scenario_id, subproblem_id, stage_id, "
+            "solver_termination_condition",
+            [(1, subproblem, 1, "optimal")]
+        ),
+        "inputs_temporal": (
+            "temporal_scenario_id, subproblem_id, stage_id, timepoint, "
+            "period, number_of_hours_in_timepoint, timepoint_weight",
+            [(1, subproblem, 1, tmp, 2030, 1, 1.0) for tmp in timepoints]
+        )
+    }
+
+
+def insert_rows(conn, subproblem_rows, tables=None):
+    for table, (columns, rows) in subproblem_rows.items():
+        if tables is not None and table not in tables:
+            continue
+        conn.executemany(
+            "INSERT INTO {} ({}) VALUES ({});".format(
+                table, columns, ", ".join(["?"] * len(columns.split(",")))
+            ),
+            rows
+        )
+    conn.commit()
+
+
+def create_database(db_path, parsed_args):
+    """
+    Create the database and import the results of all subproblems.
+    """
+    conn = sqlite3.connect(db_path)
+    with open(DB_SCHEMA, "r") as f:
+        conn.executescript(f.read())
+    conn.execute(
+        "INSERT INTO scenarios (scenario_id, scenario_name, "
+        "temporal_scenario_id) VALUES (1, 'benchmark', 1);"
+    )
+    for subproblem in range(1, parsed_args.n_subproblems + 1):
+        insert_rows(conn, get_subproblem_rows(
+            subproblem, parsed_args.n_timepoints, parsed_args.n_projects,
+            parsed_args.n_lines
+        ))
+    conn.close()
+
+
+def time_process_results(db_path, n_parallel):
+    conn = sqlite3.connect(db_path)
+    start = time.time()
+    process_results(
+        loaded_modules=[importlib.import_module(m) for m in MODULES],
+        db=conn, cursor=conn.cursor(), scenario_id=1, subscenarios=None,
+        quiet=True, n_parallel=n_parallel, db_path=db_path
+    )
+    seconds = time.time() - start
+    conn.close()
+
+    return seconds
+
+
+def get_aggregated_results(db_path):
+    conn = sqlite3.connect(db_path)
+    results = [
+        sorted(conn.execute("SELECT * FROM {};".format(table)).fetchall())
+        for table in AGGREGATED_TABLES
+    ]
+    conn.close()
+
+    return results
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_subproblems", default=52, type=int)
+    parser.add_argument("--n_timepoints", default=168, type=int)
+    parser.add_argument("--n_projects", default=100, type=int)
+    parser.add_argument("--n_lines", default=10, type=int)
+    parser.add_argument("--n_parallel_process_results", default=4, type=int)
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+
+    np.random.seed(0)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        sequential_db = os.path.join(temp_dir, "sequential.db")
+        parallel_db = os.path.join(temp_dir, "parallel.db")
+        create_database(sequential_db, parsed_args)
+        shutil.copy(sequential_db, parallel_db)
+
+        sequential = time_process_results(sequential_db, n_parallel=1)
+        parallel = time_process_results(
+            parallel_db, n_parallel=parsed_args.n_parallel_process_results
+        )
+        identical = get_aggregated_results(sequential_db) \
+            == get_aggregated_results(parallel_db)
+
+        # Re-import the results of a subproblem
+        conn = sqlite3.connect(sequential_db)
+        delete_scenario_results(conn=conn, scenario_id=1, subproblem=1,
+                                stage=1)
+        insert_rows(
+            conn,
+            get_subproblem_rows(1, parsed_args.n_timepoints,
+                                parsed_args.n_projects, parsed_args.n_lines),
+            tables=["results_project_dispatch",
+                    "results_project_costs_operations",
+                    "results_project_carbon_emissions",
+                    "results_transmission_operations", "results_scenario"]
+        )
+        conn.close()
+        one_subproblem = time_process_results(sequential_db, n_parallel=1)
+        no_new_results = time_process_results(sequential_db, n_parallel=1)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("{} subproblems, {:,} project-timepoints".format(
+        parsed_args.n_subproblems,
+        parsed_args.n_subproblems * parsed_args.n_timepoints
+        * parsed_args.n_projects))
+    print("All results, sequential:      {:.2f} s".format(sequential))
+    print("All results, {} in parallel:   {:.2f} s ({:.1f}x); identical "
+          "results: {}".format(parsed_args.n_parallel_process_results,
+                               parallel, sequential / parallel, identical))
+    print("One re-imported subproblem:   {:.2f} s ({:.1f}x)".format(
+        one_subproblem, sequential / one_subproblem))
+    print("No new results:               {:.3f} s".format(no_new_results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the queries behind the UI results plots on a database with a
+large dispatch-by-technology table (10M rows by default). Each query is
+issued by the viz function the UI calls, and its SQL is captured with a
+trace callback. We then check with EXPLAIN QUERY PLAN that no table is
+fully scanned and that each table is searched by the columns the query
+filters on, and we time the queries. With --compare, the secondary indexes
+of the schema are dropped and the queries are timed again.
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_query_plans
+"""
+
+from argparse import ArgumentParser
+import os.path
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+from db.utilities.update_schema import get_schema_objects
+from viz import curtailment_hydro_heatmap_plot, \
+    curtailment_variable_heatmap_plot, dispatch_plot, energy_plot, \
+    project_operations_plot
+
+DB_SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "db", "db_schema.sql"
+)
+N_ZONES = 10
+N_TECHNOLOGIES = 10
+RESERVE_TABLES = [
+    "results_project_lf_reserves_up", "results_project_lf_reserves_down",
+    "results_project_regulation_up", "results_project_regulation_down",
+    "results_project_frequency_response",
+    "results_project_spinning_reserves"
+]
+
+# The first week of timepoints
+START_TMP, END_TMP = 1, 168
+WEEK = list(range(START_TMP, END_TMP + 1))
+
+# The hot queries: the function issuing them and the columns each table
+# must be searched by
+HOT_QUERIES = [
+    ("dispatch plot: timepoints",
+     lambda conn: dispatch_plot.get_timepoints(
+         conn, 1, START_TMP, END_TMP, 1),
+     {"inputs_temporal": ["temporal_scenario_id"]}),
+    ("dispatch plot: power by technology",
+     lambda conn: dispatch_plot.get_power_by_tech_results(
+         conn, 1, "Zone_1", WEEK),
+     {"results_project_dispatch_by_technology":
+      ["scenario_id", "load_zone", "timepoint"]}),
+    ("dispatch plot: variable curtailment",
+     lambda conn: dispatch_plot.get_variable_curtailment_results(
+         conn.cursor(), 1, "Zone_1", WEEK),
+     {"results_project_curtailment_variable":
+      ["scenario_id", "load_zone", "timepoint"]}),
+    ("dispatch plot: hydro curtailment",
+     lambda conn: dispatch_plot.get_hydro_curtailment_results(
+         conn.cursor(), 1, "Zone_1", WEEK),
+     {"results_project_curtailment_hydro":
+      ["scenario_id", "load_zone", "timepoint"]}),
+    ("dispatch plot: imports and exports",
+     lambda conn: dispatch_plot.get_imports_exports_results(
+         conn.cursor(), 1, "Zone_1", WEEK),
+     {"results_transmission_imports_exports":
+      ["scenario_id", "load_zone", "timepoint"]}),
+    ("dispatch plot: load",
+     lambda conn: dispatch_plot.get_load(conn.cursor(), 1, "Zone_1", WEEK),
+     {"results_system_load_balance":
+      ["scenario_id", "load_zone", "timepoint"]}),
+    ("variable curtailment heatmap",
+     lambda conn: curtailment_variable_heatmap_plot.get_plotting_data(
+         conn, 1, "Zone_1", 2030, 1),
+     {"results_project_curtailment_variable": ["scenario_id", "load_zone"]}),
+    ("hydro curtailment heatmap",
+     lambda conn: curtailment_hydro_heatmap_plot.get_plotting_data(
+         conn, 1, "Zone_1", 2030, 1),
+     {"results_project_curtailment_hydro": ["scenario_id", "load_zone"]}),
+    ("project operations plot (one week)",
+     lambda conn: project_operations_plot.get_plotting_data(
+         conn, 1, "Project_1", 2030, 1, 1, 7),
+     dict(
+         [("results_project_dispatch", ["scenario_id", "project"])] +
+         [(table, ["scenario_id", "project", "stage_id", "timepoint"])
+          for table in RESERVE_TABLES]
+     )),
+    ("energy plot",
+     lambda conn: energy_plot.get_plotting_data(conn, 1, "Zone_1", 1),
+     {"results_project_dispatch_by_technology_period":
+      ["scenario_id", "load_zone", "stage_id"]}),
+]
+
+
+def create_database(db_path):
+    conn = sqlite3.connect(db_path)
+    with open(DB_SCHEMA, "r") as f:
+        conn.executescript(f.read())
+    return conn
+
+
+def populate_database(conn, n_timepoints, n_projects):
+    """
+    Add a scenario with daily subproblems of hourly timepoints, and its
+    results by zone, by zone and technology, and by project.
+    """
+    conn.execute("""
+        INSERT INTO scenarios
+        (scenario_id, scenario_name, temporal_scenario_id,
+        project_operational_chars_scenario_id)
+        VALUES (1, 'benchmark', 1, 1);""")
+    conn.executemany("""
+        INSERT INTO inputs_project_operational_chars
+        (project_operational_chars_scenario_id, project, technology,
+        operational_type, min_stable_level_fraction)
+        VALUES (1, ?, 'Tech_1', 'gen_commit_cap', 0.4);""",
+        [("Project_{}".format(p),) for p in range(1, n_projects + 1)]
+    )
+    conn.execute("""
+        INSERT INTO inputs_temporal
+        (temporal_scenario_id, subproblem_id, stage_id, timepoint, period,
+        number_of_hours_in_timepoint, timepoint_weight, month, hour_of_day)
+        WITH RECURSIVE tmps(t) AS (
+            SELECT 1 UNION ALL SELECT t + 1 FROM tmps WHERE t < ?
+        )
+        SELECT 1, (t - 1) / 24 + 1, 1, t, 2030 + (t - 1) / 8760, 1, 1,
+        (t - 1) / 730 % 12 + 1, (t - 1) % 24
+        FROM tmps;""", (n_timepoints,))
+
+    # The zones, technologies, and projects of each timepoint
+    by_zone = """
+        WITH RECURSIVE zones(z) AS (
+            SELECT 1 UNION ALL SELECT z + 1 FROM zones WHERE z < {}
+        )
+        SELECT subproblem_id, stage_id, period, timepoint, month,
+        hour_of_day, 'Zone_' || z AS load_zone, abs(random() % 100) AS mw
+        FROM inputs_temporal, zones""".format(N_ZONES)
+    by_zone_technology = """
+        WITH RECURSIVE zones(z) AS (
+            SELECT 1 UNION ALL SELECT z + 1 FROM zones WHERE z < {}
+        ), technologies(g) AS (
+            SELECT 1 UNION ALL SELECT g + 1 FROM technologies WHERE g < {}
+        )
+        SELECT subproblem_id, stage_id, period, timepoint,
+        'Zone_' || z AS load_zone, 'Tech_' || g AS technology,
+        abs(random() % 100) AS mw
+        FROM inputs_temporal, zones, technologies""".format(
+        N_ZONES, N_TECHNOLOGIES)
+    by_project = """
+        WITH RECURSIVE projects(p) AS (
+            SELECT 1 UNION ALL SELECT p + 1 FROM projects WHERE p < {}
+        )
+        SELECT subproblem_id, stage_id, period, timepoint,
+        'Project_' || p AS project, abs(random() % 100) AS mw
+        FROM inputs_temporal, projects""".format(n_projects)
+
+    conn.execute("""
+        INSERT INTO results_project_dispatch_by_technology
+        (scenario_id, subproblem_id, stage_id, period, timepoint,
+        timepoint_weight, number_of_hours_in_timepoint, load_zone, technology,
+        power_mw)
+        SELECT 1, subproblem_id, stage_id, period, timepoint, 1, 1,
+        load_zone, technology, mw
+        FROM ({});""".format(by_zone_technology))
+    conn.execute("""
+        INSERT INTO results_project_dispatch_by_technology_period
+        (scenario_id, subproblem_id, stage_id, period, load_zone, technology,
+        energy_mwh)
+        SELECT DISTINCT 1, subproblem_id, stage_id, period, load_zone,
+        technology, mw
+        FROM ({}) WHERE timepoint % 24 = 1;""".format(by_zone_technology))
+    for table in ["results_project_curtailment_variable",
+                  "results_project_curtailment_hydro"]:
+        conn.execute("""
+            INSERT INTO {}
+            (scenario_id, subproblem_id, stage_id, period, timepoint,
+            timepoint_weight, number_of_hours_in_timepoint, month,
+            hour_of_day, load_zone, scheduled_curtailment_mw)
+            SELECT 1, subproblem_id, stage_id, period, timepoint, 1, 1,
+            month, hour_of_day, load_zone, mw
+            FROM ({});""".format(table, by_zone))
+    conn.execute("""
+        INSERT INTO results_transmission_imports_exports
+        (scenario_id, load_zone, period, subproblem_id, stage_id, timepoint,
+        timepoint_weight, number_of_hours_in_timepoint, net_imports_mw)
+        SELECT 1, load_zone, period, subproblem_id, stage_id, timepoint, 1, 1,
+        mw - 50
+        FROM ({});""".format(by_zone))
+    conn.execute("""
+        INSERT INTO results_system_load_balance
+        (scenario_id, load_zone, period, subproblem_id, stage_id, timepoint,
+        timepoint_weight, number_of_hours_in_timepoint, load_mw,
+        unserved_energy_mw)
+        SELECT 1, load_zone, period, subproblem_id, stage_id, timepoint, 1, 1,
+        mw, 0
+        FROM ({});""".format(by_zone))
+    conn.execute("""
+        INSERT INTO results_project_dispatch
+        (scenario_id, project, period, subproblem_id, stage_id, timepoint,
+        operational_type, horizon, timepoint_weight,
+        number_of_hours_in_timepoint, load_zone, technology, power_mw,
+        committed_mw)
+        SELECT 1, project, period, subproblem_id, stage_id, timepoint,
+        'gen_commit_cap', subproblem_id, 1, 1, 'Zone_1', 'Tech_1', mw, 100
+        FROM ({});""".format(by_project))
+    for table in RESERVE_TABLES:
+        conn.execute("""
+            INSERT INTO {}
+            (scenario_id, project, period, subproblem_id, stage_id, horizon,
+            timepoint, timepoint_weight, number_of_hours_in_timepoint,
+            load_zone, technology, reserve_provision_mw)
+            SELECT 1, project, period, subproblem_id, stage_id,
+            subproblem_id, timepoint, 1, 1, 'Zone_1', 'Tech_1', mw
+            FROM ({});""".format(table, by_project))
+    conn.commit()
+
+
+def get_plan_issues(conn, sql, required_columns):
+    """
+    :param conn: database connection
+    :param sql: the query
+    :param required_columns: dictionary of the columns each table must be
+        searched by
+    :return: list of the full scans and of the tables not searched by the
+        required columns
+    """
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table';"
+    ).fetchall()]
+
+    issues = list()
+    for row in conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall():
+        detail = row[3]
+        scan = re.match(r"SCAN (\w+)", detail)
+        if scan is not None and scan.group(1) in tables:
+            issues.append(detail)
+        elif "AUTOMATIC" in detail:
+            issues.append(detail)
+        search = re.match(r"SEARCH (\w+) USING .*\((.*)\)", detail)
+        if search is not None and search.group(1) in required_columns:
+            searched_columns = re.findall(
+                r"(\w+)(?:[=<>]| IN)", search.group(2)
+            )
+            if not set(required_columns[search.group(1)]) \
+                    <= set(searched_columns):
+                issues.append(detail)
+
+    return issues
+
+
+def run_hot_queries(conn, check_plans):
+    """
+    :param conn: database connection
+    :param check_plans: boolean; whether to check the query plans
+    :return: list of (query name, seconds, plan issues) tuples
+    """
+    results = list()
+    for name, run_query, required_columns in HOT_QUERIES:
+        statements = list()
+        conn.set_trace_callback(statements.append)
+        start = time.time()
+        run_query(conn)
+        seconds = time.time() - start
+        conn.set_trace_callback(None)
+
+        issues = list()
+        if check_plans:
+            for sql in statements:
+                if sql.lstrip().upper().startswith("SELECT"):
+                    issues += get_plan_issues(conn, sql, required_columns)
+        results.append((name, seconds, issues))
+
+    return results
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_rows", default=10000000, type=int,
+                        help="The number of rows of the dispatch by "
+                             "technology table.")
+    parser.add_argument("--n_projects", default=10, type=int)
+    parser.add_argument("--compare", default=False, action="store_true",
+                        help="Also time the queries without the schema's "
+                             "secondary indexes.")
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+    n_timepoints = parsed_args.n_rows // (N_ZONES * N_TECHNOLOGIES)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        conn = create_database(os.path.join(temp_dir, "benchmark.db"))
+        start = time.time()
+        populate_database(conn, n_timepoints, parsed_args.n_projects)
+        print("{:,} timepoints, {:,} dispatch by technology rows; "
+              "built in {:.0f} s".format(
+                  n_timepoints, n_timepoints * N_ZONES * N_TECHNOLOGIES,
+                  time.time() - start))
+
+        indexed = run_hot_queries(conn, check_plans=True)
+
+        if parsed_args.compare:
+            for object_type, name, sql in get_schema_objects(DB_SCHEMA):
+                if object_type == "index":
+                    conn.execute("DROP INDEX IF EXISTS {};".format(name))
+            not_indexed = run_hot_queries(conn, check_plans=False)
+        conn.close()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("{:<40} {:>10}{}".format(
+        "query", "indexed", " {:>12} {:>8}".format("not indexed", "speedup")
+        if parsed_args.compare else ""))
+    for i, (name, seconds, issues) in enumerate(indexed):
+        print("{:<40} {:>9.3f}s{}".format(
+            name, seconds, " {:>11.3f}s {:>7.0f}x".format(
+                not_indexed[i][1], not_indexed[i][1] / max(seconds, 1e-6))
+            if parsed_args.compare else ""))
+
+    issues = [(name, issue) for name, seconds, query_issues in indexed
+              for issue in query_issues]
+    for name, issue in issues:
+        print("{}: {}".format(name, issue))
+    assert not issues, "Hot queries with full scans: {}".format(len(issues))
+    print("No full scans in the hot queries.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the determination of the relevant timepoints for the minimum
+up/down time constraints in a large unit-commitment setting: many
+commitment projects, hourly timepoints in daily circular horizons, and a
+handful of distinct min up/down times. We time the cached
+determine_relevant_timepoints against the uncached lookback for every
+(project, timepoint) combination, once for the min up time and once for the
+min down time constraints.
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_relevant_timepoints
+"""
+
+from argparse import ArgumentParser
+import sys
+import time
+
+from pyomo.environ import ConcreteModel, Set, Param, Any
+
+from gridpath.project.operations.operational_types.common_functions import \
+    determine_relevant_timepoints, _determine_relevant_timepoints
+
+
+def build_model(n_projects, n_days):
+    """
+    Build a model instance with the components that the relevant timepoints
+    lookback needs: n_days daily circular horizons with 24 hourly
+    timepoints each, and n_projects projects of the 'day' balancing type.
+    """
+    tmps = list(range(1, n_days * 24 + 1))
+
+    m = ConcreteModel()
+    m.TMPS = Set(initialize=tmps, ordered=True)
+    m.hrs_in_tmp = Param(m.TMPS, initialize=1)
+    m.BLN_TYPE_HRZS = Set(
+        dimen=2, ordered=True,
+        initialize=[("day", d) for d in range(1, n_days + 1)]
+    )
+    m.TMPS_BY_BLN_TYPE_HRZ = Set(
+        m.BLN_TYPE_HRZS, ordered=True,
+        initialize={
+            ("day", d): tmps[(d - 1) * 24:d * 24]
+            for d in range(1, n_days + 1)
+        }
+    )
+    m.boundary = Param(m.BLN_TYPE_HRZS, initialize="circular", within=Any)
+    m.horizon = Param(
+        m.TMPS, ["day"],
+        initialize={(tmp, "day"): (tmp - 1) // 24 + 1 for tmp in tmps}
+    )
+    m.first_hrz_tmp = Param(
+        m.BLN_TYPE_HRZS,
+        initialize=lambda mod, b, h: list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[0]
+    )
+    m.PROJECTS = Set(initialize=range(n_projects))
+    m.balancing_type_project = Param(m.PROJECTS, initialize="day", within=Any)
+    # Projects have one of a few typical min up/down times
+    m.min_up_time_hours = Param(
+        m.PROJECTS, initialize=lambda mod, g: [4, 6, 8, 12][g % 4]
+    )
+    m.min_down_time_hours = Param(
+        m.PROJECTS, initialize=lambda mod, g: [2, 4, 6, 8][g % 4]
+    )
+
+    return m
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_projects", default=200, type=int)
+    parser.add_argument("--n_days", default=30, type=int)
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+
+    m = build_model(parsed_args.n_projects, parsed_args.n_days)
+    n_calls = 2 * len(m.PROJECTS) * len(m.TMPS)
+
+    start = time.time()
+    for param in [m.min_up_time_hours, m.min_down_time_hours]:
+        for g in m.PROJECTS:
+            for tmp in m.TMPS:
+                _determine_relevant_timepoints(
+                    mod=m, bt=m.balancing_type_project[g], tmp=tmp,
+                    min_time=param[g]
+                )
+    uncached = time.time() - start
+
+    start = time.time()
+    for param in [m.min_up_time_hours, m.min_down_time_hours]:
+        for g in m.PROJECTS:
+            for tmp in m.TMPS:
+                determine_relevant_timepoints(
+                    mod=m, g=g, tmp=tmp, min_time=param[g]
+                )
+    cached = time.time() - start
+
+    print("{} projects, {} timepoints, {} lookups".format(
+        len(m.PROJECTS), len(m.TMPS), n_calls))
+    print("Uncached lookback: {:.2f} s".format(uncached))
+    print("Cached lookback:   {:.2f} s ({} distinct lookbacks)".format(
+        cached, len(m._relevant_tmps_cache)))
+    print("Speedup: {:.1f}x".format(uncached / cached))
+
+
+if __name__ == "__main__":
+    main()
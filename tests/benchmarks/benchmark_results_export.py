@@ -0,0 +1,162 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the export of a project-timepoint results table for many
+projects and a year of hourly timepoints. We time writing the
+dispatch_all.csv table row by row (looking up the static attributes and
+calling value() for each row) against the columnar export in
+gridpath.auxiliary.results_export.
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_results_export
+"""
+
+from argparse import ArgumentParser
+import csv
+import os.path
+import shutil
+import sys
+import tempfile
+import time
+
+from pyomo.environ import ConcreteModel, Set, Param, Var, Any, value
+
+from gridpath.auxiliary.results_export import get_component_column, \
+    get_prj_tmp_columns, write_results_file
+
+HEADER = ["project", "period", "horizon", "timepoint", "operational_type",
+          "balancing_type", "timepoint_weight", "number_of_hours_in_timepoint",
+          "load_zone", "technology", "power_mw"]
+
+
+def build_model(n_projects, n_days):
+    """
+    Build a model instance with the static params of the dispatch_all.csv
+    table and a solved-like power variable.
+    """
+    tmps = list(range(1, n_days * 24 + 1))
+    projects = ["project_{}".format(g) for g in range(n_projects)]
+
+    m = ConcreteModel()
+    m.TMPS = Set(initialize=tmps, ordered=True)
+    m.PROJECTS = Set(initialize=projects, ordered=True)
+    m.PRJ_OPR_TMPS = Set(
+        dimen=2, ordered=True,
+        initialize=[(g, tmp) for g in projects for tmp in tmps]
+    )
+    m.period = Param(m.TMPS, initialize=2030)
+    m.tmp_weight = Param(m.TMPS, initialize=1.0)
+    m.hrs_in_tmp = Param(m.TMPS, initialize=1)
+    m.horizon = Param(
+        m.TMPS, ["day"],
+        initialize={(tmp, "day"): (tmp - 1) // 24 + 1 for tmp in tmps}
+    )
+    m.balancing_type_project = Param(m.PROJECTS, initialize="day", within=Any)
+    m.operational_type = Param(
+        m.PROJECTS, initialize="gen_commit_cap", within=Any
+    )
+    m.load_zone = Param(m.PROJECTS, initialize="Zone1", within=Any)
+    m.technology = Param(m.PROJECTS, initialize="Gas", within=Any)
+    m.Power_Provision_MW = Var(
+        m.PRJ_OPR_TMPS, initialize=lambda mod, g, tmp: tmp * 0.1
+    )
+
+    return m
+
+
+def export_by_row(m, file_path):
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for (p, tmp) in m.PRJ_OPR_TMPS:
+            writer.writerow([
+                p,
+                m.period[tmp],
+                m.horizon[tmp, m.balancing_type_project[p]],
+                tmp,
+                m.operational_type[p],
+                m.balancing_type_project[p],
+                m.tmp_weight[tmp],
+                m.hrs_in_tmp[tmp],
+                m.load_zone[p],
+                m.technology[p],
+                value(m.Power_Provision_MW[p, tmp])
+            ])
+
+
+def export_by_column(m, file_path):
+    index = list(m.PRJ_OPR_TMPS)
+    columns = get_prj_tmp_columns(m, index)
+    write_results_file(
+        file_path, HEADER,
+        [columns["project"], columns["period"], columns["horizon"],
+         columns["timepoint"], columns["operational_type"],
+         columns["balancing_type_project"], columns["timepoint_weight"],
+         columns["number_of_hours_in_timepoint"], columns["load_zone"],
+         columns["technology"],
+         get_component_column(m.Power_Provision_MW, index)]
+    )
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_projects", default=100, type=int)
+    parser.add_argument("--n_days", default=365, type=int)
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+
+    m = build_model(parsed_args.n_projects, parsed_args.n_days)
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        by_row_file = os.path.join(temp_dir, "by_row.csv")
+        start = time.time()
+        export_by_row(m, by_row_file)
+        by_row = time.time() - start
+
+        by_column_file = os.path.join(temp_dir, "by_column.csv")
+        start = time.time()
+        export_by_column(m, by_column_file)
+        by_column = time.time() - start
+
+        with open(by_row_file) as f_row, open(by_column_file) as f_col:
+            identical = f_row.read() == f_col.read()
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print("{} projects, {} timepoints, {} rows".format(
+        len(m.PROJECTS), len(m.TMPS), len(m.PRJ_OPR_TMPS)))
+    print("Row-by-row export: {:.2f} s".format(by_row))
+    print("Columnar export:   {:.2f} s".format(by_column))
+    print("Speedup: {:.1f}x; identical files: {}".format(
+        by_row / by_column, identical))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the construction of the OPR_PRJS_IN_TMP set with the indexed
+initializer (one pass over PRJ_OPR_TMPS) against the previous filter-style
+initializer (one pass over PRJ_OPR_TMPS for every timepoint).
+
+Run from the GridPath root directory with:
+
+    python -m tests.benchmarks.benchmark_set_indexes
+
+As the number of timepoints doubles, the build time with the indexed
+initializer should roughly double too, while the build time with the
+filter-style initializer should roughly quadruple.
+"""
+
+from argparse import ArgumentParser
+import sys
+import time
+
+from pyomo.environ import ConcreteModel, Set
+
+from gridpath.project.capacity.capacity import op_gens_by_tmp
+
+
+def filter_op_gens_by_tmp(mod, tmp):
+    """
+    The filter-style initializer that OPR_PRJS_IN_TMP used to have.
+    """
+    return list(g for (g, t) in mod.PRJ_OPR_TMPS if t == tmp)
+
+
+def time_set_build(n_projects, n_tmps, initializer):
+    """
+    Build a model with n_projects projects that are all operational in all
+    n_tmps timepoints and return the time (in seconds) to construct
+    OPR_PRJS_IN_TMP with the given initializer.
+    """
+    m = ConcreteModel()
+    m.PROJECTS = Set(initialize=range(n_projects))
+    m.TMPS = Set(initialize=range(n_tmps))
+    m.PRJ_OPR_TMPS = Set(
+        dimen=2,
+        initialize=[(g, tmp) for g in m.PROJECTS for tmp in m.TMPS]
+    )
+
+    start = time.time()
+    m.OPR_PRJS_IN_TMP = Set(m.TMPS, initialize=initializer)
+
+    return time.time() - start
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+    """
+    parser = ArgumentParser(add_help=True)
+    parser.add_argument("--n_projects", default=20, type=int)
+    parser.add_argument("--n_timepoints", default=250, type=int,
+                        help="The smallest number of timepoints; it will be "
+                             "doubled for each step.")
+    parser.add_argument("--n_steps", default=4, type=int)
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parsed_args = parse_arguments(args=args)
+
+    print("{:>10} {:>12} {:>12} {:>12} {:>12}".format(
+        "timepoints", "indexed (s)", "ratio", "filter (s)", "ratio")
+    )
+    prev_indexed, prev_filter = None, None
+    for step in range(parsed_args.n_steps):
+        n_tmps = parsed_args.n_timepoints * 2 ** step
+        indexed = time_set_build(
+            parsed_args.n_projects, n_tmps, op_gens_by_tmp
+        )
+        filtered = time_set_build(
+            parsed_args.n_projects, n_tmps, filter_op_gens_by_tmp
+        )
+        print("{:>10} {:>12.3f} {:>12} {:>12.3f} {:>12}".format(
+            n_tmps,
+            indexed,
+            "" if prev_indexed is None
+            else "{:.1f}x".format(indexed / prev_indexed),
+            filtered,
+            "" if prev_filter is None
+            else "{:.1f}x".format(filtered / prev_filter)
+        ))
+        prev_indexed, prev_filter = indexed, filtered
+
+
+if __name__ == "__main__":
+    main()
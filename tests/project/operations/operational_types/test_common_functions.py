@@ -25,7 +25,7 @@ import unittest
 from tests.common_functions import add_components_and_load_data
 
 from gridpath.project.operations.operational_types.common_functions import \
-    determine_relevant_timepoints
+    determine_relevant_timepoints, df_to_param_dict, get_param_dict
 
 TEST_DATA_DIRECTORY = \
     os.path.join(os.path.dirname(__file__), "..", "..", "..", "test_data")
@@ -177,6 +177,68 @@ class TestOperationalTypeCommonFunctions(unittest.TestCase):
             self.assertListEqual(actual_rel_linked_tmp_list,
                                  expected_rel_linked_tmp_list)
 
+    def test_determine_relevant_timepoints_cache(self):
+        """
+        Check that projects with the same balancing type share the relevant
+        timepoints determined for a timepoint and min time, and that
+        modifying the returned lists doesn't modify the cached results.
+        """
+        m, data = add_components_and_load_data(
+            prereq_modules=IMPORTED_PREREQ_MODULES,
+            module_to_test=None,  # No need to name since not adding components
+            test_data_dir=TEST_DATA_DIRECTORY,
+            subproblem="",
+            stage=""
+        )
+        instance = m.create_instance(data)
+
+        expected_list = [20200103, 20200102, 20200101, 20200124, 20200123]
+        actual_list, _ = determine_relevant_timepoints(
+            mod=instance, g="Gas_CCGT", tmp=20200103, min_time=5
+        )
+        self.assertListEqual(expected_list, actual_list)
+        self.assertEqual(1, len(instance._relevant_tmps_cache))
+
+        # Coal has the same balancing type as Gas_CCGT, so its relevant
+        # timepoints come from the cache
+        actual_list.append(20200122)
+        actual_list, _ = determine_relevant_timepoints(
+            mod=instance, g="Coal", tmp=20200103, min_time=5
+        )
+        self.assertListEqual(expected_list, actual_list)
+        self.assertEqual(1, len(instance._relevant_tmps_cache))
+
+    def test_df_to_param_dict(self):
+        """
+        Check that unspecified params are skipped, values are cast, and
+        multi-column indices become tuples
+        """
+        df = pd.DataFrame({
+            "project": ["Coal", "Gas", "Wind"],
+            "horizon": [1, 2, 3],
+            "unit_size_mw": ["6", ".", "0.5"],
+            "min_stable_level_fraction": [0.4, 0.3, 0.2]
+        })
+
+        self.assertDictEqual(
+            get_param_dict(df=df, column_name="unit_size_mw",
+                           cast_as_type=float),
+            {"Coal": 6.0, "Wind": 0.5}
+        )
+        self.assertDictEqual(
+            df_to_param_dict(
+                df=df, index_columns=["project", "horizon"],
+                column_name="min_stable_level_fraction", cast_as_type=float
+            ),
+            {("Coal", 1): 0.4, ("Gas", 2): 0.3, ("Wind", 3): 0.2}
+        )
+        with self.assertRaises(ValueError):
+            df_to_param_dict(
+                df=df, index_columns=["project"],
+                column_name="unit_size_mw", cast_as_type=float,
+                missing_value=None
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -789,6 +789,48 @@ class TestOperationsInit(unittest.TestCase):
             self.assertDictEqual(expected_intercept_dict,
                                  actual_intercept_dict)
 
+    def test_get_slopes_intercept_by_project_period_segment_errors(self):
+        """
+        Check that the error for the first project with missing periods or
+        an invalid curve is raised
+        """
+        columns = ["project", "period", "load_point_fraction",
+                   "average_heat_rate_mmbtu_per_mwh"]
+        df = pd.DataFrame(
+            columns=columns,
+            data=[["gas_ct", 2020, 0.5, 10],
+                  ["gas_ct", 2020, 1, 7],
+                  ["coal_plant", 2020, 0.5, 10],
+                  ["coal_plant", 2020, 1, 4],
+                  ["nuclear", 0, 1, 8]]
+        )
+        test_cases = {
+            # gas_ct doesn't have inputs for 2030
+            1: {"projects": ["gas_ct", "coal_plant"],
+                "periods": {2020, 2030},
+                "error_project": "gas_ct",
+                "error": "isn't specified for all"},
+            # coal_plant's fuel burn decreases
+            2: {"projects": ["nuclear", "coal_plant", "gas_ct"],
+                "periods": {2020},
+                "error_project": "coal_plant",
+                "error": "Total fuel burn or variable O&M cost should be"}
+        }
+        for test_case in test_cases.keys():
+            with self.assertRaises(ValueError) as error:
+                get_slopes_intercept_by_project_period_segment(
+                    df=df,
+                    input_col="average_heat_rate_mmbtu_per_mwh",
+                    projects=test_cases[test_case]["projects"],
+                    periods=test_cases[test_case]["periods"]
+                )
+            self.assertIn(test_cases[test_case]["error"],
+                          str(error.exception))
+            self.assertIn(
+                "'{}'".format(test_cases[test_case]["error_project"]),
+                str(error.exception)
+            )
+
     # TODO: re-scale load points to fractions
     def test_calculate_slope_intercept(self):
         """
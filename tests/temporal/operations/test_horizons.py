@@ -306,6 +306,38 @@ class TestHorizons(unittest.TestCase):
                              msg="Data for param next_tmp do not match "
                                  "expected.")
 
+    def test_get_tmp_sequence(self):
+        """
+        Check that the cached timepoint sequence matches the derived params
+        """
+        m, data = add_components_and_load_data(
+            prereq_modules=IMPORTED_PREREQ_MODULES,
+            module_to_test=MODULE_BEING_TESTED,
+            test_data_dir=TEST_DATA_DIRECTORY,
+            subproblem="",
+            stage=""
+        )
+        instance = m.create_instance(data)
+
+        tmp_sequence = MODULE_BEING_TESTED.get_tmp_sequence(instance)
+
+        # The sequence is only derived once per instance
+        self.assertIs(tmp_sequence,
+                      MODULE_BEING_TESTED.get_tmp_sequence(instance))
+
+        for (b, h) in instance.BLN_TYPE_HRZS:
+            self.assertEqual(instance.first_hrz_tmp[b, h],
+                             tmp_sequence["first_hrz_tmp"][b, h])
+            self.assertEqual(instance.last_hrz_tmp[b, h],
+                             tmp_sequence["last_hrz_tmp"][b, h])
+
+        for tmp in instance.TMPS:
+            for b in instance.BLN_TYPES:
+                self.assertEqual(instance.prev_tmp[tmp, b],
+                                 tmp_sequence["prev_tmp"][tmp, b])
+                self.assertEqual(instance.next_tmp[tmp, b],
+                                 tmp_sequence["next_tmp"][tmp, b])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -87,11 +87,13 @@ class TestExamples(unittest.TestCase):
 
         self.assertListEqual(expected_validations, actual_validations)
 
-    def run_and_check_objective(self, test, expected_objective):
+    def run_and_check_objective(self, test, expected_objective,
+                                extra_args=None):
         """
 
         :param test: str, name of the test example
         :param expected_objective: float or dict, expected objective
+        :param extra_args: list of any additional arguments to pass
         :return:
         """
 
@@ -105,7 +107,7 @@ class TestExamples(unittest.TestCase):
              # "--symbolic",
              "--quiet",
              "--mute_solver_output",
-             "--testing"]
+             "--testing"] + ([] if extra_args is None else extra_args)
         )
 
         # Multi-subproblem and/or multi-stage scenarios return dict
@@ -435,6 +437,19 @@ class TestExamples(unittest.TestCase):
                                       "2": -1265436373826.0408,
                                       "3": -1265436373826.0408})
 
+    def test_example_single_stage_prod_cost_parallel(self):
+        """
+        Check objective function values of "single_stage_prod_cost" example
+        when running the subproblems in parallel
+        :return:
+        """
+        self.run_and_check_objective("single_stage_prod_cost",
+                                     {"1": -1265436373826.0408,
+                                      "2": -1265436373826.0408,
+                                      "3": -1265436373826.0408},
+                                     extra_args=["--n_parallel_subproblems",
+                                                 "3"])
+
     def test_example_single_stage_prod_cost_linked_subproblems(self):
         """
         Check objective function values of
@@ -470,6 +485,65 @@ class TestExamples(unittest.TestCase):
                                             "2": -1265436373826.0408,
                                             "3": -1265436373826.099}})
 
+    def test_example_multi_stage_prod_cost_reuse_model(self):
+        """
+        Check objective function values of "multi_stage_prod_cost" example
+        when reusing the model across subproblems and stages
+        :return:
+        """
+        self.run_and_check_objective("multi_stage_prod_cost",
+                                     {"1": {"1": -1265436373826.0408,
+                                            "2": -1265436373826.0408,
+                                            "3": -1265436373826.099},
+                                      "2": {"1": -1265436373826.0408,
+                                            "2": -1265436373826.0408,
+                                            "3": -1265436373826.099},
+                                      "3": {"1": -1265436373826.0408,
+                                            "2": -1265436373826.0408,
+                                            "3": -1265436373826.099}},
+                                     extra_args=["--reuse_model"])
+
+    def test_example_multi_stage_prod_cost_profile(self):
+        """
+        Check objective function values of "multi_stage_prod_cost" example
+        when profiling the run, and check that the profile of each
+        subproblem and stage is imported into the database
+        :return:
+        """
+        self.run_and_check_objective("multi_stage_prod_cost",
+                                     {"1": {"1": -1265436373826.0408,
+                                            "2": -1265436373826.0408,
+                                            "3": -1265436373826.099},
+                                      "2": {"1": -1265436373826.0408,
+                                            "2": -1265436373826.0408,
+                                            "3": -1265436373826.099},
+                                      "3": {"1": -1265436373826.0408,
+                                            "2": -1265436373826.0408,
+                                            "3": -1265436373826.099}},
+                                     extra_args=["--profile"])
+
+        conn = connect_to_database(db_path=DB_PATH)
+        profiled_phases = conn.execute(
+            """
+            SELECT subproblem_id, stage_id, phase, count(*) > 0
+            FROM results_scenario_profile
+            INNER JOIN
+            (SELECT scenario_id, scenario_name FROM scenarios)
+            USING (scenario_id)
+            WHERE scenario_name = 'multi_stage_prod_cost'
+            AND phase in ('add_model_components', 'solve')
+            GROUP BY subproblem_id, stage_id, phase
+            """
+        ).fetchall()
+        conn.close()
+
+        self.assertListEqual(
+            profiled_phases,
+            [(subproblem, stage, phase, 1)
+             for subproblem in [1, 2, 3] for stage in [1, 2, 3]
+             for phase in ["add_model_components", "solve"]]
+        )
+
     def test_example_multi_stage_prod_cost_w_hydro(self):
         """
         Check validation and objective function values of
@@ -0,0 +1,68 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from pyomo.environ import ConcreteModel, Var, Objective, Constraint, \
+    NonNegativeReals, SolverFactory, value
+
+from gridpath.run_scenario import get_solver_interface_name, \
+    record_problem_write_times
+
+
+class TestRunScenario(unittest.TestCase):
+    """
+
+    """
+    def test_get_solver_interface_name(self):
+        """
+        The direct and persistent interfaces should be used only if
+        available, and the file interface otherwise
+        """
+        self.assertEqual(get_solver_interface_name("cbc", "file"), "cbc")
+        self.assertEqual(
+            get_solver_interface_name("gurobi_persistent", "direct"),
+            "gurobi_persistent"
+        )
+        # Cbc doesn't have an in-memory interface
+        with self.assertWarns(UserWarning):
+            self.assertEqual(
+                get_solver_interface_name("cbc", "persistent"), "cbc"
+            )
+
+    def test_record_problem_write_times(self):
+        """
+        The problem write time should be recorded and the solver's method
+        restored afterwards
+        """
+        solver = SolverFactory("cbc")
+        if not solver.available(exception_flag=False):
+            self.skipTest("Cbc is not available")
+
+        model = ConcreteModel()
+        model.x = Var(within=NonNegativeReals)
+        model.c = Constraint(expr=model.x >= 2)
+        model.obj = Objective(expr=model.x)
+
+        write_times = list()
+        with record_problem_write_times(solver, write_times):
+            solver.solve(model)
+
+        self.assertEqual(len(write_times), 1)
+        self.assertNotIn("_convert_problem", vars(solver))
+        self.assertAlmostEqual(value(model.x), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
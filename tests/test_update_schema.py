@@ -0,0 +1,267 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from db.utilities import update_schema
+
+
+class TestUpdateSchema(unittest.TestCase):
+    """
+    Check that databases created before tables, triggers, or indexes were
+    added to the schema are migrated to them.
+    """
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        with open(update_schema.DB_SCHEMA, "r") as f:
+            self.conn.executescript(f.read())
+
+    def tearDown(self):
+        self.conn.close()
+
+    def get_objects(self):
+        return sorted(r[0] for r in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE sql IS NOT NULL "
+            "AND name NOT LIKE 'sqlite_%';"
+        ).fetchall())
+
+    def test_get_schema_objects(self):
+        """
+        The schema's CREATE statements, including the triggers whose bodies
+        contain semicolons, should be parsed into the object type, name,
+        and statement
+        """
+        schema_objects = update_schema.get_schema_objects()
+        object_types = dict(
+            (name, object_type) for object_type, name, sql in schema_objects
+        )
+        self.assertEqual(
+            object_types["project_operational_timepoints_materialized"],
+            "table"
+        )
+        self.assertEqual(object_types["project_operational_timepoints"],
+                         "view")
+        self.assertEqual(
+            object_types[
+                "inputs_temporal_delete_project_operational_timepoints"
+            ],
+            "trigger"
+        )
+        self.assertEqual(
+            object_types["project_operational_timepoints_materialized_idx"],
+            "index"
+        )
+        # The schema creates all of them
+        self.assertListEqual(sorted(object_types.keys()), self.get_objects())
+
+    def test_create_missing_schema_objects(self):
+        """
+        The missing objects should be created and existing ones kept; if
+        tables are specified, only they and their triggers and indexes
+        should be created
+        """
+        schema_objects = self.get_objects()
+        self.conn.execute("INSERT INTO results_scenario (scenario_id, "
+                          "subproblem_id, stage_id) VALUES (1, 1, 1);")
+        self.conn.execute(
+            "DROP TRIGGER "
+            "inputs_temporal_insert_project_operational_timepoints;"
+        )
+        self.conn.execute(
+            "DROP TABLE project_operational_timepoints_subscenarios;"
+        )
+        self.conn.execute("DROP TABLE status_validation;")
+
+        self.assertListEqual(
+            update_schema.create_missing_schema_objects(
+                conn=self.conn,
+                tables=["project_operational_timepoints_subscenarios"],
+                quiet=True
+            ),
+            ["project_operational_timepoints_subscenarios",
+             "inputs_temporal_insert_project_operational_timepoints"]
+        )
+        self.assertListEqual(
+            update_schema.create_missing_schema_objects(
+                conn=self.conn, quiet=True
+            ),
+            ["status_validation"]
+        )
+        self.assertListEqual(self.get_objects(), schema_objects)
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT scenario_id, subproblem_id, stage_id "
+                "FROM results_scenario;"
+            ).fetchall(),
+            [(1, 1, 1)]
+        )
+        self.assertListEqual(
+            update_schema.create_missing_schema_objects(
+                conn=self.conn, quiet=True
+            ),
+            []
+        )
+
+    def test_create_missing_indexes(self):
+        """
+        The missing secondary indexes should be created, including the
+        indexes of the results plot queries, and existing ones kept
+        """
+        schema_objects = self.get_objects()
+        for index in [
+            "results_system_load_balance_zone_timepoint_idx",
+            "results_project_spinning_reserves_project_timepoint_idx"
+        ]:
+            self.conn.execute("DROP INDEX {};".format(index))
+
+        self.assertListEqual(
+            update_schema.create_missing_schema_objects(
+                conn=self.conn, quiet=True
+            ),
+            ["results_project_spinning_reserves_project_timepoint_idx",
+             "results_system_load_balance_zone_timepoint_idx"]
+        )
+        self.assertListEqual(self.get_objects(), schema_objects)
+
+    def test_check_database_schema(self):
+        """
+        Databases missing tables, views, or triggers should be reported as
+        needing a migration without being changed; missing indexes are
+        allowed
+        """
+        update_schema.check_database_schema(conn=self.conn)
+        self.conn.execute(
+            "DROP INDEX results_system_load_balance_zone_timepoint_idx;"
+        )
+        update_schema.check_database_schema(conn=self.conn)
+
+        self.conn.execute(
+            "DROP TABLE project_operational_timepoints_subscenarios;"
+        )
+        self.conn.execute("DROP VIEW project_operational_timepoints;")
+        objects = self.get_objects()
+        self.assertListEqual(
+            update_schema.get_missing_schema_objects(conn=self.conn),
+            ["project_operational_timepoints",
+             "project_operational_timepoints_subscenarios"]
+        )
+        with self.assertRaises(ValueError):
+            update_schema.check_database_schema(conn=self.conn)
+        self.assertListEqual(self.get_objects(), objects)
+
+    def test_rebuild_outdated_tables(self):
+        """
+        Aggregated results tables whose primary key differs from the schema
+        should be recreated and marked for processing again; up-to-date
+        tables should be kept
+        """
+        self.conn.execute("DROP TABLE results_project_dispatch_by_period;")
+        self.conn.execute("""
+            CREATE TABLE results_project_dispatch_by_period (
+            scenario_id INTEGER,
+            project VARCHAR(64),
+            period INTEGER,
+            stage_id INTEGER,
+            load_zone VARCHAR(32),
+            technology VARCHAR(32),
+            energy_mwh FLOAT,
+            weighted_hours FLOAT,
+            PRIMARY KEY (scenario_id, project, period, stage_id)
+            );
+            """)
+        self.conn.execute(
+            "INSERT INTO results_project_dispatch_by_period VALUES "
+            "(1, 'Coal', 2020, 1, 'Zone1', 'Coal', 10.0, 8760.0);"
+        )
+        self.conn.executemany(
+            "INSERT INTO results_scenario_processed (scenario_id, "
+            "subproblem_id, stage_id, gridpath_module) VALUES (1, 1, 1, ?);",
+            [("gridpath.project.operations.power",),
+             ("gridpath.project.operations.costs",)]
+        )
+        self.conn.commit()
+
+        # The outdated table is reported without being changed
+        self.assertListEqual(
+            update_schema.get_outdated_tables(conn=self.conn),
+            ["results_project_dispatch_by_period"]
+        )
+        with self.assertRaises(ValueError):
+            update_schema.check_database_schema(conn=self.conn)
+
+        self.assertListEqual(
+            update_schema.rebuild_outdated_tables(conn=self.conn, quiet=True),
+            ["results_project_dispatch_by_period"]
+        )
+        self.assertIn(
+            ("subproblem_id", 4),
+            update_schema.get_table_columns(
+                self.conn, "results_project_dispatch_by_period"
+            )
+        )
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT * FROM results_project_dispatch_by_period;"
+            ).fetchall(),
+            []
+        )
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT gridpath_module FROM results_scenario_processed;"
+            ).fetchall(),
+            [("gridpath.project.operations.costs",)]
+        )
+        self.assertListEqual(
+            update_schema.rebuild_outdated_tables(conn=self.conn, quiet=True),
+            []
+        )
+        update_schema.check_database_schema(conn=self.conn)
+
+    def test_main(self):
+        """
+        The migration should create the missing tables and fill the results
+        versions of the scenarios with results
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        db_path = os.path.join(temp_dir, "io.db")
+        conn = sqlite3.connect(db_path)
+        with open(update_schema.DB_SCHEMA, "r") as f:
+            conn.executescript(f.read())
+        conn.execute("DROP TABLE results_scenario_version;")
+        conn.execute("INSERT INTO results_scenario (scenario_id, "
+                     "subproblem_id, stage_id) VALUES (1, 1, 1);")
+        conn.commit()
+        conn.close()
+
+        update_schema.main(["--database", db_path, "--quiet"])
+        conn = sqlite3.connect(db_path)
+        self.assertListEqual(
+            update_schema.get_missing_schema_objects(conn=conn), []
+        )
+        self.assertListEqual(
+            conn.execute(
+                "SELECT scenario_id FROM results_scenario_version;"
+            ).fetchall(),
+            [(1,)]
+        )
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
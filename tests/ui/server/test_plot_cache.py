@@ -0,0 +1,53 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from ui.server.plot_cache import PlotCache
+
+
+class TestPlotCache(unittest.TestCase):
+    """
+    Check that plots are served from the cache only if they were built from
+    the current version of the scenario's results.
+    """
+    def test_get_and_put(self):
+        """
+        Cached plots should be invalidated when the scenario's results
+        version changes; plots should not be cached if the version is
+        unknown
+        """
+        cache = PlotCache(max_memory_mb=1)
+        cache.put("dispatch", 1, ("Zone1",), "a", {"plot": 1})
+        cache.put("dispatch", 2, ("Zone1",), "b", {"plot": 2})
+        self.assertEqual(cache.get("dispatch", 1, ("Zone1",), "a"),
+                         {"plot": 1})
+        self.assertIsNone(cache.get("dispatch", 1, ("Zone2",), "a"))
+
+        # A new results version invalidates the scenario's plots only
+        self.assertIsNone(cache.get("dispatch", 1, ("Zone1",), "c"))
+        self.assertIsNone(cache.get("dispatch", 1, ("Zone1",), "a"))
+        self.assertEqual(cache.get("dispatch", 2, ("Zone1",), "b"),
+                         {"plot": 2})
+
+        # Without a results version, plots are not cached or served
+        cache.put("dispatch", 3, ("Zone1",), None, {"plot": 3})
+        self.assertIsNone(cache.get("dispatch", 3, ("Zone1",), None))
+        self.assertIsNone(cache.get("dispatch", 2, ("Zone1",), None))
+        self.assertIsNone(cache.get("dispatch", 2, ("Zone1",), "b"))
+        self.assertEqual(cache.memory_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,298 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os.path
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from db.create_database import load_mod_run_status_types
+from ui.server import run_queue_manager as run_queue_manager_to_test
+
+DB_SCHEMA = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "db", "db_schema.sql"
+)
+
+
+class FakeProcess(object):
+    """
+    A scenario process that runs until it is finished by the test
+    """
+    def __init__(self, pid):
+        self.pid = pid
+        self.finished = threading.Event()
+
+    def wait(self):
+        self.finished.wait()
+
+    def terminate(self):
+        self.finished.set()
+
+
+class FakeScheduler(run_queue_manager_to_test.RunQueueScheduler):
+    """
+    A scheduler that launches fake processes instead of running the
+    scenarios
+    """
+    def launch(self, scenario_id, scenario_name, solver, cpu_reservation,
+               memory_reservation_gb):
+        process = FakeProcess(pid=scenario_id)
+        run_queue_manager_to_test.record_worker(
+            db_path=self.db_path,
+            scenario_id=scenario_id,
+            process_id=process.pid,
+            cpu_reservation=cpu_reservation,
+            memory_reservation_gb=memory_reservation_gb
+        )
+        self.add_worker(
+            scenario_id, process, cpu_reservation, memory_reservation_gb
+        )
+
+
+class TestRunQueueManager(unittest.TestCase):
+    """
+    Check the CPU and memory reservations of the scenarios and the
+    launching and recovery of the scenario processes with a temporary
+    database
+    """
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "io.db")
+        self.conn = sqlite3.connect(self.db_path)
+        with open(DB_SCHEMA, "r") as f:
+            self.conn.executescript(f.read())
+        load_mod_run_status_types(conn=self.conn)
+
+        # Scenario 1 has no solver options, the others have a threads
+        # option
+        threads = [None, "2", "4.0", "0", "16", "auto", "1"]
+        for scenario_id, option_value in enumerate(threads, start=1):
+            self.conn.execute(
+                "INSERT INTO scenarios (scenario_id, scenario_name, "
+                "solver_options_id) VALUES (?, ?, ?);",
+                (scenario_id, "scenario_{}".format(scenario_id),
+                 None if option_value is None else scenario_id)
+            )
+            if option_value is not None:
+                self.conn.execute(
+                    "INSERT INTO subscenarios_options_solver "
+                    "(solver_options_id) VALUES (?);", (scenario_id,)
+                )
+                self.conn.execute(
+                    "INSERT INTO inputs_options_solver (solver_options_id, "
+                    "solver, solver_option_name, solver_option_value) "
+                    "VALUES (?, 'cplex', 'threads', ?);",
+                    (scenario_id, option_value)
+                )
+        self.conn.commit()
+
+        self.scheduler = FakeScheduler(
+            db_path=self.db_path, scenarios_directory=self.temp_dir,
+            n_workers=3, n_cpus=8, memory_gb=8, memory_gb_per_scenario=1,
+            solver_executables={}
+        )
+
+    def tearDown(self):
+        for scenario_id in self.get_running_scenarios():
+            self.finish(scenario_id)
+        self.conn.close()
+        shutil.rmtree(self.temp_dir)
+
+    def queue(self, scenario_ids):
+        for scenario_id in scenario_ids:
+            run_queue_manager_to_test.add_scenario_to_queue(
+                db_path=self.db_path, scenario_id=scenario_id
+            )
+
+    def get_running_scenarios(self):
+        with self.scheduler.lock:
+            return sorted(self.scheduler.workers.keys())
+
+    def get_reservations(self, scenario_ids):
+        c = self.conn.cursor()
+        return [
+            run_queue_manager_to_test.get_scenario_reservation(
+                c=c, scenario_id=scenario_id, n_cpus=8, memory_gb=8,
+                default_memory_gb=1
+            ) for scenario_id in scenario_ids
+        ]
+
+    def test_get_scenario_reservation(self):
+        """
+        The scenarios should reserve as many CPUs as their threads option,
+        all CPUs if 0, and one CPU if it is missing or not a number, capped
+        at the number of CPUs available; without a memory limit option or
+        a profiled run, they should reserve the default memory
+        """
+        self.assertListEqual(
+            self.get_reservations(range(1, 8)),
+            [("cbc", 1, 1), ("cplex", 2, 1), ("cplex", 4, 1),
+             ("cplex", 8, 1), ("cplex", 8, 1), ("cplex", 1, 1),
+             ("cplex", 1, 1)]
+        )
+
+    def test_get_scenario_memory_reservation(self):
+        """
+        The scenarios should reserve their solver memory limit, or else the
+        peak memory of their last profiled run, capped at the memory
+        available
+        """
+        self.conn.executemany(
+            "INSERT INTO inputs_options_solver (solver_options_id, "
+            "solver, solver_option_name, solver_option_value) "
+            "VALUES (?, ?, ?, ?);",
+            [(2, "cplex", "workmem", "3072"),
+             (3, "gurobi", "MemLimit", "2.5"),
+             (3, "gurobi", "SoftMemLimit", "2"),
+             (4, "gurobi", "MemLimit", "32"),
+             (5, "cplex", "workmem", "a lot")]
+        )
+        self.conn.executemany(
+            "INSERT INTO results_scenario_profile (scenario_id, "
+            "subproblem_id, stage_id, step_id, phase, peak_memory_mb) "
+            "VALUES (?, 1, 1, ?, 'solve', ?);",
+            [(2, 1, 512), (6, 1, 512), (6, 2, 1536), (6, 3, None)]
+        )
+        self.conn.commit()
+
+        self.assertListEqual(
+            [memory_gb for solver, cpus, memory_gb
+             in self.get_reservations(range(1, 8))],
+            [1, 3, 2.5, 8, 1, 1.5, 1]
+        )
+
+    def test_launch_scenarios(self):
+        """
+        The scenarios should be launched in queue order while their
+        reservations fit in the free resources; a scenario should not be
+        launched ahead of a scenario earlier in the queue
+        """
+        # Scenario 3 (4 CPUs) and scenario 2 (2 CPUs) fit in the 8 CPUs but
+        # scenario 5 (8 CPUs) doesn't, so scenario 7 (1 CPU) has to wait
+        # even though it fits
+        self.queue([3, 2, 5, 7])
+        self.assertTrue(self.scheduler.launch_scenarios())
+        self.assertListEqual(self.get_running_scenarios(), [2, 3])
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT scenario_id, process_id, cpu_reservation "
+                "FROM run_queue_workers ORDER BY scenario_id;"
+            ).fetchall(),
+            [(2, 2, 2), (3, 3, 4)]
+        )
+
+        # When scenario 3 finishes (and removes itself from the queue), the
+        # 4 free CPUs are still not enough for scenario 5
+        run_queue_manager_to_test.remove_scenario_from_queue(
+            db_path=self.db_path, scenario_id=3
+        )
+        self.finish(3)
+        self.assertTrue(self.scheduler.launch_scenarios())
+        self.assertListEqual(self.get_running_scenarios(), [2])
+
+        # When scenario 2 finishes, scenario 5 takes all CPUs
+        run_queue_manager_to_test.remove_scenario_from_queue(
+            db_path=self.db_path, scenario_id=2
+        )
+        self.finish(2)
+        self.assertTrue(self.scheduler.launch_scenarios())
+        self.assertListEqual(self.get_running_scenarios(), [5])
+
+        # A scenario that exits without removing itself from the queue is
+        # flagged as a run error, and scenario 7 is then launched
+        self.finish(5)
+        self.assertEqual(
+            self.conn.execute(
+                "SELECT queue_order_id, run_status_id FROM scenarios "
+                "WHERE scenario_id = 5;"
+            ).fetchone(),
+            (None, 3)
+        )
+        self.assertFalse(self.scheduler.launch_scenarios())
+        self.assertListEqual(self.get_running_scenarios(), [7])
+
+    def finish(self, scenario_id):
+        """
+        Finish the fake process of a scenario and wait for the scheduler
+        to remove the worker
+        """
+        with self.scheduler.lock:
+            process = self.scheduler.workers[scenario_id][0]
+        process.terminate()
+        for attempt in range(100):
+            if scenario_id not in self.get_running_scenarios():
+                return
+            time.sleep(0.1)
+        self.fail("Worker for scenario_id {} not removed".format(
+            scenario_id
+        ))
+
+    def test_recover_workers(self):
+        """
+        The workers of a previous queue manager should be recovered if
+        their scenario process is still running and removed otherwise
+        """
+        self.scheduler.recover_workers()
+        self.assertListEqual(self.get_running_scenarios(), [])
+
+        # Scenario 1 is still running; scenario 2's process ID is not its
+        # run's (e.g. it was reused); scenario 3 has finished
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(60)"]
+        )
+        self.addCleanup(process.wait)
+        self.addCleanup(lambda: process.poll() is None and process.kill())
+        self.queue([1, 2, 3])
+        for scenario_id, run_status_id, run_process_id in [
+            (1, 1, process.pid), (2, 1, process.pid + 1), (3, 2, None)
+        ]:
+            run_queue_manager_to_test.record_worker(
+                db_path=self.db_path, scenario_id=scenario_id,
+                process_id=process.pid, cpu_reservation=1,
+                memory_reservation_gb=1
+            )
+            self.conn.execute(
+                "UPDATE scenarios SET run_status_id = ?, run_process_id = ? "
+                "WHERE scenario_id = ?;",
+                (run_status_id, run_process_id, scenario_id)
+            )
+            self.conn.commit()
+
+        self.scheduler.recover_workers()
+        self.assertListEqual(self.get_running_scenarios(), [1])
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT scenario_id FROM run_queue_workers;"
+            ).fetchall(),
+            [(1,)]
+        )
+        # The scenarios whose run ended without leaving the queue are
+        # flagged as run errors
+        self.assertListEqual(
+            self.conn.execute(
+                "SELECT scenario_id, queue_order_id, run_status_id "
+                "FROM scenarios WHERE scenario_id IN (2, 3) "
+                "ORDER BY scenario_id;"
+            ).fetchall(),
+            [(2, None, 3), (3, None, 3)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,7 @@ from flask_restful import Resource
 import importlib
 
 from db.common_functions import connect_to_database
+from gridpath.auxiliary.db_interface import get_results_version
 from ui.server.api.view_data import get_table_data
 
 
@@ -163,6 +164,7 @@ class ScenarioResultsPlot(Resource):
 
     def __init__(self, **kwargs):
         self.db_path = kwargs["db_path"]
+        self.plot_cache = kwargs["plot_cache"]
 
     def get(self, plot, scenario_id, load_zone, rps_zone, carbon_cap_zone,
             period, horizon, start_timepoint, end_timepoint, subproblem, stage,
@@ -170,10 +172,28 @@ class ScenarioResultsPlot(Resource):
         """
 
         :return:
+
+        Plots are served from the plot cache if they were already built
+        from the current version of the scenario's results.
         """
+        plot_api = dict()
+
+        filters = (load_zone, rps_zone, carbon_cap_zone, period, horizon,
+                   start_timepoint, end_timepoint, subproblem, stage,
+                   project, commit_project, ymax)
+        conn = connect_to_database(db_path=self.db_path)
+        results_version = get_results_version(
+            conn=conn, scenario_id=scenario_id
+        )
+        conn.close()
+
+        plot_api["plotJSON"] = self.plot_cache.get(
+            plot, scenario_id, filters, results_version
+        )
+        if plot_api["plotJSON"] is not None:
+            return plot_api
 
         plot_module = importlib.import_module("viz." + plot.replace("-", "_"))
-        plot_api = dict()
 
         base_arguments = [
             "--return_json",
@@ -258,6 +278,10 @@ class ScenarioResultsPlot(Resource):
                 base_arguments + filter_arguments + ["--ylimit", ymax]
             )
 
+        self.plot_cache.put(
+            plot, scenario_id, filters, results_version, plot_api["plotJSON"]
+        )
+
         return plot_api
 
 
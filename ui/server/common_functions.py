@@ -29,3 +29,45 @@ def get_executable_path(script_name):
         )
 
     return gridpath_executable
+
+
+def get_solver_executables():
+    """
+    :return: dictionary with the executable of each solver set up for the
+        UI, by solver name
+
+    Get the solvers and their executables from the SOLVER1_NAME,
+    SOLVER1_EXECUTABLE, etc. environment variables.
+    """
+    solver_executables = dict()
+    for n in [1, 2, 3]:
+        solver_executables[os.environ["SOLVER{}_NAME".format(n)]] = \
+            os.environ["SOLVER{}_EXECUTABLE".format(n)]
+
+    return solver_executables
+
+
+def get_run_scenario_command(
+    db_path, scenarios_directory, scenario_name, solver, solver_executable
+):
+    """
+    :param db_path: the database path
+    :param scenarios_directory: the directory to run the scenario in
+    :param scenario_name: the scenario name
+    :param solver: the solver name
+    :param solver_executable: the solver executable (the solver is looked
+        for in the PATH if None)
+    :return: list, the command to run the scenario end-to-end
+    """
+    command = [
+        get_executable_path(script_name="gridpath_run_e2e"),
+        "--log",
+        "--database", db_path,
+        "--scenario", scenario_name,
+        "--scenario_location", scenarios_directory,
+        "--solver", solver
+    ]
+    if solver_executable is not None:
+        command += ["--solver_executable", solver_executable]
+
+    return command
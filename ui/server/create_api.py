@@ -24,19 +24,26 @@ from ui.server.api.scenario_new import ScenarioNewAPI
 from ui.server.api.scenarios import Scenarios
 from ui.server.api.scenario_inputs import ScenarioInputs
 from ui.server.api.view_data import ViewDataAPI
+from ui.server.plot_cache import PlotCache, DEFAULT_PLOT_CACHE_MEMORY_MB
 
 
 # Create API routes
-def add_api_resources(api, db_path):
+def add_api_resources(api, db_path,
+                      plot_cache_memory_mb=DEFAULT_PLOT_CACHE_MEMORY_MB):
     """
     :param api:
     :param db_path:
+    :param plot_cache_memory_mb: the maximum memory taken by the cached
+        results plots (MB)
 
     Add all needed API api.
     """
     add_scenarios_resources(api=api, db_path=db_path)
     add_scenario_detail_resources(api=api, db_path=db_path)
-    add_scenario_results_resources(api=api, db_path=db_path)
+    add_scenario_results_resources(
+        api=api, db_path=db_path,
+        plot_cache=PlotCache(max_memory_mb=plot_cache_memory_mb)
+    )
     add_scenario_new_resources(api=api, db_path=db_path)
     add_scenario_inputs_resources(api=api, db_path=db_path)
     add_home_resource(api=api, db_path=db_path)
@@ -124,10 +131,11 @@ def add_home_resource(api, db_path):
     )
 
 
-def add_scenario_results_resources(api, db_path):
+def add_scenario_results_resources(api, db_path, plot_cache):
     """
     :param api:
     :param db_path:
+    :param plot_cache: the PlotCache of the results plots
 
     Add the API for the Angular 'scenario-results' component.
     """
@@ -144,7 +152,7 @@ def add_scenario_results_resources(api, db_path):
         '/<carbon_cap_zone>/<period>/<horizon>'
         '/<start_timepoint>/<end_timepoint>'
         '/<subproblem>/<stage>/<project>/<commit_project>/<ymax>',
-        resource_class_kwargs={'db_path': db_path}
+        resource_class_kwargs={'db_path': db_path, 'plot_cache': plot_cache}
     )
 
     api.add_resource(
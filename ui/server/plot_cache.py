@@ -0,0 +1,113 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Server-side cache of the results plots served to the UI, so that plots
+aren't rebuilt from the database every time they are requested.
+
+Plots are cached by plot, scenario, and filters (load zone, period,
+timepoints, etc.) along with the version of the scenario's results they
+were built from (see the results_scenario_version table). The version
+changes whenever the scenario's results are imported or processed, which
+invalidates the scenario's cached plots. Plots of scenarios without a
+results version (e.g. in databases created before the table was added to
+the schema) are not cached. When the cached plots take more
+memory than allowed (approximated by the size of their JSON), the least
+recently used plots are evicted.
+"""
+
+from collections import OrderedDict
+import json
+import threading
+
+DEFAULT_PLOT_CACHE_MEMORY_MB = 256
+
+
+class PlotCache(object):
+    """
+    LRU cache of results plots with a memory cap.
+    """
+    def __init__(self, max_memory_mb=DEFAULT_PLOT_CACHE_MEMORY_MB):
+        """
+        :param max_memory_mb: the maximum memory taken by the cached plots
+            (MB)
+        """
+        self.max_memory_bytes = max_memory_mb * 1024 ** 2
+        self.memory_bytes = 0
+        # The cached plots by (plot, scenario_id, filters), in order of
+        # use: the results version, the plot, and the plot's size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, plot, scenario_id, filters, results_version):
+        """
+        :param plot: the plot name
+        :param scenario_id: the scenario_id
+        :param filters: tuple of the plot filters
+        :param results_version: the current version of the scenario's
+            results (None if unknown)
+        :return: the cached plot, or None if the plot is not cached or was
+            built from another version of the scenario's results
+
+        If the cached plot is out of date, all of the scenario's cached
+        plots are removed.
+        """
+        key = (plot, scenario_id, filters)
+        with self.lock:
+            if results_version is None:
+                self._remove_scenario(scenario_id)
+                return None
+            if key not in self.entries:
+                return None
+            cached_version, plot_json, size = self.entries[key]
+            if cached_version != results_version:
+                self._remove_scenario(scenario_id)
+                return None
+            self.entries.move_to_end(key)
+            return plot_json
+
+    def put(self, plot, scenario_id, filters, results_version, plot_json):
+        """
+        :param plot: the plot name
+        :param scenario_id: the scenario_id
+        :param filters: tuple of the plot filters
+        :param results_version: the version of the scenario's results the
+            plot was built from (None if unknown)
+        :param plot_json: the plot
+
+        Cache the plot, evicting the least recently used plots if needed.
+        Plots larger than the cache and plots built from an unknown version
+        of the scenario's results are not cached.
+        """
+        if results_version is None:
+            return
+
+        key = (plot, scenario_id, filters)
+        size = len(json.dumps(plot_json))
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            if size > self.max_memory_bytes:
+                return
+            self.entries[key] = (results_version, plot_json, size)
+            self.memory_bytes += size
+            while self.memory_bytes > self.max_memory_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        self.memory_bytes -= self.entries.pop(key)[2]
+
+    def _remove_scenario(self, scenario_id):
+        for key in [k for k in self.entries if k[1] == scenario_id]:
+            self._remove(key)
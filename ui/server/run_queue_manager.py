@@ -1,103 +1,380 @@
+"""
+The run queue manager launches the scenarios in the run queue in order of
+their queue_order_id. Up to a number of scenarios (workers) run
+concurrently, as long as their CPU and memory reservations fit in the CPUs
+and memory available to the queue. A scenario reserves as many CPUs as its
+solver threads option (see the inputs_options_solver table, from which the
+scenario's solver_options.csv file is written; all CPUs if the threads
+option is 0, one CPU if there is none). It reserves as much memory as its
+solver memory limit option (e.g. CPLEX's workmem or Gurobi's MemLimit), or
+else as the peak memory recorded the last time the scenario was run with
+--profile; the default memory per scenario is reserved only if neither is
+available.
+
+The queue manager is event-driven: it only checks the queue when the
+server tells it that scenarios were added to or removed from the queue,
+and when one of the scenario processes it launched exits. It exits when
+the queue is empty or the server stops responding.
+
+The scenario processes launched by the queue manager and their
+reservations are persisted in the run_queue_workers table, and the queue
+is left as is when the queue manager exits, so a restarted queue manager
+accounts for the runs still in progress and launches the scenarios still
+waiting in the queue.
+"""
+
 from argparse import ArgumentParser
+import datetime
 import os
+import psutil
+import signal
 import socketio
+import subprocess
 import sys
+import threading
 import time
 
 from db.common_functions import connect_to_database, spin_on_database_lock
-
-
-def exit_gracefully():
-    print('Exiting gracefully')
-    args = sys.argv[1:]
-    parsed_args = parse_arguments(args)
-
-    conn = connect_to_database(db_path=parsed_args.database)
-    c = conn.cursor()
-
-    sql = """
-        UPDATE scenarios SET queue_order_id = NULL;
+from db.utilities.update_schema import check_database_schema
+from ui.server.common_functions import get_run_scenario_command, \
+    get_solver_executables
+
+# TODO: we should specify the default solver as a global variable somewhere
+DEFAULT_SOLVER = "cbc"
+# The solver options limiting the solver's memory and their unit in GB
+SOLVER_MEMORY_OPTIONS = {
+    "workmem": 1 / 1024,  # CPLEX (MB)
+    "memlimit": 1,  # Gurobi (GB)
+    "softmemlimit": 1  # Gurobi (GB)
+}
+SERVER_URL = "http://127.0.0.1:8080"
+
+
+class RunQueueScheduler(object):
     """
-    conn.commit()
-
-    spin_on_database_lock(
-      conn=conn, cursor=c, sql=sql, data=(), many=False
-    )
-
-
-def manage_queue(db_path):
-    while True:
-        try:
-            # Check if server is running
-            sio = socketio.Client()
-            sio.connect("http://127.0.0.1:8080")
-            print("Connection to server established")
-
-            conn = connect_to_database(db_path=db_path)
-            c = conn.cursor()
-
-            scenarios_in_queue = get_scenarios_in_queue(c=c)
-            running_scenarios = get_running_scenarios(c=c)
-
-            # If there are scenarios in the queue and none of them are running,
-            # get the next scenarios to run and launch it
-            if scenarios_in_queue:  # there are scenarios in the queue
-                if not running_scenarios:  # none of them is 'running'
-                    next_scenario_to_run = c.execute("""
-                        SELECT scenario_id, MIN(queue_order_id)
-                        FROM scenarios
-                        WHERE queue_order_id IS NOT NULL
-                        GROUP BY scenario_id
-                    """).fetchone()
-
-                    # # Get the requested solver
-                    solver_query = c.execute("""
-                        SELECT name
-                        FROM subscenarios_options_solver
-                        WHERE solver_options_id = (
-                            SELECT solver_options_id
-                            FROM scenarios
-                            WHERE scenario_id = {}
-                            );
-                        """.format(next_scenario_to_run[0])
-                                       ).fetchone()
-                    if solver_query is None:
-                        # TODO: we shoud specify the default solver as a
-                        #  global variable somewhere
-                        solver = 'cbc'
-                    else:
-                        solver = solver_query[0]
-                    sio.emit(
-                        "launch_scenario_process",
-                        {"scenario": next_scenario_to_run[0], "solver": solver,
-                         "skipWarnings": False}
-                    )
-                else:
-                    pass
-            # If there are no scenarios in the queue, tell the server to
-            # reset the queue manager PID and exit the loop
-            # TODO: is keeping track of the queue manager PID still needed
-            #  now that the queue manager exits when it does not get a
-            #  response from the server?
-            else:
-                sio.emit("reset_queue_manager_pid")
+    Launch the scenarios in the run queue, keeping track of the scenario
+    processes launched (the workers) and of their CPU and memory
+    reservations.
+    """
+    def __init__(self, db_path, scenarios_directory, n_workers, n_cpus,
+                 memory_gb, memory_gb_per_scenario, solver_executables):
+        """
+        :param db_path: the database path
+        :param scenarios_directory: the directory to run the scenarios in
+        :param n_workers: the maximum number of scenarios to run
+            concurrently
+        :param n_cpus: the number of CPUs available to the queue
+        :param memory_gb: the memory available to the queue (GB)
+        :param memory_gb_per_scenario: the memory to reserve for the
+            scenarios without a solver memory limit or a profiled run (GB)
+        :param solver_executables: dictionary with the executable of each
+            solver by solver name
+        """
+        self.db_path = db_path
+        self.scenarios_directory = scenarios_directory
+        self.n_workers = n_workers
+        self.n_cpus = n_cpus
+        self.memory_gb = memory_gb
+        self.memory_gb_per_scenario = min(memory_gb_per_scenario, memory_gb)
+        self.solver_executables = solver_executables
+
+        # The workers by scenario_id: the process, the number of CPUs
+        # reserved, and the memory reserved
+        self.workers = dict()
+        self.lock = threading.Lock()
+        self.wake_up = threading.Event()
+        self.stopped = False
+
+    def wake(self, *args):
+        """
+        Wake up the scheduler to check the queue.
+        """
+        self.wake_up.set()
+
+    def stop(self, *args):
+        """
+        Stop the scheduler; the workers keep running.
+        """
+        self.stopped = True
+        self.wake_up.set()
+
+    def run(self):
+        """
+        :return: boolean, True if the queue was emptied and all workers
+            exited, False if the scheduler was stopped
+
+        Launch the scenarios in the queue as resources become available,
+        checking the queue only when woken up.
+        """
+        self.recover_workers()
+        while not self.stopped:
+            # Clear the wake-up event before checking the queue, so that we
+            # don't miss events while checking
+            self.wake_up.clear()
+            scenarios_waiting = self.launch_scenarios()
+            with self.lock:
+                n_running = len(self.workers)
+            if not scenarios_waiting and n_running == 0:
+                return True
+            self.wake_up.wait()
+
+        return False
+
+    def get_free_resources(self):
+        """
+        :return: tuple with the number of workers, CPUs, and memory (GB)
+            that are not in use
+        """
+        with self.lock:
+            return (
+                self.n_workers - len(self.workers),
+                self.n_cpus - sum(w[1] for w in self.workers.values()),
+                self.memory_gb - sum(w[2] for w in self.workers.values())
+            )
+
+    def launch_scenarios(self):
+        """
+        :return: boolean, whether there are scenarios waiting in the queue
+
+        Launch the queued scenarios in order of their queue_order_id while
+        their reservations fit in the free resources. We don't launch a
+        scenario ahead of a scenario with a lower queue_order_id, so that
+        scenarios with large reservations are not delayed indefinitely.
+        """
+        conn = connect_to_database(db_path=self.db_path)
+        c = conn.cursor()
+
+        with self.lock:
+            scenarios_to_launch = [
+                (scenario_id, scenario_name)
+                for (scenario_id, scenario_name)
+                in get_queued_scenarios_to_launch(c=c)
+                if scenario_id not in self.workers
+            ]
+
+        while scenarios_to_launch:
+            scenario_id, scenario_name = scenarios_to_launch[0]
+            solver, cpu_reservation, memory_reservation_gb = \
+                get_scenario_reservation(
+                    c=c, scenario_id=scenario_id, n_cpus=self.n_cpus,
+                    memory_gb=self.memory_gb,
+                    default_memory_gb=self.memory_gb_per_scenario
+                )
+            free_workers, free_cpus, free_memory_gb = \
+                self.get_free_resources()
+            if free_workers < 1 or cpu_reservation > free_cpus \
+                    or memory_reservation_gb > free_memory_gb:
                 break
+            self.launch(
+                scenario_id=scenario_id,
+                scenario_name=scenario_name,
+                solver=solver,
+                cpu_reservation=cpu_reservation,
+                memory_reservation_gb=memory_reservation_gb
+            )
+            scenarios_to_launch.pop(0)
+
+        conn.close()
+
+        return len(scenarios_to_launch) > 0
+
+    def launch(self, scenario_id, scenario_name, solver, cpu_reservation,
+               memory_reservation_gb):
+        """
+        :param scenario_id: the scenario_id
+        :param scenario_name: the scenario name
+        :param solver: the solver name
+        :param cpu_reservation: the number of CPUs reserved
+        :param memory_reservation_gb: the memory reserved (GB)
+
+        Launch a process to run the scenario, record the worker, and watch
+        for the process to exit.
+        """
+        print("Starting process for scenario_id {} ({} CPUs, {} GB)".format(
+            scenario_id, cpu_reservation, memory_reservation_gb
+        ))
+        process = subprocess.Popen(
+            get_run_scenario_command(
+                db_path=self.db_path,
+                scenarios_directory=self.scenarios_directory,
+                scenario_name=scenario_name,
+                solver=solver,
+                solver_executable=self.solver_executables.get(solver)
+            ),
+            shell=False
+        )
+
+        record_worker(
+            db_path=self.db_path,
+            scenario_id=scenario_id,
+            process_id=process.pid,
+            cpu_reservation=cpu_reservation,
+            memory_reservation_gb=memory_reservation_gb
+        )
+        self.add_worker(
+            scenario_id, process, cpu_reservation, memory_reservation_gb
+        )
+
+    def add_worker(self, scenario_id, process, cpu_reservation,
+                   memory_reservation_gb):
+        """
+        :param scenario_id: the scenario_id
+        :param process: the scenario process (subprocess.Popen or
+            psutil.Process object)
+        :param cpu_reservation: the number of CPUs reserved
+        :param memory_reservation_gb: the memory reserved (GB)
+        """
+        with self.lock:
+            self.workers[scenario_id] = \
+                (process, cpu_reservation, memory_reservation_gb)
+        threading.Thread(
+            target=self.watch, args=(scenario_id, process), daemon=True
+        ).start()
+
+    def watch(self, scenario_id, process):
+        """
+        :param scenario_id: the scenario_id
+        :param process: the scenario process
+
+        Wait for the scenario process to exit, then remove the worker and
+        wake up the scheduler.
+        """
+        process.wait()
+        remove_worker(db_path=self.db_path, scenario_id=scenario_id)
+        with self.lock:
+            del self.workers[scenario_id]
+        self.wake_up.set()
+
+    def recover_workers(self):
+        """
+        Account for the workers recorded by a previous queue manager whose
+        scenario process is still running; remove the others.
+        """
+        conn = connect_to_database(db_path=self.db_path)
+        c = conn.cursor()
+        workers = c.execute("""
+            SELECT scenario_id, process_id, cpu_reservation,
+            memory_reservation_gb, run_process_id, run_status_id
+            FROM run_queue_workers
+            JOIN scenarios
+            USING (scenario_id);
+            """).fetchall()
+        conn.close()
+
+        for (scenario_id, process_id, cpu_reservation,
+             memory_reservation_gb, run_process_id, run_status_id) \
+                in workers:
+            # Make sure the process is still the scenario run (the process
+            # ID could have been reused)
+            process = None
+            if run_status_id == 1 and run_process_id == process_id:
+                try:
+                    process = psutil.Process(process_id)
+                except psutil.NoSuchProcess:
+                    pass
 
-        except socketio.exceptions.ConnectionError:
-            print("Server not responding, exiting")
-            break
+            if process is None:
+                remove_worker(db_path=self.db_path, scenario_id=scenario_id)
+            else:
+                print("Scenario_id {} still running".format(scenario_id))
+                self.add_worker(
+                    scenario_id, process, cpu_reservation,
+                    memory_reservation_gb
+                )
+
+    def terminate_workers(self):
+        """
+        Terminate the scenario processes.
+        """
+        with self.lock:
+            processes = [w[0] for w in self.workers.values()]
+        for process in processes:
+            try:
+                process.terminate()
+            except psutil.NoSuchProcess:
+                pass
+
+
+def manage_queue(db_path, scenarios_directory, n_workers, n_cpus, memory_gb,
+                 memory_gb_per_scenario):
+    """
+    :param db_path: the database path
+    :param scenarios_directory: the directory to run the scenarios in
+    :param n_workers: the maximum number of scenarios to run concurrently
+    :param n_cpus: the number of CPUs available to the queue
+    :param memory_gb: the memory available to the queue (GB)
+    :param memory_gb_per_scenario: the memory to reserve for the scenarios
+        without a solver memory limit or a profiled run (GB)
+
+    Connect to the server and run the scheduler until the queue is empty or
+    the server stops responding.
+    """
+    scheduler = RunQueueScheduler(
+        db_path=db_path,
+        scenarios_directory=scenarios_directory,
+        n_workers=n_workers,
+        n_cpus=n_cpus,
+        memory_gb=memory_gb,
+        memory_gb_per_scenario=memory_gb_per_scenario,
+        solver_executables=get_solver_executables()
+    )
 
-        time.sleep(5)
+    # The server tells us when the queue was updated; stop scheduling if
+    # the connection to the server is lost
+    sio = socketio.Client(reconnection=False)
+    sio.on("queue_updated", scheduler.wake)
+    sio.on("disconnect", scheduler.stop)
+
+    # Terminate the scenario processes if the queue manager is terminated
+    # (e.g. when the server exits)
+    def sigterm_handler(signal, frame):
+        print("SIGTERM received by queue manager. Terminating scenario "
+              "processes.")
+        scheduler.terminate_workers()
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, sigterm_handler)
+
+    try:
+        connect_to_server(sio=sio)
+        queue_emptied = scheduler.run()
+    except socketio.exceptions.ConnectionError:
+        queue_emptied = False
+
+    # If the queue is empty, tell the server to reset the queue manager PID
+    # TODO: is keeping track of the queue manager PID still needed
+    #  now that the queue manager exits when it does not get a
+    #  response from the server?
+    if queue_emptied:
+        sio.emit("reset_queue_manager_pid")
+        sio.disconnect()
+    else:
+        print("Server not responding, exiting")
 
     # Need os._exit(0) to exit process, not just thread (sys.exit exits only
     # current thread)
     # https://stackoverflow.com/questions/73663/terminating-a-python-script
     # https://stackoverflow.com/questions/905189/why-does-sys-exit-not-exit-when-called-inside-a-thread-in-python/5120178#5120178
-    print("Broke out of while loop and trying to exit")
-    exit_gracefully()
     os._exit(0)
 
 
+def connect_to_server(sio, attempts=10):
+    """
+    :param sio: the socket.io client
+    :param attempts: the number of connection attempts, one second apart
+        (the queue manager can be started while the server is starting)
+    """
+    for attempt in range(attempts):
+        try:
+            sio.connect(SERVER_URL)
+            print("Connection to server established")
+            return
+        except socketio.exceptions.ConnectionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(1)
+
+
 def get_scenarios_in_queue(c):
     # Check if there are any scenarios in the queue
     scenarios_in_queue = c.execute("""
@@ -109,16 +386,134 @@ def get_scenarios_in_queue(c):
     return scenarios_in_queue
 
 
-def get_running_scenarios(c):
-    # Get the scenarios from the queue that are currently running
-    running_scenarios = c.execute("""
-        SELECT scenario_id, scenario_name, run_status_id
+def get_queued_scenarios_to_launch(c):
+    # Get the scenarios from the queue that are not running, in queue order
+    queued_scenarios = c.execute("""
+        SELECT scenario_id, scenario_name
         FROM scenarios
         WHERE queue_order_id IS NOT NULL
-        AND run_status_id = 1
+        AND run_status_id != 1
+        ORDER BY queue_order_id
     """).fetchall()
 
-    return running_scenarios
+    return queued_scenarios
+
+
+def get_scenario_reservation(c, scenario_id, n_cpus, memory_gb,
+                             default_memory_gb):
+    """
+    :param c: database cursor
+    :param scenario_id: the scenario_id
+    :param n_cpus: the number of CPUs available to the queue
+    :param memory_gb: the memory available to the queue (GB)
+    :param default_memory_gb: the memory to reserve if the scenario has
+        no solver memory limit or profiled run (GB)
+    :return: tuple with the scenario's solver and the number of CPUs and
+        memory (GB) to reserve for it
+
+    The number of CPUs is the solver's threads option (all CPUs if 0,
+    which makes most solvers use all cores; one CPU if not specified or if
+    not a number, e.g. "auto"), capped at the number of CPUs available.
+
+    The memory is the solver's memory limit option (see
+    *SOLVER_MEMORY_OPTIONS*); otherwise, it is estimated as the peak memory
+    recorded in the scenario's profile the last time it was run with
+    --profile; otherwise, it is the default memory. It is capped at the
+    memory available, so that every scenario can run on its own.
+    """
+    solver = DEFAULT_SOLVER
+    cpu_reservation = 1
+    memory_reservation_gb = None
+    for solver_name, option_name, option_value in c.execute("""
+        SELECT solver, solver_option_name, solver_option_value
+        FROM inputs_options_solver
+        WHERE solver_options_id = (
+            SELECT solver_options_id
+            FROM scenarios
+            WHERE scenario_id = ?
+            );
+        """, (scenario_id,)
+    ).fetchall():
+        solver = solver_name
+        if option_name is not None and option_name.lower() == "threads":
+            try:
+                threads = int(float(option_value))
+            except (TypeError, ValueError, OverflowError):
+                threads = 1
+            cpu_reservation = threads if threads > 0 else n_cpus
+        if option_name is not None \
+                and option_name.lower() in SOLVER_MEMORY_OPTIONS:
+            try:
+                option_memory_gb = float(option_value) \
+                    * SOLVER_MEMORY_OPTIONS[option_name.lower()]
+            except (TypeError, ValueError):
+                option_memory_gb = 0
+            if option_memory_gb > 0:
+                memory_reservation_gb = max(
+                    memory_reservation_gb or 0, option_memory_gb
+                )
+
+    if memory_reservation_gb is None:
+        peak_memory_mb = c.execute("""
+            SELECT MAX(peak_memory_mb)
+            FROM results_scenario_profile
+            WHERE scenario_id = ?;
+            """, (scenario_id,)
+        ).fetchone()[0]
+        memory_reservation_gb = default_memory_gb if peak_memory_mb is None \
+            else peak_memory_mb / 1024
+
+    return solver, min(cpu_reservation, n_cpus), \
+        min(memory_reservation_gb, memory_gb)
+
+
+def record_worker(db_path, scenario_id, process_id, cpu_reservation,
+                  memory_reservation_gb):
+    conn = connect_to_database(db_path=db_path)
+    c = conn.cursor()
+
+    sql = """
+        INSERT OR REPLACE INTO run_queue_workers
+        (scenario_id, process_id, cpu_reservation, memory_reservation_gb,
+        launch_time)
+        VALUES (?, ?, ?, ?, ?);
+    """
+
+    spin_on_database_lock(
+      conn=conn, cursor=c, sql=sql,
+      data=(scenario_id, process_id, cpu_reservation, memory_reservation_gb,
+            datetime.datetime.now().isoformat()),
+      many=False
+    )
+
+
+def remove_worker(db_path, scenario_id):
+    conn = connect_to_database(db_path=db_path)
+    c = conn.cursor()
+
+    sql = """
+        DELETE FROM run_queue_workers
+        WHERE scenario_id = ?;
+    """
+
+    spin_on_database_lock(
+      conn=conn, cursor=c, sql=sql, data=(scenario_id,), many=False
+    )
+
+    # If the run ended without removing the scenario from the queue (e.g.
+    # the process was killed), flag it as a run error and remove it from
+    # the queue so that we don't launch it again
+    sql = """
+        UPDATE scenarios
+        SET queue_order_id = NULL,
+        run_status_id = 3
+        WHERE scenario_id = ?
+        AND queue_order_id IS NOT NULL;
+    """
+
+    spin_on_database_lock(
+      conn=conn, cursor=c, sql=sql, data=(scenario_id,), many=False
+    )
 
 
 def get_max_queue_order_id(c):
@@ -182,6 +577,24 @@ def parse_arguments(args):
     parser.add_argument("--database", default="../db/io.db",
                         help="The database file path. Defaults to ../db/io.db "
                              "if not specified")
+    parser.add_argument("--scenario_location", default="../scenarios",
+                        help="The directory to run the scenarios in. "
+                             "Defaults to ../scenarios if not specified.")
+    parser.add_argument("--n_workers", default=1, type=int,
+                        help="The maximum number of scenarios to run "
+                             "concurrently. Defaults to 1.")
+    parser.add_argument("--n_cpus", default=os.cpu_count(), type=int,
+                        help="The number of CPUs available to the queue. "
+                             "Defaults to the number of CPUs of the "
+                             "machine.")
+    parser.add_argument("--memory_gb", type=float,
+                        default=psutil.virtual_memory().total / 1024 ** 3,
+                        help="The memory available to the queue (GB). "
+                             "Defaults to the memory of the machine.")
+    parser.add_argument("--memory_gb_per_scenario", default=1, type=float,
+                        help="The memory to reserve for the scenarios "
+                             "without a solver memory limit option or a "
+                             "profiled run (GB). Defaults to 1.")
 
     parsed_arguments = parser.parse_args(args=args)
 
@@ -194,10 +607,21 @@ def main(args=None):
 
     parsed_args = parse_arguments(args)
 
-    manage_queue(db_path=parsed_args.database)
+    # The queue manager doesn't change the database schema (see
+    # db.utilities.update_schema)
+    conn = connect_to_database(db_path=parsed_args.database)
+    check_database_schema(conn=conn)
+    conn.close()
+
+    manage_queue(
+        db_path=parsed_args.database,
+        scenarios_directory=parsed_args.scenario_location,
+        n_workers=parsed_args.n_workers,
+        n_cpus=parsed_args.n_cpus,
+        memory_gb=parsed_args.memory_gb,
+        memory_gb_per_scenario=parsed_args.memory_gb_per_scenario
+    )
 
 
 if __name__ == "__main__":
     main()
-
-
@@ -20,10 +20,16 @@ import os
 import signal
 import subprocess
 import sys
+import warnings
+
+from db.common_functions import connect_to_database
+from db.utilities.update_schema import check_database_schema
 
 # API
 from ui.server.create_api import add_api_resources
-from ui.server.common_functions import get_executable_path
+from ui.server.plot_cache import DEFAULT_PLOT_CACHE_MEMORY_MB
+from ui.server.common_functions import get_executable_path, \
+    get_solver_executables
 
 # Database operations functions (Socket IO)
 from ui.server.db_ops.add_scenario import add_or_update_scenario
@@ -32,7 +38,7 @@ from ui.server.db_ops.delete_scenario import clear as clear_scenario, \
 from ui.server.validate_scenario import validate_scenario
 from ui.server.save_data import save_table_data_to_csv, save_plot_data_to_csv
 from ui.server.run_queue_manager import add_scenario_to_queue,\
-    remove_scenario_from_queue
+    remove_scenario_from_queue, get_scenarios_in_queue
 
 # Scenario process functions (Socket IO)
 from ui.server.scenario_process import launch_scenario_process, \
@@ -71,18 +77,21 @@ signal.signal(signal.SIGINT, sigint_handler)
 SCENARIOS_DIRECTORY = os.environ['SCENARIOS_DIRECTORY']
 # DATABASE_PATH = '/Users/ana/dev/ui-run-scenario/db/io.db'
 DATABASE_PATH = os.environ['GRIDPATH_DATABASE_PATH']
-SOLVER1_NAME = os.environ['SOLVER1_NAME']
-SOLVER1_EXECUTABLE = os.environ['SOLVER1_EXECUTABLE']
-SOLVER2_NAME = os.environ['SOLVER2_NAME']
-SOLVER2_EXECUTABLE = os.environ['SOLVER2_EXECUTABLE']
-SOLVER3_NAME = os.environ['SOLVER3_NAME']
-SOLVER3_EXECUTABLE = os.environ['SOLVER3_EXECUTABLE']
-SOLVERS = {
-  SOLVER1_NAME: SOLVER1_EXECUTABLE,
-  SOLVER2_NAME: SOLVER2_EXECUTABLE,
-  SOLVER3_NAME: SOLVER3_EXECUTABLE
-}
+SOLVERS = get_solver_executables()
 RUN_QUEUE_MANAGER_PID = None
+# Optional run queue settings (see ui.server.run_queue_manager)
+RUN_QUEUE_OPTIONS = {
+  "--n_workers": os.environ.get("RUN_QUEUE_N_WORKERS"),
+  "--n_cpus": os.environ.get("RUN_QUEUE_N_CPUS"),
+  "--memory_gb": os.environ.get("RUN_QUEUE_MEMORY_GB"),
+  "--memory_gb_per_scenario": os.environ.get(
+    "RUN_QUEUE_MEMORY_GB_PER_SCENARIO"
+  )
+}
+# Optional maximum memory of the cached results plots (MB)
+PLOT_CACHE_MEMORY_MB = float(
+  os.environ.get("PLOT_CACHE_MEMORY_MB", DEFAULT_PLOT_CACHE_MEMORY_MB)
+)
 
 
 # TODO: not sure we'll need this
@@ -109,7 +118,8 @@ def connection():
 
 # ################################### API ################################### #
 
-add_api_resources(api=api, db_path=DATABASE_PATH)
+add_api_resources(api=api, db_path=DATABASE_PATH,
+                  plot_cache_memory_mb=PLOT_CACHE_MEMORY_MB)
 
 
 # ########################## Socket Communication ########################### #
@@ -256,9 +266,12 @@ def socket_add_scenario_to_queue(client_message):
       db_path=DATABASE_PATH, scenario_id=client_message["scenario"]
     )
 
-    # Start the run queue manager if we don't have a process currently
+    # Start the run queue manager if we don't have a process currently;
+    # otherwise, tell it to check the queue
     if RUN_QUEUE_MANAGER_PID is None:
         start_run_queue_manager()
+    else:
+        emit("queue_updated", broadcast=True)
 
 
 @socketio.on("remove_scenario_from_queue")
@@ -271,6 +284,9 @@ def socket_remove_scenario_from_queue(client_message):
       db_path=DATABASE_PATH, scenario_id=client_message["scenario"]
     )
 
+    if RUN_QUEUE_MANAGER_PID is not None:
+        emit("queue_updated", broadcast=True)
+
 
 @socketio.on("reset_queue_manager_pid")
 def socket_queue_manager_exit_alert():
@@ -285,8 +301,16 @@ def start_run_queue_manager():
         script_name="gridpath_run_queue_manager"
     )
 
+    run_queue_manager_args = [
+      "--database", DATABASE_PATH,
+      "--scenario_location", SCENARIOS_DIRECTORY
+    ]
+    for option, value in RUN_QUEUE_OPTIONS.items():
+        if value is not None:
+            run_queue_manager_args += [option, value]
+
     p = subprocess.Popen(
-      [run_queue_manager_executable, "--database", DATABASE_PATH],
+      [run_queue_manager_executable] + run_queue_manager_args,
       shell=False,
     )
     print("Queue manager PID: ,", p.pid)
@@ -349,6 +373,24 @@ def socket_save_plot_data(client_message):
 
 
 def main():
+    conn = connect_to_database(db_path=DATABASE_PATH)
+
+    # The server doesn't change the database schema: databases created
+    # before tables the server uses (e.g. the results versions of the plot
+    # cache and the aggregated results of the plots) were added to or
+    # changed in the schema must be migrated with
+    # db/utilities/update_schema.py
+    try:
+        check_database_schema(conn=conn)
+    except ValueError as e:
+        warnings.warn(str(e))
+
+    # Resume the run queue if there are scenarios left in the queue (e.g.
+    # from before a server restart)
+    if get_scenarios_in_queue(c=conn.cursor()):
+        start_run_queue_manager()
+    conn.close()
+
     # Run server
     socketio.run(
         app,
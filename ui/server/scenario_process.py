@@ -25,7 +25,7 @@ from db.common_functions import connect_to_database
 from gridpath.run_end_to_end import update_run_status, check_if_in_queue, \
   remove_from_queue_if_in_queue
 from ui.server.db_ops.delete_scenario import clear as clear_scenario
-from ui.server.common_functions import get_executable_path
+from ui.server.common_functions import get_run_scenario_command
 
 
 def launch_scenario_process(
@@ -66,20 +66,14 @@ def launch_scenario_process(
     # process
     else:
         print("Starting process for scenario_id " + str(scenario_id))
-        # Get the run_gridpath_e2e entry point script from the
-        # sys.executable
-        run_gridpath_e2e_executable = get_executable_path(
-            script_name="gridpath_run_e2e"
-        )
-
         p = subprocess.Popen(
-            [run_gridpath_e2e_executable,
-             "--log",
-             "--database", db_path,
-             "--scenario", scenario_name,
-             "--scenario_location", scenarios_directory,
-             "--solver", solver,
-             "--solver_executable", solver_executable],
+            get_run_scenario_command(
+                db_path=db_path,
+                scenarios_directory=scenarios_directory,
+                scenario_name=scenario_name,
+                solver=solver,
+                solver_executable=solver_executable
+            ),
             shell=False
         )
 
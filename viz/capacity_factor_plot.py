@@ -82,60 +82,117 @@ def get_plotting_data(conn, scenario_id, load_zone, stage, **kwargs):
     #   this assumption.
 
     # Cap Factor by period and stage
-    # Spinup/lookahead timepoints are ignored by adding the resp. column tag
-    # through inner joins and adding a conditional to ignore those timepoints
-    sql = """SELECT project, period, technology, 
-        period_mwh/(period_weight*capacity_mw) AS cap_factor
-        FROM
-            (SELECT scenario_id, project, period, technology,
-            sum(power_mw * timepoint_weight * number_of_hours_in_timepoint) 
-            AS period_mwh,
-            sum(timepoint_weight * number_of_hours_in_timepoint) 
-            AS period_weight
-            FROM results_project_dispatch
-
-            -- add temporal scenario id so we can join timepoints table
-            INNER JOIN
-            
-            (SELECT temporal_scenario_id, scenario_id FROM scenarios)
-            USING (scenario_id)
-            
-            -- filter out spinup_or_lookahead timepoints
+    # The energy and weighted hours by project, period, and subproblem
+    # (excluding spinup/lookahead timepoints) are aggregated when processing
+    # results; if they haven't been aggregated for this scenario (e.g. its
+    # results were processed before the aggregated table was added to the
+    # schema), we aggregate the dispatch results instead
+    if has_dispatch_by_period(conn=conn, scenario_id=scenario_id):
+        sql = """SELECT project, period, technology, 
+            SUM(energy_mwh)/(SUM(weighted_hours)*capacity_mw) AS cap_factor
+            FROM results_project_dispatch_by_period
+
             INNER JOIN
-            
-            (SELECT temporal_scenario_id, stage_id, subproblem_id, timepoint, 
-            spinup_or_lookahead
-            FROM inputs_temporal
-            WHERE spinup_or_lookahead is NULL)
-            USING (temporal_scenario_id, stage_id, subproblem_id, timepoint)
-            
+
+            (SELECT scenario_id, project, period,
+            avg(capacity_mw) as capacity_mw
+            FROM results_project_capacity
+            WHERE scenario_id = ?
+            GROUP BY scenario_id, project, period) AS capacity_table
+            USING (scenario_id, project, period)
+
             WHERE scenario_id = ?
             AND stage_id = ?
             AND load_zone = ?
-            
-            group by period, project) 
-            
-            AS energy_table
-        
-        INNER JOIN
-        
-        (SELECT scenario_id, project, period, avg(capacity_mw) as capacity_mw
-        FROM results_project_capacity
-        GROUP BY scenario_id, project, period) AS capacity_table
-        USING (scenario_id, project, period)
-        
-        WHERE cap_factor IS NOT NULL  -- filter out projects with 0 capacity
-        ;"""
+            GROUP BY project, period, technology, capacity_mw
+            HAVING cap_factor IS NOT NULL  -- filter out projects with 0 cap
+            ;"""
+        params = (scenario_id, scenario_id, stage, load_zone)
+    else:
+        # Spinup/lookahead timepoints are ignored by adding the resp. column
+        # tag through inner joins and adding a conditional to ignore those
+        # timepoints
+        sql = """SELECT project, period, technology, 
+            period_mwh/(period_weight*capacity_mw) AS cap_factor
+            FROM
+                (SELECT scenario_id, project, period, technology,
+                sum(power_mw * timepoint_weight 
+                * number_of_hours_in_timepoint) AS period_mwh,
+                sum(timepoint_weight * number_of_hours_in_timepoint) 
+                AS period_weight
+                FROM results_project_dispatch
+
+                -- add temporal scenario id so we can join timepoints table
+                INNER JOIN
+
+                (SELECT temporal_scenario_id, scenario_id FROM scenarios)
+                USING (scenario_id)
+
+                -- filter out spinup_or_lookahead timepoints
+                INNER JOIN
+
+                (SELECT temporal_scenario_id, stage_id, subproblem_id, 
+                timepoint, spinup_or_lookahead
+                FROM inputs_temporal
+                WHERE spinup_or_lookahead is NULL)
+                USING (temporal_scenario_id, stage_id, subproblem_id, 
+                timepoint)
+
+                WHERE scenario_id = ?
+                AND stage_id = ?
+                AND load_zone = ?
+
+                group by period, project) 
+
+                AS energy_table
+
+            INNER JOIN
+
+            (SELECT scenario_id, project, period,
+            avg(capacity_mw) as capacity_mw
+            FROM results_project_capacity
+            GROUP BY scenario_id, project, period) AS capacity_table
+            USING (scenario_id, project, period)
+
+            WHERE cap_factor IS NOT NULL  -- filter out projects with 0 cap
+            ;"""
+        params = (scenario_id, stage, load_zone)
 
     df = pd.read_sql(
         sql,
         con=conn,
-        params=(scenario_id, stage, load_zone)
+        params=params
     )
 
     return df
 
 
+def has_dispatch_by_period(conn, scenario_id):
+    """
+    :param conn:
+    :param scenario_id:
+    :return: boolean, whether the scenario's energy and weighted hours by
+        project and period have been aggregated (the
+        results_project_dispatch_by_period table is missing in databases
+        created before it was added to the schema)
+    """
+    c = conn.cursor()
+    if c.execute(
+        """SELECT COUNT(*) FROM sqlite_master
+        WHERE type = 'table'
+        AND name = 'results_project_dispatch_by_period';"""
+    ).fetchone()[0] == 0:
+        return False
+
+    return c.execute(
+        """SELECT EXISTS (
+            SELECT 1 FROM results_project_dispatch_by_period
+            WHERE scenario_id = ?
+        );""",
+        (scenario_id,)
+    ).fetchone()[0] == 1
+
+
 def create_plot(df, title, tech_colors={}):
     """
 